@@ -0,0 +1,131 @@
+"""
+Bounded agent pool.
+Hands out agent instances to one request at a time so concurrent Flask
+threads never share per-request state, and caps concurrency per agent type.
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+from utils.logger import get_logger
+
+
+class AgentPoolExhausted(RuntimeError):
+    """Raised when no agent becomes available within the acquire timeout."""
+    pass
+
+
+class AgentPool:
+    """
+    Thread-safe pool of up to max_size agent instances.
+
+    Instances are created lazily by factory (at most max_size, ever) and
+    returned to the pool after each request.
+
+    Usage:
+        pool = AgentPool("simple", SimpleAgent, max_size=8)
+        with pool.acquire() as agent:
+            agent.run(message)
+    """
+
+    def __init__(self, name: str, factory: Callable, max_size: int = 4, acquire_timeout: float = 30.0):
+        if max_size < 1:
+            raise ValueError(f"Pool size for '{name}' must be at least 1")
+        self.name = name
+        self.factory = factory
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.logger = get_logger("atlus.agent.pool")
+
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._waits = 0
+        self._timeouts = 0
+
+    def _try_create(self):
+        """Create a new instance if under max_size, else return None."""
+        with self._lock:
+            if self._created >= self.max_size:
+                return None
+            self._created += 1
+        try:
+            self.logger.debug(f"Creating {self.name} agent instance ({self._created}/{self.max_size})")
+            return self.factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _checkout(self, timeout: float):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        agent = self._try_create()
+        if agent is not None:
+            return agent
+
+        with self._lock:
+            self._waits += 1
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            with self._lock:
+                self._timeouts += 1
+            raise AgentPoolExhausted(
+                f"No {self.name} agent available after {timeout:.1f}s "
+                f"({self.max_size} in use)"
+            )
+
+    @contextmanager
+    def acquire(self, timeout: float = None):
+        """Borrow an agent for the duration of the with-block."""
+        start = time.time()
+        agent = self._checkout(self.acquire_timeout if timeout is None else timeout)
+        waited = time.time() - start
+        if waited > 0.05:
+            self.logger.info(f"Waited {waited:.2f}s for a {self.name} agent")
+
+        with self._lock:
+            self._in_use += 1
+        try:
+            yield agent
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._idle.put(agent)
+
+    def prefill(self, count: int = None) -> int:
+        """Eagerly create idle instances (up to count, default max_size). Returns how many were created."""
+        created = []
+        for _ in range(count or self.max_size):
+            agent = self._try_create()
+            if agent is None:
+                break
+            created.append(agent)
+        for agent in created:
+            self._idle.put(agent)
+        return len(created)
+
+    def idle_agents(self) -> list:
+        """Snapshot of idle instances (for warm-up; do not run requests on them)."""
+        with self._idle.mutex:
+            return list(self._idle.queue)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_size": self.max_size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "waits": self._waits,
+                "timeouts": self._timeouts
+            }
@@ -0,0 +1,79 @@
+"""
+Follow-up detection for complex tasks.
+Decides whether a message refines the task answered last in the session,
+so the orchestrator can answer it against the stored draft (TaskAgent.refine)
+instead of re-running the full pipeline.
+"""
+
+import os
+import re
+import time
+from typing import Optional
+
+
+class FollowupDetector:
+    """
+    Heuristic refinement detector.
+
+    A message is a follow-up when all of these hold:
+    - the session has stored task state that is recent and not chained too often
+    - the message is short (long messages are usually new tasks)
+    - it is not a question or an acknowledgement ("thanks, ...", "ok, ...")
+    - a clause opens with an edit verb ("add", "remove", "change", ...), so
+      "I will use it" or "what if I use postgres" do not count
+    - it points back at the previous answer ("that", "it", "the code", ...)
+      or opens like a continuation ("now", "also", "instead", ...)
+    """
+
+    MAX_MESSAGE_LENGTH = int(os.getenv("ATLUS_FOLLOWUP_MAX_LENGTH", "300"))
+    MAX_AGE_SECONDS = float(os.getenv("ATLUS_FOLLOWUP_MAX_AGE_SECONDS", "1800"))
+    # Refinements answered against one draft before the full pipeline runs again
+    MAX_CHAIN = int(os.getenv("ATLUS_FOLLOWUP_MAX_CHAIN", "5"))
+
+    _EDIT_VERBS = (
+        r"(add|adding|remove|drop|delete|change|update|modify|replace|rename|rewrite|refactor|"
+        r"extend|include|switch|convert|fix|improve|make|use|support|handle|expand|shorten|simplify)"
+    )
+    # An edit verb opening a clause, after optional continuation words
+    _LEAD = r"((now|also|and|then|next|instead|but|please|just)[,\s]+)*"
+    EDIT_RE = re.compile(rf"(^|[,;.:!]\s*){_LEAD}{_EDIT_VERBS}\b")
+    # "that"/"this" only count as the object of an edit or a preposition, so the
+    # relative pronoun in "make an app that ..." does not read as a reference
+    _TARGET = r"(it|that|this|those|these|the (code|plan|draft|solution|answer|design|example|script|function|api))"
+    REFERENCE_RE = re.compile(
+        rf"\b{_EDIT_VERBS} {_TARGET}\b"
+        rf"|\b(to|in|into|on|from|of|for|with) {_TARGET}\b"
+        r"|\bthe (code|plan|draft|solution|answer|design|example|script)\b"
+        r"|\b(above|previous|earlier|instead)\b"
+    )
+    CONTINUATION_RE = re.compile(r"^(now|also|and|then|next|instead|but)\b")
+    QUESTION_RE = re.compile(
+        r"\?\s*$"
+        r"|^((and|but|so|also|then)[,\s]+)?(what|how|why|when|where|which|who|does|do|did|is|are|can|could|"
+        r"would|should|will|shall)\b"
+    )
+    ACK_RE = re.compile(r"^(thanks|thank you|thx|ok(ay)?|great|cool|nice|perfect|awesome|got it|sounds good)\b")
+
+    def __init__(self, max_age_seconds: float = None, max_chain: int = None, max_length: int = None):
+        self.max_age_seconds = self.MAX_AGE_SECONDS if max_age_seconds is None else max_age_seconds
+        self.max_chain = self.MAX_CHAIN if max_chain is None else max_chain
+        self.max_length = self.MAX_MESSAGE_LENGTH if max_length is None else max_length
+
+    def is_followup(self, user_message: str, task_state: Optional[dict], now: float = None) -> bool:
+        """True if user_message should be answered against task_state."""
+        if not task_state or not task_state.get("draft"):
+            return False
+        if task_state.get("followups", 0) >= self.max_chain:
+            return False
+        now = time.time() if now is None else now
+        if now - task_state.get("updated_at", 0) > self.max_age_seconds:
+            return False
+
+        message = user_message.lower().strip()
+        if not message or len(message) > self.max_length:
+            return False
+        if self.QUESTION_RE.search(message) or self.ACK_RE.search(message):
+            return False
+        if not self.EDIT_RE.search(message):
+            return False
+        return bool(self.CONTINUATION_RE.search(message) or self.REFERENCE_RE.search(message))
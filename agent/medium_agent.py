@@ -0,0 +1,75 @@
+"""
+Medium Agent for moderately complex requests.
+Plans and answers in a single reasoning-model call.
+Sits between SimpleAgent (one chat call) and TaskAgent (six stages).
+"""
+
+import re
+import time
+
+from llm.router import get_llm
+from prompts.medium_prompt import build_medium_prompt
+from utils.logger import get_logger
+
+
+class MediumAgent:
+    """
+    Single-call agent for focused tasks.
+
+    Use cases:
+    - A single function or script
+    - Debugging a specific error
+    - Comparisons with a recommendation
+    - Short designs for one component
+
+    One reasoning LLM call with a "plan then answer" prompt; no verify,
+    refactor or write stages.
+    """
+
+    ANSWER_HEADING_RE = re.compile(r"^#+\s*answer\s*:?\s*$", re.IGNORECASE | re.MULTILINE)
+
+    def __init__(self):
+        self.logger = get_logger("atlus.agent.medium")
+        self.reasoning_llm = get_llm("reasoning")
+        self.logger.debug("MediumAgent initialized")
+
+    def run(self, user_message: str, context_messages: list = None) -> str:
+        """
+        Plan and answer a request in one LLM call.
+
+        Args:
+            user_message: User's input request
+            context_messages: Pre-built context with memory (optional)
+
+        Returns:
+            Answer section of the response
+        """
+        start_time = time.time()
+        self.logger.info(f"MediumAgent processing: {user_message[:50]}...")
+
+        base_prompt = build_medium_prompt(user_message)
+
+        if context_messages:
+            # Medium system prompt first, then memory/system context and history, then the request
+            self.logger.debug(f"Using context_messages with {len(context_messages)} messages")
+            prompt = [base_prompt[0], *context_messages, base_prompt[1]]
+        else:
+            prompt = base_prompt
+
+        raw = self.reasoning_llm.generate(prompt)
+        response = self._extract_answer(raw)
+
+        execution_time = time.time() - start_time
+        self.logger.info(f"MediumAgent completed in {execution_time:.2f}s ({len(response)} characters)")
+        return response
+
+    def _extract_answer(self, raw: str) -> str:
+        """Return the Answer section, or the whole response if the model ignored the format."""
+        if not raw:
+            return ""
+        match = self.ANSWER_HEADING_RE.search(raw)
+        if not match:
+            self.logger.debug("No Answer heading found, returning full response")
+            return raw.strip()
+        answer = raw[match.end():].strip()
+        return answer or raw.strip()
@@ -46,9 +46,8 @@ class SimpleAgent:
             # Use context if provided, otherwise build simple prompt
             if context_messages:
                 self.logger.debug("Using context messages with memory")
-                prompt = context_messages
-                # Add current user message
-                prompt.append({"role": "user", "content": user_message})
+                # Copy so the caller's list is never mutated (it may be reused or shared)
+                prompt = [*context_messages, {"role": "user", "content": user_message}]
             else:
                 # Build simple prompt without memory
                 prompt = build_simple_prompt(user_message)
@@ -6,7 +6,7 @@ This is the full pipeline agent for complex tasks.
 
 import json
 import time
-from typing import List
+from typing import List, Tuple
 
 # LLMs - Use router for centralized LLM management
 from llm.router import get_llm
@@ -18,6 +18,7 @@ from prompts.reasoning_prompt import build_reasoning_prompt
 from prompts.verifier_prompt import build_verifier_prompt
 from prompts.refactor_prompt import build_refactor_prompt
 from prompts.writer_prompt import build_writer_prompt
+from prompts.followup_prompt import build_followup_prompt
 
 # Parsers
 from utils.parsers.json_parser import parse_json, JSONParseError
@@ -70,6 +71,16 @@ class TaskAgent:
         Returns:
             Final polished response string
         """
+        return self.run_task(user_message, context_messages=context_messages)[0]
+
+    def run_task(self, user_message: str, context_messages: list = None) -> Tuple[str, dict]:
+        """
+        Run the full pipeline and keep what it produced.
+        
+        Returns:
+            (final response, task state) where the task state holds the intent,
+            plan and refined draft a follow-up can be answered against (refine())
+        """
         start_time = time.time()
         self.logger.info("=" * 80)
         self.logger.info("TASK AGENT EXECUTION STARTED")
@@ -137,7 +148,7 @@ class TaskAgent:
             self.logger.info(f"Final response length: {len(final)} characters")
             self.logger.info("=" * 80)
             
-            return final
+            return final, self._task_state(intent, plan, refactored, user_message)
             
         except Exception as e:
             elapsed_time = time.time() - start_time
@@ -149,6 +160,98 @@ class TaskAgent:
             self.logger.error("=" * 80)
             raise
 
+    # ==========================================================
+    # FOLLOW-UP — DELTA AGAINST THE STORED DRAFT
+    # ==========================================================
+    def refine(self, user_message: str, task_state: dict, context_messages: list = None) -> Tuple[str, dict]:
+        """
+        Answer a refinement of the previous task ("now add OAuth to that").
+        
+        Skips intent extraction, planning and verification: one reasoning call
+        produces only the requested change, the refactor stage merges it into
+        the stored draft, and the writer polishes the result.
+        
+        Args:
+            user_message: The follow-up request
+            task_state: State returned by run_task() or a previous refine()
+            context_messages: Pre-built context with memory (optional)
+            
+        Returns:
+            (final response, updated task state)
+        """
+        start_time = time.time()
+        intent, plan, draft = task_state["intent"], task_state["plan"], task_state["draft"]
+        self.logger.info("=" * 80)
+        self.logger.info("TASK AGENT FOLLOW-UP STARTED")
+        self.logger.info("=" * 80)
+        self.logger.info(f"Follow-up: {user_message}")
+        self.logger.info(f"Stored draft: {len(draft)} characters, plan: {len(plan)} steps")
+
+        delta = self._execute_delta_reasoning(intent, plan, draft, user_message, context_messages)
+        if not delta or not delta.strip():
+            raise RuntimeError("Delta reasoning returned empty output")
+        self.logger.info(f"Delta generated: {len(delta)} characters")
+
+        refactored = self._refactor_draft(draft, {
+            "issues": [f"Requested change: {user_message}"],
+            "suggested_fixes": [delta]
+        })
+        final = self._write_final_response(refactored)
+
+        state = self._task_state(intent, plan, refactored, task_state.get("request", ""))
+        state["followups"] = task_state.get("followups", 0) + 1
+        self.logger.info(
+            f"Follow-up completed in {time.time() - start_time:.2f}s "
+            f"(follow-up {state['followups']} on this task)"
+        )
+        return final, state
+
+    def _execute_delta_reasoning(self, intent: dict, plan: List[str], draft: str,
+                                 change_request: str, context_messages: list = None) -> str:
+        """Generate only the changes a follow-up asks for."""
+        prompt = build_followup_prompt(
+            context=self._format_intent(intent),
+            plan=plan,
+            previous_draft=draft,
+            change_request=change_request
+        )
+        if context_messages:
+            conversation_history = [
+                msg for msg in context_messages
+                if msg.get("role") in ["user", "assistant"]
+            ]
+            prompt = [prompt[0]] + conversation_history + [prompt[1]]
+        self.logger.debug(f"Delta prompt messages: {len(prompt)} messages")
+
+        reasoning_start = time.time()
+        result = self.reasoning_llm.generate(prompt)
+        self.logger.info(f"Delta reasoning completed in {time.time() - reasoning_start:.2f}s")
+        return result
+
+    @staticmethod
+    def _task_state(intent: dict, plan: List[str], draft: str, request: str) -> dict:
+        return {
+            "intent": intent,
+            "plan": plan,
+            "draft": draft,
+            "request": request,
+            "followups": 0,
+            "updated_at": time.time()
+        }
+
+    @staticmethod
+    def _format_intent(intent: dict) -> str:
+        constraints_str = (
+            ", ".join(intent['constraints'])
+            if isinstance(intent['constraints'], list)
+            else str(intent['constraints'])
+        )
+        return (
+            f"Goal: {intent['goal']}\n"
+            f"Constraints: {constraints_str}\n"
+            f"Expected Output: {intent['expected_output']}"
+        )
+
     # ==========================================================
     # STEP 1 — INTENT EXTRACTION (SAFE)
     # ==========================================================
@@ -254,17 +357,7 @@ class TaskAgent:
     def _execute_reasoning(self, intent: dict, plan: List[str], context_messages: list = None) -> str:
         """Generate comprehensive draft solution."""
         self.logger.debug("Formatting intent context...")
-        constraints_str = (
-            ", ".join(intent['constraints']) 
-            if isinstance(intent['constraints'], list) 
-            else str(intent['constraints'])
-        )
-        
-        context = (
-            f"Goal: {intent['goal']}\n"
-            f"Constraints: {constraints_str}\n"
-            f"Expected Output: {intent['expected_output']}"
-        )
+        context = self._format_intent(intent)
         self.logger.debug(f"Context length: {len(context)} characters")
         self.logger.debug(f"Plan steps: {len(plan)}")
         
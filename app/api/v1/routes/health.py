@@ -29,3 +29,38 @@ def health():
     return jsonify(HealthService.get_health_status()), 200
 
 
+@health_bp.route("/health/ready", methods=["GET"])
+def ready():
+    """
+    Readiness check endpoint.
+    Returns 503 until startup warm-up has finished, so load balancers
+    never route traffic to a cold instance.
+    
+    Response:
+        {
+            "status": "ready" | "not_ready",
+            "service": "atlus-api",
+            "warmup": {"state": "pending" | "warming" | "ready" | "failed", "attempts": 1, ...},
+            "timestamp": "ISO 8601"
+        }
+    """
+    status, is_ready = HealthService.get_readiness_status()
+    return jsonify(status), 200 if is_ready else 503
+
+
+
+
+@health_bp.route("/health/metrics", methods=["GET"])
+def metrics():
+    """
+    Runtime metrics endpoint.
+    
+    Response:
+        {
+            "memory": {"session": {"resident": 12, "evictions": 3, "reloads": 1, ...}, ...},
+            "classification": {...},
+            "agent_pools": {...},
+            "timestamp": "ISO 8601"
+        }
+    """
+    return jsonify(HealthService.get_metrics()), 200
@@ -14,7 +14,9 @@ from app.api.v1.schemas import (
     SessionInfoResponseSchema,
     SessionInfoData,
     ContinueSessionResponseSchema,
-    ContinueSessionData
+    ContinueSessionData,
+    SessionListResponseSchema,
+    SessionListData
 )
 from app.api.v1.validators import validate_request
 from app.api.v1.errors import APIError, handle_api_error
@@ -25,6 +27,27 @@ from app.utils.logger import get_logger
 session_bp = Blueprint("session", __name__)
 logger = get_logger("atlus.api.v1.session")
 
+MAX_PAGE_SIZE = 100
+
+
+def _int_arg(name: str, default: int, minimum: int, maximum: int = None) -> int:
+    """Read a bounded integer query parameter."""
+    raw = request.args.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        value = None
+    if value is None or value < minimum or (maximum is not None and value > maximum):
+        bounds = f">= {minimum}" if maximum is None else f"between {minimum} and {maximum}"
+        raise APIError(
+            f"Query parameter '{name}' must be an integer {bounds}",
+            status_code=400,
+            error_code="VALIDATION_ERROR"
+        )
+    return value
+
 
 @session_bp.route("/sessions", methods=["POST"])
 @rate_limit(max_requests=50, window=60)
@@ -102,6 +125,78 @@ def create_session():
         )
 
 
+@session_bp.route("/sessions", methods=["GET"])
+@rate_limit(max_requests=100, window=60)
+def list_sessions():
+    """
+    List a user's active sessions, most recent first.
+    
+    Request:
+        GET /api/v1/sessions?user_id=user_123&limit=20&offset=0
+    
+    Query Parameters:
+        user_id (optional): User identifier, default: "default_user"
+        limit (optional): Page size, 1-100, default: 20
+        offset (optional): Sessions to skip, default: 0
+    
+    Response:
+        {
+            "success": true,
+            "data": {
+                "user_id": "user_123",
+                "sessions": [{"session_id": "...", "last_activity": "...", ...}],
+                "total": 42,
+                "limit": 20,
+                "offset": 0
+            },
+            "timestamp": "2024-01-01T12:35:00Z"
+        }
+    """
+    request_id = request.headers.get(
+        "X-Request-ID",
+        f"req_{int(time.time() * 1000)}"
+    )
+
+    user_id = request.args.get("user_id", "default_user")
+
+    logger.info(f"[{request_id}] List sessions request for user: {user_id}")
+
+    try:
+        limit = _int_arg("limit", 20, 1, MAX_PAGE_SIZE)
+        offset = _int_arg("offset", 0, 0)
+
+        page = SessionService.list_user_sessions(user_id=user_id, limit=limit, offset=offset)
+
+        response_schema = SessionListResponseSchema(
+            success=True,
+            data=SessionListData(**page)
+        )
+
+        # Return JSON (handle Pydantic v1/v2 compatibility)
+        try:
+            return jsonify(response_schema.model_dump()), 200
+        except AttributeError:
+            return jsonify(response_schema.dict()), 200
+
+    except APIError as e:
+        logger.warning(f"[{request_id}] API Error: {str(e)}")
+        return handle_api_error(e, request_id)
+
+    except Exception as e:
+        logger.error(
+            f"[{request_id}] Unexpected error: {str(e)}",
+            exc_info=True
+        )
+        return handle_api_error(
+            APIError(
+                "An internal server error occurred",
+                status_code=500,
+                error_code="INTERNAL_ERROR"
+            ),
+            request_id
+        )
+
+
 @session_bp.route("/sessions/<session_id>", methods=["GET"])
 @rate_limit(max_requests=100, window=60)
 def get_session_info(session_id: str):
@@ -282,8 +377,8 @@ def continue_last_session():
     logger.info(f"[{request_id}] Continue session request for user: {user_id}")
 
     try:
-        # Get last session
-        last_session = SessionService.get_last_session(user_id=user_id)
+        # Get last session (its memory starts loading in the background)
+        last_session = SessionService.continue_last_session(user_id=user_id)
 
         if not last_session:
             raise APIError(
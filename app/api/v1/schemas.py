@@ -3,7 +3,7 @@ Pydantic schemas for API request/response validation.
 """
 
 from pydantic import BaseModel, Field, validator
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
@@ -98,6 +98,22 @@ class ContinueSessionData(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Session metadata")
 
 
+class SessionListData(BaseModel):
+    """Paginated session list data."""
+    user_id: str = Field(..., description="User identifier")
+    sessions: List[ContinueSessionData] = Field(default_factory=list, description="Sessions, most recent first")
+    total: int = Field(..., description="Total active sessions for the user")
+    limit: int = Field(..., description="Page size")
+    offset: int = Field(..., description="Sessions skipped")
+
+
+class SessionListResponseSchema(BaseModel):
+    """Response schema for listing a user's sessions."""
+    success: bool = Field(True, description="Request success status")
+    data: SessionListData = Field(..., description="Session page")
+    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
+
+
 class ContinueSessionResponseSchema(BaseModel):
     """Response schema for continue session."""
     success: bool = Field(True, description="Request success status")
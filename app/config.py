@@ -25,6 +25,13 @@ class Config:
     RATE_LIMIT_REQUESTS = int(os.getenv('RATE_LIMIT_REQUESTS', '100'))
     RATE_LIMIT_WINDOW = int(os.getenv('RATE_LIMIT_WINDOW', '60'))
 
+    # Startup warm-up (pre-create agents, pre-connect LLM providers)
+    WARMUP_ENABLED = os.getenv('ATLUS_WARMUP', 'false').lower() == 'true'
+    WARMUP_PROBE = os.getenv('ATLUS_WARMUP_PROBE', 'false').lower() == 'true'
+
+    # Restore state from a snapshot file at startup (only into empty storage)
+    RESTORE_SNAPSHOT = os.getenv('ATLUS_RESTORE_SNAPSHOT')
+
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -47,6 +54,7 @@ class TestingConfig(Config):
     DEBUG = True
     TESTING = True
     SECRET_KEY = 'test-secret-key'
+    WARMUP_ENABLED = False
 
 
 
@@ -9,6 +9,8 @@ from flask import Flask, jsonify
 from app.config import DevelopmentConfig, ProductionConfig, TestingConfig
 from app.core.extensions import init_extensions
 from app.api import init_api
+from app.services.snapshot_service import SnapshotService
+from app.services.warmup_service import WarmupService
 from app.utils.logger import get_logger
 from dotenv import load_dotenv
 load_dotenv()
@@ -41,6 +43,10 @@ def create_app(config_name: str = None) -> Flask:
     
     logger.info(f"Loading configuration: {config_class.__name__}")
     
+    # Bulk-load state from a snapshot before anything reads sessions
+    if app.config.get('RESTORE_SNAPSHOT'):
+        SnapshotService.restore(app.config['RESTORE_SNAPSHOT'])
+    
     # Initialize extensions (CORS, etc.)
     init_extensions(app)
     
@@ -50,6 +56,12 @@ def create_app(config_name: str = None) -> Flask:
     # Register root endpoints
     register_root_routes(app)
     
+    # Warm up agents and upstream connections (opt-in); /health/ready waits for it
+    if app.config.get('WARMUP_ENABLED'):
+        WarmupService.start(probe=app.config.get('WARMUP_PROBE', False))
+    else:
+        WarmupService.mark_ready()
+    
     logger.info("Flask application created successfully")
     return app
 
@@ -71,6 +83,7 @@ def register_root_routes(app: Flask):
             "endpoints": {
                 "chat": "/api/v1/chat",
                 "health": "/api/v1/health",
+                "ready": "/api/v1/health/ready",
                 "docs": "/api/v1/docs"
             }
         }), 200
@@ -127,6 +140,12 @@ def run_server(host: str = '0.0.0.0', port: int = 5000, debug: bool = False):
     """
     app = create_app()
     
+    # Don't accept connections until warm-up has finished
+    if app.config.get('WARMUP_ENABLED'):
+        logger.info("Waiting for warm-up to finish before serving traffic...")
+        if not WarmupService.wait():
+            logger.warning(f"Warm-up did not complete: {WarmupService.status()}")
+    
     logger.info("=" * 80)
     logger.info(f"Starting ATLUS API server")
     logger.info(f"Host: {host}")
@@ -7,6 +7,7 @@ from app.services.chat_service import ChatService
 from app.services.health_service import HealthService
 from app.services.memory_service import MemoryService
 from app.services.session_service import SessionService
+from app.services.snapshot_service import SnapshotService
 
-__all__ = ["ChatService", "HealthService", "MemoryService", "SessionService"]
+__all__ = ["ChatService", "HealthService", "MemoryService", "SessionService", "SnapshotService"]
 
@@ -1,9 +1,11 @@
 # app/services/chat_service.py
 
+import threading
 import time
 from typing import Dict, Any
 
 from orchestrator.orchestrator import Orchestrator
+from agent.agent_pool import AgentPoolExhausted
 from app.services.memory_service import MemoryService
 from app.api.v1.errors import APIError
 from app.utils.logger import get_logger
@@ -17,14 +19,17 @@ class ChatService:
     """
 
     _orchestrator_instance: Orchestrator | None = None
+    _orchestrator_lock = threading.Lock()
     MAX_MESSAGE_LENGTH = 5000
 
     @classmethod
     def _get_orchestrator(cls) -> Orchestrator:
-        """Singleton orchestrator instance."""
+        """Singleton orchestrator instance (safe to call from concurrent request threads)."""
         if cls._orchestrator_instance is None:
-            logger.info("Creating new Orchestrator instance")
-            cls._orchestrator_instance = Orchestrator()
+            with cls._orchestrator_lock:
+                if cls._orchestrator_instance is None:
+                    logger.info("Creating new Orchestrator instance")
+                    cls._orchestrator_instance = Orchestrator(task_state_store=MemoryService)
         return cls._orchestrator_instance
 
     @classmethod
@@ -92,10 +97,19 @@ class ChatService:
 
         # Run orchestrator with context
         orchestrator = cls._get_orchestrator()
-        response_text = orchestrator.run(message, session_id=session_id, context_messages=context_messages)
+        try:
+            response_text = orchestrator.run(message, session_id=session_id, context_messages=context_messages)
+        except AgentPoolExhausted as e:
+            raise APIError(
+                "Server is busy, please retry shortly",
+                status_code=503,
+                error_code="AGENT_BUSY",
+                details=[{"reason": str(e)}]
+            )
 
-        # Save conversation turn to memory (includes preference extraction)
-        MemoryService.save_turn(session_id, message, response_text, user_id=user_id)
+        # Save conversation turn to memory (includes preference extraction) after
+        # responding; turns of one session are applied in order
+        MemoryService.enqueue_turn(session_id, message, response_text, user_id=user_id)
 
         execution_time = round(time.time() - start_time, 2)
 
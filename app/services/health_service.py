@@ -2,6 +2,10 @@
 
 import time
 
+from app.services.warmup_service import WarmupService
+from app.services.memory_service import MemoryService
+from storage.file_lock import lock_stats
+
 class HealthService:
     @staticmethod
     def get_health_status():
@@ -13,3 +17,53 @@ class HealthService:
                 time.gmtime()
             )
         }
+
+    @staticmethod
+    def get_readiness_status():
+        """Readiness for load balancers: only ready once warm-up has finished."""
+        ready = WarmupService.is_ready()
+        return {
+            "status": "ready" if ready else "not_ready",
+            "service": "atlus-api",
+            "warmup": WarmupService.status(),
+            "timestamp": time.strftime(
+                "%Y-%m-%dT%H:%M:%SZ",
+                time.gmtime()
+            )
+        }, ready
+
+    @staticmethod
+    def get_metrics():
+        """Process-level metrics: memory residency and, once created, orchestrator caches and pools."""
+        from app.services.chat_service import ChatService
+        from app.services.session_service import SessionService
+
+        metrics = {
+            "memory": MemoryService.get_registry_stats(),
+            "summaries": MemoryService._summarizer.stats(),
+            "context_cache": MemoryService.get_context_cache_stats(),
+            "file_locks": lock_stats(),
+            "timestamp": time.strftime(
+                "%Y-%m-%dT%H:%M:%SZ",
+                time.gmtime()
+            )
+        }
+        if MemoryService._ingest is not None:
+            metrics["memory_ingest"] = MemoryService._ingest.stats()
+        if MemoryService._prefetch is not None:
+            metrics["memory_prefetch"] = MemoryService.get_prefetch_stats()
+        if MemoryService._registry_sweeper is not None:
+            metrics["memory_sweeps"] = MemoryService._registry_sweeper.stats()
+        if MemoryService._fact_batcher is not None:
+            metrics["long_term_writes"] = MemoryService.get_long_term_write_stats()
+        if SessionService._persister is not None:
+            metrics["session_writes"] = SessionService._persister.stats()
+        if SessionService._sweeper is not None:
+            metrics["session_expiry"] = SessionService._sweeper.stats()
+        orchestrator = ChatService._orchestrator_instance
+        if orchestrator is not None:
+            metrics["classification"] = orchestrator.get_classification_stats()
+            metrics["agent_pools"] = orchestrator.get_pool_stats()
+            metrics["context_packing"] = orchestrator.get_context_stats()
+            metrics["followups"] = orchestrator.get_followup_stats()
+        return metrics
@@ -2,6 +2,12 @@
 Memory service for managing user memories across sessions.
 """
 
+import atexit
+import os
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
 from typing import Dict, Optional
 from memory import (
     SessionMemory,
@@ -10,53 +16,462 @@ from memory import (
     BehaviorProfile,
     ContextAssembler
 )
+from context.context_cache import ContextCache
+from context.fact_index import FactIndex
+from context.packer import SUMMARY_PREFIX
+from context.summarizer import EMPTY_SUMMARY, RollingSummarizer
+from models.message import Turn, compact, to_wire
+from storage import FactBatcher, IngestQueue, get_storage
+from storage.registry import MemoryRegistry, RegistrySweeper
 from app.utils.logger import get_logger
 
 logger = get_logger("atlus.service.memory")
 
 
+def _load_recent_history(session: SessionMemory, session_id: str) -> bool:
+    """
+    Load the turns the rolling summary does not cover (at least the last
+    RECENT_HISTORY_MESSAGES) into session.history, without reading older
+    turns. session.history_offset is how many stored messages precede it,
+    and the in-memory summary's "covered" counts from there.
+
+    Returns False if the backend holds no history for the session.
+    """
+    storage = get_storage()
+    total = storage.history_length(session_id)
+    if not total:
+        return False
+    summary = storage.load_summary(session_id) or dict(EMPTY_SUMMARY)
+    keep = MemoryService.RECENT_HISTORY_MESSAGES
+    if MemoryService.SUMMARY_ENABLED:
+        keep = max(keep, total - summary.get("covered", 0))
+    stored = storage.load_history(session_id, last_n=keep) if keep < total else storage.load_history(session_id)
+    session.history = compact(stored)
+    session.history_offset = total - len(stored)
+    session.summary = {**summary, "covered": max(summary.get("covered", 0) - session.history_offset, 0)}
+    return True
+
+
+def _history_offset(session: SessionMemory) -> int:
+    return getattr(session, "history_offset", 0)
+
+
+def _new_session_memory(session_id: str) -> SessionMemory:
+    logger.info(f"Creating new session memory: {session_id}")
+    session = SessionMemory(session_id)
+    # The storage backend owns history (turns are appended there, not via
+    # session.add_turn); the legacy per-session file only seeds it once
+    if _load_recent_history(session, session_id):
+        return session
+    storage = get_storage()
+    if session.history:
+        storage.replace_history(session_id, to_wire(session.history))
+        session.history = compact(session.history)
+    session.history_offset = 0
+    session.summary = storage.load_summary(session_id) or dict(EMPTY_SUMMARY)
+    return session
+
+
+def _new_working_memory(session_id: str) -> WorkingMemory:
+    logger.info(f"Creating new working memory: {session_id}")
+    return WorkingMemory(session_id)
+
+
+class _StoredLongTermMemory(LongTermMemory):
+    """
+    LongTermMemory kept in the storage backend (SQLite rows, Redis hash)
+    instead of data/memory_{user_id}.json. save() writes only the facts that
+    changed, so a new fact costs one row write rather than a file rewrite.
+    """
+
+    def __init__(self, user_id: str):
+        super().__init__(user_id)
+        self.user_id = user_id
+        self._facts = get_storage().load_long_term(user_id)
+
+    def load(self) -> Dict:
+        return dict(self._facts)
+
+    def get_all(self) -> Dict:
+        return dict(self._facts)
+
+    def get(self, key, default=None):
+        return self._facts.get(key, default)
+
+    def save(self, data: Dict):
+        storage = get_storage()
+        changed = {key: value for key, value in data.items() if key not in self._facts or self._facts[key] != value}
+        removed = [key for key in self._facts if key not in data]
+        if changed:
+            storage.update_long_term(self.user_id, changed)
+        if removed:
+            storage.delete_long_term(self.user_id, removed)
+        self._facts = dict(data)
+
+    def update(self, key, value):
+        self.save({**self._facts, key: value})
+
+    def __getstate__(self):
+        # The backend holds the facts; a spilled copy could be stale on reload
+        state = dict(self.__dict__)
+        state.pop("_facts", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._facts = get_storage().load_long_term(self.user_id)
+
+
+def _new_long_term_memory(user_id: str) -> LongTermMemory:
+    logger.info(f"Loading long-term memory: {user_id}")
+    if get_storage().NATIVE_LONG_TERM:
+        return LongTermMemory(user_id)
+    return _StoredLongTermMemory(user_id)
+
+
+def _new_fact_index(user_id: str) -> FactIndex:
+    index = FactIndex.load(user_id, MemoryService.FACT_INDEX_DIR)
+    # Re-embed anything written while the index was not resident (or never built)
+    changed = index.sync(MemoryService.get_long_term_memory(user_id).get_all())
+    if changed:
+        logger.info(f"Re-indexed {changed} long-term fact(s) for {user_id}")
+    return index
+
+
+def _new_behavior_profile(session_id: str) -> BehaviorProfile:
+    logger.info(f"Creating new behavior profile: {session_id}")
+    return BehaviorProfile()
+
+
+def _summary_llm():
+    from llm.router import get_llm
+    return get_llm("summarizing")
+
+
+class _SummarizedSessionView:
+    """
+    Read-only stand-in for SessionMemory during context assembly: exposes
+    only the history the rolling summary does not cover.
+    """
+
+    def __init__(self, session: SessionMemory, history: list):
+        self._session = session
+        self.history = history
+
+    def get_context(self):
+        return list(self.history)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+class _RelevantLongTermView:
+    """
+    Read-only stand-in for LongTermMemory during context assembly: get_all()
+    and load() return only the given facts (those selected for the current
+    message, or the stored facts with not-yet-written updates overlaid).
+    """
+
+    def __init__(self, long_term: LongTermMemory, facts: Dict):
+        self._long_term = long_term
+        self._facts = facts
+
+    def get_all(self) -> Dict:
+        return dict(self._facts)
+
+    def load(self) -> Dict:
+        return dict(self._facts)
+
+    def __getattr__(self, name):
+        return getattr(self._long_term, name)
+
+
+def _history_size(session: SessionMemory) -> int:
+    """Cheap size estimate: characters of conversation history."""
+    return sum(
+        len(msg.get("content") or "") if isinstance(msg, Mapping) else len(str(msg))
+        for msg in getattr(session, "history", [])
+    )
+
+
 class MemoryService:
     """
     Manages memory instances for users and sessions.
     """
 
-    # In-memory storage (use Redis in production)
-    _sessions: Dict[str, SessionMemory] = {}
-    _working: Dict[str, WorkingMemory] = {}
-    _long_term: Dict[str, LongTermMemory] = {}
-    _behavior: Dict[str, BehaviorProfile] = {}
+    # Residency limits: least recently used (or idle) memory is spilled to disk
+    # and reloaded transparently on next access
+    SPILL_DIR = Path(os.getenv("ATLUS_MEMORY_SPILL_DIR", "data/spill"))
+    MAX_RESIDENT_SESSIONS = int(os.getenv("ATLUS_MEMORY_MAX_SESSIONS", "1000"))
+    MAX_RESIDENT_USERS = int(os.getenv("ATLUS_MEMORY_MAX_USERS", "1000"))
+    MAX_SESSION_HISTORY_BYTES = int(os.getenv("ATLUS_MEMORY_MAX_HISTORY_BYTES", str(256 * 1024 * 1024)))
+    # Messages loaded when a session becomes resident; older ones stay in
+    # storage (with summaries on, every turn the summary does not cover is loaded too)
+    RECENT_HISTORY_MESSAGES = int(os.getenv("ATLUS_MEMORY_RECENT_MESSAGES", "40"))
+    MAX_IDLE_SECONDS = float(os.getenv("ATLUS_MEMORY_IDLE_SECONDS", "1800"))
+    # Per-session memory idle this long (or pushed out by the limits above) is
+    # kept compressed in RAM until MAX_IDLE_SECONDS, within MAX_WARM_BYTES
+    WARM_AFTER_SECONDS = float(os.getenv("ATLUS_MEMORY_WARM_SECONDS", "300"))
+    MAX_WARM_BYTES = int(os.getenv("ATLUS_MEMORY_MAX_WARM_BYTES", str(64 * 1024 * 1024)))
+    _warm_tier = (
+        {"warm_after_seconds": WARM_AFTER_SECONDS, "max_warm_bytes": MAX_WARM_BYTES}
+        if WARM_AFTER_SECONDS > 0 else {}
+    )
+    # Idle memory is compressed and spilled by a background sweep this often,
+    # not only when new sessions push it out (0 = no sweep)
+    SWEEP_INTERVAL_SECONDS = float(os.getenv("ATLUS_MEMORY_SWEEP_INTERVAL", "30"))
+
+    _registry_sweeper: Optional[RegistrySweeper] = None
+    _registry_sweeper_lock = threading.Lock()
+
+    # Rolling summary: older turns are folded in the background once the
+    # unsummarized history exceeds the threshold
+    SUMMARY_ENABLED = os.getenv("ATLUS_SUMMARY_ENABLED", "true").lower() == "true"
+    SUMMARY_TOKEN_THRESHOLD = int(os.getenv("ATLUS_SUMMARY_TOKEN_THRESHOLD", "2000"))
+    SUMMARY_KEEP_TURNS = int(os.getenv("ATLUS_SUMMARY_KEEP_TURNS", "4"))
+
+    # Relevance-ranked long-term memory: once a user has more than TOP_K
+    # facts, only the TOP_K most similar to the current message are sent
+    FACT_INDEX_DIR = Path(os.getenv("ATLUS_FACT_INDEX_DIR", "data/fact_index"))
+    LONG_TERM_TOP_K = int(os.getenv("ATLUS_LONG_TERM_TOP_K", "8"))
+    LONG_TERM_MIN_SCORE = float(os.getenv("ATLUS_LONG_TERM_MIN_SCORE", "0.05"))
+
+    # Turn ingestion (history append, memory log, preference extraction,
+    # long-term updates) runs after the response on per-session ordered workers
+    INGEST_ASYNC = os.getenv("ATLUS_MEMORY_INGEST_ASYNC", "true").lower() == "true"
+    INGEST_WORKERS = int(os.getenv("ATLUS_MEMORY_INGEST_WORKERS", "4"))
+    INGEST_MAX_PENDING = int(os.getenv("ATLUS_MEMORY_INGEST_MAX_PENDING", "1000"))
+    INGEST_WAIT_SECONDS = float(os.getenv("ATLUS_MEMORY_INGEST_WAIT_SECONDS", "10"))
+
+    _ingest: Optional[IngestQueue] = None
+    _ingest_lock = threading.Lock()
+
+    # Sessions a client is about to use (continued, or inspected) have their
+    # memory loaded in the background so the next chat finds it resident
+    PREFETCH_ENABLED = os.getenv("ATLUS_MEMORY_PREFETCH_ENABLED", "true").lower() == "true"
+    PREFETCH_WORKERS = int(os.getenv("ATLUS_MEMORY_PREFETCH_WORKERS", "2"))
+
+    _prefetch: Optional[IngestQueue] = None
+    _prefetch_lock = threading.Lock()
+    _prefetch_stats = {"requested": 0, "already_resident": 0, "already_queued": 0, "dropped": 0, "loaded": 0}
+
+    # Long-term fact updates for one user are merged and written together
+    # once no new update arrived for LONG_TERM_WRITE_WINDOW seconds
+    LONG_TERM_WRITE_WINDOW = float(os.getenv("ATLUS_LONG_TERM_WRITE_WINDOW", "0.5"))
+    LONG_TERM_WRITE_MAX_DELAY = float(os.getenv("ATLUS_LONG_TERM_WRITE_MAX_DELAY", "5"))
+
+    _fact_batcher: Optional[FactBatcher] = None
+    _fact_batcher_lock = threading.Lock()
+
+    # Assembled context per session, reused while no memory component has
+    # changed; saved turns extend the cached history instead of dropping it
+    CONTEXT_CACHE_ENABLED = os.getenv("ATLUS_CONTEXT_CACHE_ENABLED", "true").lower() == "true"
+    CONTEXT_CACHE_MAX_SESSIONS = int(os.getenv("ATLUS_CONTEXT_CACHE_MAX_SESSIONS", str(MAX_RESIDENT_SESSIONS)))
+
+    _context_cache = ContextCache(max_entries=CONTEXT_CACHE_MAX_SESSIONS if CONTEXT_CACHE_ENABLED else 0)
+
+    _summarizer = RollingSummarizer(
+        _summary_llm,
+        token_threshold=SUMMARY_TOKEN_THRESHOLD,
+        keep_turns=SUMMARY_KEEP_TURNS
+    )
+
+    # In-process registries (use Redis in production)
+    _sessions = MemoryRegistry(
+        "session", _new_session_memory, spill_dir=SPILL_DIR,
+        max_entries=MAX_RESIDENT_SESSIONS, max_idle_seconds=MAX_IDLE_SECONDS,
+        max_bytes=MAX_SESSION_HISTORY_BYTES, size_of=_history_size, **_warm_tier
+    )
+    _working = MemoryRegistry(
+        "working", _new_working_memory, spill_dir=SPILL_DIR,
+        max_entries=MAX_RESIDENT_SESSIONS, max_idle_seconds=MAX_IDLE_SECONDS, **_warm_tier
+    )
+    _long_term = MemoryRegistry(
+        "long_term", _new_long_term_memory, spill_dir=SPILL_DIR,
+        max_entries=MAX_RESIDENT_USERS, max_idle_seconds=MAX_IDLE_SECONDS
+    )
+    _behavior = MemoryRegistry(
+        "behavior", _new_behavior_profile, spill_dir=SPILL_DIR,
+        max_entries=MAX_RESIDENT_SESSIONS, max_idle_seconds=MAX_IDLE_SECONDS, **_warm_tier
+    )
+    # Fact indexes persist themselves on every change, so eviction just drops them
+    _fact_indexes = MemoryRegistry(
+        "fact_index", _new_fact_index,
+        max_entries=MAX_RESIDENT_USERS, max_idle_seconds=MAX_IDLE_SECONDS
+    )
+
+    @classmethod
+    def _start_registry_sweeper(cls):
+        """Start the idle sweep over the memory registries (once, unless disabled)."""
+        if cls._registry_sweeper is not None or cls.SWEEP_INTERVAL_SECONDS <= 0:
+            return
+        with cls._registry_sweeper_lock:
+            if cls._registry_sweeper is None:
+                sweeper = RegistrySweeper(
+                    [cls._sessions, cls._working, cls._long_term, cls._behavior, cls._fact_indexes],
+                    interval=cls.SWEEP_INTERVAL_SECONDS
+                ).start()
+                atexit.register(sweeper.stop)
+                cls._registry_sweeper = sweeper
+
+    @classmethod
+    def _get_ingest(cls) -> IngestQueue:
+        """Get or start the ingestion queue (drained at interpreter exit)."""
+        if cls._ingest is None:
+            with cls._ingest_lock:
+                if cls._ingest is None:
+                    # Open storage first so its atexit close runs after the drain
+                    get_storage()
+                    ingest = IngestQueue(
+                        "memory", workers=cls.INGEST_WORKERS, max_pending=cls.INGEST_MAX_PENDING
+                    ).start()
+                    atexit.register(ingest.close)
+                    cls._ingest = ingest
+        return cls._ingest
+
+    @classmethod
+    def _get_fact_batcher(cls) -> FactBatcher:
+        """Get or start the long-term write batcher (flushed at interpreter exit)."""
+        if cls._fact_batcher is None:
+            with cls._fact_batcher_lock:
+                if cls._fact_batcher is None:
+                    # Open storage first so its atexit close runs after the final flush
+                    get_storage()
+                    batcher = FactBatcher(
+                        "long_term", cls._apply_long_term,
+                        window=cls.LONG_TERM_WRITE_WINDOW, max_delay=cls.LONG_TERM_WRITE_MAX_DELAY
+                    ).start()
+                    atexit.register(batcher.close)
+                    cls._fact_batcher = batcher
+        return cls._fact_batcher
+
+    @classmethod
+    def _get_prefetch(cls) -> IngestQueue:
+        """Get or start the prefetch queue (stopped at interpreter exit)."""
+        if cls._prefetch is None:
+            with cls._prefetch_lock:
+                if cls._prefetch is None:
+                    get_storage()
+                    prefetch = IngestQueue(
+                        "prefetch", workers=cls.PREFETCH_WORKERS, max_pending=cls.INGEST_MAX_PENDING
+                    ).start()
+                    atexit.register(prefetch.close, timeout=1.0)
+                    cls._prefetch = prefetch
+        return cls._prefetch
+
+    @classmethod
+    def prefetch(cls, session_id: str, user_id: str = "default_user") -> bool:
+        """
+        Load a session's memory objects in the background without blocking.
+
+        Returns:
+            True if a load was queued; False if prefetching is disabled, the
+            memory is already resident, a load is already queued or the queue is full
+        """
+        if not cls.PREFETCH_ENABLED:
+            return False
+        outcome = "requested"
+        if all(registry.is_resident(key) for registry, key in cls._prefetch_targets(session_id, user_id)):
+            outcome = "already_resident"
+        else:
+            prefetch = cls._get_prefetch()
+            if prefetch.pending(session_id):
+                outcome = "already_queued"
+            elif not prefetch.try_submit(session_id, cls._load_session, session_id, user_id):
+                outcome = "dropped"
+        with cls._prefetch_lock:
+            cls._prefetch_stats["requested"] += 1
+            if outcome != "requested":
+                cls._prefetch_stats[outcome] += 1
+        if outcome != "requested":
+            logger.debug(f"Prefetch of session {session_id} skipped: {outcome}")
+        return outcome == "requested"
+
+    @classmethod
+    def _prefetch_targets(cls, session_id: str, user_id: str):
+        return (
+            (cls._sessions, session_id),
+            (cls._working, session_id),
+            (cls._behavior, session_id),
+            (cls._long_term, user_id),
+            (cls._fact_indexes, user_id),
+        )
+
+    @classmethod
+    def _load_session(cls, session_id: str, user_id: str):
+        """Bring every memory object build_context reads into the hot tier."""
+        start = time.perf_counter()
+        # Queued turns first, so the loaded history includes them
+        cls.wait_for_ingest(session_id)
+        for registry, key in cls._prefetch_targets(session_id, user_id):
+            registry.get(key)
+        cls._sync_shared_history(session_id, cls._sessions.get(session_id))
+        with cls._prefetch_lock:
+            cls._prefetch_stats["loaded"] += 1
+        logger.debug(f"Prefetched memory for session {session_id} in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    @classmethod
+    def get_prefetch_stats(cls) -> Dict:
+        """Prefetch requests, how many were skipped and why, and completed loads."""
+        with cls._prefetch_lock:
+            stats = dict(cls._prefetch_stats)
+        if cls._prefetch is not None:
+            stats["queue"] = cls._prefetch.stats()
+        return stats
+
+    @classmethod
+    def wait_for_ingest(cls, session_id: str) -> bool:
+        """Block until turns queued for session_id have been written. False on timeout."""
+        if cls._ingest is None:
+            return True
+        if cls._ingest.wait_for(session_id, timeout=cls.INGEST_WAIT_SECONDS):
+            return True
+        logger.warning(f"Timed out waiting for queued turns of session {session_id}")
+        return False
+
+    # The getters hand out mutable memory objects, so each one marks its
+    # component changed for the context cache; internal reads go through
+    # the registries directly
 
     @classmethod
     def get_session_memory(cls, session_id: str) -> SessionMemory:
         """Get or create session memory."""
-        if session_id not in cls._sessions:
-            logger.info(f"Creating new session memory: {session_id}")
-            cls._sessions[session_id] = SessionMemory(session_id)
-        return cls._sessions[session_id]
+        cls._context_cache.bump("session", session_id)
+        return cls._sessions.get(session_id)
 
     @classmethod
     def get_working_memory(cls, session_id: str) -> WorkingMemory:
         """Get or create working memory."""
-        if session_id not in cls._working:
-            logger.info(f"Creating new working memory: {session_id}")
-            cls._working[session_id] = WorkingMemory(session_id)
-        return cls._working[session_id]
+        cls._context_cache.bump("working", session_id)
+        return cls._working.get(session_id)
 
     @classmethod
     def get_long_term_memory(cls, user_id: str = "default_user") -> LongTermMemory:
         """Get or create long-term memory."""
-        if user_id not in cls._long_term:
-            logger.info(f"Loading long-term memory: {user_id}")
-            cls._long_term[user_id] = LongTermMemory(user_id)
-        return cls._long_term[user_id]
+        cls._context_cache.bump("long_term", user_id)
+        return cls._long_term.get(user_id)
 
     @classmethod
     def get_behavior_profile(cls, session_id: str) -> BehaviorProfile:
         """Get or create behavior profile."""
-        if session_id not in cls._behavior:
-            logger.info(f"Creating new behavior profile: {session_id}")
-            cls._behavior[session_id] = BehaviorProfile()
-        return cls._behavior[session_id]
+        cls._context_cache.bump("behavior", session_id)
+        return cls._behavior.get(session_id)
+
+    # The last complex task (intent, plan, draft) lives on the working memory
+    # object as an attribute rather than a working-memory item, so it spills
+    # and clears with the session but is never injected into the prompt
+
+    @classmethod
+    def get_task_state(cls, session_id: str) -> Optional[Dict]:
+        """TaskAgent state of the session's last complex task, if any."""
+        if session_id not in cls._working:
+            return None
+        return getattr(cls._working.get(session_id), "task_state", None)
+
+    @classmethod
+    def save_task_state(cls, session_id: str, task_state: Dict):
+        """Keep TaskAgent state for follow-up requests in this session."""
+        cls._working.get(session_id).task_state = task_state
 
     @classmethod
     def build_context(
@@ -78,23 +493,168 @@ class MemoryService:
         Returns:
             List of messages for LLM
         """
-        session = cls.get_session_memory(session_id)
-        working = cls.get_working_memory(session_id)
-        long_term = cls.get_long_term_memory(user_id)
-        behavior = cls.get_behavior_profile(session_id)
+        # Read-your-writes: the previous turn may still be queued
+        cls.wait_for_ingest(session_id)
+        cls._start_registry_sweeper()
+
+        session = cls._sessions.get(session_id)
+        cls._sync_shared_history(session_id, session)
+
+        # Nothing changed since the same request was last built: reuse it
+        cache = cls._context_cache
+        vector = cache.vector(session_id, user_id)
+        request = (system_prompt, user_id, user_message)
+        cached = cache.lookup(session_id, vector, request)
+        if cached is not None:
+            logger.debug(f"Reused cached context for session {session_id}")
+            return cached
+
+        working = cls._working.get(session_id)
+        long_term = cls._long_term.get(user_id)
+        behavior = cls._behavior.get(session_id)
+
+        # Facts waiting for their batched write are already in effect
+        pending = cls._fact_batcher.pending(user_id) if cls._fact_batcher is not None else {}
+        if pending:
+            long_term = _RelevantLongTermView(long_term, {**long_term.get_all(), **pending})
+
+        if user_message:
+            long_term = cls._relevant_long_term(user_id, long_term, user_message)
+
+        summary = getattr(session, "summary", None) or EMPTY_SUMMARY
+        segment = cache.history(session_id, vector[0])
+        if segment is not None:
+            history, summarized = segment
+        else:
+            # With a summary, send it plus only the turns it does not cover
+            summarized = bool(summary.get("text"))
+            history = RollingSummarizer.unsummarized(session.history, summary) if summarized else session.get_context()
+            cache.store_history(session_id, vector[0], history, summarized, user_id=user_id)
 
         context = ContextAssembler.build_context(
             system_prompt=system_prompt,
-            session=session,
+            session=_SummarizedSessionView(session, history),
             working=working,
             long_term=long_term,
             behavior=behavior,
             last_user_message=user_message
         )
 
+        if summarized:
+            position = 1 if context and context[0].get("role") == "system" else 0
+            context.insert(position, {
+                "role": "system",
+                "content": f"{SUMMARY_PREFIX}\n{summary['text']}"
+            })
+
+        cache.store(session_id, user_id, vector, request, context)
         logger.debug(f"Built context with {len(context)} messages for session {session_id}")
         return context
 
+    @classmethod
+    def _sync_shared_history(cls, session_id: str, session: SessionMemory):
+        """Pick up turns other workers stored for this session (shared backends only)."""
+        storage = get_storage()
+        if not storage.SHARED or storage.history_length(session_id) == _history_offset(session) + len(session.history):
+            return
+        if not _load_recent_history(session, session_id):
+            session.history = []
+            session.history_offset = 0
+            session.summary = dict(EMPTY_SUMMARY)
+        cls._context_cache.bump("session", session_id)
+        logger.debug(f"Reloaded {len(session.history)} messages for session {session_id} from shared storage")
+
+    @classmethod
+    def _relevant_long_term(cls, user_id: str, long_term: LongTermMemory, user_message: str):
+        """Narrow long-term memory to the facts most relevant to user_message."""
+        facts = long_term.get_all()
+        if cls.LONG_TERM_TOP_K <= 0 or len(facts) <= cls.LONG_TERM_TOP_K:
+            return long_term
+        try:
+            hits = cls._fact_indexes.get(user_id).search(
+                user_message, k=cls.LONG_TERM_TOP_K, min_score=cls.LONG_TERM_MIN_SCORE
+            )
+        except Exception as e:
+            logger.warning(f"Fact retrieval failed, sending all long-term facts: {e}")
+            return long_term
+        selected = {key: facts[key] for key, _ in hits if key in facts}
+        logger.debug(f"Selected {len(selected)} of {len(facts)} long-term facts for {user_id}")
+        return _RelevantLongTermView(long_term, selected)
+
+    @classmethod
+    def update_long_term(cls, user_id: str, facts: Dict) -> Dict:
+        """
+        Set several long-term facts for a user in one write.
+
+        Values equal to the stored (or already pending) ones are skipped, and
+        updates for the same user within LONG_TERM_WRITE_WINDOW are merged
+        into a single write. Pending facts are visible to build_context
+        straight away.
+
+        Returns:
+            The facts that were queued (empty if nothing changed)
+        """
+        long_term = cls._long_term.get(user_id)
+        queued = cls._get_fact_batcher().update(user_id, facts, current=long_term.get_all())
+        if queued:
+            cls._context_cache.bump("long_term", user_id)
+        return queued
+
+    @classmethod
+    def _apply_long_term(cls, user_id: str, facts: Dict):
+        """Write one merged batch: long-term memory and fact index once each."""
+        long_term = cls._long_term.get(user_id)
+        data = long_term.load()
+        changed = {key: value for key, value in facts.items() if key not in data or data[key] != value}
+        if not changed:
+            logger.debug(f"Skipped long-term write for {user_id}: {len(facts)} fact(s) unchanged")
+            return
+        data.update(changed)
+        # One file rewrite (FileStorage) or one write of the changed rows
+        long_term.save(data)
+        index = cls._fact_indexes.get(user_id)
+        for key, value in changed.items():
+            index.upsert(key, value, save=False)
+        index.save()
+        cls._context_cache.bump("long_term", user_id)
+        logger.info(
+            f"Saved {len(changed)} fact(s) to long-term memory (user: {user_id}): "
+            + ", ".join(f"{key} = {value}" for key, value in changed.items())
+        )
+
+    @classmethod
+    def forget_fact(cls, user_id: str, key: str):
+        """Remove a fact from a user's long-term memory and its index."""
+        if cls._fact_batcher is not None:
+            cls._fact_batcher.discard(user_id, key)
+        long_term = cls.get_long_term_memory(user_id)
+        data = long_term.load()
+        if key in data:
+            del data[key]
+            long_term.save(data)
+        cls._fact_indexes.get(user_id).delete(key)
+        cls._context_cache.bump("long_term", user_id)
+        logger.info(f"Forgot long-term fact {key} (user: {user_id})")
+
+    @classmethod
+    def enqueue_turn(
+        cls,
+        session_id: str,
+        user_message: str,
+        agent_response: str,
+        user_id: str = "default_user"
+    ):
+        """
+        Save a turn in the background, after earlier turns of the same session.
+        Falls back to save_turn inline when async ingestion is disabled.
+        """
+        if not cls.INGEST_ASYNC:
+            cls.save_turn(session_id, user_message, agent_response, user_id=user_id)
+            return
+        cls._get_ingest().submit(
+            session_id, cls.save_turn, session_id, user_message, agent_response, user_id=user_id
+        )
+
     @classmethod
     def save_turn(
         cls,
@@ -109,8 +669,17 @@ class MemoryService:
         """
         from memory.memory_logger import MemoryLogger
         
-        session = cls.get_session_memory(session_id)
-        session.add_turn(user_message, agent_response)
+        cls._start_registry_sweeper()
+        session = cls._sessions.get(session_id)
+        turn = Turn(user_message, agent_response).messages()
+        # Append to the history log instead of session.add_turn, which
+        # rewrites the whole session file on every turn
+        session.history.extend(turn)
+        get_storage().append_history(session_id, to_wire(turn))
+        cls._context_cache.append_turn(session_id, turn, session.get_context)
+        cls._sessions.refresh_size(session_id)
+        if cls.SUMMARY_ENABLED:
+            cls._schedule_summary(session_id, session)
         logger.debug(f"Saved turn to session {session_id}")
         MemoryLogger.log_write(
             "session",
@@ -122,23 +691,42 @@ class MemoryService:
         # Extract and save preferences to long-term memory
         cls._extract_and_save_preferences(session_id, user_message, user_id)
 
+    @classmethod
+    def _schedule_summary(cls, session_id: str, session: SessionMemory):
+        """Fold old turns into the rolling summary in the background, if due."""
+        def get_state():
+            return list(session.history), getattr(session, "summary", None)
+
+        def on_done(summary):
+            if session_id not in cls._sessions:
+                return  # cleared while the fold was running
+            session.summary = summary
+            cls._context_cache.bump("session", session_id)
+            # Stored coverage counts from the first stored message, not the loaded window
+            stored = {**summary, "covered": summary["covered"] + _history_offset(session)}
+            get_storage().save_summary(session_id, stored)
+            logger.debug(f"Updated rolling summary for session {session_id} (covers {summary['covered']} messages)")
+
+        cls._summarizer.schedule(session_id, get_state, on_done)
+
     @classmethod
     def clear_session(cls, session_id: str):
         """Clear session memory."""
-        if session_id in cls._sessions:
+        # Let queued turns land first so they cannot recreate the session afterwards
+        cls.wait_for_ingest(session_id)
+        session_memory = cls._sessions.pop(session_id)
+        if session_memory is not None:
             # Clear the session memory file
-            session_memory = cls._sessions[session_id]
             if hasattr(session_memory, 'clear'):
                 session_memory.clear()
-            del cls._sessions[session_id]
             logger.info(f"Cleared session memory: {session_id}")
+        get_storage().delete_history(session_id)
+        cls._context_cache.invalidate(session_id)
         
-        if session_id in cls._working:
-            del cls._working[session_id]
+        if cls._working.pop(session_id, load=False) is not None:
             logger.info(f"Cleared working memory: {session_id}")
         
-        if session_id in cls._behavior:
-            del cls._behavior[session_id]
+        if cls._behavior.pop(session_id, load=False) is not None:
             logger.info(f"Cleared behavior profile: {session_id}")
 
     @classmethod
@@ -149,22 +737,18 @@ class MemoryService:
         try:
             from app.services.preference_extractor import PreferenceExtractor
             
-            # Get conversation history
-            session = cls.get_session_memory(session_id)
-            conversation_history = session.get_context()
+            # History is passed in place rather than copied via get_context()
+            session = cls._sessions.get(session_id)
             
             # Extract preferences
             preferences = PreferenceExtractor.extract_preferences(
                 user_message, 
-                conversation_history
+                session.history
             )
             
             if preferences:
-                # Save to long-term memory
-                long_term = cls.get_long_term_memory(user_id)
-                for key, value in preferences.items():
-                    long_term.update(key, value)
-                    logger.info(f"Saved preference to long-term memory: {key} = {value} (user: {user_id})")
+                # One batched write per user; unchanged values are skipped
+                cls.update_long_term(user_id, preferences)
             
         except Exception as e:
             # Don't fail the whole request if preference extraction fails
@@ -173,6 +757,7 @@ class MemoryService:
     @classmethod
     def get_session_stats(cls, session_id: str) -> Dict:
         """Get session statistics."""
+        cls.wait_for_ingest(session_id)
         stats = {
             "session_id": session_id,
             "has_session_memory": session_id in cls._sessions,
@@ -180,9 +765,43 @@ class MemoryService:
             "has_behavior_profile": session_id in cls._behavior,
         }
 
-        if session_id in cls._sessions:
-            stats["conversation_turns"] = len(cls._sessions[session_id].history) // 2
+        session = cls._sessions.peek(session_id)
+        if session is not None:
+            offset = _history_offset(session)
+            summary = getattr(session, "summary", None) or EMPTY_SUMMARY
+            stats["conversation_turns"] = (offset + len(session.history)) // 2
+            stats["summarized_messages"] = offset + summary.get("covered", 0)
 
         return stats
 
+    @classmethod
+    def get_registry_stats(cls) -> Dict:
+        """Residency metrics: entries and RAM per tier, evictions, spills, reloads and promotions."""
+        return {
+            registry.name: registry.stats()
+            for registry in (cls._sessions, cls._working, cls._long_term, cls._behavior, cls._fact_indexes)
+        }
+
+    @classmethod
+    def get_long_term_write_stats(cls) -> Dict:
+        """Long-term write batching: updates, skipped unchanged values, coalesced facts and batches."""
+        if cls._fact_batcher is None:
+            return {}
+        return cls._fact_batcher.stats()
+
+    @classmethod
+    def get_context_cache_stats(cls) -> Dict:
+        """Context cache hits, misses and incremental history updates."""
+        return cls._context_cache.stats()
+
+    @classmethod
+    def flush(cls):
+        """Spill all resident memory to disk (e.g. on shutdown)."""
+        if cls._ingest is not None:
+            cls._ingest.drain(timeout=cls.INGEST_WAIT_SECONDS)
+        if cls._fact_batcher is not None:
+            cls._fact_batcher.flush()
+        for registry in (cls._sessions, cls._working, cls._long_term, cls._behavior):
+            registry.flush()
+
 
@@ -1,16 +1,20 @@
 """
 Session service for managing user sessions.
 Handles session creation, validation, and lifecycle.
-Persists sessions to JSON files for recovery.
+Persists sessions through the configured storage backend for recovery.
 """
 
+import atexit
+import os
+import threading
 import uuid
 import time
-import json
 from typing import Dict, Optional
-from datetime import datetime, timedelta
-from pathlib import Path
+from datetime import datetime, timedelta, timezone
 
+from storage import StorageBackend, WriteBehind, get_storage
+from storage.expiry import ExpiryQueue, ExpirySweeper
+from storage.session_index import SessionIndex
 from app.services.memory_service import MemoryService
 from app.api.v1.errors import APIError
 from app.utils.logger import get_logger
@@ -23,52 +27,222 @@ class SessionService:
     Business logic for session management.
     """
 
-    # In-memory session storage (use Redis/DB in production)
+    # In-memory session cache, backed by the storage backend (use Redis/DB in production)
     _sessions: Dict[str, Dict] = {}
-    
-    # Session storage file
-    SESSIONS_FILE = Path("data/sessions.json")
+
+    # Active sessions per user, ordered by last activity
+    _index = SessionIndex()
+
+    # Expiry deadline per active session
+    _expiry = ExpiryQueue()
+    _lock = threading.RLock()
 
     # Session configuration
     SESSION_ID_PREFIX = "session_"
-    DEFAULT_TTL_HOURS = 24  # Sessions expire after 24 hours of inactivity
-    
+    DEFAULT_TTL_HOURS = float(os.getenv("ATLUS_SESSION_TTL_HOURS", "24"))  # Expire after this long inactive (0 = never)
+    SWEEP_INTERVAL_SECONDS = float(os.getenv("ATLUS_SESSION_SWEEP_INTERVAL", "60"))
+    SWEEP_BATCH_SIZE = int(os.getenv("ATLUS_SESSION_SWEEP_BATCH", "200"))
+
+    _sweeper: Optional[ExpirySweeper] = None
+
+    # Activity updates are written behind the request, batched
+    FLUSH_INTERVAL_SECONDS = float(os.getenv("ATLUS_SESSION_FLUSH_INTERVAL", "1.0"))
+    FLUSH_BATCH_SIZE = int(os.getenv("ATLUS_SESSION_FLUSH_BATCH", "100"))
+
+    _persister: Optional[WriteBehind] = None
+    _persister_lock = threading.Lock()
+
+    # With a shared backend (Redis) other workers write the same sessions, so a
+    # local copy is re-read from storage once it is older than this
+    SESSION_CACHE_TTL_SECONDS = float(os.getenv("ATLUS_SESSION_CACHE_TTL", "5"))
+    _fetched_at: Dict[str, float] = {}
+
+    @classmethod
+    def _storage(cls) -> StorageBackend:
+        return get_storage()
+
+    @classmethod
+    def _get_persister(cls) -> WriteBehind:
+        """Get or start the write-behind persister (flushed at interpreter exit)."""
+        if cls._persister is None:
+            with cls._persister_lock:
+                if cls._persister is None:
+                    persister = WriteBehind(
+                        "sessions",
+                        lambda sessions: cls._storage().save_sessions(sessions),
+                        interval=cls.FLUSH_INTERVAL_SECONDS,
+                        max_pending=cls.FLUSH_BATCH_SIZE
+                    ).start()
+                    atexit.register(persister.close)
+                    cls._persister = persister
+        return cls._persister
+
+    @classmethod
+    def _get_sweeper(cls) -> ExpirySweeper:
+        """Get or start the background expiry sweeper."""
+        if cls._sweeper is None:
+            with cls._persister_lock:
+                if cls._sweeper is None:
+                    sweeper = ExpirySweeper(
+                        "session",
+                        cls._expiry,
+                        cls._expire_session,
+                        interval=cls.SWEEP_INTERVAL_SECONDS,
+                        batch_size=cls.SWEEP_BATCH_SIZE
+                    )
+                    if cls.DEFAULT_TTL_HOURS > 0:
+                        sweeper.start()
+                        atexit.register(sweeper.stop)
+                    cls._sweeper = sweeper
+        return cls._sweeper
+
+    @staticmethod
+    def _activity_ts(last_activity: str) -> Optional[float]:
+        try:
+            last = datetime.fromisoformat(last_activity.replace("Z", "+00:00"))
+        except (ValueError, AttributeError):
+            return None
+        if last.tzinfo is None:
+            last = last.replace(tzinfo=timezone.utc)
+        return last.timestamp()
+
+    @classmethod
+    def _schedule_expiry(cls, session_id: str, last_activity: str):
+        """(Re)arm the session's expiry deadline from its last activity."""
+        if cls.DEFAULT_TTL_HOURS <= 0:
+            return
+        last_ts = cls._activity_ts(last_activity)
+        if last_ts is None:
+            last_ts = time.time()
+        cls._expiry.schedule(session_id, last_ts + cls.DEFAULT_TTL_HOURS * 3600)
+
+    @classmethod
+    def _shared(cls) -> bool:
+        return cls._storage().SHARED
+
+    @classmethod
+    def _lookup(cls, session_id: str) -> Optional[Dict]:
+        """The session record, re-read from a shared backend when missing or stale locally."""
+        cls._init_sessions()
+        session = cls._sessions.get(session_id)
+        if not cls._shared():
+            return session
+        fetched_at = cls._fetched_at.get(session_id)
+        if session is not None and fetched_at is not None \
+                and time.monotonic() - fetched_at < cls.SESSION_CACHE_TTL_SECONDS:
+            return session
+        return cls._adopt(session_id, cls._storage().get_session(session_id))
+
+    @classmethod
+    def _adopt(cls, session_id: str, stored: Optional[Dict]) -> Optional[Dict]:
+        """
+        Replace the local copy of a session with what another worker stored.
+        Keeps the later last_activity when this worker's touch is not flushed yet.
+        """
+        with cls._lock:
+            local = cls._sessions.get(session_id)
+            if stored is None:
+                # Deleted by another worker
+                if local is not None:
+                    del cls._sessions[session_id]
+                    cls._index.remove(session_id)
+                    cls._expiry.cancel(session_id)
+                    if cls._persister is not None:
+                        cls._persister.discard(session_id)
+                cls._fetched_at.pop(session_id, None)
+                return None
+
+            if local is not None:
+                local_ts = cls._activity_ts(local.get("last_activity", ""))
+                stored_ts = cls._activity_ts(stored.get("last_activity", ""))
+                if local_ts is not None and (stored_ts is None or local_ts > stored_ts):
+                    stored["last_activity"] = local["last_activity"]
+                # Update in place: a pending write-behind entry holds this dict
+                local.clear()
+                local.update(stored)
+                session = local
+            else:
+                session = cls._sessions[session_id] = stored
+
+            if session.get("is_active", True):
+                cls._index.add(session_id, session.get("user_id", "default_user"), session.get("last_activity", ""))
+                cls._schedule_expiry(session_id, session.get("last_activity", ""))
+            else:
+                cls._index.remove(session_id)
+                cls._expiry.cancel(session_id)
+            cls._fetched_at[session_id] = time.monotonic()
+            return session
+
+    @classmethod
+    def _expire_session(cls, session_id: str) -> bool:
+        """
+        Deactivate an expired session and release its memory state and files.
+        The session record itself is kept (inactive) for history.
+        """
+        if cls._shared():
+            # Another worker may have kept the session alive since we last read it
+            cls._adopt(session_id, cls._storage().get_session(session_id))
+            if not cls._expiry.is_expired(session_id):
+                return False
+        with cls._lock:
+            session = cls._sessions.get(session_id)
+            if session is None or not session.get("is_active", True):
+                return False
+            session["is_active"] = False
+            cls._index.remove(session_id)
+            cls._expiry.cancel(session_id)
+            cls._get_persister().mark_dirty(session_id, session)
+
+        MemoryService.clear_session(session_id)
+        logger.info(f"Expired session: {session_id}")
+        return True
+
+    @classmethod
+    def sweep_expired(cls) -> int:
+        """Expire every session past its TTL now. Returns the number reclaimed."""
+        cls._init_sessions()
+        return cls._get_sweeper().sweep()
+
     @classmethod
-    def _ensure_storage(cls):
-        """Ensure data directory and sessions file exist."""
-        cls.SESSIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        if not cls.SESSIONS_FILE.exists():
-            cls.SESSIONS_FILE.write_text(json.dumps({}, indent=2), encoding='utf-8')
-            logger.debug(f"Created sessions file: {cls.SESSIONS_FILE}")
-    
+    def flush(cls):
+        """Write pending session updates now (e.g. on shutdown)."""
+        if cls._persister is not None:
+            cls._persister.flush()
+
     @classmethod
     def _load_sessions(cls) -> Dict[str, Dict]:
-        """Load sessions from JSON file."""
-        cls._ensure_storage()
-        if cls.SESSIONS_FILE.exists():
-            try:
-                data = json.loads(cls.SESSIONS_FILE.read_text(encoding='utf-8'))
-                logger.debug(f"Loaded {len(data)} sessions from {cls.SESSIONS_FILE}")
-                return data
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.warning(f"Failed to load sessions: {e}, starting fresh")
-                return {}
-        return {}
-    
+        """Load sessions from the storage backend."""
+        try:
+            data = cls._storage().load_sessions()
+            logger.debug(f"Loaded {len(data)} sessions from {cls._storage().name} storage")
+            return data
+        except Exception as e:
+            logger.warning(f"Failed to load sessions: {e}, starting fresh")
+            return {}
+
     @classmethod
-    def _save_sessions(cls):
-        """Save sessions to JSON file."""
-        cls._ensure_storage()
-        cls.SESSIONS_FILE.write_text(json.dumps(cls._sessions, indent=2), encoding='utf-8')
-        logger.debug(f"Saved {len(cls._sessions)} sessions to {cls.SESSIONS_FILE}")
-    
+    def _save_session(cls, session_id: str):
+        """Persist one session record."""
+        cls._storage().save_session(cls._sessions[session_id])
+        logger.debug(f"Saved session {session_id} to {cls._storage().name} storage")
+
     @classmethod
     def _init_sessions(cls):
-        """Initialize sessions from file on first access."""
+        """Initialize sessions from storage on first access."""
         if not hasattr(cls, '_initialized'):
             cls._sessions = cls._load_sessions()
+            cls._index.clear()
+            cls._expiry.clear()
+            loaded_at = time.monotonic()
+            cls._fetched_at = {session_id: loaded_at for session_id in cls._sessions}
+            for session_id, session in cls._sessions.items():
+                if session.get("is_active", True):
+                    cls._index.add(session_id, session.get("user_id", "default_user"), session.get("last_activity", ""))
+                    cls._schedule_expiry(session_id, session.get("last_activity", ""))
             cls._initialized = True
-            logger.info(f"Initialized SessionService with {len(cls._sessions)} sessions from disk")
+            logger.info(f"Initialized SessionService with {len(cls._sessions)} sessions from storage")
+            # Sessions that expired while the server was down go on the first sweep
+            cls._get_sweeper()
 
     @classmethod
     def create_session(cls, user_id: str = "default_user", metadata: Optional[Dict] = None) -> Dict:
@@ -99,9 +273,12 @@ class SessionService:
         
         # Store session
         cls._sessions[session_id] = session_data
+        cls._fetched_at[session_id] = time.monotonic()
+        cls._index.add(session_id, user_id, session_data["last_activity"])
+        cls._schedule_expiry(session_id, session_data["last_activity"])
         
-        # Save to file
-        cls._save_sessions()
+        # Persist
+        cls._save_session(session_id)
         
         # Initialize memory components for this session
         # This ensures session memory is ready
@@ -129,8 +306,7 @@ class SessionService:
         Returns:
             Session data or None if not found
         """
-        cls._init_sessions()
-        return cls._sessions.get(session_id)
+        return cls._lookup(session_id)
 
     @classmethod
     def validate_session(cls, session_id: str) -> bool:
@@ -146,7 +322,7 @@ class SessionService:
         if not session_id:
             return False
         
-        session = cls._sessions.get(session_id)
+        session = cls._lookup(session_id)
         
         if not session:
             return False
@@ -154,11 +330,10 @@ class SessionService:
         if not session.get("is_active", True):
             return False
         
-        # Check if session expired (optional - for production)
-        # last_activity = datetime.fromisoformat(session["last_activity"].replace("Z", "+00:00"))
-        # if datetime.utcnow() - last_activity > timedelta(hours=cls.DEFAULT_TTL_HOURS):
-        #     session["is_active"] = False
-        #     return False
+        # Enforce TTL even if the sweeper has not reached this session yet
+        if cls._expiry.is_expired(session_id):
+            cls._expire_session(session_id)
+            return False
         
         return True
 
@@ -170,10 +345,12 @@ class SessionService:
         Args:
             session_id: Session identifier
         """
-        cls._init_sessions()
-        if session_id in cls._sessions:
-            cls._sessions[session_id]["last_activity"] = datetime.utcnow().isoformat() + "Z"
-            cls._save_sessions()  # Persist to file
+        session = cls._lookup(session_id)
+        if session is not None:
+            session["last_activity"] = datetime.utcnow().isoformat() + "Z"
+            cls._index.touch(session_id, session["last_activity"])
+            cls._schedule_expiry(session_id, session["last_activity"])
+            cls._get_persister().mark_dirty(session_id, session)  # Persisted in the background
             logger.debug(f"Updated activity for session: {session_id}")
 
     @classmethod
@@ -187,18 +364,20 @@ class SessionService:
         Returns:
             True if deleted, False if not found
         """
-        cls._init_sessions()
-        if session_id not in cls._sessions:
+        if cls._lookup(session_id) is None:
             return False
         
         # Clear memory (including session memory file)
         MemoryService.clear_session(session_id)
         
-        # Remove session
+        # Remove session (dropping any pending write so it is not resurrected)
         del cls._sessions[session_id]
-        
-        # Save to file
-        cls._save_sessions()
+        cls._fetched_at.pop(session_id, None)
+        cls._index.remove(session_id)
+        cls._expiry.cancel(session_id)
+        if cls._persister is not None:
+            cls._persister.discard(session_id)
+        cls._storage().delete_session(session_id)
         
         logger.info(f"Deleted session: {session_id}")
         return True
@@ -223,8 +402,15 @@ class SessionService:
                 error_code="SESSION_NOT_FOUND"
             )
         
+        # Enforces the TTL; an expired or inactive session must not have its
+        # memory reloaded after the sweeper released it
+        usable = cls.validate_session(session_id)
+
         # Get memory stats
         memory_stats = MemoryService.get_session_stats(session_id)
+        if usable:
+            # Clients inspect a session before chatting in it
+            MemoryService.prefetch(session_id, session["user_id"])
         
         return {
             "session_id": session_id,
@@ -248,30 +434,97 @@ class SessionService:
             Session data of the last active session, or None if no sessions found
         """
         cls._init_sessions()
-        
-        # Find all sessions for this user
-        user_sessions = [
-            (session_id, session_data)
-            for session_id, session_data in cls._sessions.items()
-            if session_data.get("user_id") == user_id and session_data.get("is_active", True)
-        ]
-        
-        if not user_sessions:
+        if cls._shared():
+            return cls._last_shared_session(user_id)
+        
+        # Most recent active session from the per-user index, skipping expired ones
+        session_id = cls._index.latest(user_id)
+        while session_id is not None and cls._expiry.is_expired(session_id):
+            if not cls._expire_session(session_id):
+                cls._index.remove(session_id)
+            session_id = cls._index.latest(user_id)
+        if session_id is None:
             return None
         
-        # Sort by last_activity (most recent first)
-        user_sessions.sort(
-            key=lambda x: x[1].get("last_activity", ""),
-            reverse=True
-        )
+        logger.info(f"Found last session for user {user_id}: {session_id}")
         
-        # Return the most recent session
-        session_id, session_data = user_sessions[0]
+        return cls._session_summary(cls._sessions[session_id])
+
+    @classmethod
+    def continue_last_session(cls, user_id: str = "default_user") -> Optional[Dict]:
+        """
+        Get the last active session for a user and start loading its memory
+        in the background, so the chat message that follows does not pay for it.
         
-        logger.info(f"Found last session for user {user_id}: {session_id}")
+        Args:
+            user_id: User identifier
+            
+        Returns:
+            Session data of the last active session, or None if no sessions found
+        """
+        session = cls.get_last_session(user_id)
+        if session is not None:
+            MemoryService.prefetch(session["session_id"], session["user_id"])
+        return session
+
+    @classmethod
+    def list_user_sessions(cls, user_id: str = "default_user", limit: int = 20, offset: int = 0) -> Dict:
+        """
+        List a user's active sessions, most recent first.
         
+        Args:
+            user_id: User identifier
+            limit: Page size
+            offset: Number of sessions to skip
+            
+        Returns:
+            Dict with the page of sessions and the user's total session count
+        """
+        cls._init_sessions()
+        if cls._shared():
+            # Other workers' sessions are only in storage
+            storage = cls._storage()
+            sessions = storage.list_user_sessions(user_id, limit=limit, offset=offset)
+            return {
+                "user_id": user_id,
+                "sessions": [cls._session_summary(cls._adopt(s["session_id"], s)) for s in sessions],
+                "total": storage.count_user_sessions(user_id),
+                "limit": limit,
+                "offset": offset
+            }
+        session_ids = cls._index.page(user_id, limit=limit, offset=offset)
         return {
-            "session_id": session_id,
+            "user_id": user_id,
+            "sessions": [cls._session_summary(cls._sessions[sid]) for sid in session_ids],
+            "total": cls._index.count(user_id),
+            "limit": limit,
+            "offset": offset
+        }
+
+    @classmethod
+    def _last_shared_session(cls, user_id: str) -> Optional[Dict]:
+        """get_last_session against a shared backend, which sees every worker's sessions."""
+        # Keyset paging: expiring sessions below removes them from the active
+        # list, which would shift an offset past sessions not yet seen
+        after = None
+        while True:
+            page = cls._storage().list_user_sessions(user_id, limit=10, after=after)
+            if not page:
+                return None
+            # Taken before _adopt, which may move a record's last_activity forward
+            after = (page[-1].get("last_activity", ""), page[-1]["session_id"])
+            for stored in page:
+                session_id = stored["session_id"]
+                session = cls._adopt(session_id, stored)
+                if session.get("is_active", True) and not cls._expiry.is_expired(session_id):
+                    logger.info(f"Found last session for user {user_id}: {session_id}")
+                    return cls._session_summary(session)
+                cls._expire_session(session_id)
+
+    @staticmethod
+    def _session_summary(session_data: Dict) -> Dict:
+        return {
+            "session_id": session_data["session_id"],
             "user_id": session_data["user_id"],
             "created_at": session_data["created_at"],
             "last_activity": session_data["last_activity"],
@@ -0,0 +1,53 @@
+"""
+Snapshot service.
+Writes all session and memory state to one binary file and restores it,
+for fast restarts and for moving state between hosts.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.services.memory_service import MemoryService
+from app.services.session_service import SessionService
+from app.utils.logger import get_logger
+from storage import get_storage
+from storage.snapshot import restore_snapshot, write_snapshot
+
+logger = get_logger("atlus.service.snapshot")
+
+
+class SnapshotService:
+    """
+    Snapshot and restore of durable state (see storage/snapshot.py for the format).
+    """
+
+    @classmethod
+    def create(cls, path: Path, compress: bool = True) -> Dict:
+        """
+        Snapshot the current state to path.
+        Pending background writes are flushed first so the file is complete.
+        """
+        MemoryService.flush()
+        SessionService.flush()
+        return write_snapshot(get_storage(), Path(path), compress=compress)
+
+    @classmethod
+    def restore(cls, path: Path, force: bool = False) -> Optional[Dict]:
+        """
+        Load a snapshot into the storage backend.
+
+        Meant for startup, before sessions are served. Without force, a
+        backend that already holds sessions is left alone so a stale
+        snapshot never overwrites newer state on an ordinary restart.
+
+        Returns the restore counts, or None if skipped.
+        """
+        path = Path(path)
+        if not path.exists():
+            logger.warning(f"Snapshot {path} not found, skipping restore")
+            return None
+        storage = get_storage()
+        if not force and storage.load_sessions():
+            logger.info(f"Storage already holds sessions, skipping restore of {path}")
+            return None
+        return restore_snapshot(storage, path)
@@ -0,0 +1,143 @@
+"""
+Warm-up service.
+Pre-creates agents and pre-connects LLM providers at startup so the first
+real request doesn't pay for construction, DNS lookups and TLS handshakes.
+Readiness is reported only once warm-up has finished. A failed warm-up is
+retried in the background with exponential backoff, so a transient startup
+error (provider outage, DNS) does not keep the instance unready for good.
+An LLM role that cannot be reached fails the attempt like any other error.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from app.utils.logger import get_logger
+
+logger = get_logger("atlus.service.warmup")
+
+
+class WarmupService:
+    """
+    Tracks startup warm-up state.
+
+    States: pending -> warming -> ready | failed (-> warming again on retry)
+    """
+
+    # Backoff between attempts after a failure: doubles up to the maximum
+    RETRY_INITIAL_SECONDS = float(os.getenv("ATLUS_WARMUP_RETRY_SECONDS", "5"))
+    RETRY_MAX_SECONDS = float(os.getenv("ATLUS_WARMUP_RETRY_MAX_SECONDS", "300"))
+    MAX_ATTEMPTS = int(os.getenv("ATLUS_WARMUP_MAX_ATTEMPTS", "0"))  # 0 = retry until ready
+
+    _state = "pending"
+    _report: Optional[Dict] = None
+    _error: Optional[str] = None
+    _started_at: Optional[float] = None
+    _lock = threading.Lock()
+    _done = threading.Event()
+    _thread: Optional[threading.Thread] = None
+    _attempts = 0
+    _next_retry_at: Optional[float] = None
+
+    @classmethod
+    def start(cls, probe: bool = False):
+        """Run warm-up in a background thread, retrying until ready (no-op if already started)."""
+        with cls._lock:
+            if cls._state != "pending":
+                return
+            cls._state = "warming"
+            cls._started_at = time.time()
+        cls._thread = threading.Thread(target=cls._run_until_ready, args=(probe,), name="atlus-warmup", daemon=True)
+        cls._thread.start()
+
+    @classmethod
+    def run(cls, probe: bool = False) -> Dict:
+        """Run warm-up synchronously (one attempt) and return its status."""
+        with cls._lock:
+            if cls._state == "pending":
+                cls._state = "warming"
+                cls._started_at = time.time()
+        if not cls._done.is_set():
+            cls._run(probe)
+        return cls.status()
+
+    @classmethod
+    def _run_until_ready(cls, probe: bool):
+        """Attempt warm-up, backing off between failures, until ready or out of attempts."""
+        delay = cls.RETRY_INITIAL_SECONDS
+        while not cls._run(probe):
+            if cls.MAX_ATTEMPTS and cls._attempts >= cls.MAX_ATTEMPTS:
+                logger.error(f"Warm-up gave up after {cls._attempts} attempt(s)")
+                return
+            with cls._lock:
+                cls._next_retry_at = time.time() + delay
+            logger.warning(f"Retrying warm-up in {delay:.0f}s (attempt {cls._attempts + 1})")
+            time.sleep(delay)
+            delay = min(delay * 2, cls.RETRY_MAX_SECONDS)
+            with cls._lock:
+                cls._state = "warming"
+                cls._next_retry_at = None
+
+    @classmethod
+    def _run(cls, probe: bool) -> bool:
+        """One warm-up attempt. Returns True if the instance is ready."""
+        from app.services.chat_service import ChatService
+
+        with cls._lock:
+            cls._attempts += 1
+        logger.info(f"Starting warm-up (probe={probe}, attempt {cls._attempts})")
+        try:
+            orchestrator = ChatService._get_orchestrator()
+            report = orchestrator.warm_up(probe=probe)
+            with cls._lock:
+                cls._report = report
+                cls._error = None
+                cls._state = "ready"
+            logger.info(f"Warm-up finished, instance is ready: {report}")
+            return True
+        except Exception as e:
+            with cls._lock:
+                # WarmupFailed carries the per-role connection results
+                cls._report = getattr(e, "report", None)
+                cls._error = str(e)
+                cls._state = "failed"
+            logger.error(f"Warm-up failed: {str(e)}", exc_info=True)
+            return False
+        finally:
+            # Startup waits for the first attempt only; retries continue in the background
+            cls._done.set()
+
+    @classmethod
+    def mark_ready(cls):
+        """Mark the instance ready without warming up (warm-up disabled)."""
+        with cls._lock:
+            if cls._state == "pending":
+                cls._state = "ready"
+                cls._done.set()
+
+    @classmethod
+    def wait(cls, timeout: float = None) -> bool:
+        """Block until warm-up finishes. Returns True if the instance is ready."""
+        cls._done.wait(timeout)
+        return cls.is_ready()
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        return cls._state == "ready"
+
+    @classmethod
+    def status(cls) -> Dict:
+        with cls._lock:
+            status = {"state": cls._state}
+            if cls._started_at is not None:
+                status["started_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(cls._started_at))
+            if cls._report is not None:
+                status["report"] = cls._report
+            if cls._attempts:
+                status["attempts"] = cls._attempts
+            if cls._error is not None:
+                status["error"] = cls._error
+            if cls._next_retry_at is not None:
+                status["next_retry_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(cls._next_retry_at))
+            return status
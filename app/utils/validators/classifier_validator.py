@@ -27,9 +27,9 @@ def validate_classifier(data: dict) -> dict:
         raise ClassifierValidationError("Missing 'intent_type' field")
     
     intent_type = data["intent_type"]
-    if intent_type not in ["simple", "complex"]:
+    if intent_type not in ["simple", "medium", "complex"]:
         raise ClassifierValidationError(
-            f"Invalid intent_type: '{intent_type}'. Must be 'simple' or 'complex'"
+            f"Invalid intent_type: '{intent_type}'. Must be 'simple', 'medium' or 'complex'"
         )
     
     # Validate confidence if present
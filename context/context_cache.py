@@ -0,0 +1,270 @@
+"""
+Per-session cache of assembled LLM context.
+
+MemoryService.build_context combines four memory objects (session history,
+working memory, long-term facts, behavior profile) into a message list on
+every request. This cache keeps, per session:
+
+    history   the conversation segment handed to the assembler (the turns
+              the rolling summary does not cover, or the session window),
+              extended in place when a turn is saved
+    messages  the last assembled context and the request it was built for
+              (system prompt, user, message), returned as-is when that
+              request repeats and no memory changed
+
+Validity is tracked with a version vector over the four components. Each
+write bumps the component it touched; an entry built at vector V is only
+reused while the current vector is still V (or, for the history segment,
+while the session component alone is unchanged).
+
+Versions are only kept while they can matter: a session's versions go with
+its entry (LRU eviction or invalidate), a user's long_term version with the
+user's last entry, and versions bumped for sessions that have no entry are
+pruned once they outnumber the cached ones. Unknown keys read as a floor
+that rises on every drop, so a vector taken before a drop never matches
+after it; each entry pins its own versions when stored so the floor does
+not disturb it.
+"""
+
+import itertools
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+COMPONENTS = ("session", "working", "long_term", "behavior")
+
+# long_term is versioned per user; the other components per session
+_USER_COMPONENTS = ("long_term",)
+
+
+@dataclass
+class CachedContext:
+    user_id: Optional[str] = None
+    history_version: int = -1
+    history: List[Dict] = field(default_factory=list)
+    summarized: bool = False
+    vector: Optional[Tuple[int, ...]] = None
+    request: Optional[Tuple] = None
+    messages: Optional[List[Dict]] = None
+
+
+class ContextCache:
+    """
+    Version-checked context entries, least recently used first out.
+
+    Args:
+        max_entries: Sessions kept (0 disables caching; versions are still tracked)
+        max_versions: Versions kept before those without an entry are pruned
+            (default: one per component of max_entries sessions)
+
+    Usage:
+        vector = cache.vector(session_id, user_id)
+        messages = cache.lookup(session_id, vector, request)
+        if messages is None:
+            ...build...
+            cache.store(session_id, user_id, vector, request, messages)
+    """
+
+    def __init__(self, max_entries: int = 1000, max_versions: int = None):
+        self.max_entries = max_entries
+        self.max_versions = max_versions if max_versions is not None else max(max_entries, 1) * len(COMPONENTS)
+        self._entries: "OrderedDict[str, CachedContext]" = OrderedDict()
+        self._versions: Dict[Tuple[str, str], int] = {}
+        # Entries per user, so a user's long_term version goes with the last one
+        self._user_entries: Counter = Counter()
+        self._clock = itertools.count(1)
+        self._floor = 0
+        self._prune_at = self.max_versions
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._history_hits = 0
+        self._incremental = 0
+        self._invalidations = 0
+        self._pruned = 0
+
+    # ==========================================================
+    # VERSIONS
+    # ==========================================================
+    def version(self, component: str, key: str) -> int:
+        return self._versions.get((component, key), self._floor)
+
+    def bump(self, component: str, key: str) -> int:
+        """Record a change to one component of a session (or, for long_term, of a user)."""
+        if component not in COMPONENTS:
+            raise ValueError(f"Unknown context component: {component}")
+        with self._lock:
+            version = self._versions[(component, key)] = next(self._clock)
+            if len(self._versions) > self._prune_at:
+                self._prune()
+            return version
+
+    def vector(self, session_id: str, user_id: str) -> Tuple[int, ...]:
+        return tuple(self.version(c, key) for c, key in self._keys(session_id, user_id))
+
+    @staticmethod
+    def _keys(session_id: str, user_id: str):
+        return [(c, user_id if c in _USER_COMPONENTS else session_id) for c in COMPONENTS]
+
+    # ==========================================================
+    # FULL CONTEXT
+    # ==========================================================
+    def lookup(self, session_id: str, vector: Tuple[int, ...], request: Tuple) -> Optional[List[Dict]]:
+        """The assembled context if it was built for this request at this vector, else None."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry.messages is None or entry.vector != vector or entry.request != request:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self._hits += 1
+            return [dict(m) for m in entry.messages]
+
+    def store(self, session_id: str, user_id: str, vector: Tuple[int, ...], request: Tuple, messages: List[Dict]):
+        with self._lock:
+            if vector != self.vector(session_id, user_id):
+                return  # memory changed while this context was being built
+            entry = self._entry(session_id, user_id)
+            if entry is None:
+                return
+            entry.vector = vector
+            entry.request = request
+            entry.messages = [dict(m) for m in messages]
+
+    # ==========================================================
+    # HISTORY SEGMENT
+    # ==========================================================
+    def history(self, session_id: str, session_version: int) -> Optional[Tuple[List[Dict], bool]]:
+        """(history, summarized) if cached at this session version, else None."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry.history_version != session_version:
+                return None
+            self._history_hits += 1
+            return entry.history, entry.summarized
+
+    def store_history(self, session_id: str, session_version: int, history: List[Dict], summarized: bool,
+                      user_id: str = None):
+        with self._lock:
+            if session_version != self.version("session", session_id):
+                return
+            entry = self._entry(session_id, user_id)
+            if entry is None:
+                return
+            entry.history_version = session_version
+            entry.history = history
+            entry.summarized = summarized
+
+    def append_turn(self, session_id: str, turn: List[Dict], window: Callable[[], List[Dict]]) -> bool:
+        """
+        Bump the session version for a saved turn and carry the cached history
+        segment forward instead of dropping it. A summarized segment is every
+        uncovered message, so the turn is appended; otherwise the segment is
+        re-read from window(). Returns True if a segment was updated.
+        """
+        with self._lock:
+            current = self._versions.get(("session", session_id), self._floor)
+            version = self._versions[("session", session_id)] = next(self._clock)
+            entry = self._entries.get(session_id)
+            if entry is None or entry.history_version != current:
+                return False
+            # New lists: the previous segment may still be referenced by a caller
+            entry.history = entry.history + list(turn) if entry.summarized else list(window())
+            entry.history_version = version
+            entry.messages = None
+            self._incremental += 1
+            return True
+
+    # ==========================================================
+    # LIFECYCLE
+    # ==========================================================
+    def invalidate(self, session_id: str):
+        """Forget a session entirely (entry and versions)."""
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is not None:
+                self._invalidations += 1
+                self._release_user(entry.user_id)
+            self._drop_session(session_id)
+
+    def _entry(self, session_id: str, user_id: str = None) -> Optional[CachedContext]:
+        """
+        The session's entry, created if needed. Its versions are pinned at
+        their current values first, so evicting another entry (which raises
+        the floor) does not change them.
+        """
+        if self.max_entries <= 0:
+            return None
+        entry = self._entries.get(session_id)
+        if entry is None:
+            entry = self._entries[session_id] = CachedContext()
+        else:
+            self._entries.move_to_end(session_id)
+        if user_id is not None and entry.user_id != user_id:
+            self._release_user(entry.user_id)
+            entry.user_id = user_id
+            self._user_entries[user_id] += 1
+        for key in self._keys(session_id, entry.user_id):
+            if key[1] is not None:
+                self._versions.setdefault(key, self._floor)
+        while len(self._entries) > self.max_entries:
+            evicted_id, evicted = self._entries.popitem(last=False)
+            self._release_user(evicted.user_id)
+            self._drop_session(evicted_id)
+        return entry
+
+    def _release_user(self, user_id: Optional[str]):
+        if user_id is None:
+            return
+        self._user_entries[user_id] -= 1
+        if self._user_entries[user_id] <= 0:
+            del self._user_entries[user_id]
+            for component in _USER_COMPONENTS:
+                self._drop((component, user_id))
+
+    def _drop_session(self, session_id: str):
+        for component in COMPONENTS:
+            if component not in _USER_COMPONENTS:
+                self._drop((component, session_id))
+
+    def _drop(self, key: Tuple[str, str]):
+        if self._versions.pop(key, None) is not None:
+            # The key now reads as the floor; raise it past every version handed out
+            self._floor = next(self._clock)
+
+    def _prune(self):
+        """Drop versions of sessions and users that have no entry."""
+        before = len(self._versions)
+        self._versions = {
+            key: version for key, version in self._versions.items()
+            if (key[1] in self._user_entries if key[0] in _USER_COMPONENTS else key[1] in self._entries)
+        }
+        if len(self._versions) < before:
+            self._pruned += before - len(self._versions)
+            self._floor = next(self._clock)
+        # Amortized: prune again only after the map doubles
+        self._prune_at = max(self.max_versions, 2 * len(self._versions))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._entries
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "history_hits": self._history_hits,
+                "incremental_updates": self._incremental,
+                "invalidations": self._invalidations,
+                "versions": len(self._versions),
+                "versions_pruned": self._pruned
+            }
@@ -0,0 +1,203 @@
+"""
+Per-user long-term fact index.
+
+Each fact ("preferred_language" -> "Python") is embedded as a sparse,
+L2-normalised vector of hashed word and character n-grams. An inverted
+index from feature to facts means a query only scores facts that share at
+least one feature with it, so retrieval cost follows the overlap, not the
+number of facts. Pure Python and offline: no model download, no NumPy.
+"""
+
+import json
+import math
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from storage.file_lock import atomic_write
+from storage.filenames import key_to_filename
+from utils.logger import get_logger
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+N_FEATURES = 2 ** 20
+
+
+def _hash(feature: str) -> int:
+    # crc32 is stable across processes (unlike hash()), so saved vectors stay valid
+    return zlib.crc32(feature.encode("utf-8")) % N_FEATURES
+
+
+def embed(text: str) -> Dict[int, float]:
+    """Sparse L2-normalised hashed embedding of text (words + character trigrams)."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    vector: Dict[int, float] = {}
+    for token in tokens:
+        idx = _hash(f"w:{token}")
+        vector[idx] = vector.get(idx, 0.0) + 1.0
+        padded = f"<{token}>"
+        # Trigrams let "pythonic" match "python" and survive small typos
+        for j in range(len(padded) - 2):
+            idx = _hash(f"c:{padded[j:j + 3]}")
+            vector[idx] = vector.get(idx, 0.0) + 0.5
+    norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+    return {idx: v / norm for idx, v in vector.items()}
+
+
+def fact_text(key: str, value: Any) -> str:
+    """Text a fact is embedded from: its key words plus its value."""
+    if not isinstance(value, str):
+        value = json.dumps(value)
+    return f"{key.replace('_', ' ')}: {value}"
+
+
+class FactIndex:
+    """
+    Incremental fact index for one user.
+
+    Usage:
+        index = FactIndex.load("user_123", Path("data/fact_index"))
+        index.upsert("preferred_language", "Python")
+        index.search("write me a script", k=5)  # [("preferred_language", 0.31), ...]
+    """
+
+    def __init__(self, user_id: str, path: Optional[Path] = None):
+        self.user_id = user_id
+        self.path = Path(path) if path else None
+        self.logger = get_logger("atlus.context.fact_index")
+
+        self._vectors: Dict[str, Dict[int, float]] = {}
+        self._texts: Dict[str, str] = {}
+        self._postings: Dict[int, Dict[str, float]] = {}
+        self._lock = threading.RLock()
+
+    # ==========================================================
+    # UPDATES
+    # ==========================================================
+    def upsert(self, key: str, value: Any, save: bool = True) -> bool:
+        """Insert or update a fact. Returns False if it was already indexed unchanged."""
+        text = fact_text(key, value)
+        with self._lock:
+            if self._texts.get(key) == text:
+                return False
+            self._remove(key)
+            vector = embed(text)
+            self._vectors[key] = vector
+            self._texts[key] = text
+            for idx, weight in vector.items():
+                self._postings.setdefault(idx, {})[key] = weight
+        if save:
+            self.save()
+        return True
+
+    def delete(self, key: str, save: bool = True) -> bool:
+        with self._lock:
+            removed = self._remove(key)
+        if removed and save:
+            self.save()
+        return removed
+
+    def sync(self, facts: Dict[str, Any]) -> int:
+        """Make the index match facts exactly (bulk build / repair). Returns changes made."""
+        changes = 0
+        with self._lock:
+            for key in list(self._texts):
+                if key not in facts:
+                    self._remove(key)
+                    changes += 1
+            for key, value in facts.items():
+                changes += self.upsert(key, value, save=False)
+        if changes:
+            self.save()
+        return changes
+
+    # ==========================================================
+    # QUERIES
+    # ==========================================================
+    def search(self, query: str, k: int = 5, min_score: float = 0.0) -> List[Tuple[str, float]]:
+        """Top-k (key, cosine score) pairs for query, best first."""
+        query_vector = embed(query)
+        scores: Dict[str, float] = {}
+        with self._lock:
+            for idx, q_weight in query_vector.items():
+                for key, weight in self._postings.get(idx, {}).items():
+                    scores[key] = scores.get(key, 0.0) + q_weight * weight
+        ranked = sorted(
+            ((key, score) for key, score in scores.items() if score > min_score),
+            key=lambda item: (-item[1], item[0])
+        )
+        return ranked[:k]
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._texts)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._texts)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._texts
+
+    # ==========================================================
+    # PERSISTENCE
+    # ==========================================================
+    def save(self):
+        """Write the index atomically (no-op without a path)."""
+        if self.path is None:
+            return
+        with self._lock:
+            payload = {
+                "user_id": self.user_id,
+                "n_features": N_FEATURES,
+                "facts": {
+                    key: {"text": self._texts[key], "vector": {str(i): w for i, w in self._vectors[key].items()}}
+                    for key in self._texts
+                }
+            }
+        # Derived from long-term facts (rebuilt by sync), so no fsync
+        atomic_write(self.path, json.dumps(payload), fsync=False)
+
+    @classmethod
+    def load(cls, user_id: str, index_dir: Optional[Path] = None) -> "FactIndex":
+        """Load a user's index from index_dir, or start an empty one there."""
+        path = Path(index_dir) / f"{key_to_filename(user_id)}.json" if index_dir else None
+        index = cls(user_id, path)
+        if path is None or not path.exists():
+            return index
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            if payload.get("n_features") != N_FEATURES:
+                raise ValueError("feature space changed")
+            if payload.get("user_id") != user_id:
+                raise ValueError(f"index belongs to {payload.get('user_id')!r}")
+            for key, fact in payload.get("facts", {}).items():
+                vector = {int(i): float(w) for i, w in fact["vector"].items()}
+                index._vectors[key] = vector
+                index._texts[key] = fact["text"]
+                for idx, weight in vector.items():
+                    index._postings.setdefault(idx, {})[key] = weight
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            # The caller rebuilds from the facts themselves via sync()
+            index.logger.warning(f"Discarding unreadable fact index for {user_id}: {e}")
+            index = cls(user_id, path)
+        return index
+
+    # ==========================================================
+    # INTERNALS
+    # ==========================================================
+    def _remove(self, key: str) -> bool:
+        vector = self._vectors.pop(key, None)
+        if vector is None:
+            return False
+        self._texts.pop(key, None)
+        for idx in vector:
+            posting = self._postings.get(idx)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self._postings[idx]
+        return True
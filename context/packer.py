@@ -0,0 +1,187 @@
+"""
+Token-budget context packing.
+
+The assembled context (system prompt, memory sections, rolling summary,
+history) is split into items, each with a section, a token estimate and a
+value: the section's priority weight, decayed by age for history turns.
+Required items (the base system prompt and the current request) are always
+kept; the rest of the budget is filled greedily by value per token. Kept
+items go out in their original order, and everything dropped is reported.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from context.summarizer import estimate_tokens
+from utils.logger import get_logger
+
+# How much a section is worth per message, before recency decay
+DEFAULT_WEIGHTS = {
+    "system": 10.0,
+    "memory": 4.0,
+    "summary": 3.0,
+    "history": 2.0,
+}
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:"
+
+
+@dataclass
+class ContextItem:
+    """One packable unit: a single message, or a user/assistant turn."""
+    section: str
+    messages: List[Dict]
+    tokens: int
+    value: float
+    required: bool = False
+
+
+@dataclass
+class PackResult:
+    messages: List[Dict]
+    budget: int
+    used_tokens: int
+    dropped: List[Dict] = field(default_factory=list)
+
+    @property
+    def dropped_tokens(self) -> int:
+        return sum(item["tokens"] for item in self.dropped)
+
+
+class ContextPacker:
+    """
+    Greedy value-per-token packer.
+
+    Args:
+        weights: Section -> priority weight (missing sections use DEFAULT_WEIGHTS)
+        history_decay: Value multiplier per turn of age (newest turn = 1.0)
+
+    Usage:
+        packer = ContextPacker()
+        result = packer.pack(context_messages, budget=4000, user_message=message)
+        result.messages, result.dropped
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, history_decay: float = 0.85):
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.history_decay = history_decay
+        self.logger = get_logger("atlus.context.packer")
+
+        self._lock = threading.Lock()
+        self._packs = 0
+        self._packs_trimmed = 0
+        self._dropped_items: Dict[str, int] = {}
+        self._dropped_tokens = 0
+
+    # ==========================================================
+    # SPLITTING
+    # ==========================================================
+    def split(self, messages: List[Dict], user_message: str = None) -> List[ContextItem]:
+        """Group messages into items, tagging sections and values."""
+        items = []
+        turn: List[Dict] = []
+        turns: List[ContextItem] = []
+
+        def close_turn():
+            if turn:
+                item = ContextItem("history", list(turn), estimate_tokens(turn), 0.0)
+                items.append(item)
+                turns.append(item)
+                turn.clear()
+
+        for i, message in enumerate(messages):
+            role = message.get("role")
+            if role == "system":
+                close_turn()
+                content = message.get("content", "")
+                if i == 0:
+                    section = "system"
+                elif content.startswith(SUMMARY_PREFIX):
+                    section = "summary"
+                else:
+                    section = "memory"
+                items.append(ContextItem(
+                    section, [message], estimate_tokens([message]),
+                    self.weights.get(section, 1.0), required=section == "system"
+                ))
+            else:
+                # A user message starts a new turn; replies stay with it
+                if role == "user":
+                    close_turn()
+                turn.append(message)
+        close_turn()
+
+        last = turns[-1] if turns else None
+        if (
+            user_message and last is not None and last is items[-1]
+            and last.messages[-1].get("role") == "user"
+            and last.messages[-1].get("content") == user_message
+        ):
+            last.required = True
+
+        weight = self.weights.get("history", 1.0)
+        for age, item in enumerate(reversed(turns)):
+            item.value = weight * len(item.messages) * (self.history_decay ** age)
+        return items
+
+    # ==========================================================
+    # PACKING
+    # ==========================================================
+    def pack(self, messages: List[Dict], budget: int, user_message: str = None) -> PackResult:
+        """Fit messages into budget tokens. Required items are kept even over budget."""
+        items = self.split(messages, user_message)
+        total = sum(item.tokens for item in items)
+        if total <= budget:
+            self._record([])
+            return PackResult(list(messages), budget, total)
+
+        keep = set()
+        used = 0
+        for i, item in enumerate(items):
+            if item.required:
+                keep.add(i)
+                used += item.tokens
+
+        optional = sorted(
+            (i for i in range(len(items)) if i not in keep),
+            key=lambda i: items[i].value / max(items[i].tokens, 1),
+            reverse=True
+        )
+        for i in optional:
+            if used + items[i].tokens <= budget:
+                keep.add(i)
+                used += items[i].tokens
+
+        packed = []
+        dropped = []
+        for i, item in enumerate(items):
+            if i in keep:
+                packed.extend(item.messages)
+            else:
+                dropped.append({
+                    "section": item.section,
+                    "messages": len(item.messages),
+                    "tokens": item.tokens
+                })
+
+        self._record(dropped)
+        return PackResult(packed, budget, used, dropped)
+
+    def _record(self, dropped: List[Dict]):
+        with self._lock:
+            self._packs += 1
+            if dropped:
+                self._packs_trimmed += 1
+            for item in dropped:
+                self._dropped_items[item["section"]] = self._dropped_items.get(item["section"], 0) + 1
+                self._dropped_tokens += item["tokens"]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "packs": self._packs,
+                "packs_trimmed": self._packs_trimmed,
+                "dropped_items": dict(self._dropped_items),
+                "dropped_tokens": self._dropped_tokens
+            }
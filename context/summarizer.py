@@ -0,0 +1,196 @@
+"""
+Rolling conversation summary.
+
+Once the part of a session's history not yet covered by its summary grows
+past a token threshold, the oldest of those turns are folded into the
+summary by an LLM call, leaving the last few turns verbatim. Folding runs
+on a background worker after a turn is saved, never on the request path.
+
+A summary is {"text": str, "covered": int}: "covered" is how many leading
+history messages the text stands for, so context is always
+summary + history[covered:].
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from prompts.summary_prompt import build_summary_prompt
+from utils.logger import get_logger
+
+EMPTY_SUMMARY = {"text": "", "covered": 0}
+
+
+def estimate_tokens(messages: List[Dict]) -> int:
+    """Cheap token estimate (~4 characters per token plus per-message overhead)."""
+    return sum(len(m.get("content", "")) // 4 + 4 for m in messages)
+
+
+class RollingSummarizer:
+    """
+    Background summarizer.
+
+    Args:
+        llm_factory: Returns an object with generate(messages) -> str; created on first fold
+        token_threshold: Fold once unsummarized history exceeds this many tokens
+        keep_turns: Turns (user + assistant pairs) always left verbatim
+        max_workers: Concurrent fold calls across sessions
+
+    Usage:
+        summarizer = RollingSummarizer(lambda: get_llm("summarizing"))
+        summarizer.schedule(session_id, get_state, on_done)
+        summarizer.unsummarized(history, summary)  # messages to send verbatim
+    """
+
+    def __init__(
+        self,
+        llm_factory: Callable,
+        token_threshold: int = 2000,
+        keep_turns: int = 4,
+        max_workers: int = 1
+    ):
+        self.llm_factory = llm_factory
+        self.token_threshold = token_threshold
+        self.keep_turns = keep_turns
+        self.logger = get_logger("atlus.context.summarizer")
+
+        self._llm = None
+        self._llm_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="summarizer")
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+        self._folds = 0
+        self._folded_messages = 0
+        self._failures = 0
+        self._fold_seconds_total = 0.0
+
+    # ==========================================================
+    # PLANNING
+    # ==========================================================
+    @staticmethod
+    def unsummarized(history: List[Dict], summary: Optional[Dict]) -> List[Dict]:
+        """Messages the summary does not cover."""
+        covered = (summary or EMPTY_SUMMARY).get("covered", 0)
+        if covered > len(history):
+            # History was replaced underneath the summary; it no longer applies
+            covered = 0
+        return history[covered:]
+
+    def plan(self, history: List[Dict], summary: Optional[Dict]) -> Optional[Tuple[int, int]]:
+        """
+        Return the (start, end) slice of history to fold, or None if under threshold.
+        """
+        summary = summary or EMPTY_SUMMARY
+        covered = summary.get("covered", 0)
+        if covered > len(history):
+            covered = 0
+        pending = history[covered:]
+        if estimate_tokens(pending) <= self.token_threshold:
+            return None
+        end = len(history) - self.keep_turns * 2
+        if end <= covered:
+            return None
+        return covered, end
+
+    # ==========================================================
+    # FOLDING
+    # ==========================================================
+    def _get_llm(self):
+        if self._llm is None:
+            with self._llm_lock:
+                if self._llm is None:
+                    self._llm = self.llm_factory()
+        return self._llm
+
+    def fold(self, history: List[Dict], summary: Optional[Dict]) -> Optional[Dict]:
+        """
+        Fold per plan() synchronously. Returns the new summary, or None if
+        there was nothing to do or the model returned no text.
+        """
+        span = self.plan(history, summary)
+        if span is None:
+            return None
+        start, end = span
+        previous = (summary or EMPTY_SUMMARY).get("text", "") if start else ""
+
+        started = time.perf_counter()
+        text = (self._get_llm().generate(build_summary_prompt(previous, history[start:end])) or "").strip()
+        elapsed = time.perf_counter() - started
+
+        if not text:
+            # Covering these turns with no text would drop them from context;
+            # keep the previous summary and retry on a later turn
+            with self._lock:
+                self._failures += 1
+            self.logger.warning(f"Summary fold of {end - start} messages returned no text, keeping previous summary")
+            return None
+
+        with self._lock:
+            self._folds += 1
+            self._folded_messages += end - start
+            self._fold_seconds_total += elapsed
+        self.logger.debug(f"Folded {end - start} messages into summary in {elapsed:.2f}s")
+        return {"text": text, "covered": end}
+
+    def schedule(
+        self,
+        key: str,
+        get_state: Callable[[], Tuple[List[Dict], Optional[Dict]]],
+        on_done: Callable[[Dict], None]
+    ) -> bool:
+        """
+        Fold in the background if needed.
+
+        get_state is called on the worker and returns (history, summary);
+        on_done receives the new summary. At most one fold per key runs at
+        a time. Returns True if a job was queued.
+        """
+        history, summary = get_state()
+        if self.plan(history, summary) is None:
+            return False
+        with self._lock:
+            if key in self._in_flight:
+                return False
+            self._in_flight.add(key)
+        self._executor.submit(self._run, key, get_state, on_done)
+        return True
+
+    def _run(self, key, get_state, on_done):
+        try:
+            history, summary = get_state()
+            new_summary = self.fold(list(history), summary)
+            if new_summary is not None:
+                on_done(new_summary)
+        except Exception as e:
+            with self._lock:
+                self._failures += 1
+            self.logger.warning(f"Summary fold for {key} failed: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+
+    def wait(self, timeout: float = None):
+        """Block until queued folds finish (tests and shutdown)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not self._in_flight:
+                    return True
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "folds": self._folds,
+                "folded_messages": self._folded_messages,
+                "failures": self._failures,
+                "in_flight": len(self._in_flight),
+                "fold_seconds_avg": round(self._fold_seconds_total / self._folds, 3) if self._folds else 0.0
+            }
@@ -5,9 +5,24 @@ from abc import ABC, abstractmethod
 class BaseLLM(ABC):
 
     @abstractmethod
-    def generate(self, messages: list[dict], **kwargs) -> str:
+    def generate(self, messages: list, **kwargs) -> str:
         """
-        messages: OpenAI-style messages
+        messages: OpenAI-style messages (dicts or models.message.Message;
+                  clients convert with models.message.to_wire)
         returns: assistant text
         """
         pass
+
+    def warm_up(self, probe: bool = False):
+        """
+        Open a pooled connection to the provider (DNS + TLS) ahead of traffic.
+
+        probe: also send a one-token completion to confirm the model responds
+        """
+        self.client.models.list()
+        if probe:
+            self.client.chat.completions.create(
+                model=self.cfg["model"],
+                messages=[{"role": "user", "content": "ping"}],
+                max_tokens=1,
+            )
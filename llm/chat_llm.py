@@ -1,5 +1,6 @@
 from groq import Groq
 from llm.base import BaseLLM
+from models.message import to_wire
 from llm.config import MODELS
 import os
 from dotenv import load_dotenv
@@ -16,7 +17,7 @@ class ChatLLM(BaseLLM):
         # Use streaming and collect chunks (Groq SDK pattern)
         response = self.client.chat.completions.create(
             model=self.cfg["model"],
-            messages=messages,
+            messages=to_wire(messages),
             temperature=self.cfg["temperature"],
             max_completion_tokens=self.cfg["max_tokens"],
             top_p=1,
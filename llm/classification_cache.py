@@ -0,0 +1,166 @@
+# llm/classification_cache.py
+
+"""
+Classification result cache.
+
+LRU cache of intent classifications keyed on a normalised message, so
+repeated short requests ("can you explain X", "thanks!") skip the classifier
+entirely. Shared by every session served by the process and persisted to
+disk so hits survive restarts.
+"""
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from storage.file_lock import atomic_write
+
+DEFAULT_CACHE_PATH = Path("data/classification_cache.json")
+
+# Punctuation that only frames a word ("thanks!", "(this)") and is trimmed
+# from token edges. Symbols that carry intent ("c++", "c#", "2+2", "?") and
+# punctuation inside a token ("2.5", "file.py") stay in the key.
+_FRAMING_CHARS = ".,!;:'\"`()[]{}"
+_QUESTION_RE = re.compile(r"\?+")
+_WORD_RE = re.compile(r"[^\W\d_]+")
+_SUFFIXES = ("ing", "edly", "ed", "ies", "es", "ly", "s")
+
+# Bumped whenever normalize_message changes, so keys persisted by an older
+# version (which may merge messages this one keeps apart) are not reused
+KEY_VERSION = 2
+
+
+def _stem(token: str) -> str:
+    """Very light suffix stripping; enough to merge 'explain'/'explaining'."""
+    if len(token) <= 4:
+        return token
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)]
+    return token
+
+
+def normalize_message(message: str, stem: bool = False) -> str:
+    """
+    Normalise a message for cache lookups.
+
+    Lowercases, collapses whitespace and trims framing punctuation from each
+    token, keeping intent-bearing symbols so "what is 2+2?" and "what is 22"
+    never share an entry; optionally applies light stemming to each word.
+    """
+    tokens = (token.strip(_FRAMING_CHARS) for token in message.lower().split())
+    text = _QUESTION_RE.sub("?", " ".join(token for token in tokens if token))
+    if stem:
+        text = _WORD_RE.sub(lambda match: _stem(match.group()), text)
+    return text
+
+
+class ClassificationCache:
+    """
+    Thread-safe, bounded LRU cache of classification results.
+
+    Each entry stores the classification dict and the source that produced
+    it ("llm", "local", "heuristic"), so stats can report how many classifier
+    LLM calls were actually avoided.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = DEFAULT_CACHE_PATH,
+        max_entries: int = 5000,
+        stem: bool = False,
+        save_every: int = 25
+    ):
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self.stem = stem
+        self.save_every = save_every
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.llm_calls_avoided = 0
+
+        self.load()
+
+    def key(self, message: str) -> str:
+        return normalize_message(message, stem=self.stem)
+
+    def get(self, message: str) -> Optional[Dict]:
+        """Return a copy of the cached classification, or None."""
+        key = self.key(message)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if entry["source"] == "llm":
+                self.llm_calls_avoided += 1
+            return dict(entry["classification"])
+
+    def put(self, message: str, classification: Dict, source: str = "llm"):
+        """Store a classification, evicting the least recently used entry if full."""
+        key = self.key(message)
+        if not key:
+            return
+        with self._lock:
+            self._entries[key] = {"classification": dict(classification), "source": source}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._unsaved += 1
+            should_save = self.save_every and self._unsaved >= self.save_every
+        if should_save:
+            self.save()
+
+    def stats(self) -> Dict:
+        """Hit-rate metrics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "llm_calls_avoided": self.llm_calls_avoided
+            }
+
+    def load(self):
+        """Load persisted entries (oldest first, so LRU order is preserved)."""
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        # Older files are a bare list of entries keyed by a previous normalisation
+        if not isinstance(data, dict) or data.get("key_version") != KEY_VERSION:
+            return
+        items = data.get("entries", [])
+        with self._lock:
+            for key, entry in items[-self.max_entries:]:
+                self._entries[key] = entry
+
+    def save(self):
+        """Persist entries with a write-then-rename so a crash never leaves a torn file."""
+        if not self.path:
+            return
+        with self._lock:
+            items = list(self._entries.items())
+            self._unsaved = 0
+        atomic_write(self.path, json.dumps({"key_version": KEY_VERSION, "entries": items}), fsync=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.llm_calls_avoided = 0
+            self._unsaved = 0
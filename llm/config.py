@@ -40,6 +40,13 @@ MODELS = {
         "max_tokens": 16384,
         "reasoning": False,
     },
+    "summarizing": {
+        "provider": "openrouter",
+        "model": "nvidia/nemotron-3-nano-30b-a3b:free",
+        "temperature": 0.2,
+        "max_tokens": 768,
+        "reasoning": False,
+    },
     "chatting":{
         "provider": "groq",
         "model": "meta-llama/llama-4-scout-17b-16e-instruct",
@@ -48,3 +55,13 @@ MODELS = {
         "reasoning": True,
     }
 }
+
+# ---------- CONTEXT BUDGETS ----------
+# Prompt-side token budget per role for memory context (system prompt,
+# memory, summary, history); kept well under each model's window so
+# prefill stays fast. Roles missing here are not packed. Section
+# priorities live in context/packer.py (DEFAULT_WEIGHTS).
+CONTEXT_BUDGETS = {
+    "chatting": 3000,
+    "reasoning": 6000,
+}
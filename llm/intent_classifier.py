@@ -0,0 +1,285 @@
+# llm/intent_classifier.py
+
+"""
+Local intent classifier.
+
+Multinomial logistic regression over hashed word and character n-grams.
+Trained offline from labeled examples and logged classifier decisions
+(see scripts/train_intent_classifier.py), then loaded by the Orchestrator
+so most messages are routed without an IntentLLM call.
+
+Pure Python on sparse features: a prediction touches only the handful of
+active n-grams, so it answers in microseconds without extra dependencies.
+"""
+
+import json
+import math
+import random
+import re
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_LABELS = ("simple", "medium", "complex")
+DEFAULT_MODEL_PATH = Path("data/intent_classifier.json")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+class IntentClassifier:
+    """
+    Lightweight intent classifier.
+
+    Usage:
+        clf = IntentClassifier()
+        clf.fit([("hi there", "simple"), ("build a todo app", "complex")])
+        clf.classify("hello")  # {"intent_type": "simple", "confidence": 0.9, ...}
+    """
+
+    N_FEATURES = 2 ** 18
+    CHAR_NGRAM = 3
+
+    def __init__(self, labels: Iterable[str] = DEFAULT_LABELS, n_features: int = None):
+        self.labels: List[str] = list(labels)
+        self.n_features = n_features or self.N_FEATURES
+        # label -> {feature_index: weight}; sparse so untouched features cost nothing
+        self.weights: Dict[str, Dict[int, float]] = {label: {} for label in self.labels}
+        self.bias: Dict[str, float] = {label: 0.0 for label in self.labels}
+        self.trained_at: Optional[str] = None
+        self.n_examples = 0
+
+    # ==========================================================
+    # FEATURES
+    # ==========================================================
+    def _hash(self, feature: str) -> int:
+        # crc32 is stable across processes (unlike hash()), so saved weights stay valid
+        return zlib.crc32(feature.encode("utf-8")) % self.n_features
+
+    def featurize(self, text: str) -> Dict[int, float]:
+        """Map text to a sparse, L2-normalised hashed n-gram vector."""
+        tokens = _TOKEN_RE.findall(text.lower())
+        features: Dict[int, float] = {}
+
+        def add(name: str):
+            idx = self._hash(name)
+            features[idx] = features.get(idx, 0.0) + 1.0
+
+        for i, token in enumerate(tokens):
+            add(f"w:{token}")
+            if i + 1 < len(tokens):
+                add(f"b:{token} {tokens[i + 1]}")
+            padded = f"<{token}>"
+            for j in range(len(padded) - self.CHAR_NGRAM + 1):
+                add(f"c:{padded[j:j + self.CHAR_NGRAM]}")
+
+        if tokens:
+            add(f"first:{tokens[0]}")
+        # Coarse length bucket: very short messages are almost always chit-chat
+        add(f"len:{min(len(tokens), 40) // 5}")
+
+        norm = math.sqrt(sum(v * v for v in features.values())) or 1.0
+        return {idx: v / norm for idx, v in features.items()}
+
+    # ==========================================================
+    # INFERENCE
+    # ==========================================================
+    def _scores(self, features: Dict[int, float]) -> Dict[str, float]:
+        scores = {}
+        for label in self.labels:
+            w = self.weights[label]
+            scores[label] = self.bias[label] + sum(w.get(idx, 0.0) * v for idx, v in features.items())
+        return scores
+
+    @staticmethod
+    def _softmax(scores: Dict[str, float]) -> Dict[str, float]:
+        top = max(scores.values())
+        exps = {label: math.exp(s - top) for label, s in scores.items()}
+        total = sum(exps.values())
+        return {label: e / total for label, e in exps.items()}
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """Return probability per label."""
+        return self._softmax(self._scores(self.featurize(text)))
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Return (label, confidence) for the most likely label."""
+        probs = self.predict_proba(text)
+        label = max(probs, key=probs.get)
+        return label, probs[label]
+
+    def classify(self, text: str) -> dict:
+        """Classify text into the same structure the classifier LLM returns."""
+        label, confidence = self.predict(text)
+        return {
+            "intent_type": label,
+            "confidence": round(confidence, 4),
+            "reasoning": "Local classifier"
+        }
+
+    # ==========================================================
+    # TRAINING
+    # ==========================================================
+    def fit(
+        self,
+        examples: List[Tuple[str, str]],
+        epochs: int = 30,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+        seed: int = 13
+    ) -> "IntentClassifier":
+        """
+        Train with plain SGD on the softmax cross-entropy loss.
+
+        Args:
+            examples: (text, label) pairs; labels outside self.labels are skipped
+            epochs: Passes over the data
+            learning_rate: Initial step size (decays linearly)
+            l2: L2 penalty applied lazily to touched weights
+            seed: Shuffle seed for reproducible models
+        """
+        data = [(self.featurize(text), label) for text, label in examples if label in self.labels]
+        if not data:
+            raise ValueError("No training examples with known labels")
+
+        rng = random.Random(seed)
+        for epoch in range(epochs):
+            rng.shuffle(data)
+            lr = learning_rate * (1.0 - epoch / epochs) + 1e-3
+            for features, label in data:
+                probs = self._softmax(self._scores(features))
+                for cls in self.labels:
+                    grad = probs[cls] - (1.0 if cls == label else 0.0)
+                    w = self.weights[cls]
+                    for idx, v in features.items():
+                        current = w.get(idx, 0.0)
+                        w[idx] = current - lr * (grad * v + l2 * current)
+                    self.bias[cls] -= lr * grad
+
+        # Drop weights that decayed to nothing to keep the saved model small
+        for cls in self.labels:
+            self.weights[cls] = {idx: w for idx, w in self.weights[cls].items() if abs(w) > 1e-6}
+
+        self.n_examples = len(data)
+        self.trained_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        return self
+
+    # ==========================================================
+    # EVALUATION
+    # ==========================================================
+    def evaluate(self, examples: List[Tuple[str, str]], min_confidence: float = 0.0) -> dict:
+        """
+        Evaluate on held-out examples.
+
+        Args:
+            examples: (text, label) pairs
+            min_confidence: Predictions below this are counted as deferred to the LLM
+
+        Returns:
+            Report dict with accuracy, per-label precision/recall/f1, confusion
+            matrix, coverage at min_confidence and mean latency per prediction.
+        """
+        confusion = {t: {p: 0 for p in self.labels} for t in self.labels}
+        covered = covered_correct = correct = total = 0
+        elapsed = 0.0
+
+        for text, label in examples:
+            if label not in self.labels:
+                continue
+            start = time.perf_counter()
+            predicted, confidence = self.predict(text)
+            elapsed += time.perf_counter() - start
+
+            total += 1
+            confusion[label][predicted] += 1
+            correct += predicted == label
+            if confidence >= min_confidence:
+                covered += 1
+                covered_correct += predicted == label
+
+        per_label = {}
+        for cls in self.labels:
+            tp = confusion[cls][cls]
+            fp = sum(confusion[t][cls] for t in self.labels if t != cls)
+            fn = sum(confusion[cls][p] for p in self.labels if p != cls)
+            precision = tp / (tp + fp) if tp + fp else 0.0
+            recall = tp / (tp + fn) if tp + fn else 0.0
+            f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+            per_label[cls] = {
+                "precision": round(precision, 4),
+                "recall": round(recall, 4),
+                "f1": round(f1, 4),
+                "support": tp + fn
+            }
+
+        return {
+            "examples": total,
+            "accuracy": round(correct / total, 4) if total else 0.0,
+            "per_label": per_label,
+            "confusion": confusion,
+            "min_confidence": min_confidence,
+            "coverage": round(covered / total, 4) if total else 0.0,
+            "covered_accuracy": round(covered_correct / covered, 4) if covered else 0.0,
+            "mean_latency_us": round(elapsed / total * 1e6, 2) if total else 0.0
+        }
+
+    # ==========================================================
+    # PERSISTENCE
+    # ==========================================================
+    def save(self, path: Path = DEFAULT_MODEL_PATH):
+        """Save model weights as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "labels": self.labels,
+            "n_features": self.n_features,
+            "bias": self.bias,
+            "weights": {cls: {str(idx): w for idx, w in ws.items()} for cls, ws in self.weights.items()},
+            "trained_at": self.trained_at,
+            "n_examples": self.n_examples
+        }
+        path.write_text(json.dumps(payload), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_MODEL_PATH) -> "IntentClassifier":
+        """Load a model saved with save()."""
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        model = cls(labels=payload["labels"], n_features=payload["n_features"])
+        model.bias = {label: float(b) for label, b in payload["bias"].items()}
+        model.weights = {
+            label: {int(idx): float(w) for idx, w in ws.items()}
+            for label, ws in payload["weights"].items()
+        }
+        model.trained_at = payload.get("trained_at")
+        model.n_examples = payload.get("n_examples", 0)
+        return model
+
+
+def load_examples(path: Path, min_confidence: float = 0.0) -> List[Tuple[str, str]]:
+    """
+    Load (text, label) pairs from a JSONL file.
+
+    Accepts both labeled examples ({"message", "intent_type"}) and logged
+    classifier decisions, which also carry "confidence"; decisions below
+    min_confidence are skipped so noisy LLM labels don't leak into training.
+    """
+    examples = []
+    path = Path(path)
+    if not path.exists():
+        return examples
+
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        message = record.get("message")
+        label = record.get("intent_type")
+        if not message or not label:
+            continue
+        if record.get("confidence", 1.0) < min_confidence:
+            continue
+        examples.append((message, label))
+    return examples
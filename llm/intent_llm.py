@@ -2,6 +2,7 @@
 
 from openai import OpenAI
 from llm.base import BaseLLM
+from models.message import to_wire
 from llm.config import MODELS, OPENROUTER_BASE_URL
 import os
 from dotenv import load_dotenv
@@ -18,7 +19,7 @@ class IntentLLM(BaseLLM):
     def generate(self, messages, **kwargs) -> str:
         response = self.client.chat.completions.create(
             model=self.cfg["model"],
-            messages=messages,
+            messages=to_wire(messages),
             temperature=self.cfg["temperature"],
             max_tokens=self.cfg["max_tokens"],
             extra_body={
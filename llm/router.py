@@ -5,13 +5,14 @@ from llm.planner_llm import PlannerLLM
 from llm.reasoning_llm import ReasoningLLM
 from llm.verifier_llm import VerifierLLM
 from llm.writer_llm import WriterLLM
+from llm.summary_llm import SummaryLLM
 
 def get_llm(role: str):
     """
     Factory function to get LLM instances by role.
     
     Args:
-        role: One of "intent", "planning", "reasoning", "verification", "writing"
+        role: One of "intent", "planning", "reasoning", "verification", "writing", "summarizing"
         
     Returns:
         Appropriate LLM instance
@@ -29,4 +30,6 @@ def get_llm(role: str):
         return VerifierLLM()
     if role == "writing":
         return WriterLLM()
-    raise ValueError(f"Unknown LLM role: {role}. Valid roles: intent, planning, reasoning, verification, writing")
+    if role == "summarizing":
+        return SummaryLLM()
+    raise ValueError(f"Unknown LLM role: {role}. Valid roles: intent, planning, reasoning, verification, writing, summarizing")
@@ -0,0 +1,34 @@
+# llm/summary_llm.py
+
+import os
+from openai import OpenAI
+
+from llm.base import BaseLLM
+from models.message import to_wire
+from llm.config import MODELS, OPENROUTER_BASE_URL
+
+
+class SummaryLLM(BaseLLM):
+    """
+    Conversation summarizer.
+    Folds older turns into the session's rolling summary (runs in the background).
+    """
+
+    def __init__(self):
+        self.cfg = MODELS["summarizing"]
+        self.client = OpenAI(
+            base_url=OPENROUTER_BASE_URL,
+            api_key=os.getenv("OPENROUTER_API_KEY"),
+        )
+
+    def generate(self, messages, **kwargs) -> str:
+        response = self.client.chat.completions.create(
+            model=self.cfg["model"],
+            messages=to_wire(messages),
+            temperature=self.cfg["temperature"],
+            max_tokens=self.cfg["max_tokens"],
+            extra_body={
+                "reasoning": {"enabled": self.cfg.get("reasoning", False)}
+            }
+        )
+        return response.choices[0].message.content
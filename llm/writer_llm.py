@@ -4,6 +4,7 @@ import os
 from openai import OpenAI
 
 from llm.base import BaseLLM
+from models.message import to_wire
 from llm.config import MODELS, OPENROUTER_BASE_URL
 
 
@@ -23,7 +24,7 @@ class WriterLLM(BaseLLM):
     def generate(self, messages, **kwargs) -> str:
         response = self.client.chat.completions.create(
             model=self.cfg["model"],
-            messages=messages,
+            messages=to_wire(messages),
             temperature=self.cfg["temperature"],
             max_tokens=self.cfg["max_tokens"],
         )
@@ -0,0 +1,105 @@
+"""
+Compact conversation message types.
+
+Session history holds one message per turn half for the life of the
+session, so a plain {"role": ..., "content": ...} dict per message costs
+a hash table each (about 180 bytes before the content). Message keeps the
+two fields in __slots__ with the role string interned, and reads like the
+dict it replaces (msg["content"], msg.get("role"), dict(msg)), so prompt
+builders and the context assembler need no changes.
+
+Dicts are still the wire format: to_wire() converts at the boundaries
+that serialize messages (LLM clients, storage backends).
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator, List, Union
+
+ROLES = ("system", "user", "assistant", "tool")
+_ROLE_TABLE = {role: sys.intern(role) for role in ROLES}
+_FIELDS = ("role", "content")
+
+
+def _intern_role(role: str) -> str:
+    interned = _ROLE_TABLE.get(role)
+    return interned if interned is not None else sys.intern(role)
+
+
+class Message(Mapping):
+    """
+    Immutable chat message with a read-only mapping interface.
+
+    Usage:
+        msg = Message("user", "hi")
+        msg["role"], msg.get("content"), dict(msg)  # -> "user", "hi", {...}
+    """
+
+    __slots__ = _FIELDS
+
+    def __init__(self, role: str, content: str):
+        object.__setattr__(self, "role", _intern_role(role))
+        object.__setattr__(self, "content", content)
+
+    @classmethod
+    def from_wire(cls, message: Union["Message", Mapping]) -> Union["Message", Mapping]:
+        """
+        Compact a wire message. Messages carrying fields other than role and
+        content (names, tool calls) are returned unchanged.
+        """
+        if isinstance(message, Message):
+            return message
+        if len(message) == 2 and "role" in message and "content" in message:
+            return cls(message["role"], message["content"])
+        return message
+
+    def to_wire(self) -> dict:
+        return {"role": self.role, "content": self.content}
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "role":
+            return self.role
+        if key == "content":
+            return self.content
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_FIELDS)
+
+    def __len__(self) -> int:
+        return 2
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Message is immutable")
+
+    def __reduce__(self):
+        return (Message, (self.role, self.content))
+
+    def __repr__(self) -> str:
+        return f"Message(role={self.role!r}, content={self.content!r})"
+
+
+class Turn:
+    """One user message and the assistant reply to it."""
+
+    __slots__ = ("user", "assistant")
+
+    def __init__(self, user: str, assistant: str):
+        self.user = user
+        self.assistant = assistant
+
+    def messages(self) -> List[Message]:
+        return [Message("user", self.user), Message("assistant", self.assistant)]
+
+    def __reduce__(self):
+        return (Turn, (self.user, self.assistant))
+
+
+def compact(messages: Iterable[Mapping]) -> List[Union[Message, Mapping]]:
+    """Messages as Message objects where they fit (see Message.from_wire)."""
+    return [Message.from_wire(m) for m in messages]
+
+
+def to_wire(messages: Iterable[Mapping]) -> List[dict]:
+    """OpenAI-style dicts for an LLM client or a serializer."""
+    return [m.to_wire() if isinstance(m, Message) else m for m in messages]
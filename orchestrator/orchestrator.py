@@ -3,36 +3,114 @@ Main Orchestrator.
 Classifies user intent and routes to appropriate specialized agent.
 """
 
+import atexit
 import json
+import os
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 from llm.router import get_llm
+from llm.base import BaseLLM
+from llm.config import MODELS, CONTEXT_BUDGETS
+from llm.intent_classifier import IntentClassifier
+from llm.classification_cache import ClassificationCache
 from prompts.classifier_prompt import build_classifier_prompt
 from utils.parsers.json_parser import parse_json, JSONParseError
 from utils.validators.classifier_validator import validate_classifier, ClassifierValidationError
 from utils.logger import get_logger
 
 from agent.simple_agent import SimpleAgent
+from agent.medium_agent import MediumAgent
 from agent.task_agent import TaskAgent
+from agent.agent_pool import AgentPool, AgentPoolExhausted
+from agent.followup import FollowupDetector
+from context.packer import ContextPacker
 from memory import ContextAssembler, BehaviorProfile
 
 
+class WarmupFailed(RuntimeError):
+    """Raised by warm_up() when a required LLM role could not be reached; carries the report."""
+
+    def __init__(self, message: str, report: dict):
+        super().__init__(message)
+        self.report = report
+
+
 class Orchestrator:
     """
     Main orchestrator with intelligent routing.
     
     Flow:
-    1. Intent Classification (simple vs complex)
+    1. Intent Classification (simple vs medium vs complex)
     2. Route to appropriate agent:
        - SimpleAgent: Greetings, simple questions, casual conversation
+       - MediumAgent: Focused tasks answered in one planned reasoning call
        - TaskAgent: Complex tasks requiring full pipeline
     
     This prevents wasting resources on simple requests like "hi".
     """
     
     MAX_RETRIES = 1
+
+    # Local intent classifier (trained with scripts/train_intent_classifier.py).
+    # Predictions below CLASSIFIER_MIN_CONFIDENCE fall in the uncertainty band
+    # and are deferred to the classifier LLM.
+    CLASSIFIER_MODEL_PATH = Path(os.getenv("ATLUS_INTENT_MODEL_PATH", "data/intent_classifier.json"))
+    CLASSIFIER_MIN_CONFIDENCE = float(os.getenv("ATLUS_CLASSIFIER_MIN_CONFIDENCE", "0.75"))
+    CLASSIFIER_DECISIONS_LOG = Path(os.getenv("ATLUS_CLASSIFIER_DECISIONS_LOG", "data/classifier_decisions.jsonl"))
+
+    # Heuristic fallback when no local model is available (whole words only,
+    # so "hi" doesn't match "this" or "ship")
+    SIMPLE_KEYWORDS_RE = re.compile(
+        r"\b(hi|hello|hey|good morning|good afternoon|good evening|thanks|thank you|bye|goodbye)\b"
+    )
+    COMPLEX_KEYWORDS_RE = re.compile(
+        r"\b(build|create|implement|design|develop|make|write|generate|plan|solve)\b"
+    )
+
+    # Classification cache (shared across sessions, persisted across restarts)
+    CLASSIFICATION_CACHE_PATH = Path(os.getenv("ATLUS_CLASSIFICATION_CACHE_PATH", "data/classification_cache.json"))
+    CLASSIFICATION_CACHE_SIZE = int(os.getenv("ATLUS_CLASSIFICATION_CACHE_SIZE", "5000"))
+    CLASSIFICATION_CACHE_STEM = os.getenv("ATLUS_CLASSIFICATION_CACHE_STEM", "false").lower() == "true"
+
+    # Concurrency limits: max agent instances (and so concurrent requests) per agent type
+    AGENT_POOL_SIZES = {
+        "simple": int(os.getenv("ATLUS_SIMPLE_AGENT_POOL_SIZE", "8")),
+        "medium": int(os.getenv("ATLUS_MEDIUM_AGENT_POOL_SIZE", "4")),
+        "complex": int(os.getenv("ATLUS_TASK_AGENT_POOL_SIZE", "2")),
+    }
+    AGENT_ACQUIRE_TIMEOUT = float(os.getenv("ATLUS_AGENT_ACQUIRE_TIMEOUT", "30"))
+
+    # Complex classifications below this confidence are answered by MediumAgent
+    COMPLEX_MIN_CONFIDENCE = float(os.getenv("ATLUS_COMPLEX_MIN_CONFIDENCE", "0.8"))
+
+    # Context packing: memory context is trimmed to the token budget of the
+    # role the chosen agent answers with (llm.config.CONTEXT_BUDGETS)
+    CONTEXT_PACKING_ENABLED = os.getenv("ATLUS_CONTEXT_PACKING_ENABLED", "true").lower() == "true"
+    CONTEXT_HISTORY_DECAY = float(os.getenv("ATLUS_CONTEXT_HISTORY_DECAY", "0.85"))
+    AGENT_ROLES = {"simple": "chatting", "medium": "reasoning", "complex": "reasoning"}
+
+    # Agents pre-created per pool by warm_up()
+    WARMUP_AGENTS_PER_POOL = int(os.getenv("ATLUS_WARMUP_AGENTS_PER_POOL", "1"))
+    # LLM roles whose connection failures do not fail warm-up (comma-separated)
+    WARMUP_OPTIONAL_ROLES = frozenset(
+        role.strip() for role in os.getenv("ATLUS_WARMUP_OPTIONAL_ROLES", "").split(",") if role.strip()
+    )
+
+    # Follow-up fast path: refinements of the last complex task are answered
+    # against its stored draft (needs a task_state_store)
+    FOLLOWUP_ENABLED = os.getenv("ATLUS_FOLLOWUP_ENABLED", "true").lower() == "true"
     
-    def __init__(self):
+    def __init__(self, task_state_store=None):
+        """
+        Args:
+            task_state_store: Keeps TaskAgent state per session for follow-ups;
+                needs get_task_state(session_id) and save_task_state(session_id, state)
+                (MemoryService). Without it every request runs the full pipeline.
+        """
         self.logger = get_logger("atlus.orchestrator")
         self.logger.info("=" * 80)
         self.logger.info("Initializing ATLUS Orchestrator")
@@ -41,10 +119,32 @@ class Orchestrator:
         # Initialize classifier LLM
         self.logger.debug("Initializing classifier LLM...")
         self.classifier_llm = get_llm("intent")  # Use intent LLM for classification
+        self.local_classifier = self._load_local_classifier()
+        self._decisions_lock = threading.Lock()
+        self.classification_cache = ClassificationCache(
+            path=self.CLASSIFICATION_CACHE_PATH,
+            max_entries=self.CLASSIFICATION_CACHE_SIZE,
+            stem=self.CLASSIFICATION_CACHE_STEM
+        )
+        atexit.register(self.classification_cache.save)
         
-        # Initialize specialized agents (lazy loading)
-        self._simple_agent = None
-        self._task_agent = None
+        # Specialized agent pools (instances created lazily, one request per instance)
+        agent_factories = {"simple": SimpleAgent, "medium": MediumAgent, "complex": TaskAgent}
+        self.agent_pools = {
+            intent_type: AgentPool(
+                intent_type,
+                factory,
+                max_size=self.AGENT_POOL_SIZES[intent_type],
+                acquire_timeout=self.AGENT_ACQUIRE_TIMEOUT
+            )
+            for intent_type, factory in agent_factories.items()
+        }
+        self.context_packer = ContextPacker(history_decay=self.CONTEXT_HISTORY_DECAY)
+
+        self.task_state_store = task_state_store
+        self.followup_detector = FollowupDetector()
+        self._followup_lock = threading.Lock()
+        self._followup_stats = {"fast_path": 0, "fallbacks": 0, "tasks_stored": 0}
         
         self.logger.info("Orchestrator initialized successfully")
     
@@ -68,20 +168,21 @@ class Orchestrator:
         self.logger.info(f"Input Length: {len(user_message)} characters")
         
         try:
+            # Refinement of the last complex task: skip classification and planning
+            response = self._try_followup(user_message, session_id, context_messages)
+            if response is not None:
+                self.logger.info(f"Follow-up answered in {time.time() - start_time:.2f} seconds")
+                return response
+
             # Step 1: Classify Intent
             self.logger.info("\n" + "-" * 80)
             self.logger.info("STEP 1: INTENT CLASSIFICATION")
             self.logger.info("-" * 80)
             
             classification = self._classify_intent(user_message)
-            intent_type = classification.get("intent_type", "simple")  # Default to simple if unclear
+            intent_type = self._route(classification)
             confidence = classification.get("confidence", 0.5)
             
-            # Aggressive filtering: Only use complex if confidence is high
-            if intent_type == "complex" and confidence < 0.8:
-                self.logger.warning(f"Low confidence ({confidence:.2f}) for complex classification, defaulting to simple")
-                intent_type = "simple"
-            
             self.logger.info(f"Intent classified as: {intent_type} (confidence: {confidence:.2f})")
             if "reasoning" in classification:
                 self.logger.debug(f"Classification reasoning: {classification['reasoning']}")
@@ -91,16 +192,17 @@ class Orchestrator:
             self.logger.info(f"STEP 2: ROUTING TO {intent_type.upper()} AGENT")
             self.logger.info("-" * 80)
             
-            if intent_type == "simple":
-                agent = self._get_simple_agent()
-                self.logger.info("Using SimpleAgent for quick response")
-                # Pass context to simple agent
-                response = agent.run(user_message, context_messages=context_messages)
-            else:
-                agent = self._get_task_agent()
-                self.logger.info("Using TaskAgent for complex task processing")
-                # Pass context to task agent
-                response = agent.run(user_message, context_messages=context_messages)
+            if intent_type not in self.agent_pools:
+                intent_type = "complex"
+            context_messages = self._pack_context(intent_type, user_message, context_messages)
+            with self.agent_pools[intent_type].acquire() as agent:
+                self.logger.info(f"Using {agent.__class__.__name__} for {intent_type} request")
+                # Pass context to the agent
+                if intent_type == "complex" and self._followups_enabled():
+                    response, task_state = agent.run_task(user_message, context_messages=context_messages)
+                    self._save_task_state(session_id, task_state)
+                else:
+                    response = agent.run(user_message, context_messages=context_messages)
             
             # Summary
             elapsed_time = time.time() - start_time
@@ -111,10 +213,16 @@ class Orchestrator:
             self.logger.info(f"Agent Used: {agent.__class__.__name__}")
             self.logger.info(f"Total execution time: {elapsed_time:.2f} seconds")
             self.logger.info(f"Response length: {len(response)} characters")
+            self.logger.info(f"Classification cache: {self.classification_cache.stats()}")
             self.logger.info("=" * 80)
             
             return response
-            
+
+        except AgentPoolExhausted:
+            # Overloaded, not broken: let the caller reject the request instead of queueing more work
+            self.logger.warning(f"Agent pools exhausted: {self.get_pool_stats()}")
+            raise
+
         except Exception as e:
             elapsed_time = time.time() - start_time
             self.logger.error("=" * 80)
@@ -127,14 +235,81 @@ class Orchestrator:
             # Fallback to simple agent on error
             self.logger.warning("Falling back to SimpleAgent")
             try:
-                agent = self._get_simple_agent()
-                return agent.run(user_message)
+                with self.agent_pools["simple"].acquire() as agent:
+                    return agent.run(user_message)
             except:
                 return "I apologize, but I encountered an error. Please try again."
     
+    def _route(self, classification: dict) -> str:
+        """Agent type for a classification (simple, medium or complex)."""
+        intent_type = classification.get("intent_type", "simple")  # Default to simple if unclear
+        confidence = classification.get("confidence", 0.5)
+
+        # Aggressive filtering: Only use the full pipeline if confidence is high;
+        # uncertain complex requests still deserve a planned answer
+        if intent_type == "complex" and confidence < self.COMPLEX_MIN_CONFIDENCE:
+            self.logger.warning(f"Low confidence ({confidence:.2f}) for complex classification, downgrading to medium")
+            intent_type = "medium"
+        return intent_type
+
+    # ==========================================================
+    # FOLLOW-UP FAST PATH
+    # ==========================================================
+    def _followups_enabled(self) -> bool:
+        return self.FOLLOWUP_ENABLED and self.task_state_store is not None
+
+    def _try_followup(self, user_message: str, session_id: str, context_messages: list):
+        """Answer a refinement against the stored task state; None to take the normal path."""
+        if not self._followups_enabled():
+            return None
+        try:
+            task_state = self.task_state_store.get_task_state(session_id)
+        except Exception as e:
+            self.logger.warning(f"Failed to load task state for {session_id}: {e}")
+            return None
+        if not self.followup_detector.is_followup(user_message, task_state):
+            return None
+
+        self.logger.info(
+            f"Follow-up detected (refinement {task_state.get('followups', 0) + 1} "
+            f"of the last task), running delta reasoning"
+        )
+        context_messages = self._pack_context("complex", user_message, context_messages)
+        try:
+            with self.agent_pools["complex"].acquire() as agent:
+                response, new_state = agent.refine(user_message, task_state, context_messages=context_messages)
+        except AgentPoolExhausted:
+            raise
+        except Exception as e:
+            self.logger.warning(f"Follow-up fast path failed, running full pipeline: {e}")
+            self._count_followup("fallbacks")
+            return None
+
+        self._count_followup("fast_path")
+        self._save_task_state(session_id, new_state)
+        return response
+
+    def _save_task_state(self, session_id: str, task_state: dict):
+        try:
+            self.task_state_store.save_task_state(session_id, task_state)
+            self._count_followup("tasks_stored")
+        except Exception as e:
+            self.logger.warning(f"Failed to store task state for {session_id}: {e}")
+
+    def _count_followup(self, key: str):
+        with self._followup_lock:
+            self._followup_stats[key] += 1
+
+    def get_followup_stats(self) -> dict:
+        """Follow-up fast path counters."""
+        with self._followup_lock:
+            stats = dict(self._followup_stats)
+        stats["enabled"] = self._followups_enabled()
+        return stats
+
     def _classify_intent(self, user_message: str) -> dict:
         """
-        Classify user intent as simple or complex.
+        Classify user intent as simple, medium or complex.
         
         Args:
             user_message: User's input message
@@ -142,30 +317,46 @@ class Orchestrator:
         Returns:
             Classification dictionary with intent_type, confidence, reasoning
         """
-        # Quick heuristic check for obvious cases (skip LLM call)
+        cached = self.classification_cache.get(user_message)
+        if cached is not None:
+            self.logger.debug(
+                f"Quick classification: {cached['intent_type']} (cache hit, "
+                f"stats: {self.classification_cache.stats()})"
+            )
+            return cached
+
         message_lower = user_message.lower().strip()
-        
-        # Obvious simple cases
-        simple_keywords = ["hi", "hello", "hey", "good morning", "good afternoon", 
-                          "good evening", "thanks", "thank you", "bye", "goodbye"]
-        if any(keyword in message_lower for keyword in simple_keywords) and len(message_lower) < 20:
-            self.logger.debug("Quick classification: simple (heuristic)")
-            return {
-                "intent_type": "simple",
-                "confidence": 0.95,
-                "reasoning": "Simple greeting or short message"
-            }
-        
-        # Obvious complex cases (task-oriented keywords)
-        complex_keywords = ["build", "create", "implement", "design", "develop", 
-                           "make", "write", "generate", "plan", "solve"]
-        if any(keyword in message_lower for keyword in complex_keywords) and len(message_lower) > 15:
-            self.logger.debug("Quick classification: complex (heuristic)")
-            return {
-                "intent_type": "complex",
-                "confidence": 0.95,
-                "reasoning": "Task-oriented request"
-            }
+
+        if self.local_classifier is not None:
+            # Local model answers in microseconds; only the uncertainty band reaches the LLM
+            classification = self.local_classifier.classify(message_lower)
+            if classification["confidence"] >= self.CLASSIFIER_MIN_CONFIDENCE:
+                self.logger.debug(
+                    f"Quick classification: {classification['intent_type']} "
+                    f"(local model, confidence {classification['confidence']:.2f})"
+                )
+                return self._remember(user_message, classification, "local")
+            self.logger.debug(
+                f"Local classifier uncertain ({classification['confidence']:.2f} < "
+                f"{self.CLASSIFIER_MIN_CONFIDENCE:.2f}), deferring to LLM"
+            )
+        else:
+            # Quick heuristic check for obvious cases (skip LLM call)
+            if self.SIMPLE_KEYWORDS_RE.search(message_lower) and len(message_lower) < 20:
+                self.logger.debug("Quick classification: simple (heuristic)")
+                return self._remember(user_message, {
+                    "intent_type": "simple",
+                    "confidence": 0.95,
+                    "reasoning": "Simple greeting or short message"
+                }, "heuristic")
+
+            if self.COMPLEX_KEYWORDS_RE.search(message_lower) and len(message_lower) > 15:
+                self.logger.debug("Quick classification: complex (heuristic)")
+                return self._remember(user_message, {
+                    "intent_type": "complex",
+                    "confidence": 0.95,
+                    "reasoning": "Task-oriented request"
+                }, "heuristic")
         
         # Use LLM for classification
         self.logger.debug("Using LLM for intent classification...")
@@ -185,7 +376,8 @@ class Orchestrator:
                 classification = validate_classifier(parsed)
                 
                 self.logger.info(f"Intent classification successful: {classification['intent_type']}")
-                return classification
+                self._log_decision(user_message, classification)
+                return self._remember(user_message, classification, "llm")
                 
             except (JSONParseError, ClassifierValidationError) as e:
                 self.logger.warning(f"Classification failed on attempt {attempt + 1}: {str(e)}")
@@ -196,7 +388,7 @@ class Orchestrator:
                         repair_prompt = [
                             {
                                 "role": "system",
-                                "content": "You fix invalid JSON. Return ONLY valid JSON: {\"intent_type\": \"simple\" or \"complex\", \"confidence\": 0.0-1.0, \"reasoning\": \"string\"}"
+                                "content": "You fix invalid JSON. Return ONLY valid JSON: {\"intent_type\": \"simple\", \"medium\" or \"complex\", \"confidence\": 0.0-1.0, \"reasoning\": \"string\"}"
                             },
                             {
                                 "role": "user",
@@ -215,17 +407,137 @@ class Orchestrator:
                         "reasoning": "Classification failed, using simple agent"
                     }
     
-    def _get_simple_agent(self) -> SimpleAgent:
-        """Get or create SimpleAgent instance (lazy loading)."""
-        if self._simple_agent is None:
-            self.logger.debug("Creating SimpleAgent instance")
-            self._simple_agent = SimpleAgent()
-        return self._simple_agent
+    def _remember(self, user_message: str, classification: dict, source: str) -> dict:
+        """Store a classification in the cache and return it."""
+        self.classification_cache.put(user_message, classification, source=source)
+        return classification
+
+    def get_classification_stats(self) -> dict:
+        """Classification cache hit-rate metrics."""
+        return self.classification_cache.stats()
+
+    def _load_local_classifier(self):
+        """Load the local intent classifier if a trained model exists."""
+        if not self.CLASSIFIER_MODEL_PATH.exists():
+            self.logger.info(
+                f"No local intent model at {self.CLASSIFIER_MODEL_PATH}, using heuristics + LLM"
+            )
+            return None
+        try:
+            model = IntentClassifier.load(self.CLASSIFIER_MODEL_PATH)
+            self.logger.info(
+                f"Loaded local intent classifier ({model.n_examples} examples, "
+                f"trained {model.trained_at}, labels: {model.labels})"
+            )
+            return model
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Failed to load local intent classifier: {e}")
+            return None
+
+    def _log_decision(self, user_message: str, classification: dict):
+        """Append an LLM classification to the decisions log used as training data."""
+        record = {
+            "message": user_message,
+            "intent_type": classification["intent_type"],
+            "confidence": classification.get("confidence", 0.5),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        }
+        try:
+            with self._decisions_lock:
+                self.CLASSIFIER_DECISIONS_LOG.parent.mkdir(parents=True, exist_ok=True)
+                with self.CLASSIFIER_DECISIONS_LOG.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            self.logger.warning(f"Failed to log classifier decision: {e}")
     
-    def _get_task_agent(self) -> TaskAgent:
-        """Get or create TaskAgent instance (lazy loading)."""
-        if self._task_agent is None:
-            self.logger.debug("Creating TaskAgent instance")
-            self._task_agent = TaskAgent()
-        return self._task_agent
+    def warm_up(self, probe: bool = False) -> dict:
+        """
+        Pre-create agents and pre-connect every LLM client they hold.
+
+        Args:
+            probe: Also send a one-token completion once per LLM role
+
+        Returns:
+            Report with agents created per pool, per-role connection results and timings
+
+        Raises:
+            WarmupFailed: A client of a role outside WARMUP_OPTIONAL_ROLES failed to connect
+        """
+        start_time = time.time()
+        self.logger.info(f"Warming up orchestrator (probe={probe})")
+
+        agents_created = {
+            intent_type: pool.prefill(min(self.WARMUP_AGENTS_PER_POOL, pool.max_size))
+            for intent_type, pool in self.agent_pools.items()
+        }
+
+        llms = [self.classifier_llm]
+        for pool in self.agent_pools.values():
+            for agent in pool.idle_agents():
+                llms.extend(value for value in vars(agent).values() if isinstance(value, BaseLLM))
+
+        probed_roles = set()
+        jobs = []
+        for llm in llms:
+            role = next((name for name, cfg in MODELS.items() if cfg is llm.cfg), llm.__class__.__name__)
+            should_probe = probe and role not in probed_roles
+            probed_roles.add(role)
+            jobs.append((role, llm, should_probe))
+
+        def connect(job):
+            role, llm, should_probe = job
+            job_start = time.time()
+            try:
+                llm.warm_up(probe=should_probe)
+                return role, None, time.time() - job_start
+            except Exception as e:
+                return role, str(e), time.time() - job_start
+
+        connections = {}
+        # Connections are independent network round trips; open them in parallel
+        with ThreadPoolExecutor(max_workers=min(8, len(jobs)) or 1) as executor:
+            for role, error, elapsed in executor.map(connect, jobs):
+                entry = connections.setdefault(role, {"clients": 0, "errors": [], "max_seconds": 0.0})
+                entry["clients"] += 1
+                entry["max_seconds"] = round(max(entry["max_seconds"], elapsed), 3)
+                if error:
+                    entry["errors"].append(error)
+                    self.logger.warning(f"Warm-up failed for {role}: {error}")
+
+        failed_roles = sorted(
+            role for role, entry in connections.items()
+            if entry["errors"] and role not in self.WARMUP_OPTIONAL_ROLES
+        )
+        report = {
+            "agents_created": agents_created,
+            "connections": connections,
+            "failed_roles": failed_roles,
+            "probe": probe,
+            "elapsed_seconds": round(time.time() - start_time, 3)
+        }
+        if failed_roles:
+            raise WarmupFailed(f"LLM role(s) failed to connect: {', '.join(failed_roles)}", report)
+        self.logger.info(f"Warm-up completed in {report['elapsed_seconds']:.2f}s: {agents_created}")
+        return report
+
+    def _pack_context(self, intent_type: str, user_message: str, context_messages: list) -> list:
+        """Trim context_messages to the token budget of the agent's model role."""
+        budget = CONTEXT_BUDGETS.get(self.AGENT_ROLES.get(intent_type))
+        if not context_messages or not self.CONTEXT_PACKING_ENABLED or budget is None:
+            return context_messages
+        result = self.context_packer.pack(context_messages, budget, user_message=user_message)
+        if result.dropped:
+            dropped = ", ".join(f"{d['section']}({d['tokens']})" for d in result.dropped)
+            self.logger.info(
+                f"Context packed to {result.used_tokens}/{budget} tokens for {intent_type}; "
+                f"dropped {len(result.dropped)} item(s), {result.dropped_tokens} tokens: {dropped}"
+            )
+        return result.messages
+
+    def get_context_stats(self) -> dict:
+        """Context packing counters: packs, trimmed packs and what was dropped per section."""
+        return self.context_packer.stats()
 
+    def get_pool_stats(self) -> dict:
+        """Per-agent-type pool usage."""
+        return {intent_type: pool.stats() for intent_type, pool in self.agent_pools.items()}
@@ -5,7 +5,12 @@ Uses rules from rules/classification_rules.py and rules/json_schemas.py.
 """
 
 from rules.json_schemas import get_classifier_schema, get_json_output_instruction
-from rules.classification_rules import get_classification_rules, get_simple_examples, get_complex_examples
+from rules.classification_rules import (
+    get_classification_rules,
+    get_simple_examples,
+    get_medium_examples,
+    get_complex_examples
+)
 
 
 def build_classifier_prompt(user_message: str):
@@ -14,6 +19,7 @@ def build_classifier_prompt(user_message: str):
     
     Classifies requests into:
     - "simple": Greetings, simple questions, casual conversation
+    - "medium": Focused tasks that fit in one planned answer
     - "complex": Tasks requiring planning, reasoning, implementation
     """
     return [
@@ -21,7 +27,7 @@ def build_classifier_prompt(user_message: str):
             "role": "system",
             "content": (
                 "You are an intent classifier.\n"
-                "Classify user messages to determine if they need simple response or complex task processing.\n\n"
+                "Classify user messages to determine if they need a simple response, a single planned answer (medium), or complex task processing.\n\n"
                 "CRITICAL: Default to 'simple' unless the request clearly requires heavy multi-step implementation.\n"
                 "Simple conversations, questions, drafts, explanations, and advice requests should be 'simple'.\n"
                 "Only classify as 'complex' for heavy implementation/development tasks.\n\n"
@@ -38,6 +44,7 @@ def build_classifier_prompt(user_message: str):
                 f"REQUIRED JSON structure:\n{get_classifier_schema()}\n\n"
                 f"{get_classification_rules()}\n\n"
                 f"{get_simple_examples()}\n\n"
+                f"{get_medium_examples()}\n\n"
                 f"{get_complex_examples()}\n\n"
                 f"{get_json_output_instruction()}"
             )
@@ -0,0 +1,37 @@
+"""
+Follow-up (delta reasoning) prompt builder.
+Uses rules from rules/followup_rules.py.
+"""
+
+from rules.followup_rules import get_followup_rules
+from rules.reasoning_rules import get_memory_context_instruction
+
+
+def build_followup_prompt(context: str, plan: list[str], previous_draft: str, change_request: str):
+    """
+    Asks for the delta a follow-up request makes to the stored draft.
+    The delta is merged into the draft by the refactor stage.
+    """
+    steps = "\n".join(f"- {s}" for s in plan)
+
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You are a reasoning engine extending an existing solution.\n"
+                "The user is refining the task you already solved.\n\n"
+                f"{get_followup_rules()}\n\n"
+                f"{get_memory_context_instruction()}"
+            )
+        },
+        {
+            "role": "user",
+            "content": (
+                f"Original task:\n{context}\n\n"
+                f"Original plan:\n{steps}\n\n"
+                f"EXISTING SOLUTION:\n{previous_draft}\n\n"
+                f"FOLLOW-UP REQUEST:\n{change_request}\n\n"
+                "Describe and write only the changes needed."
+            )
+        }
+    ]
@@ -0,0 +1,27 @@
+"""
+Medium agent prompt builder.
+Single reasoning call that plans and answers in one response.
+Uses rules from rules/medium_rules.py and rules/reasoning_rules.py.
+"""
+
+from rules.medium_rules import get_medium_instructions
+from rules.reasoning_rules import get_memory_context_instruction
+
+
+def build_medium_prompt(user_message: str):
+    """Build prompt for moderately complex requests (plan then answer)."""
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You are ATLUS, an intelligent AI assistant.\n"
+                "Solve the user's request in a single pass: plan first, then answer.\n\n"
+                f"{get_medium_instructions()}\n\n"
+                f"{get_memory_context_instruction()}"
+            )
+        },
+        {
+            "role": "user",
+            "content": user_message
+        }
+    ]
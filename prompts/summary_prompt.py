@@ -0,0 +1,33 @@
+"""
+Rolling summary prompt builder.
+Folds older conversation turns into the running session summary.
+"""
+
+
+def build_summary_prompt(previous_summary: str, messages: list):
+    """Build prompt that merges messages into previous_summary."""
+    transcript = "\n".join(
+        f"{m.get('role', 'user').upper()}: {m.get('content', '')}" for m in messages
+    )
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You maintain a running summary of a conversation between a user and ATLUS, an AI assistant.\n"
+                "Merge the new messages into the existing summary.\n\n"
+                "Rules:\n"
+                "- Keep facts, decisions, requirements, constraints, names and code identifiers the user gave.\n"
+                "- Keep open questions and unfinished tasks.\n"
+                "- Drop greetings, pleasantries and repeated content.\n"
+                "- Write compact bullet points, at most 250 words in total.\n"
+                "- Output only the updated summary."
+            )
+        },
+        {
+            "role": "user",
+            "content": (
+                f"Existing summary:\n{previous_summary or '(none)'}\n\n"
+                f"New messages:\n{transcript}"
+            )
+        }
+    ]
@@ -21,6 +21,7 @@ from rules.json_schemas import (
 from rules.classification_rules import (
     get_classification_rules,
     get_simple_examples,
+    get_medium_examples,
     get_complex_examples
 )
 from rules.plan_constraints import (
@@ -35,6 +36,8 @@ from rules.reasoning_rules import (
     get_reasoning_instructions,
     get_memory_context_instruction
 )
+from rules.medium_rules import get_medium_instructions
+from rules.followup_rules import get_followup_rules
 from rules.refactor_rules import get_refactor_rules
 from rules.writer_rules import get_writer_rules
 
@@ -51,6 +54,7 @@ __all__ = [
     "get_json_output_instruction",
     "get_classification_rules",
     "get_simple_examples",
+    "get_medium_examples",
     "get_complex_examples",
     "get_plan_constraints",
     "get_plan_example",
@@ -58,6 +62,8 @@ __all__ = [
     "get_verifier_examples",
     "get_reasoning_instructions",
     "get_memory_context_instruction",
+    "get_medium_instructions",
+    "get_followup_rules",
     "get_refactor_rules",
     "get_writer_rules",
 ]
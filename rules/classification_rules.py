@@ -1,6 +1,6 @@
 """
 Rules for intent classification.
-Defines criteria for simple vs complex requests.
+Defines criteria for simple vs medium vs complex requests.
 """
 
 
@@ -9,8 +9,9 @@ def get_classification_rules() -> str:
     return (
         "Classification Rules (STRICT - Default to 'simple' unless clearly a heavy task):\n"
         "- 'simple': DEFAULT for most cases - Greetings, questions, casual conversation, explanations, discussions, drafts, messages, requests for information, thanks, goodbye, follow-ups, clarifications\n"
+        "- 'medium': Focused tasks that need some planning but fit in one answer - A single function or script, a bug fix, a comparison with a recommendation, a short design for one component, a step-by-step guide\n"
         "- 'complex': ONLY for heavy tasks requiring multi-step execution - Building/creating applications, implementing systems, complex planning with multiple steps, generating code architectures, designing complex systems\n\n"
-        "IMPORTANT: When in doubt, classify as 'simple'. Only use 'complex' for clearly heavy implementation/development tasks."
+        "IMPORTANT: When in doubt, classify as 'simple'. Prefer 'medium' over 'complex' unless the task clearly spans multiple components or deliverables."
     )
 
 
@@ -31,6 +32,19 @@ def get_simple_examples() -> str:
     )
 
 
+def get_medium_examples() -> str:
+    """Examples of medium requests (one focused deliverable)."""
+    return (
+        "Examples (medium - focused task, one answer):\n"
+        "Input: 'Write a Python function that validates email addresses with tests'\n"
+        "Output: {\"intent_type\": \"medium\", \"confidence\": 0.90, \"reasoning\": \"Single function with tests\"}\n\n"
+        "Input: 'Why does my Flask route return 405 and how do I fix it?'\n"
+        "Output: {\"intent_type\": \"medium\", \"confidence\": 0.85, \"reasoning\": \"Focused debugging task\"}\n\n"
+        "Input: 'Compare Redis and Memcached for session storage and recommend one'\n"
+        "Output: {\"intent_type\": \"medium\", \"confidence\": 0.85, \"reasoning\": \"Comparison with recommendation\"}"
+    )
+
+
 def get_complex_examples() -> str:
     """Examples of complex requests (ONLY for heavy implementation tasks)."""
     return (
@@ -0,0 +1,17 @@
+"""
+Rules for follow-up (delta) reasoning.
+A refinement of the previous task is answered against the stored draft
+instead of re-running intent extraction and planning.
+"""
+
+
+def get_followup_rules() -> str:
+    """Rules for producing only the change a follow-up asks for."""
+    return (
+        "Rules:\n"
+        "- Work from the existing solution; do NOT start over or re-plan the task.\n"
+        "- Output ONLY what changes: new sections, and replaced sections in full.\n"
+        "- Name the section or step each change belongs to.\n"
+        "- Keep the original goal and constraints unless the request overrides them.\n"
+        "- If the request conflicts with a constraint, say so briefly and follow the request."
+    )
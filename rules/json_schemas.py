@@ -32,7 +32,7 @@ def get_classifier_schema() -> str:
     """JSON schema for intent classification."""
     return (
         "{\n"
-        '  "intent_type": "simple" or "complex",\n'
+        '  "intent_type": "simple", "medium" or "complex",\n'
         '  "confidence": 0.0-1.0,\n'
         '  "reasoning": "brief explanation"\n'
         "}"
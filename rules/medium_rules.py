@@ -0,0 +1,19 @@
+"""
+Rules for the medium (single-call) agent.
+Plan then answer in one response, no separate verify/refactor/write stages.
+"""
+
+
+def get_medium_instructions() -> str:
+    """Output structure for plan-then-answer responses."""
+    return (
+        "Respond in exactly two sections:\n"
+        "## Plan\n"
+        "A short numbered list (3-6 steps) of how you will solve the request.\n"
+        "## Answer\n"
+        "The complete, user-facing answer that follows the plan.\n\n"
+        "Rules:\n"
+        "- Keep the plan brief; put the effort into the answer.\n"
+        "- Check your answer against the plan before finishing.\n"
+        "- The Answer section must stand on its own (the plan is not shown to the user)."
+    )
@@ -11,7 +11,7 @@ logger = get_logger("atlus.cli")
 
 def main():
     """Run orchestrator with memory support."""
-    orchestrator = Orchestrator()
+    orchestrator = Orchestrator(task_state_store=MemoryService)
     session_id = "cli_session"
     
     # Build context with memory
@@ -0,0 +1,87 @@
+"""
+Benchmark resident memory of session history: dict messages vs Message.
+
+Builds the history of N sessions the way MemoryService holds it (messages
+decoded from the storage backend's JSON lines) and measures the Python heap
+with tracemalloc for:
+
+    dict      the decoded {"role": ..., "content": ...} dicts as-is
+    Message   the same history after models.message.compact()
+
+Content strings are identical in both, so the difference is per-message
+overhead. Results are scaled to 1,000 sessions.
+
+Usage:
+    python scripts/bench_messages.py --sessions 1000 --turns 10
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.message import compact
+
+
+WORDS = (
+    "the a to of and in is it for on with this that you can use function data "
+    "error file python api request response server memory session user value "
+    "return list dict string build test run install config model token cache"
+).split()
+
+
+def _lines(n_sessions: int, turns: int, seed: int = 7):
+    """JSON lines per session, as the turn log stores them."""
+    rng = random.Random(seed)
+    sessions = []
+    for _ in range(n_sessions):
+        lines = []
+        for _ in range(turns):
+            user = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 40)))
+            reply = " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 160)))
+            lines.append(json.dumps({"role": "user", "content": user}))
+            lines.append(json.dumps({"role": "assistant", "content": reply}))
+        sessions.append(lines)
+    return sessions
+
+
+def measure(sessions, convert) -> int:
+    """Heap bytes held by the histories built from sessions."""
+    gc.collect()
+    tracemalloc.start()
+    histories = [convert([json.loads(line) for line in lines]) for lines in sessions]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del histories
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dict vs Message session history memory")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--turns", type=int, default=10, help="Turns of history per session")
+    args = parser.parse_args()
+
+    sessions = _lines(args.sessions, args.turns)
+    messages = args.sessions * args.turns * 2
+    scale = 1000 / args.sessions
+
+    as_dicts = measure(sessions, list)
+    as_messages = measure(sessions, compact)
+
+    print(f"{args.sessions} sessions x {args.turns} turns ({messages} messages)")
+    print(f"{'':<10} {'MB / 1k sessions':>18} {'bytes / message':>16}")
+    for label, size in (("dict", as_dicts), ("Message", as_messages)):
+        print(f"{label:<10} {size * scale / 1e6:>18.2f} {size / messages:>16.1f}")
+    saved = as_dicts - as_messages
+    print(f"saved      {saved * scale / 1e6:>18.2f} {saved / messages:>16.1f}  ({saved / as_dicts:.1%})")
+
+
+if __name__ == "__main__":
+    main()
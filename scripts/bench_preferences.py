@@ -0,0 +1,75 @@
+"""
+Benchmark preference extraction per turn against history length.
+
+For each history length, a session is pre-filled with that many turns and
+then extended turn by turn; the time of each extract_preferences call is
+measured. History is no longer joined every turn, so the cost should not
+grow with its length.
+
+Usage:
+    python scripts/bench_preferences.py
+    python scripts/bench_preferences.py --lengths 10 100 1000 10000 --turns 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.preference_extractor import PreferenceExtractor
+
+MESSAGES = [
+    "Can you write a function that parses this CSV file?",
+    "I prefer Python, and please keep it brief",
+    "Why does my Rust build fail with a linker error?",
+    "Explain in detail how the free tier limits work",
+    "Thanks, that worked. Now add unit tests.",
+    "I don't want any paid APIs in this project",
+]
+
+
+def _turn(rng: random.Random) -> list:
+    return [
+        {"role": "user", "content": rng.choice(MESSAGES)},
+        {"role": "assistant", "content": "Here is an answer. " * 20}
+    ]
+
+
+def bench(history_turns: int, turns: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    history = []
+    for _ in range(history_turns):
+        history.extend(_turn(rng))
+
+    samples = []
+    for _ in range(turns):
+        history.extend(_turn(rng))
+        start = time.perf_counter()
+        PreferenceExtractor.extract_preferences(history[-2]["content"], history)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "mean_us": statistics.mean(samples) * 1e6,
+        "p95_us": samples[int(len(samples) * 0.95) - 1] * 1e6
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-turn preference extraction")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 100, 1000, 10000],
+                        help="History lengths (turns) to measure at")
+    parser.add_argument("--turns", type=int, default=200, help="Turns measured per length")
+    args = parser.parse_args()
+
+    print(f"{'history':>8} {'mean us':>10} {'p95 us':>10}")
+    for length in args.lengths:
+        result = bench(length, args.turns)
+        print(f"{length:>8} {result['mean_us']:>10.1f} {result['p95_us']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark snapshot size and restore time against the per-file JSON layout.
+
+Seeds a FileStorage data directory with N sessions (each with a short
+history) and N/10 users with long-term facts, then measures:
+
+    json read       cold load of every session, history and fact file
+    snapshot write  one file via storage.snapshot.write_snapshot
+    snapshot read   decode every frame of that file
+    restore         load the snapshot into an empty file / SQLite backend
+
+Numbers are with a warm OS page cache; a cold disk widens the gap between
+many small reads and one sequential read.
+
+Usage:
+    python scripts/bench_snapshot.py --sessions 10000
+    python scripts/bench_snapshot.py --sessions 10000 --turns 10 --no-compress
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import FileStorage, SQLiteStorage
+from storage.snapshot import iter_snapshot, restore_snapshot, write_snapshot
+
+
+WORDS = (
+    "the a to of and in is it for on with this that you can use function data "
+    "error file python api request response server memory session user value "
+    "return list dict string build test run install config model token cache"
+).split()
+
+
+def _text(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def _dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def seed(data_dir: Path, n_sessions: int, turns: int, seed: int = 7):
+    rng = random.Random(seed)
+    storage = FileStorage(data_dir, fsync="never")
+    n_users = max(1, n_sessions // 10)
+    sessions = []
+    for i in range(n_sessions):
+        session_id = f"session_{i:016x}"
+        ts = f"2024-01-01T00:00:{i % 60:02d}.{i:06d}Z"
+        sessions.append({
+            "session_id": session_id, "user_id": f"user_{i % n_users}",
+            "created_at": ts, "last_activity": ts, "is_active": True, "metadata": {}
+        })
+        history = []
+        for t in range(turns):
+            history.append({"role": "user", "content": _text(rng, rng.randint(5, 40))})
+            history.append({"role": "assistant", "content": _text(rng, rng.randint(20, 160))})
+        storage.replace_history(session_id, history)
+    storage.save_sessions(sessions)
+    for u in range(n_users):
+        storage.update_long_term(f"user_{u}", {
+            "preferred_language": rng.choice(["Python", "Go", "Rust"]),
+            "communication_style": rng.choice(["brief", "detailed"]),
+        })
+    storage.close()
+
+
+def json_read(data_dir: Path) -> float:
+    start = time.perf_counter()
+    storage = FileStorage(data_dir, fsync="never")
+    for session_id in storage.load_sessions():
+        storage.load_history(session_id)
+        storage.load_summary(session_id)
+    for user_id in storage.list_long_term_users():
+        storage.load_long_term(user_id)
+    storage.close()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark snapshot vs per-file JSON")
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--turns", type=int, default=5, help="Turns of history per session")
+    parser.add_argument("--no-compress", action="store_true")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="atlus_snapshot_bench_"))
+    try:
+        data_dir = workdir / "data"
+        print(f"Seeding {args.sessions} sessions x {args.turns} turns...")
+        seed(data_dir, args.sessions, args.turns)
+        json_bytes = _dir_size(data_dir)
+        json_files = sum(1 for p in data_dir.rglob("*") if p.is_file())
+        json_seconds = json_read(data_dir)
+
+        snap_path = workdir / "atlus.snap"
+        source = FileStorage(data_dir, fsync="never")
+        written = write_snapshot(source, snap_path, compress=not args.no_compress)
+        source.close()
+
+        start = time.perf_counter()
+        frames = sum(1 for _ in iter_snapshot(snap_path))
+        read_seconds = time.perf_counter() - start
+
+        file_target = FileStorage(workdir / "restored", fsync="never")
+        file_restore = restore_snapshot(file_target, snap_path)
+        file_target.close()
+        sqlite_target = SQLiteStorage(workdir / "restored.db")
+        sqlite_restore = restore_snapshot(sqlite_target, snap_path)
+        sqlite_target.close()
+
+        print(f"{'':<22} {'size MB':>10} {'files':>8} {'seconds':>9}")
+        print(f"{'json layout read':<22} {json_bytes / 1e6:>10.2f} {json_files:>8} {json_seconds:>9.3f}")
+        print(f"{'snapshot write':<22} {written['bytes'] / 1e6:>10.2f} {1:>8} {written['seconds']:>9.3f}")
+        print(f"{'snapshot read':<22} {'':>10} {frames:>8} {read_seconds:>9.3f}")
+        print(f"{'restore -> file':<22} {'':>10} {'':>8} {file_restore['seconds']:>9.3f}")
+        print(f"{'restore -> sqlite':<22} {'':>10} {'':>8} {sqlite_restore['seconds']:>9.3f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark storage backends.
+
+Seeds N sessions spread over N/10 users, then times the operations the
+service performs per request: touching a session's last_activity,
+appending a turn, finding a user's latest session, and a cold load of all
+sessions (server start).
+
+Usage:
+    python scripts/bench_storage.py --sessions 100000
+    python scripts/bench_storage.py --sessions 100000 --backends sqlite --ops 2000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import FileStorage, SQLiteStorage
+
+
+def _make_backend(name: str, workdir: Path):
+    if name == "file":
+        return FileStorage(workdir / "file")
+    return SQLiteStorage(workdir / "sqlite" / "atlus.db")
+
+
+def _timed(fn, repeat: int) -> dict:
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "mean_ms": statistics.mean(samples) * 1000,
+        "p95_ms": samples[int(len(samples) * 0.95) - 1 if len(samples) > 1 else 0] * 1000
+    }
+
+
+def bench(name: str, n_sessions: int, ops: int, workdir: Path, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    backend = _make_backend(name, workdir)
+    n_users = max(1, n_sessions // 10)
+    session_ids = [f"session_{i:016x}" for i in range(n_sessions)]
+
+    start = time.perf_counter()
+    batch = []
+    for i, session_id in enumerate(session_ids):
+        ts = f"2024-01-01T00:00:{i % 60:02d}.{i:06d}Z"
+        batch.append({
+            "session_id": session_id, "user_id": f"user_{i % n_users}",
+            "created_at": ts, "last_activity": ts, "is_active": True, "metadata": {}
+        })
+        if len(batch) == 5000:
+            backend.save_sessions(batch)
+            batch = []
+    if batch:
+        backend.save_sessions(batch)
+    results = {"seed_s": time.perf_counter() - start}
+
+    def touch(i):
+        session = dict(backend.get_session(rng.choice(session_ids)))
+        session["last_activity"] = f"2025-01-01T00:00:00.{i:06d}Z"
+        backend.save_session(session)
+
+    def append(i):
+        backend.append_history(session_ids[i % 100], [
+            {"role": "user", "content": "hello " * 20},
+            {"role": "assistant", "content": "hi " * 80}
+        ])
+
+    def latest(i):
+        backend.list_user_sessions(f"user_{rng.randrange(n_users)}", limit=1)
+
+    results["touch"] = _timed(touch, ops)
+    results["append_turn"] = _timed(append, ops)
+    results["latest_session"] = _timed(latest, ops)
+
+    backend.close()
+    cold = _make_backend(name, workdir)
+    start = time.perf_counter()
+    cold.load_sessions()
+    results["cold_load_s"] = time.perf_counter() - start
+    cold.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark storage backends")
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=200, help="Timed operations per measurement")
+    parser.add_argument("--backends", nargs="+", default=["file", "sqlite"], choices=["file", "sqlite"])
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="atlus_bench_"))
+    try:
+        print(f"{args.sessions} sessions, {args.ops} ops per measurement\n")
+        print(f"{'backend':<8} {'seed s':>8} {'touch ms':>10} {'append ms':>10} {'latest ms':>10} {'cold load s':>12}")
+        for name in args.backends:
+            r = bench(name, args.sessions, args.ops, workdir)
+            print(
+                f"{name:<8} {r['seed_s']:>8.2f} {r['touch']['mean_ms']:>10.3f} "
+                f"{r['append_turn']['mean_ms']:>10.3f} {r['latest_session']['mean_ms']:>10.3f} "
+                f"{r['cold_load_s']:>12.2f}"
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Migrate the JSON file layout into a SQLite database.
+
+Reads data/sessions.json, history (data/history/{id}.jsonl or legacy
+data/session_{id}.json) and data/memory_{user}.json and writes them into
+the SQLite backend in batched transactions. Safe to re-run: sessions and
+facts are upserted, and history is replaced per session.
+
+Usage:
+    python scripts/migrate_json_to_sqlite.py
+    python scripts/migrate_json_to_sqlite.py --data-dir data --db data/atlus.db --batch-size 1000
+
+Then start the server with ATLUS_STORAGE_BACKEND=sqlite.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import FileStorage, SQLiteStorage
+
+
+def migrate(source: FileStorage, target: SQLiteStorage, batch_size: int = 1000) -> dict:
+    """Copy sessions, history and long-term memory. Returns counts."""
+    counts = {"sessions": 0, "histories": 0, "messages": 0, "users": 0, "facts": 0}
+
+    sessions = list(source.load_sessions().values())
+    for i in range(0, len(sessions), batch_size):
+        target.save_sessions(sessions[i:i + batch_size])
+    counts["sessions"] = len(sessions)
+
+    # History files can exist for sessions missing from sessions.json; keep them too
+    for session_id in source.list_history_sessions():
+        history = source.load_history(session_id)
+        if history:
+            target.replace_history(session_id, history)
+            counts["histories"] += 1
+            counts["messages"] += len(history)
+
+    for user_id in source.list_long_term_users():
+        facts = source.load_long_term(user_id)
+        if facts:
+            target.update_long_term(user_id, facts)
+            counts["users"] += 1
+            counts["facts"] += len(facts)
+
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate JSON session/memory files to SQLite")
+    parser.add_argument("--data-dir", type=Path, default=Path(os.getenv("ATLUS_DATA_DIR", "data")))
+    parser.add_argument("--db", type=Path, default=Path(os.getenv("ATLUS_SQLITE_PATH", "data/atlus.db")))
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    if not args.data_dir.exists():
+        print(f"Data directory not found: {args.data_dir}")
+        return 1
+
+    start = time.perf_counter()
+    target = SQLiteStorage(args.db)
+    try:
+        counts = migrate(FileStorage(args.data_dir), target, batch_size=args.batch_size)
+    finally:
+        target.close()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"Migrated {counts['sessions']} sessions, {counts['histories']} histories "
+        f"({counts['messages']} messages) and {counts['facts']} facts for {counts['users']} users "
+        f"to {args.db} in {elapsed:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
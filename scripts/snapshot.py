@@ -0,0 +1,72 @@
+"""
+Snapshot and restore session/memory state.
+
+Reads from (or writes to) the backend configured by ATLUS_STORAGE_BACKEND,
+ATLUS_DATA_DIR and ATLUS_SQLITE_PATH. Run against a stopped server, or use
+SnapshotService.create() in-process so pending background writes are
+included.
+
+Usage:
+    python scripts/snapshot.py create data/atlus.snap
+    python scripts/snapshot.py restore data/atlus.snap [--force]
+    python scripts/snapshot.py info data/atlus.snap
+
+To restore at server start instead, set ATLUS_RESTORE_SNAPSHOT=data/atlus.snap.
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import create_storage
+from storage.snapshot import END, SnapshotError, iter_snapshot, restore_snapshot, write_snapshot
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Snapshot or restore all session and memory state")
+    parser.add_argument("command", choices=["create", "restore", "info"])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--backend", help="file or sqlite (default: ATLUS_STORAGE_BACKEND)")
+    parser.add_argument("--no-compress", action="store_true", help="Write frames without zlib")
+    parser.add_argument("--force", action="store_true", help="Restore even if storage already holds sessions")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        try:
+            kinds = Counter()
+            end = {}
+            for kind, payload in iter_snapshot(args.path):
+                kinds[kind.decode()] += 1
+                if kind == END:
+                    end = payload.get("counts", {})
+        except SnapshotError as e:
+            print(e)
+            return 1
+        print(f"{args.path}: {args.path.stat().st_size} bytes, frames {dict(kinds)}, counts {end}")
+        return 0
+
+    storage = create_storage(args.backend)
+    try:
+        if args.command == "create":
+            result = write_snapshot(storage, args.path, compress=not args.no_compress)
+            print(f"Wrote {args.path}: {result}")
+        else:
+            if not args.force and storage.load_sessions():
+                print("Storage already holds sessions; pass --force to restore over it")
+                return 1
+            result = restore_snapshot(storage, args.path)
+            print(f"Restored {args.path}: {result}")
+    except SnapshotError as e:
+        print(e)
+        return 1
+    finally:
+        storage.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
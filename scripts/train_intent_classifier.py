@@ -0,0 +1,110 @@
+"""
+Train the local intent classifier.
+
+Combines the shipped labeled examples with classifier decisions logged by
+the Orchestrator, holds out a slice for evaluation, prints an evaluation
+report and saves the model where the Orchestrator loads it from.
+
+Usage:
+    python scripts/train_intent_classifier.py
+    python scripts/train_intent_classifier.py --decisions data/classifier_decisions.jsonl \
+        --min-llm-confidence 0.85 --report data/intent_classifier_report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm.intent_classifier import IntentClassifier, DEFAULT_LABELS, DEFAULT_MODEL_PATH, load_examples
+
+DEFAULT_EXAMPLES = Path(__file__).parent / "intent_examples.jsonl"
+DEFAULT_DECISIONS = Path("data/classifier_decisions.jsonl")
+
+
+def split_holdout(examples, every: int):
+    """Deterministic split: every Nth example goes to the evaluation set."""
+    if every <= 1:
+        return examples, examples
+    train = [ex for i, ex in enumerate(examples) if i % every != 0]
+    holdout = [ex for i, ex in enumerate(examples) if i % every == 0]
+    return train, holdout
+
+
+def format_report(report: dict) -> str:
+    """Render an evaluation report as plain text."""
+    lines = [
+        f"Examples:          {report['examples']}",
+        f"Accuracy:          {report['accuracy']:.3f}",
+        f"Coverage @ {report['min_confidence']:.2f}:  {report['coverage']:.3f} "
+        f"(accuracy on covered: {report['covered_accuracy']:.3f})",
+        f"Mean latency:      {report['mean_latency_us']:.1f} us/prediction",
+        "",
+        f"{'label':<10} {'precision':>9} {'recall':>7} {'f1':>6} {'support':>8}",
+    ]
+    for label, stats in report["per_label"].items():
+        lines.append(
+            f"{label:<10} {stats['precision']:>9.3f} {stats['recall']:>7.3f} "
+            f"{stats['f1']:>6.3f} {stats['support']:>8}"
+        )
+    labels = list(report["confusion"].keys())
+    lines += ["", "Confusion (rows = true, cols = predicted):", " " * 10 + "".join(f"{l:>10}" for l in labels)]
+    for true_label in labels:
+        row = report["confusion"][true_label]
+        lines.append(f"{true_label:<10}" + "".join(f"{row[p]:>10}" for p in labels))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the local intent classifier")
+    parser.add_argument("--examples", type=Path, default=DEFAULT_EXAMPLES,
+                        help="Labeled examples (JSONL with message/intent_type)")
+    parser.add_argument("--decisions", type=Path, default=DEFAULT_DECISIONS,
+                        help="Logged classifier LLM decisions (JSONL)")
+    parser.add_argument("--min-llm-confidence", type=float, default=0.8,
+                        help="Skip logged decisions below this confidence")
+    parser.add_argument("--output", type=Path, default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--report", type=Path, default=None, help="Also write the report as JSON")
+    parser.add_argument("--holdout-every", type=int, default=5,
+                        help="Every Nth example is held out for evaluation (1 = evaluate on training data)")
+    parser.add_argument("--min-confidence", type=float,
+                        default=float(os.getenv("ATLUS_CLASSIFIER_MIN_CONFIDENCE", "0.75")),
+                        help="Confidence below which the Orchestrator defers to the LLM")
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--learning-rate", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    examples = load_examples(args.examples)
+    decisions = load_examples(args.decisions, min_confidence=args.min_llm_confidence)
+    print(f"Loaded {len(examples)} labeled examples and {len(decisions)} logged decisions")
+
+    dataset = examples + decisions
+    if not dataset:
+        print("No training data found")
+        return 1
+
+    seen = {label for _, label in dataset}
+    labels = [l for l in DEFAULT_LABELS if l in seen] + sorted(seen - set(DEFAULT_LABELS))
+    train, holdout = split_holdout(dataset, args.holdout_every)
+
+    # Evaluate a model trained without the holdout, then ship one trained on everything
+    model = IntentClassifier(labels=labels).fit(train, epochs=args.epochs, learning_rate=args.learning_rate)
+    report = model.evaluate(holdout, min_confidence=args.min_confidence)
+    print(format_report(report))
+
+    final = IntentClassifier(labels=labels).fit(dataset, epochs=args.epochs, learning_rate=args.learning_rate)
+    final.save(args.output)
+    print(f"\nSaved model ({final.n_examples} examples) to {args.output}")
+
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved report to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Storage package.
+Persistence and residency management for sessions and memory.
+"""
+
+import atexit
+import os
+import threading
+from pathlib import Path
+
+from storage.base import StorageBackend
+from storage.fact_batcher import FactBatcher
+from storage.file_lock import FileLock, LockTimeout
+from storage.file_storage import FileStorage
+from storage.ingest_queue import IngestQueue
+from storage.inprocess_redis import InProcessRedis
+from storage.redis_storage import RedisStorage
+from storage.sqlite_storage import SQLiteStorage
+from storage.registry import MemoryRegistry, RegistrySweeper
+from storage.turn_log import TurnLog
+from storage.write_behind import WriteBehind
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def create_storage(backend: str = None) -> StorageBackend:
+    """
+    Create a storage backend.
+
+    Args:
+        backend: "file", "sqlite" or "redis" (default: ATLUS_STORAGE_BACKEND, else "file")
+    """
+    backend = (backend or os.getenv("ATLUS_STORAGE_BACKEND", "file")).lower()
+    if backend == "file":
+        return FileStorage(
+            Path(os.getenv("ATLUS_DATA_DIR", "data")),
+            fsync=os.getenv("ATLUS_HISTORY_FSYNC", "interval")
+        )
+    if backend == "sqlite":
+        return SQLiteStorage(Path(os.getenv("ATLUS_SQLITE_PATH", "data/atlus.db")))
+    if backend == "redis":
+        return RedisStorage.from_url(
+            os.getenv("ATLUS_REDIS_URL", "redis://localhost:6379/0"),
+            prefix=os.getenv("ATLUS_REDIS_PREFIX", "atlus:")
+        )
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def get_storage() -> StorageBackend:
+    """Process-wide storage backend, created on first use."""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_storage()
+                atexit.register(_storage.close)
+    return _storage
+
+
+__all__ = [
+    "StorageBackend",
+    "FactBatcher",
+    "FileLock",
+    "FileStorage",
+    "IngestQueue",
+    "InProcessRedis",
+    "LockTimeout",
+    "RedisStorage",
+    "SQLiteStorage",
+    "MemoryRegistry",
+    "RegistrySweeper",
+    "TurnLog",
+    "WriteBehind",
+    "create_storage",
+    "get_storage",
+]
@@ -0,0 +1,148 @@
+"""
+Storage backend interface.
+
+A backend persists the three kinds of durable state the service keeps:
+session records (SessionService), conversation history per session and
+long-term facts per user (MemoryService).
+"""
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class StorageBackend(ABC):
+    """
+    Base class for storage backends.
+
+    Session records are plain dicts with the keys SessionService writes:
+    session_id, user_id, created_at, last_activity, is_active, metadata.
+    History messages are {"role", "content"} dicts in conversation order.
+    """
+
+    name = "base"
+
+    # True when LongTermMemory already persists to this backend's layout on
+    # its own (data/memory_{user_id}.json); otherwise MemoryService keeps
+    # long-term facts in the backend only and writes just the changed keys
+    NATIVE_LONG_TERM = False
+
+    # True when several processes share this backend's state, so a worker's
+    # in-memory copy of a session may be stale and must be re-read
+    SHARED = False
+
+    # ==========================================================
+    # SESSIONS
+    # ==========================================================
+    @abstractmethod
+    def load_sessions(self) -> Dict[str, Dict]:
+        """Return every session record keyed by session_id."""
+
+    @abstractmethod
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        """Return one session record, or None."""
+
+    @abstractmethod
+    def save_session(self, session: Dict):
+        """Insert or replace one session record."""
+
+    def save_sessions(self, sessions: Iterable[Dict]):
+        """Insert or replace many session records (one transaction where supported)."""
+        for session in sessions:
+            self.save_session(session)
+
+    @abstractmethod
+    def delete_session(self, session_id: str) -> bool:
+        """Delete a session record and its history. Returns False if it did not exist."""
+
+    @abstractmethod
+    def list_user_sessions(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        active_only: bool = True,
+        after: Optional[Tuple[str, str]] = None
+    ) -> List[Dict]:
+        """
+        Return a user's sessions, most recent activity first (ties by session id,
+        descending).
+
+        after: (last_activity, session_id) of the last session already seen;
+            only sessions ordered after it are returned. Unlike offset, this
+            keyset cursor does not skip sessions when earlier ones drop out of
+            the active list between pages.
+        """
+
+    def count_user_sessions(self, user_id: str, active_only: bool = True) -> int:
+        """Number of sessions list_user_sessions would return without a limit."""
+        return len(self.list_user_sessions(user_id, active_only=active_only))
+
+    # ==========================================================
+    # HISTORY
+    # ==========================================================
+    @abstractmethod
+    def load_history(self, session_id: str, last_n: Optional[int] = None) -> List[Dict]:
+        """Return a session's messages (only the last last_n if given)."""
+
+    @abstractmethod
+    def append_history(self, session_id: str, messages: List[Dict]):
+        """Append messages to a session's history."""
+
+    @abstractmethod
+    def replace_history(self, session_id: str, messages: List[Dict]):
+        """Overwrite a session's history."""
+
+    def history_length(self, session_id: str) -> int:
+        """Number of stored messages for a session."""
+        return len(self.load_history(session_id))
+
+    def delete_history(self, session_id: str):
+        """Forget a session's history (and its summary)."""
+        self.replace_history(session_id, [])
+
+    def list_history_sessions(self) -> List[str]:
+        """Ids of every session that may have stored history."""
+        return list(self.load_sessions())
+
+    @abstractmethod
+    def load_summary(self, session_id: str) -> Optional[Dict]:
+        """Return the session's rolling summary ({"text", "covered"}), or None."""
+
+    @abstractmethod
+    def save_summary(self, session_id: str, summary: Dict):
+        """Store the session's rolling summary."""
+
+    # ==========================================================
+    # LONG-TERM MEMORY
+    # ==========================================================
+    @abstractmethod
+    def load_long_term(self, user_id: str) -> Dict:
+        """Return a user's long-term facts."""
+
+    @abstractmethod
+    def update_long_term(self, user_id: str, facts: Dict):
+        """Merge facts into a user's long-term memory."""
+
+    @abstractmethod
+    def delete_long_term(self, user_id: str, keys: Optional[Iterable[str]] = None):
+        """Forget the given facts for a user, or everything when keys is None."""
+
+    def list_long_term_users(self) -> List[str]:
+        """Ids of every user that may have long-term facts."""
+        return sorted({s.get("user_id", "default_user") for s in self.load_sessions().values()})
+
+    # ==========================================================
+    # LIFECYCLE
+    # ==========================================================
+    @contextmanager
+    def bulk(self):
+        """Group many writes (e.g. a restore) into one transaction where supported."""
+        yield
+
+    def stats(self) -> Dict:
+        return {"backend": self.name}
+
+    def close(self):
+        """Release connections and file handles."""
+        pass
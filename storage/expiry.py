@@ -0,0 +1,186 @@
+"""
+Expiry queue and background sweeper.
+
+ExpiryQueue is a min-heap of (deadline, key) with lazy invalidation:
+rescheduling a key pushes a new entry and the old one is skipped when it
+surfaces, so touch, cancel and "what expired?" are all O(log n).
+ExpirySweeper drains it on a background thread in bounded batches.
+"""
+
+import heapq
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+
+class ExpiryQueue:
+    """
+    Keys with deadlines (epoch seconds).
+
+    Usage:
+        queue = ExpiryQueue()
+        queue.schedule("session_1", time.time() + ttl)
+        queue.pop_expired(time.time(), limit=100)  # ["session_1", ...]
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, str]] = []
+        self._deadlines: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def schedule(self, key: str, deadline: float):
+        """Set (or move) the deadline for key."""
+        with self._lock:
+            self._deadlines[key] = deadline
+            heapq.heappush(self._heap, (deadline, key))
+            # Stale entries pile up when keys are touched often; rebuild now and then
+            if len(self._heap) > 2 * len(self._deadlines) + 1024:
+                self._heap = [(d, k) for k, d in self._deadlines.items()]
+                heapq.heapify(self._heap)
+
+    def cancel(self, key: str) -> bool:
+        with self._lock:
+            return self._deadlines.pop(key, None) is not None
+
+    def deadline(self, key: str) -> Optional[float]:
+        with self._lock:
+            return self._deadlines.get(key)
+
+    def is_expired(self, key: str, now: float = None) -> bool:
+        with self._lock:
+            deadline = self._deadlines.get(key)
+        return deadline is not None and deadline <= (time.time() if now is None else now)
+
+    def pop_expired(self, now: float = None, limit: int = None) -> List[str]:
+        """Remove and return up to limit keys whose deadline has passed, earliest first."""
+        now = time.time() if now is None else now
+        expired = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                if limit is not None and len(expired) >= limit:
+                    break
+                deadline, key = heapq.heappop(self._heap)
+                if self._deadlines.get(key) != deadline:
+                    continue  # rescheduled or cancelled since this entry was pushed
+                del self._deadlines[key]
+                expired.append(key)
+        return expired
+
+    def next_deadline(self) -> Optional[float]:
+        with self._lock:
+            while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+            self._deadlines.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._deadlines)
+
+
+class ExpirySweeper:
+    """
+    Background thread that expires keys from an ExpiryQueue.
+
+    Each sweep pops expired keys in batches of batch_size and calls
+    on_expire for each; between batches the queue lock is released so
+    request threads are never blocked for long.
+
+    Args:
+        name: Used in logs, stats and the thread name
+        queue: Queue to drain
+        on_expire: Called with each expired key; returns True if it reclaimed
+            the key, False if there was nothing to do (touched again, already gone)
+        interval: Seconds between sweeps
+        batch_size: Keys expired per batch
+    """
+
+    def __init__(
+        self,
+        name: str,
+        queue: ExpiryQueue,
+        on_expire: Callable[[str], bool],
+        interval: float = 60.0,
+        batch_size: int = 200
+    ):
+        self.name = name
+        self.queue = queue
+        self.on_expire = on_expire
+        self.interval = interval
+        self.batch_size = batch_size
+        self.logger = get_logger("atlus.storage.expiry")
+
+        self._stopped = threading.Event()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self._sweeps = 0
+        self._reclaimed_total = 0
+        self._last_reclaimed = 0
+        self._skipped_total = 0
+        self._last_sweep_ms = 0.0
+        self._errors = 0
+
+    def start(self) -> "ExpirySweeper":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name=f"expiry-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def sweep(self, now: float = None) -> int:
+        """Expire everything due now. Returns how many keys were reclaimed."""
+        start = time.perf_counter()
+        reclaimed = skipped = 0
+        while True:
+            batch = self.queue.pop_expired(now, limit=self.batch_size)
+            for key in batch:
+                try:
+                    if self.on_expire(key):
+                        reclaimed += 1
+                    else:
+                        skipped += 1
+                except Exception as e:
+                    with self._stats_lock:
+                        self._errors += 1
+                    self.logger.warning(f"Failed to expire {self.name} {key}: {e}")
+            if len(batch) < self.batch_size:
+                break
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            self._sweeps += 1
+            self._last_reclaimed = reclaimed
+            self._reclaimed_total += reclaimed
+            self._skipped_total += skipped
+            self._last_sweep_ms = elapsed_ms
+        if reclaimed:
+            self.logger.info(f"Expiry sweep reclaimed {reclaimed} {self.name}(s) in {elapsed_ms:.1f}ms")
+        return reclaimed
+
+    def _loop(self):
+        while not self._stopped.wait(self.interval):
+            self.sweep()
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            return {
+                "name": self.name,
+                "scheduled": len(self.queue),
+                "sweeps": self._sweeps,
+                "last_reclaimed": self._last_reclaimed,
+                "reclaimed_total": self._reclaimed_total,
+                "skipped_total": self._skipped_total,
+                "last_sweep_ms": round(self._last_sweep_ms, 3),
+                "errors": self._errors
+            }
@@ -0,0 +1,196 @@
+"""
+Coalescing batcher for long-term fact updates.
+
+Preference extraction can produce several facts per turn, and a user with
+several sessions can produce updates in quick succession. Each update used
+to rewrite the user's memory file. Here updates are merged per user and
+applied with one call once the user has been quiet for the window (or the
+oldest pending update reaches max_delay), and values that would not change
+anything are dropped before they are queued.
+
+Pending facts are visible through pending() so readers can overlay them
+until they are written.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from utils.logger import get_logger
+
+_MISSING = object()
+
+
+class FactBatcher:
+    """
+    Per-user write coalescing.
+
+    Args:
+        name: Used in logs, stats and the thread name
+        apply_fn: apply_fn(user_id, facts) writes one user's merged changes
+        window: Seconds without new updates before a user's batch is applied
+            (0 applies every update immediately, still skipping unchanged values)
+        max_delay: Upper bound on how long a pending fact waits
+
+    Usage:
+        batcher = FactBatcher("long_term", apply_fn, window=0.5).start()
+        batcher.update(user_id, {"preferred_language": "Python"}, current=facts)
+        ...
+        batcher.close()  # final flush
+    """
+
+    def __init__(self, name: str, apply_fn: Callable[[str, Dict], None], window: float = 0.5, max_delay: float = 5.0):
+        self.name = name
+        self.apply_fn = apply_fn
+        self.window = window
+        self.max_delay = max_delay
+        self.logger = get_logger("atlus.storage.fact_batcher")
+
+        # Per user: merged pending facts, and when the first and latest were queued
+        self._pending: Dict[str, Dict] = {}
+        self._first: Dict[str, float] = {}
+        self._last: Dict[str, float] = {}
+        # Batches being written stay visible to pending() until the write lands
+        self._applying: Dict[str, Dict] = {}
+        self._cond = threading.Condition()
+        # Held while a batch is being applied so flush()/discard() see a settled state
+        self._apply_lock = threading.RLock()
+        self._stopped = False
+        self._thread = None
+
+        self._updates = 0
+        self._queued = 0
+        self._unchanged = 0
+        self._coalesced = 0
+        self._batches = 0
+        self._failures = 0
+
+    def start(self) -> "FactBatcher":
+        if self._thread is None and self.window > 0:
+            self._thread = threading.Thread(target=self._loop, name=f"fact-batcher-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def update(self, user_id: str, facts: Dict, current: Optional[Dict] = None) -> Dict:
+        """
+        Queue facts for user_id, dropping values equal to what is already
+        stored (current) or pending. Returns the facts that were queued.
+        """
+        current = current or {}
+        with self._cond:
+            self._updates += 1
+            pending = self._pending.get(user_id, {})
+            changes = {}
+            for key, value in facts.items():
+                known = pending.get(key, current.get(key, _MISSING))
+                if known is not _MISSING and known == value:
+                    self._unchanged += 1
+                else:
+                    changes[key] = value
+            if not changes:
+                return {}
+            self._coalesced += sum(1 for key in changes if key in pending)
+            self._queued += len(changes)
+            now = time.monotonic()
+            self._pending[user_id] = {**pending, **changes}
+            self._first.setdefault(user_id, now)
+            self._last[user_id] = now
+            self._cond.notify()
+        if self.window <= 0 or self._thread is None:
+            self.flush(user_id)
+        return changes
+
+    def pending(self, user_id: str) -> Dict:
+        """Facts queued for user_id and not yet applied."""
+        with self._cond:
+            return {**self._applying.get(user_id, {}), **self._pending.get(user_id, {})}
+
+    def discard(self, user_id: str, key: str):
+        """Drop a pending fact (e.g. it was deleted), waiting out any in-flight batch."""
+        with self._apply_lock:
+            with self._cond:
+                facts = self._pending.get(user_id)
+                if facts is not None:
+                    facts.pop(key, None)
+
+    def flush(self, user_id: Optional[str] = None) -> int:
+        """Apply pending batches now (one user, or all). Returns the number applied."""
+        with self._cond:
+            users = [user_id] if user_id is not None else list(self._pending)
+        return sum(self._apply(u) for u in users)
+
+    def close(self):
+        """Stop the background thread and apply what is left."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=max(self.window, 1.0) * 5)
+            self._thread = None
+        self.flush()
+
+    def _apply(self, user_id: str) -> int:
+        with self._apply_lock:
+            with self._cond:
+                facts = self._pending.pop(user_id, None)
+                self._first.pop(user_id, None)
+                self._last.pop(user_id, None)
+                if facts:
+                    self._applying[user_id] = facts
+            if not facts:
+                return 0
+            try:
+                self.apply_fn(user_id, facts)
+            except Exception as e:
+                # Keep the batch for the next attempt unless newer values arrived meanwhile
+                with self._cond:
+                    self._applying.pop(user_id, None)
+                    self._pending[user_id] = {**facts, **self._pending.get(user_id, {})}
+                    self._first.setdefault(user_id, time.monotonic())
+                    self._last.setdefault(user_id, time.monotonic())
+                    self._failures += 1
+                self.logger.error(f"Applying {len(facts)} {self.name} fact(s) for {user_id} failed: {e}")
+                return 0
+            with self._cond:
+                self._applying.pop(user_id, None)
+                self._batches += 1
+            return 1
+
+    def _due(self, now: float):
+        """(users whose batch is due, seconds until the next one is)."""
+        due, wait = [], None
+        for user_id, last in self._last.items():
+            deadline = min(last + self.window, self._first[user_id] + self.max_delay)
+            if deadline <= now:
+                due.append(user_id)
+            else:
+                wait = deadline - now if wait is None else min(wait, deadline - now)
+        return due, wait
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    due, wait = self._due(time.monotonic())
+                    if due:
+                        break
+                    self._cond.wait(wait)
+            for user_id in due:
+                self._apply(user_id)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "name": self.name,
+                "window_seconds": self.window,
+                "pending_users": len(self._pending),
+                "pending_facts": sum(len(facts) for facts in self._pending.values()),
+                "updates": self._updates,
+                "queued": self._queued,
+                "unchanged_skipped": self._unchanged,
+                "coalesced": self._coalesced,
+                "batches": self._batches,
+                "failures": self._failures
+            }
@@ -0,0 +1,203 @@
+"""
+Cross-process file locking and atomic file writes.
+
+The API server and the run.py CLI can share one data/ directory, so every
+read-modify-write of a JSON file there happens under an advisory fcntl lock
+on a sidecar lock file, and every write goes to a unique temp file that is
+fsynced and renamed over the target. Readers never see a torn file and a
+crash mid-write leaves the previous version in place.
+
+Files that still fail to parse are moved aside (quarantine) instead of being
+silently replaced by an empty default on the next write.
+
+fcntl is POSIX-only; elsewhere FileLock degrades to an in-process lock.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from utils.logger import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = get_logger("atlus.storage.lock")
+
+DEFAULT_TIMEOUT_SECONDS = float(os.getenv("ATLUS_FILE_LOCK_TIMEOUT", "10"))
+
+_stats_lock = threading.Lock()
+_stats = {"acquired": 0, "contended": 0, "timeouts": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0}
+
+
+class LockTimeout(TimeoutError):
+    """Another process held the lock for longer than the timeout."""
+
+
+def lock_stats() -> Dict:
+    """Process-wide lock contention counters."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["contention_rate"] = round(stats["contended"] / stats["acquired"], 4) if stats["acquired"] else 0.0
+    stats["wait_ms_total"] = round(stats["wait_ms_total"], 2)
+    stats["wait_ms_max"] = round(stats["wait_ms_max"], 2)
+    stats["fcntl"] = fcntl is not None
+    return stats
+
+
+def _record(waited_ms: float, contended: bool, timed_out: bool = False):
+    with _stats_lock:
+        if timed_out:
+            _stats["timeouts"] += 1
+        else:
+            _stats["acquired"] += 1
+        if contended:
+            _stats["contended"] += 1
+            _stats["wait_ms_total"] += waited_ms
+            _stats["wait_ms_max"] = max(_stats["wait_ms_max"], waited_ms)
+
+
+class FileLock:
+    """
+    Exclusive advisory lock on a lock file, re-entrant within a thread.
+
+    Threads of one process serialize on an RLock first, so only one flock
+    per FileLock is held at a time; other processes wait on the flock.
+
+    Args:
+        path: Lock file (created if missing, never deleted)
+        timeout: Seconds to wait before raising LockTimeout
+
+    Usage:
+        with FileLock(Path("data/.locks/sessions.json.lock")):
+            ...read, modify, atomic_write...
+    """
+
+    def __init__(self, path: Union[str, Path], timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self):
+        start = time.monotonic()
+        contended = False
+        if not self._thread_lock.acquire(blocking=False):
+            # Another thread of this process holds it
+            contended = True
+            if not self._thread_lock.acquire(timeout=self.timeout):
+                _record((time.monotonic() - start) * 1000, True, timed_out=True)
+                raise LockTimeout(f"Timed out after {self.timeout}s waiting for {self.path}")
+        if self._depth:
+            self._depth += 1
+            return
+        try:
+            contended = self._flock(start) or contended
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._depth = 1
+        waited_ms = (time.monotonic() - start) * 1000
+        _record(waited_ms, contended)
+        if contended:
+            logger.debug(f"Waited {waited_ms:.1f}ms for {self.path.name}")
+
+    def _flock(self, start: float) -> bool:
+        """Take the flock; returns True if another process held it."""
+        if fcntl is None:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        delay = 0.001
+        contended = False
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    contended = True
+                    if time.monotonic() - start >= self.timeout:
+                        _record((time.monotonic() - start) * 1000, True, timed_out=True)
+                        raise LockTimeout(f"Timed out after {self.timeout}s waiting for {self.path}")
+                    time.sleep(delay)
+                    delay = min(delay * 2, 0.05)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        return contended
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fd, self._fd = self._fd, None
+            try:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            finally:
+                os.close(fd)
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def atomic_write(path: Union[str, Path], data: Union[str, bytes], fsync: bool = True):
+    """
+    Replace path with data via a unique temp file in the same directory.
+
+    Concurrent writers never share a temp file, and with fsync the new
+    contents are on disk before the rename makes them visible.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            if fsync:
+                os.fsync(fh.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+
+def quarantine(path: Union[str, Path], reason: str = "") -> Optional[Path]:
+    """
+    Move an unreadable file aside as {name}.corrupt-{timestamp} so it can be
+    inspected, and so the next write does not silently overwrite it.
+    """
+    path = Path(path)
+    target = path.with_name(f"{path.name}.corrupt-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}")
+    try:
+        os.replace(path, target)
+    except FileNotFoundError:
+        return None
+    logger.error(f"Moved unreadable {path} to {target.name}{': ' + reason if reason else ''}")
+    return target
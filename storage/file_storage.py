@@ -0,0 +1,275 @@
+"""
+JSON file storage backend.
+
+Keeps the original on-disk layout:
+
+    data/sessions.json              all session records
+    data/session_{session_id}.json  {"session_id", "history"} per session (legacy)
+    data/memory_{user_id}.json      flat dict of long-term facts per user
+    data/summaries/{session_id}.json rolling history summary per session
+
+except that history is written to an append-only log per session
+(data/history/{session_id}.jsonl, see storage.turn_log); legacy session
+files are still read and are moved into the log on the first append.
+
+Session and memory files are rewritten whole on every change, so cost grows
+with the size of that file. Kept as the default for small deployments and as
+the source layout for scripts/migrate_json_to_sqlite.py.
+
+Several processes (API server, run.py CLI) may share one data directory:
+read-modify-write cycles hold an fcntl lock (data/.locks/), writes are
+atomic renames, and sessions.json is re-read when another process changed
+it. A file that does not parse is moved aside rather than overwritten.
+"""
+
+import json
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from storage.base import StorageBackend
+from storage.file_lock import DEFAULT_TIMEOUT_SECONDS, FileLock, atomic_write, lock_stats, quarantine
+from storage.turn_log import TurnLog
+from utils.logger import get_logger
+
+# History and memory files share this many lock files per kind
+LOCK_STRIPES = 64
+
+
+def _write_json(path: Path, data, indent: Optional[int] = 2, fsync: bool = True):
+    """Write JSON via a unique temp file and rename, so readers never see a partial file."""
+    atomic_write(path, json.dumps(data, indent=indent), fsync=fsync)
+
+
+def _read_json(path: Path, default):
+    """Read a JSON file; one that does not parse is quarantined and read as default."""
+    for attempt in range(2):
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except OSError:
+            return default
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            if attempt == 0:
+                # Writers outside this module may not rename atomically yet
+                time.sleep(0.05)
+                continue
+            quarantine(path, str(e))
+            return default
+
+
+def _file_signature(path: Path):
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class FileStorage(StorageBackend):
+    """
+    JSON file backend.
+
+    Args:
+        data_dir: Directory holding the JSON files
+        fsync: History log fsync policy ("always", "interval" or "never");
+            JSON files are fsynced before rename unless "never"
+        lock_timeout: Seconds to wait for another process's file lock
+    """
+
+    name = "file"
+    NATIVE_LONG_TERM = True
+
+    def __init__(self, data_dir: Path = Path("data"), fsync: str = "interval", lock_timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        self.data_dir = Path(data_dir)
+        self.sessions_file = self.data_dir / "sessions.json"
+        self.turn_log = TurnLog(self.data_dir / "history", fsync=fsync)
+        self.fsync_json = fsync != "never"
+        self.lock_timeout = lock_timeout
+        self.logger = get_logger("atlus.storage.file")
+        self._lock = threading.RLock()
+        self._sessions: Optional[Dict[str, Dict]] = None
+        self._sessions_signature = None
+        self._file_locks: Dict[str, FileLock] = {}
+
+    # ==========================================================
+    # PATHS
+    # ==========================================================
+    def session_path(self, session_id: str) -> Path:
+        return self.data_dir / f"session_{session_id}.json"
+
+    def memory_path(self, user_id: str) -> Path:
+        return self.data_dir / f"memory_{user_id}.json"
+
+    def summary_path(self, session_id: str) -> Path:
+        return self.data_dir / "summaries" / f"{session_id}.json"
+
+    def _file_lock(self, kind: str, key: Optional[str] = None) -> FileLock:
+        """Cross-process lock for sessions.json, or one of LOCK_STRIPES per kind keyed by id."""
+        name = kind if key is None else f"{kind}-{zlib.crc32(key.encode('utf-8')) % LOCK_STRIPES}"
+        with self._lock:
+            lock = self._file_locks.get(name)
+            if lock is None:
+                lock = self._file_locks[name] = FileLock(self.data_dir / ".locks" / f"{name}.lock", self.lock_timeout)
+            return lock
+
+    # ==========================================================
+    # SESSIONS
+    # ==========================================================
+    def _all_sessions(self) -> Dict[str, Dict]:
+        # Re-read when another process has replaced the file since we last saw it
+        signature = _file_signature(self.sessions_file)
+        if self._sessions is None or signature != self._sessions_signature:
+            data = _read_json(self.sessions_file, {})
+            self._sessions = data if isinstance(data, dict) else {}
+            self._sessions_signature = _file_signature(self.sessions_file)
+        return self._sessions
+
+    def _flush_sessions(self):
+        # Compact JSON: this file holds every session and is rewritten per batch
+        _write_json(self.sessions_file, self._all_sessions(), indent=None, fsync=self.fsync_json)
+        self._sessions_signature = _file_signature(self.sessions_file)
+
+    def load_sessions(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {session_id: dict(s) for session_id, s in self._all_sessions().items()}
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        with self._lock:
+            session = self._all_sessions().get(session_id)
+            return dict(session) if session is not None else None
+
+    def save_session(self, session: Dict):
+        self.save_sessions([session])
+
+    def save_sessions(self, sessions):
+        # Store copies so callers can keep mutating their dicts while we serialize
+        with self._lock, self._file_lock("sessions"):
+            all_sessions = self._all_sessions()
+            for session in sessions:
+                all_sessions[session["session_id"]] = dict(session)
+            self._flush_sessions()
+
+    def delete_session(self, session_id: str) -> bool:
+        with self._lock, self._file_lock("sessions"):
+            existed = self._all_sessions().pop(session_id, None) is not None
+            if existed:
+                self._flush_sessions()
+        self.delete_history(session_id)
+        return existed
+
+    def list_user_sessions(self, user_id: str, limit: int = None, offset: int = 0, active_only: bool = True,
+                           after: Tuple[str, str] = None) -> List[Dict]:
+        with self._lock:
+            sessions = [
+                s for s in self._all_sessions().values()
+                if s.get("user_id") == user_id and (not active_only or s.get("is_active", True))
+            ]
+        if after is not None:
+            sessions = [s for s in sessions if (s.get("last_activity", ""), s["session_id"]) < tuple(after)]
+        sessions.sort(key=lambda s: (s.get("last_activity", ""), s["session_id"]), reverse=True)
+        end = offset + limit if limit is not None else None
+        return sessions[offset:end]
+
+    # ==========================================================
+    # HISTORY
+    # ==========================================================
+    def _legacy_history(self, session_id: str) -> List[Dict]:
+        data = _read_json(self.session_path(session_id), {})
+        return data.get("history", []) if isinstance(data, dict) else []
+
+    def load_history(self, session_id: str, last_n: int = None) -> List[Dict]:
+        if self.turn_log.exists(session_id):
+            if last_n:
+                return self.turn_log.tail(session_id, last_n)
+            # A full read may compact the log, which must not race another process's append
+            with self._file_lock("history", session_id):
+                return self.turn_log.read(session_id)
+        history = self._legacy_history(session_id)
+        return history[-last_n:] if last_n else history
+
+    def history_length(self, session_id: str) -> int:
+        if self.turn_log.exists(session_id):
+            # A log from before lines carried their position is read in full, which may compact it
+            with self._file_lock("history", session_id):
+                return self.turn_log.count(session_id)
+        return len(self._legacy_history(session_id))
+
+    def append_history(self, session_id: str, messages: List[Dict]):
+        with self._lock, self._file_lock("history", session_id):
+            if not self.turn_log.exists(session_id):
+                # First write since the legacy layout: carry its history into the log
+                messages = self._legacy_history(session_id) + list(messages)
+            self.turn_log.append(session_id, messages)
+
+    def replace_history(self, session_id: str, messages: List[Dict]):
+        with self._file_lock("history", session_id):
+            self.turn_log.replace(session_id, list(messages))
+
+    def delete_history(self, session_id: str):
+        with self._file_lock("history", session_id):
+            self.turn_log.delete(session_id)
+            for path in (self.session_path(session_id), self.summary_path(session_id)):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def list_history_sessions(self) -> List[str]:
+        # History can exist for sessions missing from sessions.json (and in legacy files)
+        session_ids = {path.stem[len("session_"):] for path in self.data_dir.glob("session_*.json")}
+        session_ids.update(self.turn_log.session_ids())
+        return sorted(session_ids)
+
+    def load_summary(self, session_id: str) -> Optional[Dict]:
+        data = _read_json(self.summary_path(session_id), None)
+        return data if isinstance(data, dict) else None
+
+    def save_summary(self, session_id: str, summary: Dict):
+        _write_json(self.summary_path(session_id), summary, indent=None, fsync=self.fsync_json)
+
+    # ==========================================================
+    # LONG-TERM MEMORY
+    # ==========================================================
+    def load_long_term(self, user_id: str) -> Dict:
+        data = _read_json(self.memory_path(user_id), {})
+        return data if isinstance(data, dict) else {}
+
+    def list_long_term_users(self) -> List[str]:
+        return sorted(path.stem[len("memory_"):] for path in self.data_dir.glob("memory_*.json"))
+
+    def update_long_term(self, user_id: str, facts: Dict):
+        with self._lock, self._file_lock("memory", user_id):
+            data = self.load_long_term(user_id)
+            data.update(facts)
+            _write_json(self.memory_path(user_id), data, fsync=self.fsync_json)
+
+    def delete_long_term(self, user_id: str, keys: Optional[List[str]] = None):
+        with self._lock, self._file_lock("memory", user_id):
+            if keys is not None:
+                data = self.load_long_term(user_id)
+                removed = [key for key in keys if key in data]
+                for key in removed:
+                    del data[key]
+                if removed:
+                    _write_json(self.memory_path(user_id), data, fsync=self.fsync_json)
+                return
+            try:
+                self.memory_path(user_id).unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "backend": self.name,
+                "data_dir": str(self.data_dir),
+                "sessions": len(self._all_sessions()),
+                "history_log": self.turn_log.stats(),
+                "file_locks": lock_stats()
+            }
+
+    def close(self):
+        self.turn_log.close()
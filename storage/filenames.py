@@ -0,0 +1,48 @@
+"""
+Per-key file names.
+
+Session and user ids become file names for spill files, history logs and
+fact indexes. The mapping has to be injective: sanitising unsafe characters
+("alice@corp.com" -> "alice_corp.com") would let two ids share one file
+and hand one user's data to the other.
+
+    safe ids        kept as they are ("sess_1a2b3c")
+    other ids       "~" + URL-safe base64 of the UTF-8 id (reversible)
+    very long ids   "~~" + sha256 hex of the id (not reversible)
+
+Safe ids never contain "~", so the three forms cannot collide.
+"""
+
+import base64
+import binascii
+import hashlib
+import re
+from typing import Optional
+
+_SAFE_KEY_RE = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]*")
+
+# Leaves room for a suffix and temp-file decoration within the usual 255-byte limit
+MAX_NAME_LENGTH = 160
+
+
+def key_to_filename(key: str) -> str:
+    """File name stem for key; distinct keys always get distinct stems."""
+    if len(key) <= MAX_NAME_LENGTH and _SAFE_KEY_RE.fullmatch(key):
+        return key
+    encoded = base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii").rstrip("=")
+    if len(encoded) < MAX_NAME_LENGTH:
+        return f"~{encoded}"
+    return f"~~{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+
+def filename_to_key(stem: str) -> Optional[str]:
+    """Key for a stem made by key_to_filename, or None for hashed or foreign names."""
+    if not stem.startswith("~"):
+        return stem if _SAFE_KEY_RE.fullmatch(stem) else None
+    if stem.startswith("~~"):
+        return None
+    encoded = stem[1:]
+    try:
+        return base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError):
+        return None
@@ -0,0 +1,183 @@
+"""
+Background ingestion queue with per-key ordering.
+
+Jobs are routed to one of N worker shards by a stable hash of their key,
+so jobs for the same key (session) always run on the same thread, in
+submission order, while different keys run in parallel. Shards are
+bounded: when one is full, submit() blocks until there is room, which
+pushes back on producers instead of letting the backlog grow unbounded.
+"""
+
+import queue
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional
+
+from utils.logger import get_logger
+
+_STOP = object()
+
+
+class IngestQueue:
+    """
+    Sharded, ordered background job queue.
+
+    Args:
+        name: Used in logs, stats and thread names
+        workers: Number of shards (one thread each)
+        max_pending: Queued jobs per shard before submit() blocks
+
+    Usage:
+        ingest = IngestQueue("memory", workers=4).start()
+        ingest.submit(session_id, save_turn, session_id, message, response)
+        ingest.wait_for(session_id)  # before reading what the job writes
+        ingest.close()               # drain on shutdown
+    """
+
+    def __init__(self, name: str, workers: int = 4, max_pending: int = 1000):
+        self.name = name
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.logger = get_logger("atlus.storage.ingest")
+
+        self._queues: List[queue.Queue] = [queue.Queue(maxsize=max_pending) for _ in range(self.workers)]
+        self._threads: List[threading.Thread] = []
+        self._pending: Dict[str, int] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self._submitted = 0
+        self._completed = 0
+        self._failures = 0
+        self._blocked = 0
+        self._blocked_seconds = 0.0
+        self._job_seconds_total = 0.0
+
+    def start(self) -> "IngestQueue":
+        if not self._threads:
+            for shard, jobs in enumerate(self._queues):
+                thread = threading.Thread(
+                    target=self._worker, args=(jobs,), name=f"ingest-{self.name}-{shard}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def submit(self, key: str, fn: Callable, *args, **kwargs):
+        """Queue fn(*args, **kwargs) behind earlier jobs for key. Blocks while the shard is full."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Ingest queue {self.name} is closed")
+            self._pending[key] = self._pending.get(key, 0) + 1
+            self._submitted += 1
+
+        jobs = self._queues[zlib.crc32(key.encode("utf-8")) % self.workers]
+        job = (key, fn, args, kwargs)
+        try:
+            jobs.put_nowait(job)
+        except queue.Full:
+            start = time.perf_counter()
+            jobs.put(job)
+            waited = time.perf_counter() - start
+            with self._cond:
+                self._blocked += 1
+                self._blocked_seconds += waited
+            self.logger.warning(f"Ingest queue {self.name} full; producer blocked {waited * 1000:.0f}ms")
+
+    def try_submit(self, key: str, fn: Callable, *args, **kwargs) -> bool:
+        """Queue fn like submit(), but return False instead of blocking when the shard is full."""
+        with self._cond:
+            if self._closed:
+                return False
+            self._pending[key] = self._pending.get(key, 0) + 1
+            self._submitted += 1
+
+        jobs = self._queues[zlib.crc32(key.encode("utf-8")) % self.workers]
+        try:
+            jobs.put_nowait((key, fn, args, kwargs))
+            return True
+        except queue.Full:
+            with self._cond:
+                self._submitted -= 1
+                remaining = self._pending.get(key, 1) - 1
+                if remaining:
+                    self._pending[key] = remaining
+                else:
+                    self._pending.pop(key, None)
+                self._cond.notify_all()
+            return False
+
+    def wait_for(self, key: str, timeout: float = None) -> bool:
+        """Block until every job submitted for key has run. False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending.get(key), timeout=timeout)
+
+    def drain(self, timeout: float = None) -> bool:
+        """Block until all queued jobs have run. False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending, timeout=timeout)
+
+    def close(self, timeout: float = 30.0) -> bool:
+        """Stop accepting jobs, run everything already queued, then stop the workers."""
+        with self._cond:
+            if self._closed:
+                return True
+            self._closed = True
+        drained = self.drain(timeout)
+        if not drained:
+            self.logger.warning(f"Ingest queue {self.name} closed with {self.pending()} job(s) not run")
+        for jobs in self._queues:
+            try:
+                jobs.put_nowait(_STOP)
+            except queue.Full:
+                pass  # worker is stuck on a job; it is a daemon thread
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._threads = []
+        return drained
+
+    def pending(self, key: Optional[str] = None) -> int:
+        with self._cond:
+            if key is not None:
+                return self._pending.get(key, 0)
+            return sum(self._pending.values())
+
+    def _worker(self, jobs: queue.Queue):
+        while True:
+            job = jobs.get()
+            if job is _STOP:
+                return
+            key, fn, args, kwargs = job
+            start = time.perf_counter()
+            failed = False
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                failed = True
+                self.logger.error(f"Ingest job for {key} failed: {e}", exc_info=True)
+            elapsed = time.perf_counter() - start
+            with self._cond:
+                self._completed += 1
+                self._failures += failed
+                self._job_seconds_total += elapsed
+                remaining = self._pending.get(key, 1) - 1
+                if remaining:
+                    self._pending[key] = remaining
+                else:
+                    self._pending.pop(key, None)
+                self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "name": self.name,
+                "workers": self.workers,
+                "pending": sum(self._pending.values()),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failures": self._failures,
+                "producer_blocks": self._blocked,
+                "producer_blocked_seconds": round(self._blocked_seconds, 3),
+                "job_ms_avg": round(self._job_seconds_total / self._completed * 1000, 3) if self._completed else 0.0
+            }
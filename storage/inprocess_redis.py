@@ -0,0 +1,261 @@
+"""
+In-process stand-in for a Redis server.
+
+Implements the subset of the redis-py client API that RedisStorage uses,
+with decode_responses=True semantics (values come back as str). State
+lives in one process, so it is for tests and single-process development
+only; it shares nothing between workers.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class _Hash(dict):
+    pass
+
+
+class _SortedSet(dict):
+    """member -> score"""
+
+
+def _score_bound(bound):
+    """(value, exclusive) for a ZRANGEBYSCORE bound: a number, "-inf"/"+inf" or "(value"."""
+    if isinstance(bound, str):
+        if bound.startswith("("):
+            return float(bound[1:]), True
+        return float(bound), False
+    return float(bound), False
+
+
+class InProcessRedis:
+    """
+    Minimal redis.Redis look-alike (strings, lists, hashes, sets, sorted sets).
+
+    Usage:
+        storage = RedisStorage(InProcessRedis())
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self.commands = 0  # round trips, so tests can assert on caching
+
+    # ==========================================================
+    # KEYS / STRINGS
+    # ==========================================================
+    def ping(self) -> bool:
+        self.commands += 1
+        return True
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            self.commands += 1
+            return self._typed(key, str)
+
+    def mget(self, keys: List[str]) -> List[Optional[str]]:
+        with self._lock:
+            self.commands += 1
+            return [self._typed(key, str) for key in keys]
+
+    def set(self, key: str, value: str) -> bool:
+        with self._lock:
+            self.commands += 1
+            self._data[key] = str(value)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            self.commands += 1
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def exists(self, *keys: str) -> int:
+        with self._lock:
+            self.commands += 1
+            return sum(key in self._data for key in keys)
+
+    # ==========================================================
+    # LISTS
+    # ==========================================================
+    def rpush(self, key: str, *values: str) -> int:
+        with self._lock:
+            self.commands += 1
+            items = self._typed(key, list)
+            if items is None:
+                items = self._data[key] = []
+            items.extend(str(v) for v in values)
+            return len(items)
+
+    def lrange(self, key: str, start: int, end: int) -> List[str]:
+        with self._lock:
+            self.commands += 1
+            items = self._typed(key, list) or []
+            n = len(items)
+            start = max(n + start, 0) if start < 0 else start
+            end = n + end if end < 0 else end
+            return list(items[start:end + 1])
+
+    def llen(self, key: str) -> int:
+        with self._lock:
+            self.commands += 1
+            return len(self._typed(key, list) or [])
+
+    # ==========================================================
+    # HASHES
+    # ==========================================================
+    def hset(self, key: str, mapping: Dict[str, str]) -> int:
+        with self._lock:
+            self.commands += 1
+            fields = self._typed(key, _Hash)
+            if fields is None:
+                fields = self._data[key] = _Hash()
+            added = sum(field not in fields for field in mapping)
+            fields.update({field: str(value) for field, value in mapping.items()})
+            return added
+
+    def hgetall(self, key: str) -> Dict[str, str]:
+        with self._lock:
+            self.commands += 1
+            return dict(self._typed(key, _Hash) or {})
+
+    def hdel(self, key: str, *fields: str) -> int:
+        with self._lock:
+            self.commands += 1
+            mapping = self._typed(key, _Hash) or {}
+            removed = sum(mapping.pop(field, None) is not None for field in fields)
+            if not mapping:
+                self._data.pop(key, None)
+            return removed
+
+    # ==========================================================
+    # SETS
+    # ==========================================================
+    def sadd(self, key: str, *members: str) -> int:
+        with self._lock:
+            self.commands += 1
+            members_set = self._typed(key, set)
+            if members_set is None:
+                members_set = self._data[key] = set()
+            added = len(set(members) - members_set)
+            members_set.update(members)
+            return added
+
+    def srem(self, key: str, *members: str) -> int:
+        with self._lock:
+            self.commands += 1
+            members_set = self._typed(key, set) or set()
+            removed = len(members_set & set(members))
+            members_set.difference_update(members)
+            if not members_set:
+                self._data.pop(key, None)
+            return removed
+
+    def smembers(self, key: str) -> set:
+        with self._lock:
+            self.commands += 1
+            return set(self._typed(key, set) or set())
+
+    # ==========================================================
+    # SORTED SETS
+    # ==========================================================
+    def zadd(self, key: str, mapping: Dict[str, float]) -> int:
+        with self._lock:
+            self.commands += 1
+            scores = self._typed(key, _SortedSet)
+            if scores is None:
+                scores = self._data[key] = _SortedSet()
+            added = sum(member not in scores for member in mapping)
+            scores.update({member: float(score) for member, score in mapping.items()})
+            return added
+
+    def zrem(self, key: str, *members: str) -> int:
+        with self._lock:
+            self.commands += 1
+            scores = self._typed(key, _SortedSet) or {}
+            removed = sum(scores.pop(member, None) is not None for member in members)
+            if not scores:
+                self._data.pop(key, None)
+            return removed
+
+    def zrevrange(self, key: str, start: int, end: int) -> List[str]:
+        with self._lock:
+            self.commands += 1
+            scores = self._typed(key, _SortedSet) or {}
+            # Equal scores order by member, reversed, as in ZREVRANGE
+            ordered = sorted(((score, member) for member, score in scores.items()), reverse=True)
+            members = [member for _, member in ordered]
+            end = len(members) + end if end < 0 else end
+            return members[start:end + 1]
+
+    def zrevrangebyscore(self, key: str, max, min, start: int = None, num: int = None,
+                         withscores: bool = False) -> List:
+        with self._lock:
+            self.commands += 1
+            scores = self._typed(key, _SortedSet) or {}
+            high, high_open = _score_bound(max)
+            low, low_open = _score_bound(min)
+            ordered = [
+                (score, member) for score, member in sorted(
+                    ((score, member) for member, score in scores.items()), reverse=True
+                )
+                if (score < high if high_open else score <= high) and (score > low if low_open else score >= low)
+            ]
+            if start is not None:
+                ordered = ordered[start:start + num if num is not None and num >= 0 else None]
+            if withscores:
+                return [(member, score) for score, member in ordered]
+            return [member for _, member in ordered]
+
+    def zcard(self, key: str) -> int:
+        with self._lock:
+            self.commands += 1
+            return len(self._typed(key, _SortedSet) or {})
+
+    # ==========================================================
+    # PIPELINES
+    # ==========================================================
+    def pipeline(self, transaction: bool = True) -> "_Pipeline":
+        return _Pipeline(self)
+
+    def flushall(self):
+        with self._lock:
+            self._data.clear()
+
+    def close(self):
+        pass
+
+    def _typed(self, key: str, kind: type):
+        value = self._data.get(key)
+        if value is not None and not isinstance(value, kind):
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+
+class _Pipeline:
+    """Queues commands and runs them atomically (under the client lock) on execute()."""
+
+    def __init__(self, client: InProcessRedis):
+        self._client = client
+        self._queued = []
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+
+        def queue(*args, **kwargs):
+            self._queued.append((method, args, kwargs))
+            return self
+        return queue
+
+    def execute(self) -> List[Any]:
+        with self._client._lock:
+            results = [method(*args, **kwargs) for method, args, kwargs in self._queued]
+            # A pipeline is one round trip
+            self._client.commands -= max(len(self._queued) - 1, 0)
+        self._queued = []
+        return results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._queued = []
@@ -0,0 +1,237 @@
+"""
+Redis storage backend.
+
+Shared state for running several worker processes against the same
+sessions: every worker reads and writes the same Redis server, so a
+session created by one worker validates on all of them.
+
+Keys (all under a configurable prefix, default "atlus:"):
+    session:{id}          JSON session record
+    sessions              set of all session ids
+    user_sessions:{user}  sorted set of the user's session ids by last activity
+    user_active:{user}    the same, active sessions only
+    history:{id}          list of JSON messages
+    summary:{id}          JSON rolling summary
+    long_term:{user}      hash of fact -> JSON value
+    long_term_users       set of users with facts
+
+Works with any client exposing the redis-py API with decode_responses=True
+(redis.Redis, or storage.inprocess_redis.InProcessRedis in tests).
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from storage.base import StorageBackend
+from utils.logger import get_logger
+
+_MGET_CHUNK = 500
+
+
+def _activity_score(timestamp: str) -> float:
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class RedisStorage(StorageBackend):
+    """
+    Redis backend.
+
+    Args:
+        client: redis-py compatible client created with decode_responses=True
+        prefix: Key prefix, so several deployments can share one server
+
+    Usage:
+        storage = RedisStorage.from_url("redis://localhost:6379/0")
+    """
+
+    name = "redis"
+    NATIVE_LONG_TERM = False
+    SHARED = True
+
+    def __init__(self, client, prefix: str = "atlus:"):
+        self.client = client
+        self.prefix = prefix
+        self.logger = get_logger("atlus.storage.redis")
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "atlus:") -> "RedisStorage":
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("The redis storage backend needs the redis package: pip install redis") from e
+        client = redis.Redis.from_url(url, decode_responses=True)
+        client.ping()
+        return cls(client, prefix=prefix)
+
+    def _key(self, *parts: str) -> str:
+        return self.prefix + ":".join(parts)
+
+    # ==========================================================
+    # SESSIONS
+    # ==========================================================
+    def load_sessions(self) -> Dict[str, Dict]:
+        session_ids = sorted(self.client.smembers(self._key("sessions")))
+        sessions = {}
+        for i in range(0, len(session_ids), _MGET_CHUNK):
+            chunk = session_ids[i:i + _MGET_CHUNK]
+            for raw in self.client.mget([self._key("session", sid) for sid in chunk]):
+                if raw:
+                    session = json.loads(raw)
+                    sessions[session["session_id"]] = session
+        return sessions
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        raw = self.client.get(self._key("session", session_id))
+        return json.loads(raw) if raw else None
+
+    def save_session(self, session: Dict):
+        self.save_sessions([session])
+
+    def save_sessions(self, sessions: Iterable[Dict]):
+        pipe = self.client.pipeline(transaction=True)
+        queued = False
+        for session in sessions:
+            session_id = session["session_id"]
+            user_id = session.get("user_id", "default_user")
+            score = _activity_score(session.get("last_activity", session.get("created_at", "")))
+            pipe.set(self._key("session", session_id), json.dumps(session))
+            pipe.sadd(self._key("sessions"), session_id)
+            pipe.zadd(self._key("user_sessions", user_id), {session_id: score})
+            if session.get("is_active", True):
+                pipe.zadd(self._key("user_active", user_id), {session_id: score})
+            else:
+                pipe.zrem(self._key("user_active", user_id), session_id)
+            queued = True
+        if queued:
+            pipe.execute()
+
+    def delete_session(self, session_id: str) -> bool:
+        session = self.get_session(session_id)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(
+            self._key("session", session_id),
+            self._key("history", session_id),
+            self._key("summary", session_id)
+        )
+        pipe.srem(self._key("sessions"), session_id)
+        if session is not None:
+            user_id = session.get("user_id", "default_user")
+            pipe.zrem(self._key("user_sessions", user_id), session_id)
+            pipe.zrem(self._key("user_active", user_id), session_id)
+        pipe.execute()
+        return session is not None
+
+    def list_user_sessions(self, user_id: str, limit: int = None, offset: int = 0, active_only: bool = True,
+                           after: Tuple[str, str] = None) -> List[Dict]:
+        index = self._key("user_active" if active_only else "user_sessions", user_id)
+        if after is not None:
+            session_ids = self._ids_after(index, after, limit, offset)
+        else:
+            end = -1 if limit is None else offset + limit - 1
+            session_ids = self.client.zrevrange(index, offset, end)
+        if not session_ids:
+            return []
+        raws = self.client.mget([self._key("session", sid) for sid in session_ids])
+        return [json.loads(raw) for raw in raws if raw]
+
+    def _ids_after(self, index: str, after: Tuple[str, str], limit: Optional[int], offset: int) -> List[str]:
+        """Members ordered after (score, member) of the cursor; equal scores order by member, as in ZREVRANGE."""
+        cursor = (_activity_score(after[0]), after[1])
+        wanted = None if limit is None else offset + limit
+        ids, start = [], 0
+        while True:
+            # Scores equal to the cursor's are fetched too; members at or before it are filtered out
+            if wanted is None:
+                rows = self.client.zrevrangebyscore(index, cursor[0], "-inf", withscores=True)
+            else:
+                rows = self.client.zrevrangebyscore(index, cursor[0], "-inf", start=start, num=wanted, withscores=True)
+            ids.extend(member for member, score in rows if (score, member) < cursor)
+            start += len(rows)
+            if wanted is None or len(ids) >= wanted or len(rows) < wanted:
+                break
+        return ids[offset:wanted]
+
+    def count_user_sessions(self, user_id: str, active_only: bool = True) -> int:
+        return self.client.zcard(self._key("user_active" if active_only else "user_sessions", user_id))
+
+    # ==========================================================
+    # HISTORY
+    # ==========================================================
+    def load_history(self, session_id: str, last_n: int = None) -> List[Dict]:
+        start = -last_n if last_n else 0
+        return [json.loads(raw) for raw in self.client.lrange(self._key("history", session_id), start, -1)]
+
+    def history_length(self, session_id: str) -> int:
+        return self.client.llen(self._key("history", session_id))
+
+    def append_history(self, session_id: str, messages: List[Dict]):
+        if messages:
+            self.client.rpush(self._key("history", session_id), *[json.dumps(m) for m in messages])
+
+    def replace_history(self, session_id: str, messages: List[Dict]):
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(self._key("history", session_id))
+        if messages:
+            pipe.rpush(self._key("history", session_id), *[json.dumps(m) for m in messages])
+        pipe.execute()
+
+    def delete_history(self, session_id: str):
+        self.client.delete(self._key("history", session_id), self._key("summary", session_id))
+
+    def list_history_sessions(self) -> List[str]:
+        return sorted(self.client.smembers(self._key("sessions")))
+
+    def load_summary(self, session_id: str) -> Optional[Dict]:
+        raw = self.client.get(self._key("summary", session_id))
+        return json.loads(raw) if raw else None
+
+    def save_summary(self, session_id: str, summary: Dict):
+        self.client.set(self._key("summary", session_id), json.dumps(summary))
+
+    # ==========================================================
+    # LONG-TERM MEMORY
+    # ==========================================================
+    def load_long_term(self, user_id: str) -> Dict:
+        return {key: json.loads(value) for key, value in self.client.hgetall(self._key("long_term", user_id)).items()}
+
+    def update_long_term(self, user_id: str, facts: Dict):
+        if not facts:
+            return
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hset(self._key("long_term", user_id), mapping={key: json.dumps(value) for key, value in facts.items()})
+        pipe.sadd(self._key("long_term_users"), user_id)
+        pipe.execute()
+
+    def delete_long_term(self, user_id: str, keys: Optional[Iterable[str]] = None):
+        if keys is None:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.delete(self._key("long_term", user_id))
+            pipe.srem(self._key("long_term_users"), user_id)
+            pipe.execute()
+            return
+        keys = list(keys)
+        if keys:
+            self.client.hdel(self._key("long_term", user_id), *keys)
+
+    def list_long_term_users(self) -> List[str]:
+        return sorted(self.client.smembers(self._key("long_term_users")))
+
+    # ==========================================================
+    # LIFECYCLE
+    # ==========================================================
+    def stats(self) -> Dict:
+        return {
+            "backend": self.name,
+            "prefix": self.prefix,
+            "sessions": len(self.client.smembers(self._key("sessions")))
+        }
+
+    def close(self):
+        self.client.close()
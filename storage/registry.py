@@ -0,0 +1,644 @@
+"""
+Bounded memory registry.
+
+LRU map of live memory objects with idle-time and size limits. Objects
+pushed out of RAM are pickled to disk and transparently reloaded on their
+next access, so a long-running process only keeps hot sessions resident.
+
+With a warm tier, residency has three levels:
+
+    hot   live objects, handed out by get()
+    warm  idle objects kept in RAM as zlib-compressed pickles
+    cold  pickles on disk
+
+Objects idle for warm_after_seconds (or pushed out by the hot limits) are
+compressed; warm objects idle for max_idle_seconds (or pushed out by the
+warm byte cap) go to disk. get() promotes either back to hot.
+
+Idle limits are applied whenever a key is inserted and by RegistrySweeper
+on a timer. Pickling, compression and spill writes run outside the
+registry lock, so moving one object never blocks access to the others.
+"""
+
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from storage.file_lock import atomic_write
+from storage.filenames import key_to_filename
+from utils.logger import get_logger
+
+# Spill files start with this, then the key (length-prefixed) and the pickle
+_SPILL_MAGIC = b"ATLUS-SPILL-1\n"
+
+_MISSING = object()
+
+
+class _Entry:
+    __slots__ = ("value", "last_access", "size", "dirty")
+
+    def __init__(self, value: Any, size: int, dirty: bool):
+        self.value = value
+        self.last_access = time.time()
+        self.size = size
+        self.dirty = dirty
+
+
+class _WarmEntry:
+    __slots__ = ("blob", "raw_size", "last_access", "dirty")
+
+    def __init__(self, blob: bytes, raw_size: int, last_access: float, dirty: bool):
+        self.blob = blob
+        self.raw_size = raw_size
+        self.last_access = last_access
+        self.dirty = dirty
+
+
+class MemoryRegistry:
+    """
+    Bounded LRU registry with spill-to-disk.
+
+    Args:
+        name: Registry name (used for logging and the spill sub-directory)
+        factory: Creates a fresh object for a key that is neither resident nor spilled
+        spill_dir: Where evicted objects are pickled (None = drop on eviction)
+        max_entries: Maximum resident objects
+        max_idle_seconds: Evict objects not accessed for this long (None = no idle limit)
+        max_bytes: Maximum total estimated size of resident objects (needs size_of)
+        size_of: Cheap size estimate for an object, in bytes
+        warm_after_seconds: Compress objects not accessed for this long (None = no warm tier)
+        max_warm_bytes: Maximum compressed bytes in the warm tier (None = no cap)
+        compress_level: zlib level for warm objects
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[str], Any],
+        spill_dir: Optional[Path] = None,
+        max_entries: int = 1000,
+        max_idle_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        size_of: Optional[Callable[[Any], int]] = None,
+        warm_after_seconds: Optional[float] = None,
+        max_warm_bytes: Optional[int] = None,
+        compress_level: int = 6
+    ):
+        self.name = name
+        self.factory = factory
+        self.spill_dir = Path(spill_dir) / name if spill_dir else None
+        self.max_entries = max_entries
+        self.max_idle_seconds = max_idle_seconds
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.warm_after_seconds = warm_after_seconds
+        self.max_warm_bytes = max_warm_bytes
+        self.compress_level = compress_level
+        self.logger = get_logger("atlus.storage.registry")
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._warm: "OrderedDict[str, _WarmEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        # Objects being compressed or spilled, and the signal that a move finished
+        self._moving: Dict[str, Any] = {}
+        self._moved = threading.Condition(self._lock)
+        self._bytes = 0
+        self._warm_bytes = 0
+        self._warm_raw_bytes = 0
+
+        self._evictions = 0
+        self._spills = 0
+        self._reloads = 0
+        self._creations = 0
+        self._reload_seconds_total = 0.0
+        self._reload_seconds_max = 0.0
+        self._demotions = 0
+        self._promotions = 0
+        self._promote_seconds_total = 0.0
+
+    # ==========================================================
+    # ACCESS
+    # ==========================================================
+    def get(self, key: str) -> Any:
+        """Return the object for key, promoting it from the warm tier, reloading it from disk or creating it."""
+        value = _MISSING
+        while True:
+            with self._lock:
+                self._wait_for_move(key)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    # Possibly loaded by another thread meanwhile; keep the first one
+                    self._touch(key, entry)
+                    return entry.value
+                warm = self._take_warm(key)
+                if warm is None and value is not _MISSING:
+                    self._insert(key, value, dirty=True)
+                    moves = self._select_victims(exclude=key)
+                    break
+            if warm is not None:
+                promoted = self._promote(key, warm)
+                if promoted is not None:
+                    return promoted
+            elif value is _MISSING:
+                value, reloaded = self._load_or_create(key)
+        self._run_moves(moves)
+        return value
+
+    def peek(self, key: str) -> Optional[Any]:
+        """
+        Return the object for key if it is in RAM, without loading, creating,
+        promoting or touching it. A warm object comes back as a decompressed
+        copy, so peek() results are for reading only.
+        """
+        with self._lock:
+            self._wait_for_move(key)
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry.value
+            warm = self._warm.get(key)
+        return self._unpack(key, warm.blob) if warm is not None else None
+
+    def put(self, key: str, value: Any):
+        """Insert or replace the object for key."""
+        with self._lock:
+            self._wait_for_move(key)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._pop_warm(key)
+            self._insert(key, value, dirty=True)
+            moves = self._select_victims(exclude=key)
+        self._run_moves(moves)
+
+    def pop(self, key: str, load: bool = True) -> Optional[Any]:
+        """
+        Remove key from the registry and from disk.
+
+        Args:
+            load: Reload a spilled object so the caller can clean it up
+
+        Returns:
+            The removed object, or None if it was neither resident nor spilled (or load=False)
+        """
+        with self._lock:
+            self._wait_for_move(key)
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+            warm = self._pop_warm(key)
+        value = entry.value if entry is not None else None
+        if value is None and load:
+            value = self._unpack(key, warm.blob) if warm is not None else self._read_spill(key)
+        self._delete_spill(key)
+        return value
+
+    def refresh_size(self, key: str):
+        """Re-measure a resident object after it grew and enforce the byte limit."""
+        if self.size_of is None:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            size = self.size_of(entry.value)
+            self._bytes += size - entry.size
+            entry.size = size
+            moves = self._select_victims(exclude=key)
+        self._run_moves(moves)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._wait_for_move(key)
+            if key in self._entries or key in self._warm:
+                return True
+        return self._spill_path(key) is not None and self._spill_path(key).exists()
+
+    def is_resident(self, key: str) -> bool:
+        """True if key is hot (a live object)."""
+        with self._lock:
+            return key in self._entries
+
+    def tier(self, key: str) -> Optional[str]:
+        """"hot", "warm", "cold" (on disk) or None if unknown."""
+        with self._lock:
+            self._wait_for_move(key)
+            if key in self._entries:
+                return "hot"
+            if key in self._warm:
+                return "warm"
+        path = self._spill_path(key)
+        return "cold" if path is not None and path.exists() else None
+
+    def resident_keys(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries.keys()))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    # ==========================================================
+    # EVICTION
+    # ==========================================================
+    def evict_idle(self) -> int:
+        """
+        Move idle objects down a tier: hot objects idle for warm_after_seconds
+        are compressed, and anything idle for max_idle_seconds goes to disk.
+        Returns the number of objects moved.
+        """
+        with self._lock:
+            moves = self._select_idle(time.time())
+        self._run_moves(moves)
+        return len(moves)
+
+    def flush(self):
+        """Spill every dirty hot and warm object to disk (objects stay in their tier)."""
+        with self._lock:
+            items = [(key, entry) for key, entry in self._entries.items() if entry.dirty]
+            warm_items = [(key, warm) for key, warm in self._warm.items() if warm.dirty]
+        for key, entry in items:
+            if self._write_spill(key, entry.value):
+                entry.dirty = False
+        for key, warm in warm_items:
+            if self._write_spill_data(key, zlib.decompress(warm.blob)):
+                warm.dirty = False
+
+    def clear(self):
+        """Drop all hot and warm objects (spill files are kept)."""
+        with self._lock:
+            while self._moving:
+                self._moved.wait()
+            self._entries.clear()
+            self._warm.clear()
+            self._bytes = 0
+            self._warm_bytes = 0
+            self._warm_raw_bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = {
+                "name": self.name,
+                "resident": len(self._entries),
+                "max_entries": self.max_entries,
+                "resident_bytes": self._bytes if self.size_of else None,
+                "creations": self._creations,
+                "evictions": self._evictions,
+                "spills": self._spills,
+                "reloads": self._reloads,
+                "reload_ms_avg": round(self._reload_seconds_total / self._reloads * 1000, 3) if self._reloads else 0.0,
+                "reload_ms_max": round(self._reload_seconds_max * 1000, 3),
+                "demotions": self._demotions,
+                "promotions": self._promotions,
+                "promote_ms_avg": (
+                    round(self._promote_seconds_total / self._promotions * 1000, 3) if self._promotions else 0.0
+                ),
+                "moving": len(self._moving),
+                "tiers": {
+                    # hot bytes are the size_of estimate (None without one)
+                    "hot": {"entries": len(self._entries), "ram_bytes": self._bytes if self.size_of else None},
+                    "warm": {
+                        "entries": len(self._warm),
+                        "ram_bytes": self._warm_bytes,
+                        "uncompressed_bytes": self._warm_raw_bytes,
+                        "max_bytes": self.max_warm_bytes
+                    }
+                }
+            }
+        stats["tiers"]["cold"] = self._disk_usage()
+        return stats
+
+    # ==========================================================
+    # INTERNALS
+    # ==========================================================
+    # Moving an object down a tier happens in two steps: under the lock it
+    # is taken out of its map into _moving, then it is pickled, compressed
+    # or written without the lock, so other keys stay available meanwhile.
+    # Anything that needs the same key waits for its move to finish.
+    def _touch(self, key: str, entry: _Entry):
+        entry.last_access = time.time()
+        # Callers get a mutable object back, so assume it will change
+        entry.dirty = True
+        self._entries.move_to_end(key)
+        if self.size_of is not None:
+            size = self.size_of(entry.value)
+            self._bytes += size - entry.size
+            entry.size = size
+
+    def _insert(self, key: str, value: Any, dirty: bool):
+        size = self.size_of(value) if self.size_of is not None else 0
+        self._entries[key] = _Entry(value, size, dirty)
+        self._bytes += size
+
+    def _wait_for_move(self, key: str):
+        """Block until key is not being moved between tiers (caller holds _lock)."""
+        while key in self._moving:
+            self._moved.wait()
+
+    def _take(self, key: str) -> _Entry:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        self._moving[key] = entry
+        return entry
+
+    def _take_warm(self, key: str) -> Optional[_WarmEntry]:
+        warm = self._pop_warm(key)
+        if warm is not None:
+            self._moving[key] = warm
+        return warm
+
+    def _select_idle(self, now: float) -> List[Tuple[str, str, Any]]:
+        """Take idle objects out for their move down a tier (caller holds _lock)."""
+        cold_cutoff = now - self.max_idle_seconds if self.max_idle_seconds is not None else None
+        warm_cutoff = now - self.warm_after_seconds if self.warm_after_seconds is not None else None
+        moves = []
+        # Both tiers are in recency order, so idle entries are at the front
+        while cold_cutoff is not None and self._warm:
+            key, warm = next(iter(self._warm.items()))
+            if warm.last_access > cold_cutoff:
+                break
+            moves.append(("spill_warm", key, self._take_warm(key)))
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if cold_cutoff is not None and entry.last_access <= cold_cutoff:
+                moves.append(("spill", key, self._take(key)))
+            elif warm_cutoff is not None and entry.last_access <= warm_cutoff:
+                moves.append(("demote", key, self._take(key)))
+            else:
+                break
+        return moves
+
+    def _select_victims(self, exclude: str = None) -> List[Tuple[str, str, Any]]:
+        """Take out idle objects and whatever the hot limits push out (caller holds _lock)."""
+        moves = self._select_idle(time.time())
+        while len(self._entries) > self.max_entries:
+            if not self._select_oldest(moves, exclude):
+                break
+        if self.max_bytes is not None and self.size_of is not None:
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                if not self._select_oldest(moves, exclude):
+                    break
+        return moves
+
+    def _select_oldest(self, moves: list, exclude: str = None) -> bool:
+        for key in self._entries:
+            if key != exclude:
+                action = "demote" if self.warm_after_seconds is not None else "spill"
+                moves.append((action, key, self._take(key)))
+                return True
+        return False
+
+    def _select_warm_overflow(self) -> List[Tuple[str, str, Any]]:
+        moves = []
+        if self.max_warm_bytes is None:
+            return moves
+        while self._warm and self._warm_bytes > self.max_warm_bytes:
+            key = next(iter(self._warm))
+            moves.append(("spill_warm", key, self._take_warm(key)))
+        return moves
+
+    def _run_moves(self, moves: List[Tuple[str, str, Any]]):
+        """Compress or spill taken-out objects without the lock, then file them in their new tier."""
+        while moves:
+            results: Dict[str, Optional[_WarmEntry]] = {}
+            try:
+                for action, key, item in moves:
+                    if action == "demote":
+                        results[key] = self._compress(key, item)
+                        continue
+                    if action == "spill" and item.dirty:
+                        self._write_spill(key, item.value)
+                    elif action == "spill_warm" and item.dirty:
+                        self._write_spill_data(key, zlib.decompress(item.blob))
+                    results[key] = None
+            finally:
+                with self._lock:
+                    self._finish_moves(moves, results)
+            with self._lock:
+                # Compressed objects may have pushed the warm tier over its cap
+                moves = self._select_warm_overflow()
+
+    def _finish_moves(self, moves: List[Tuple[str, str, Any]], results: Dict[str, Optional[_WarmEntry]]):
+        for _, key, _ in moves:
+            warm = results.get(key)
+            if warm is not None:
+                self._warm[key] = warm
+                self._warm_bytes += len(warm.blob)
+                self._warm_raw_bytes += warm.raw_size
+                self._demotions += 1
+            else:
+                # Spilled, or dropped because it could not be pickled
+                self._evictions += 1
+            self._moving.pop(key, None)
+        self._moved.notify_all()
+
+    def _compress(self, key: str, entry: _Entry) -> Optional[_WarmEntry]:
+        """Hot -> warm: the object as a compressed pickle (None if it cannot be pickled)."""
+        try:
+            raw = pickle.dumps(entry.value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self.logger.warning(f"Failed to compress {self.name} memory {key}, dropping it: {e}")
+            return None
+        return _WarmEntry(zlib.compress(raw, self.compress_level), len(raw), entry.last_access, entry.dirty)
+
+    def _promote(self, key: str, warm: _WarmEntry) -> Optional[Any]:
+        """Warm -> hot for an entry taken out by get(). None if the blob could not be restored."""
+        start = time.perf_counter()
+        value = self._unpack(key, warm.blob)
+        with self._lock:
+            self._moving.pop(key, None)
+            self._moved.notify_all()
+            if value is None:
+                return None
+            # Handed to the caller, so dirty like any get()
+            self._insert(key, value, dirty=True)
+            self._promotions += 1
+            self._promote_seconds_total += time.perf_counter() - start
+            moves = self._select_victims(exclude=key)
+        self._run_moves(moves)
+        return value
+
+    def _pop_warm(self, key: str) -> Optional[_WarmEntry]:
+        warm = self._warm.pop(key, None)
+        if warm is not None:
+            self._warm_bytes -= len(warm.blob)
+            self._warm_raw_bytes -= warm.raw_size
+        return warm
+
+    def _unpack(self, key: str, blob: bytes) -> Optional[Any]:
+        try:
+            return pickle.loads(zlib.decompress(blob))
+        except Exception as e:
+            self.logger.warning(f"Failed to restore compressed {self.name} memory {key}: {e}")
+            return None
+
+    def _disk_usage(self) -> Dict:
+        files = size = 0
+        if self.spill_dir is not None:
+            try:
+                with os.scandir(self.spill_dir) as it:
+                    for item in it:
+                        if item.name.endswith(".pkl") and not item.name.startswith("."):
+                            files += 1
+                            size += item.stat().st_size
+            except FileNotFoundError:
+                pass
+        # Spill files of objects that were reloaded stay on disk, so this
+        # counts every key with a copy on disk, not only cold ones
+        return {"files": files, "disk_bytes": size}
+
+    def _load_or_create(self, key: str):
+        start = time.perf_counter()
+        value = self._read_spill(key)
+        if value is not None:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._reloads += 1
+                self._reload_seconds_total += elapsed
+                self._reload_seconds_max = max(self._reload_seconds_max, elapsed)
+            self.logger.debug(f"Reloaded {self.name} memory {key} from disk in {elapsed * 1000:.2f}ms")
+            return value, True
+
+        value = self.factory(key)
+        with self._lock:
+            self._creations += 1
+        return value, False
+
+    def _spill_path(self, key: str) -> Optional[Path]:
+        if self.spill_dir is None:
+            return None
+        return self.spill_dir / f"{key_to_filename(key)}.pkl"
+
+    def _write_spill(self, key: str, value: Any) -> bool:
+        if self._spill_path(key) is None:
+            return False
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            # Objects that persist themselves (session history, long-term facts)
+            # are still safe to drop; they reload through the factory
+            self.logger.warning(f"Failed to spill {self.name} memory {key}: {e}")
+            return False
+        return self._write_spill_data(key, data)
+
+    def _write_spill_data(self, key: str, data: bytes) -> bool:
+        path = self._spill_path(key)
+        if path is None:
+            return False
+        key_bytes = key.encode("utf-8")
+        try:
+            # Unique temp file: another process may spill the same key
+            atomic_write(path, _SPILL_MAGIC + struct.pack(">I", len(key_bytes)) + key_bytes + data, fsync=False)
+            with self._lock:
+                self._spills += 1
+            return True
+        except OSError as e:
+            self.logger.warning(f"Failed to spill {self.name} memory {key}: {e}")
+            return False
+
+    def _read_spill(self, key: str) -> Optional[Any]:
+        path = self._spill_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            raw = path.read_bytes()
+            if not raw.startswith(_SPILL_MAGIC):
+                raise ValueError("not a spill file")
+            start = len(_SPILL_MAGIC) + 4
+            (key_length,) = struct.unpack(">I", raw[len(_SPILL_MAGIC):start])
+            if raw[start:start + key_length] != key.encode("utf-8"):
+                # Never hand one key's object to another
+                raise ValueError("spill file belongs to another key")
+            return pickle.loads(memoryview(raw)[start + key_length:])
+        except Exception as e:
+            self.logger.warning(f"Failed to reload {self.name} memory {key}, recreating: {e}")
+            return None
+
+    def _delete_spill(self, key: str):
+        path = self._spill_path(key)
+        if path is not None:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class RegistrySweeper:
+    """
+    Background thread that runs evict_idle() on registries every interval
+    seconds, so idle objects are compressed and spilled on time even when no
+    new key arrives to push them out.
+
+    Args:
+        registries: Registries to sweep
+        interval: Seconds between sweeps
+    """
+
+    def __init__(self, registries: List[MemoryRegistry], interval: float = 30.0):
+        self.registries = list(registries)
+        self.interval = interval
+        self.logger = get_logger("atlus.storage.registry")
+
+        self._stopped = threading.Event()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self._sweeps = 0
+        self._moved_total = 0
+        self._last_moved = 0
+        self._last_sweep_ms = 0.0
+        self._errors = 0
+
+    def start(self) -> "RegistrySweeper":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="registry-sweeper", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def sweep(self) -> int:
+        """Move idle objects down a tier in every registry. Returns how many moved."""
+        start = time.perf_counter()
+        moved = 0
+        for registry in self.registries:
+            try:
+                moved += registry.evict_idle()
+            except Exception as e:
+                with self._stats_lock:
+                    self._errors += 1
+                self.logger.warning(f"Idle sweep of {registry.name} memory failed: {e}")
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            self._sweeps += 1
+            self._last_moved = moved
+            self._moved_total += moved
+            self._last_sweep_ms = elapsed_ms
+        if moved:
+            self.logger.debug(f"Idle sweep moved {moved} object(s) down a tier in {elapsed_ms:.1f}ms")
+        return moved
+
+    def _loop(self):
+        while not self._stopped.wait(self.interval):
+            self.sweep()
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            return {
+                "registries": [registry.name for registry in self.registries],
+                "interval_seconds": self.interval,
+                "sweeps": self._sweeps,
+                "last_moved": self._last_moved,
+                "moved_total": self._moved_total,
+                "last_sweep_ms": round(self._last_sweep_ms, 3),
+                "errors": self._errors
+            }
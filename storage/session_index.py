@@ -0,0 +1,101 @@
+"""
+Per-user session index.
+
+Secondary index from user_id to that user's active sessions, kept sorted
+by last activity. "Continue last session" is a lookup of the newest entry
+and listing a user's sessions is a slice, instead of a scan and sort over
+every session in the process.
+"""
+
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+
+class SessionIndex:
+    """
+    user_id -> [(last_activity, session_id), ...] in ascending order.
+
+    last_activity values are ISO 8601 strings in one fixed format, so
+    string order is time order.
+
+    Usage:
+        index = SessionIndex()
+        index.add("session_1", "user_1", "2024-01-01T12:00:00Z")
+        index.touch("session_1", "2024-01-01T12:30:00Z")
+        index.latest("user_1")  # "session_1"
+    """
+
+    def __init__(self):
+        self._by_user: Dict[str, List[Tuple[str, str]]] = {}
+        self._entries: Dict[str, Tuple[str, str]] = {}  # session_id -> (user_id, last_activity)
+        self._lock = threading.Lock()
+
+    def add(self, session_id: str, user_id: str, last_activity: str):
+        """Index a session (re-indexes it if already present)."""
+        with self._lock:
+            self._remove(session_id)
+            insort(self._by_user.setdefault(user_id, []), (last_activity, session_id))
+            self._entries[session_id] = (user_id, last_activity)
+
+    def touch(self, session_id: str, last_activity: str):
+        """Move a session to its new activity position. No-op for unknown sessions."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return
+            user_id, old_activity = entry
+            if old_activity == last_activity:
+                return
+            sessions = self._by_user[user_id]
+            del sessions[bisect_left(sessions, (old_activity, session_id))]
+            insort(sessions, (last_activity, session_id))
+            self._entries[session_id] = (user_id, last_activity)
+
+    def remove(self, session_id: str) -> bool:
+        with self._lock:
+            return self._remove(session_id)
+
+    def latest(self, user_id: str) -> Optional[str]:
+        """Most recently active session_id for user_id, or None."""
+        with self._lock:
+            sessions = self._by_user.get(user_id)
+            return sessions[-1][1] if sessions else None
+
+    def page(self, user_id: str, limit: Optional[int] = None, offset: int = 0) -> List[str]:
+        """session_ids for user_id, most recent first."""
+        with self._lock:
+            sessions = self._by_user.get(user_id, [])
+            end = len(sessions) - offset
+            if end <= 0:
+                return []
+            start = max(0, end - limit) if limit is not None else 0
+            return [session_id for _, session_id in reversed(sessions[start:end])]
+
+    def count(self, user_id: str) -> int:
+        with self._lock:
+            return len(self._by_user.get(user_id, ()))
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._by_user.clear()
+            self._entries.clear()
+
+    def _remove(self, session_id: str) -> bool:
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return False
+        user_id, last_activity = entry
+        sessions = self._by_user[user_id]
+        del sessions[bisect_left(sessions, (last_activity, session_id))]
+        if not sessions:
+            del self._by_user[user_id]
+        return True
@@ -0,0 +1,192 @@
+"""
+Binary snapshot of all durable state.
+
+One file holds every session record, history, rolling summary and
+long-term fact set, so a restart (or a move to another host) is one
+sequential read instead of thousands of small file opens.
+
+Layout:
+    header  b"ATLSNAP" + version (1 byte) + flags (1 byte, bit 0 = zlib)
+    body    frames, zlib-compressed as one stream when flagged:
+            kind (1 byte) + payload length (uint32, big-endian) + JSON payload
+    last    an END frame with record counts; a file without it is truncated
+
+Frame kinds: S session record, H {"session_id", "messages"},
+M {"session_id", "summary"}, L {"user_id", "facts"}, E {"counts"}.
+"""
+
+import json
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+from storage.base import StorageBackend
+from utils.logger import get_logger
+
+MAGIC = b"ATLSNAP"
+VERSION = 1
+FLAG_ZLIB = 0x01
+
+SESSION, HISTORY, SUMMARY, LONG_TERM, END = b"S", b"H", b"M", b"L", b"E"
+
+_FRAME_HEADER = struct.Struct(">cI")
+_READ_CHUNK = 1 << 20
+
+logger = get_logger("atlus.storage.snapshot")
+
+
+class SnapshotError(Exception):
+    """Raised for unreadable, truncated or incompatible snapshot files."""
+
+
+class _Writer:
+    def __init__(self, fh, compress: bool, level: int):
+        self._fh = fh
+        self._compressor = zlib.compressobj(level) if compress else None
+
+    def frame(self, kind: bytes, payload):
+        data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        chunk = _FRAME_HEADER.pack(kind, len(data)) + data
+        self._fh.write(self._compressor.compress(chunk) if self._compressor else chunk)
+
+    def close(self):
+        if self._compressor:
+            self._fh.write(self._compressor.flush())
+
+
+def write_snapshot(storage: StorageBackend, path: Path, compress: bool = True, level: int = 6) -> Dict:
+    """
+    Stream the backend's full state into path (atomically replaced).
+
+    Returns record counts plus bytes written and elapsed seconds.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    counts = {"sessions": 0, "histories": 0, "messages": 0, "summaries": 0, "users": 0, "facts": 0}
+    start = time.perf_counter()
+
+    with open(tmp_path, "wb") as fh:
+        fh.write(MAGIC + bytes([VERSION, FLAG_ZLIB if compress else 0]))
+        writer = _Writer(fh, compress, level)
+
+        sessions = storage.load_sessions()
+        for session in sessions.values():
+            writer.frame(SESSION, session)
+            counts["sessions"] += 1
+
+        for session_id in sorted(set(sessions) | set(storage.list_history_sessions())):
+            messages = storage.load_history(session_id)
+            if messages:
+                writer.frame(HISTORY, {"session_id": session_id, "messages": messages})
+                counts["histories"] += 1
+                counts["messages"] += len(messages)
+            summary = storage.load_summary(session_id)
+            if summary:
+                writer.frame(SUMMARY, {"session_id": session_id, "summary": summary})
+                counts["summaries"] += 1
+
+        for user_id in storage.list_long_term_users():
+            facts = storage.load_long_term(user_id)
+            if facts:
+                writer.frame(LONG_TERM, {"user_id": user_id, "facts": facts})
+                counts["users"] += 1
+                counts["facts"] += len(facts)
+
+        writer.frame(END, {"counts": counts})
+        writer.close()
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp_path, path)
+
+    elapsed = time.perf_counter() - start
+    size = path.stat().st_size
+    logger.info(f"Wrote snapshot {path} ({size} bytes, {counts['sessions']} sessions) in {elapsed:.2f}s")
+    return {**counts, "bytes": size, "seconds": round(elapsed, 3)}
+
+
+def _read_body(fh, compressed: bool) -> Iterator[bytes]:
+    decompressor = zlib.decompressobj() if compressed else None
+    while True:
+        chunk = fh.read(_READ_CHUNK)
+        if not chunk:
+            break
+        yield decompressor.decompress(chunk) if decompressor else chunk
+    if decompressor:
+        yield decompressor.flush()
+
+
+def iter_snapshot(path: Path) -> Iterator[Tuple[bytes, Dict]]:
+    """Yield (kind, payload) for every frame, ending with the END frame."""
+    with open(path, "rb") as fh:
+        header = fh.read(len(MAGIC) + 2)
+        if len(header) < len(MAGIC) + 2 or header[:len(MAGIC)] != MAGIC:
+            raise SnapshotError(f"{path} is not a snapshot file")
+        version, flags = header[len(MAGIC)], header[len(MAGIC) + 1]
+        if version != VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {version}")
+
+        buffer = bytearray()
+        offset = 0
+        try:
+            for data in _read_body(fh, bool(flags & FLAG_ZLIB)):
+                buffer += data
+                while len(buffer) - offset >= _FRAME_HEADER.size:
+                    kind, length = _FRAME_HEADER.unpack_from(buffer, offset)
+                    end = offset + _FRAME_HEADER.size + length
+                    if end > len(buffer):
+                        break
+                    payload = json.loads(buffer[offset + _FRAME_HEADER.size:end])
+                    offset = end
+                    yield kind, payload
+                    if kind == END:
+                        return
+                # Drop consumed bytes now and then instead of on every frame
+                if offset > _READ_CHUNK:
+                    del buffer[:offset]
+                    offset = 0
+        except zlib.error as e:
+            raise SnapshotError(f"Corrupt snapshot {path}: {e}")
+    raise SnapshotError(f"Snapshot {path} is truncated (no end marker)")
+
+
+def restore_snapshot(storage: StorageBackend, path: Path) -> Dict:
+    """
+    Load a snapshot into storage, upserting sessions and facts and replacing
+    histories. Writes are grouped via storage.bulk(), and session records
+    are saved in one batch. Returns record counts plus elapsed seconds.
+    """
+    counts = {"sessions": 0, "histories": 0, "messages": 0, "summaries": 0, "users": 0, "facts": 0}
+    start = time.perf_counter()
+    sessions = []
+    expected = None
+
+    with storage.bulk():
+        for kind, payload in iter_snapshot(path):
+            if kind == SESSION:
+                sessions.append(payload)
+                counts["sessions"] += 1
+            elif kind == HISTORY:
+                storage.replace_history(payload["session_id"], payload["messages"])
+                counts["histories"] += 1
+                counts["messages"] += len(payload["messages"])
+            elif kind == SUMMARY:
+                storage.save_summary(payload["session_id"], payload["summary"])
+                counts["summaries"] += 1
+            elif kind == LONG_TERM:
+                storage.update_long_term(payload["user_id"], payload["facts"])
+                counts["users"] += 1
+                counts["facts"] += len(payload["facts"])
+            elif kind == END:
+                expected = payload.get("counts")
+        if sessions:
+            storage.save_sessions(sessions)
+
+    if expected is not None and expected != counts:
+        logger.warning(f"Snapshot {path} counts mismatch: header {expected}, restored {counts}")
+    elapsed = time.perf_counter() - start
+    logger.info(f"Restored snapshot {path} ({counts['sessions']} sessions) in {elapsed:.2f}s")
+    return {**counts, "seconds": round(elapsed, 3)}
@@ -0,0 +1,338 @@
+"""
+SQLite storage backend.
+
+One database file in WAL mode: readers never block the writer, and each
+change is a small indexed row write inside a transaction instead of a
+whole-file rewrite.
+
+Schema:
+    sessions(session_id PK, user_id, created_at, last_activity, is_active, metadata)
+        indexed on (user_id, last_activity) and last_activity
+    history(session_id, seq, role, content) PK (session_id, seq)
+    long_term(user_id, key, value) PK (user_id, key)
+    summaries(session_id PK, text, covered)
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from storage.base import StorageBackend
+from utils.logger import get_logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id    TEXT PRIMARY KEY,
+    user_id       TEXT NOT NULL,
+    created_at    TEXT NOT NULL,
+    last_activity TEXT NOT NULL,
+    is_active     INTEGER NOT NULL DEFAULT 1,
+    metadata      TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_user_activity ON sessions (user_id, last_activity);
+CREATE INDEX IF NOT EXISTS idx_sessions_activity ON sessions (last_activity);
+
+CREATE TABLE IF NOT EXISTS history (
+    session_id TEXT NOT NULL,
+    seq        INTEGER NOT NULL,
+    role       TEXT NOT NULL,
+    content    TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS summaries (
+    session_id TEXT PRIMARY KEY,
+    text       TEXT NOT NULL,
+    covered    INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS long_term (
+    user_id TEXT NOT NULL,
+    key     TEXT NOT NULL,
+    value   TEXT NOT NULL,
+    PRIMARY KEY (user_id, key)
+) WITHOUT ROWID;
+"""
+
+_SESSION_COLUMNS = "session_id, user_id, created_at, last_activity, is_active, metadata"
+
+
+def _row_to_session(row) -> Dict:
+    return {
+        "session_id": row[0],
+        "user_id": row[1],
+        "created_at": row[2],
+        "last_activity": row[3],
+        "is_active": bool(row[4]),
+        "metadata": json.loads(row[5]) if row[5] else {}
+    }
+
+
+def _session_to_row(session: Dict) -> tuple:
+    return (
+        session["session_id"],
+        session.get("user_id", "default_user"),
+        session.get("created_at", ""),
+        session.get("last_activity", session.get("created_at", "")),
+        1 if session.get("is_active", True) else 0,
+        json.dumps(session.get("metadata") or {})
+    )
+
+
+def _close_quietly(conn: sqlite3.Connection):
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    SQLite backend.
+
+    Connections are per thread (sqlite3 objects must not be shared across
+    threads); WAL lets Flask's request threads read while one writes. Flask
+    runs each request on a new thread, so connections of threads that have
+    exited are closed whenever another thread connects (and on stats()).
+
+    Args:
+        path: Database file (":memory:" is not supported; use a temp file)
+        synchronous: SQLite synchronous pragma; NORMAL is durable in WAL mode
+            except for the last transactions before a power loss
+        busy_timeout_ms: How long a writer waits for the lock before failing
+    """
+
+    name = "sqlite"
+    NATIVE_LONG_TERM = False
+
+    def __init__(self, path: Path = Path("data/atlus.db"), synchronous: str = "NORMAL", busy_timeout_ms: int = 5000):
+        self.path = Path(path)
+        self.synchronous = synchronous
+        self.busy_timeout_ms = busy_timeout_ms
+        self.logger = get_logger("atlus.storage.sqlite")
+
+        self._local = threading.local()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # executescript manages its own transaction
+        self._connect().executescript(SCHEMA)
+        self.logger.info(f"SQLite storage ready at {self.path}")
+
+    # ==========================================================
+    # CONNECTIONS
+    # ==========================================================
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: transactions are explicit (see transaction())
+            conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._reap_connections()
+                self._connections[threading.current_thread()] = conn
+        return conn
+
+    def _reap_connections(self) -> int:
+        """Close connections whose threads have exited (caller holds _connections_lock)."""
+        dead = [thread for thread in self._connections if not thread.is_alive()]
+        for thread in dead:
+            _close_quietly(self._connections.pop(thread))
+        return len(dead)
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT, rolled back on error. Nested calls join the outer transaction."""
+        conn = self._connect()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    @contextmanager
+    def bulk(self):
+        with self.transaction():
+            yield
+
+    def close(self):
+        with self._connections_lock:
+            for conn in self._connections.values():
+                _close_quietly(conn)
+            self._connections.clear()
+        self._local = threading.local()
+
+    # ==========================================================
+    # SESSIONS
+    # ==========================================================
+    def load_sessions(self) -> Dict[str, Dict]:
+        rows = self._connect().execute(f"SELECT {_SESSION_COLUMNS} FROM sessions").fetchall()
+        return {row[0]: _row_to_session(row) for row in rows}
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        row = self._connect().execute(
+            f"SELECT {_SESSION_COLUMNS} FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return _row_to_session(row) if row else None
+
+    def save_session(self, session: Dict):
+        self.save_sessions([session])
+
+    def save_sessions(self, sessions: Iterable[Dict]):
+        with self.transaction() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO sessions ({_SESSION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                [_session_to_row(s) for s in sessions]
+            )
+
+    def touch_sessions(self, activity: Dict[str, str]):
+        """Update last_activity only, for many sessions at once."""
+        with self.transaction() as conn:
+            conn.executemany(
+                "UPDATE sessions SET last_activity = ? WHERE session_id = ?",
+                [(ts, sid) for sid, ts in activity.items()]
+            )
+
+    def delete_session(self, session_id: str) -> bool:
+        with self.transaction() as conn:
+            deleted = conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount
+            conn.execute("DELETE FROM history WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM summaries WHERE session_id = ?", (session_id,))
+        return deleted > 0
+
+    def list_user_sessions(self, user_id: str, limit: int = None, offset: int = 0, active_only: bool = True,
+                           after: Tuple[str, str] = None) -> List[Dict]:
+        query = f"SELECT {_SESSION_COLUMNS} FROM sessions WHERE user_id = ?"
+        params = [user_id]
+        if active_only:
+            query += " AND is_active = 1"
+        if after is not None:
+            query += " AND (last_activity < ? OR (last_activity = ? AND session_id < ?))"
+            params += [after[0], after[0], after[1]]
+        query += " ORDER BY last_activity DESC, session_id DESC LIMIT ? OFFSET ?"
+        rows = self._connect().execute(
+            query, (*params, -1 if limit is None else limit, offset)
+        ).fetchall()
+        return [_row_to_session(row) for row in rows]
+
+    # ==========================================================
+    # HISTORY
+    # ==========================================================
+    def load_history(self, session_id: str, last_n: int = None) -> List[Dict]:
+        conn = self._connect()
+        if last_n:
+            rows = conn.execute(
+                "SELECT role, content FROM ("
+                "  SELECT seq, role, content FROM history WHERE session_id = ? ORDER BY seq DESC LIMIT ?"
+                ") ORDER BY seq",
+                (session_id, last_n)
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT role, content FROM history WHERE session_id = ? ORDER BY seq", (session_id,)
+            ).fetchall()
+        return [{"role": role, "content": content} for role, content in rows]
+
+    def history_length(self, session_id: str) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM history WHERE session_id = ?", (session_id,)
+        ).fetchone()[0]
+
+    def append_history(self, session_id: str, messages: List[Dict]):
+        with self.transaction() as conn:
+            start = conn.execute(
+                "SELECT COALESCE(MAX(seq), -1) + 1 FROM history WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+            conn.executemany(
+                "INSERT INTO history (session_id, seq, role, content) VALUES (?, ?, ?, ?)",
+                [(session_id, start + i, m.get("role", ""), m.get("content", "")) for i, m in enumerate(messages)]
+            )
+
+    def replace_history(self, session_id: str, messages: List[Dict]):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM history WHERE session_id = ?", (session_id,))
+            conn.executemany(
+                "INSERT INTO history (session_id, seq, role, content) VALUES (?, ?, ?, ?)",
+                [(session_id, i, m.get("role", ""), m.get("content", "")) for i, m in enumerate(messages)]
+            )
+
+    def delete_history(self, session_id: str):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM history WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM summaries WHERE session_id = ?", (session_id,))
+
+    def list_history_sessions(self) -> List[str]:
+        rows = self._connect().execute("SELECT DISTINCT session_id FROM history ORDER BY session_id").fetchall()
+        return [row[0] for row in rows]
+
+    def load_summary(self, session_id: str) -> Optional[Dict]:
+        row = self._connect().execute(
+            "SELECT text, covered FROM summaries WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return {"text": row[0], "covered": row[1]} if row else None
+
+    def save_summary(self, session_id: str, summary: Dict):
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (session_id, text, covered) VALUES (?, ?, ?)",
+                (session_id, summary.get("text", ""), int(summary.get("covered", 0)))
+            )
+
+    # ==========================================================
+    # LONG-TERM MEMORY
+    # ==========================================================
+    def load_long_term(self, user_id: str) -> Dict:
+        rows = self._connect().execute(
+            "SELECT key, value FROM long_term WHERE user_id = ?", (user_id,)
+        ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def list_long_term_users(self) -> List[str]:
+        rows = self._connect().execute("SELECT DISTINCT user_id FROM long_term ORDER BY user_id").fetchall()
+        return [row[0] for row in rows]
+
+    def update_long_term(self, user_id: str, facts: Dict):
+        if not facts:
+            return
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO long_term (user_id, key, value) VALUES (?, ?, ?)",
+                [(user_id, key, json.dumps(value)) for key, value in facts.items()]
+            )
+
+    def delete_long_term(self, user_id: str, keys: Optional[Iterable[str]] = None):
+        with self.transaction() as conn:
+            if keys is None:
+                conn.execute("DELETE FROM long_term WHERE user_id = ?", (user_id,))
+            else:
+                conn.executemany(
+                    "DELETE FROM long_term WHERE user_id = ? AND key = ?",
+                    [(user_id, key) for key in keys]
+                )
+
+    def stats(self) -> Dict:
+        conn = self._connect()
+        with self._connections_lock:
+            self._reap_connections()
+            connections = len(self._connections)
+        return {
+            "backend": self.name,
+            "path": str(self.path),
+            "sessions": conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0],
+            "history_rows": conn.execute("SELECT COUNT(*) FROM history").fetchone()[0],
+            "users_with_long_term": conn.execute("SELECT COUNT(DISTINCT user_id) FROM long_term").fetchone()[0],
+            "connections": connections
+        }
@@ -0,0 +1,320 @@
+"""
+Append-only conversation history log.
+
+One JSONL file per session, one message per line. Adding a turn appends
+two lines instead of rewriting the whole history, so write cost no longer
+grows with conversation length.
+
+Replacing a history appends a reset marker followed by the new messages;
+the superseded prefix is dropped by compaction once it outweighs the live
+part. A line torn by a crash mid-write is skipped on read and fenced off
+by the next append.
+
+Each message line also records its position ("_seq", stripped on read), so
+the number of live messages is known from the last line alone.
+"""
+
+import json
+import os
+import threading
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from storage.file_lock import atomic_write
+from storage.filenames import filename_to_key, key_to_filename
+from utils.logger import get_logger
+
+_RESET = {"_reset": True}
+_SEQ = "_seq"
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+def _strip(record: Dict) -> Dict:
+    """Drop the position field from a decoded message."""
+    record.pop(_SEQ, None)
+    return record
+
+
+class TurnLog:
+    """
+    Per-session append-only message log.
+
+    Args:
+        log_dir: Directory holding one .jsonl file per session (see storage.filenames)
+        fsync: "always" (fsync every append; survives power loss),
+            "interval" (a background thread fsyncs files with new appends
+            every fsync_interval seconds, and close() syncs the rest; a power
+            loss loses at most that window) or "never" (leave it to the OS;
+            survives process crashes only)
+        fsync_interval: Seconds between background fsyncs under the "interval" policy
+        tail_block_size: Bytes read per step when scanning from the end
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        fsync: str = "interval",
+        fsync_interval: float = 1.0,
+        tail_block_size: int = 8192
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync} (expected one of {FSYNC_POLICIES})")
+        self.log_dir = Path(log_dir)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.tail_block_size = tail_block_size
+        self.logger = get_logger("atlus.storage.turn_log")
+
+        self._lock = threading.RLock()
+        self._unsynced: set = set()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        self._appends = 0
+        self._compactions = 0
+        self._fsyncs = 0
+
+    # ==========================================================
+    # PATHS
+    # ==========================================================
+    def path(self, session_id: str) -> Path:
+        return self.log_dir / f"{key_to_filename(session_id)}.jsonl"
+
+    def exists(self, session_id: str) -> bool:
+        return self.path(session_id).exists()
+
+    def session_ids(self) -> List[str]:
+        """Sessions with a log (except ids too long to recover from their file name)."""
+        session_ids = (filename_to_key(path.stem) for path in self.log_dir.glob("*.jsonl"))
+        return [session_id for session_id in session_ids if session_id is not None]
+
+    # ==========================================================
+    # WRITES
+    # ==========================================================
+    def append(self, session_id: str, messages: List[Dict]):
+        """Append messages to the session's log."""
+        if not messages:
+            return
+        with self._lock:
+            self._write(session_id, self._encode(messages, self.count(session_id)))
+
+    def replace(self, session_id: str, messages: List[Dict]):
+        """Supersede the session's history with messages."""
+        path = self.path(session_id)
+        with self._lock:
+            dead_bytes = path.stat().st_size if path.exists() else 0
+            data = (json.dumps(_RESET) + "\n").encode("utf-8") + self._encode(messages, 0)
+            if dead_bytes > len(data):
+                # More superseded than live data: rewrite instead of appending
+                self._rewrite(session_id, list(messages))
+            else:
+                self._write(session_id, data)
+
+    def compact(self, session_id: str) -> bool:
+        """Rewrite the log with only live messages. Returns True if anything was dropped."""
+        with self._lock:
+            path = self.path(session_id)
+            if not path.exists():
+                return False
+            raw = path.read_bytes()
+            messages, dead = self._parse(raw)
+            if not dead:
+                return False
+            self._rewrite(session_id, messages)
+            return True
+
+    def delete(self, session_id: str):
+        with self._lock:
+            try:
+                self.path(session_id).unlink()
+            except FileNotFoundError:
+                pass
+            self._unsynced.discard(session_id)
+
+    def sync(self):
+        """fsync every file with unsynced appends (called on close and by the interval flusher)."""
+        with self._lock:
+            pending = list(self._unsynced)
+        for session_id in pending:
+            self._fsync_path(session_id)
+
+    def close(self):
+        self._closed.set()
+        self.sync()
+
+    # ==========================================================
+    # READS
+    # ==========================================================
+    def read(self, session_id: str) -> List[Dict]:
+        """Return all live messages, compacting the log if it holds dead records."""
+        path = self.path(session_id)
+        if not path.exists():
+            return []
+        messages, dead = self._parse(path.read_bytes())
+        if dead:
+            # Already paid for the full read; leave a clean file behind
+            with self._lock:
+                self._rewrite(session_id, messages)
+        return messages
+
+    def tail(self, session_id: str, n: int) -> List[Dict]:
+        """
+        Return the last n live messages, reading the file backwards.
+
+        Cost is proportional to the size of those messages, not to the
+        whole conversation.
+        """
+        path = self.path(session_id)
+        if n <= 0 or not path.exists():
+            return []
+
+        found: List[Dict] = []
+        with closing(self._records_backwards(path)) as records:
+            for record in records:
+                if record.get("_reset"):
+                    break
+                found.append(_strip(record))
+                if len(found) == n:
+                    break
+        return list(reversed(found))
+
+    def count(self, session_id: str) -> int:
+        """Number of live messages, read from the last line's position."""
+        path = self.path(session_id)
+        if not path.exists():
+            return 0
+        with closing(self._records_backwards(path)) as records:
+            last = next(records, None)
+        if last is None or last.get("_reset"):
+            return 0
+        if isinstance(last.get(_SEQ), int):
+            return last[_SEQ] + 1
+        # Written before lines carried their position
+        return len(self.read(session_id))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "fsync": self.fsync,
+                "appends": self._appends,
+                "fsyncs": self._fsyncs,
+                "compactions": self._compactions,
+                "unsynced_files": len(self._unsynced)
+            }
+
+    # ==========================================================
+    # INTERNALS
+    # ==========================================================
+    @staticmethod
+    def _encode(messages: List[Dict], start: int) -> bytes:
+        return "".join(
+            json.dumps({**m, _SEQ: start + i}, ensure_ascii=False) + "\n" for i, m in enumerate(messages)
+        ).encode("utf-8")
+
+    def _records_backwards(self, path: Path) -> Iterator[Dict]:
+        """Decoded records from the last line to the first, skipping torn lines."""
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            remainder = b""
+            while position > 0:
+                step = min(self.tail_block_size, position)
+                position -= step
+                f.seek(position)
+                chunk = f.read(step) + remainder
+                lines = chunk.split(b"\n")
+                # The first piece may be a partial line unless we reached the file start
+                remainder = lines.pop(0) if position > 0 else b""
+                for line in reversed(lines):
+                    record = self._decode(line)
+                    if record is not None:
+                        yield record
+
+    @staticmethod
+    def _decode(line: bytes) -> Optional[Dict]:
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            record = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            # Torn write from a crash
+            return None
+        return record if isinstance(record, dict) else None
+
+    def _parse(self, raw: bytes):
+        """Return (live messages, whether the file holds dead records)."""
+        messages: List[Dict] = []
+        dead = False
+        for line in raw.split(b"\n"):
+            if not line.strip():
+                continue
+            record = self._decode(line)
+            if record is None:
+                dead = True
+            elif record.get("_reset"):
+                dead = True
+                messages = []
+            else:
+                messages.append(_strip(record))
+        return messages, dead
+
+    def _write(self, session_id: str, data: bytes):
+        path = self.path(session_id)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "ab") as f:
+                # Fence off a torn last line so the new record starts clean
+                if f.tell() > 0 and not self._ends_with_newline(path):
+                    f.write(b"\n")
+                f.write(data)
+                f.flush()
+                if self.fsync == "always":
+                    os.fsync(f.fileno())
+                    self._fsyncs += 1
+                else:
+                    self._unsynced.add(session_id)
+            self._appends += 1
+            if self.fsync == "interval":
+                self._start_flusher()
+
+    def _start_flusher(self):
+        """Start the background fsync thread on the first deferred append (caller holds _lock)."""
+        if self._flusher is not None or self._closed.is_set():
+            return
+        self._flusher = threading.Thread(target=self._flush_loop, name="atlus-turn-log-fsync", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self):
+        # Syncs on a timer, so a session that goes quiet is still on disk within the interval
+        while not self._closed.wait(self.fsync_interval):
+            try:
+                self.sync()
+            except OSError as e:
+                self.logger.warning(f"Background fsync of history logs failed: {e}")
+
+    @staticmethod
+    def _ends_with_newline(path: Path) -> bool:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _fsync_path(self, session_id: str):
+        path = self.path(session_id)
+        with self._lock:
+            self._unsynced.discard(session_id)
+            if not path.exists():
+                return
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+                self._fsyncs += 1
+            finally:
+                os.close(fd)
+
+    def _rewrite(self, session_id: str, messages: List[Dict]):
+        atomic_write(self.path(session_id), self._encode(messages, 0), fsync=self.fsync != "never")
+        self._unsynced.discard(session_id)
+        self._compactions += 1
+        self.logger.debug(f"Compacted history log for {session_id} ({len(messages)} messages)")
@@ -0,0 +1,130 @@
+"""
+Write-behind persister.
+
+Callers mark records dirty and return immediately; a background thread
+writes them in batches when the flush interval elapses or enough records
+are pending. Repeated updates to the same record between flushes coalesce
+into one write.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List
+
+from utils.logger import get_logger
+
+
+class WriteBehind:
+    """
+    Batching persister.
+
+    Args:
+        name: Used in logs and stats
+        flush_fn: Persists a batch; receives a list of record snapshots
+        interval: Maximum seconds a dirty record waits before being written
+        max_pending: Flush early once this many records are dirty
+
+    Usage:
+        persister = WriteBehind("sessions", storage.save_sessions, interval=1.0)
+        persister.mark_dirty(session_id, session)
+        ...
+        persister.close()  # final flush
+    """
+
+    def __init__(self, name: str, flush_fn: Callable[[List[Dict]], None], interval: float = 1.0, max_pending: int = 100):
+        self.name = name
+        self.flush_fn = flush_fn
+        self.interval = interval
+        self.max_pending = max_pending
+        self.logger = get_logger("atlus.storage.write_behind")
+
+        self._pending: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        # Held for the whole of a flush so discard() can wait out an in-flight batch
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        self._marks = 0
+        self._flushes = 0
+        self._written = 0
+        self._failures = 0
+        self._last_flush_ms = 0.0
+
+    def start(self) -> "WriteBehind":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name=f"write-behind-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def mark_dirty(self, key: str, record: Dict):
+        """Queue a snapshot of record for the next flush."""
+        with self._lock:
+            self._pending[key] = dict(record)
+            self._marks += 1
+            pending = len(self._pending)
+        if pending >= self.max_pending:
+            self._wakeup.set()
+
+    def discard(self, key: str):
+        """Drop a pending write (e.g. the record was deleted), waiting out any in-flight flush."""
+        with self._flush_lock:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def flush(self) -> int:
+        """Write all pending records now. Returns how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            start = time.perf_counter()
+            try:
+                self.flush_fn(list(batch.values()))
+            except Exception as e:
+                # Keep the batch for the next attempt unless newer snapshots arrived meanwhile
+                with self._lock:
+                    for key, record in batch.items():
+                        self._pending.setdefault(key, record)
+                    self._failures += 1
+                self.logger.error(f"Write-behind flush for {self.name} failed ({len(batch)} records): {e}")
+                return 0
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._flushes += 1
+                self._written += len(batch)
+                self._last_flush_ms = elapsed_ms
+            self.logger.debug(f"Flushed {len(batch)} {self.name} records in {elapsed_ms:.1f}ms")
+            return len(batch)
+
+    def close(self):
+        """Stop the background thread and flush what is left."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(self.interval, 1.0) * 5)
+            self._thread = None
+        self.flush()
+
+    def _loop(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            self.flush()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "pending": len(self._pending),
+                "marks": self._marks,
+                "flushes": self._flushes,
+                "written": self._written,
+                "coalesced": max(0, self._marks - self._written - len(self._pending)),
+                "failures": self._failures,
+                "last_flush_ms": round(self._last_flush_ms, 3)
+            }
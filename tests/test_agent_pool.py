@@ -0,0 +1,96 @@
+"""
+Unit tests for AgentPool.
+Tests bounded instance creation, reuse and per-request isolation.
+"""
+
+import threading
+import time
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent.agent_pool import AgentPool, AgentPoolExhausted
+
+
+class DummyAgent:
+    instances = 0
+
+    def __init__(self):
+        DummyAgent.instances += 1
+
+
+@pytest.fixture(autouse=True)
+def reset_instances():
+    DummyAgent.instances = 0
+
+
+class TestAgentPool:
+    """Test suite for AgentPool class."""
+
+    def test_instances_are_reused(self):
+        """Sequential requests reuse a single instance."""
+        pool = AgentPool("dummy", DummyAgent, max_size=4)
+        for _ in range(5):
+            with pool.acquire() as agent:
+                assert isinstance(agent, DummyAgent)
+        assert DummyAgent.instances == 1
+        assert pool.stats()["idle"] == 1
+
+    def test_concurrent_requests_get_distinct_agents(self):
+        """Two overlapping requests never share an instance."""
+        pool = AgentPool("dummy", DummyAgent, max_size=2)
+        with pool.acquire() as first:
+            with pool.acquire() as second:
+                assert first is not second
+                assert pool.stats()["in_use"] == 2
+        assert pool.stats()["in_use"] == 0
+
+    def test_exhausted_pool_times_out(self):
+        """Acquire fails with AgentPoolExhausted once max_size are in use."""
+        pool = AgentPool("dummy", DummyAgent, max_size=1, acquire_timeout=0.05)
+        with pool.acquire():
+            with pytest.raises(AgentPoolExhausted):
+                with pool.acquire():
+                    pass
+        assert pool.stats()["timeouts"] == 1
+
+    def test_waiter_gets_released_agent(self):
+        """A waiting request receives the instance as soon as it is returned."""
+        pool = AgentPool("dummy", DummyAgent, max_size=1, acquire_timeout=2)
+        results = []
+
+        def worker():
+            with pool.acquire() as agent:
+                results.append(agent)
+
+        with pool.acquire() as held:
+            thread = threading.Thread(target=worker)
+            thread.start()
+            time.sleep(0.05)
+        thread.join()
+        assert results == [held]
+        assert DummyAgent.instances == 1
+
+    def test_failed_factory_does_not_consume_capacity(self):
+        """A factory error frees the slot it reserved."""
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return DummyAgent()
+
+        pool = AgentPool("dummy", flaky, max_size=1)
+        with pytest.raises(RuntimeError):
+            with pool.acquire():
+                pass
+        with pool.acquire() as agent:
+            assert isinstance(agent, DummyAgent)
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            AgentPool("dummy", DummyAgent, max_size=0)
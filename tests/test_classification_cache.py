@@ -0,0 +1,93 @@
+"""
+Unit tests for ClassificationCache.
+Tests message normalisation, LRU eviction, persistence and hit-rate stats.
+"""
+
+import json
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from llm.classification_cache import ClassificationCache, normalize_message
+
+
+SIMPLE = {"intent_type": "simple", "confidence": 0.9, "reasoning": "test"}
+COMPLEX = {"intent_type": "complex", "confidence": 0.95, "reasoning": "test"}
+
+
+class TestClassificationCache:
+    """Test suite for ClassificationCache class."""
+
+    def test_normalize_message(self):
+        """Case, whitespace and framing punctuation are ignored."""
+        assert normalize_message("  Can you   EXPLAIN (this)! ") == "can you explain this"
+        assert normalize_message("Explaining things?", stem=True) == normalize_message("explain things?", stem=True)
+
+    def test_normalize_keeps_intent_symbols(self):
+        """Symbols that change what is asked keep messages apart."""
+        assert normalize_message("what is 2+2?") != normalize_message("what is 22")
+        assert normalize_message("C++ vs C") != normalize_message("c vs c")
+        assert normalize_message("c# tips", stem=True) != normalize_message("c tips", stem=True)
+        assert normalize_message("is it 2.5?") != normalize_message("is it 25?")
+
+        cache = ClassificationCache(path=None)
+        cache.put("what is 2+2?", SIMPLE)
+        assert cache.get("what is 22") is None
+        assert cache.get("What is 2+2??") == SIMPLE
+
+    def test_hit_after_put(self):
+        """Normalised variants of a message hit the same entry."""
+        cache = ClassificationCache(path=None)
+        assert cache.get("How do I do Y?") is None
+        cache.put("How do I do Y?", SIMPLE)
+        assert cache.get("  how do i DO y?") == SIMPLE
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["llm_calls_avoided"] == 1
+
+    def test_non_llm_hits_do_not_count_as_avoided_calls(self):
+        """Only entries produced by the LLM count towards avoided calls."""
+        cache = ClassificationCache(path=None)
+        cache.put("hi", SIMPLE, source="heuristic")
+        cache.get("hi")
+        assert cache.stats()["llm_calls_avoided"] == 0
+
+    def test_lru_eviction(self):
+        """Least recently used entries are evicted first."""
+        cache = ClassificationCache(path=None, max_entries=2)
+        cache.put("a message", SIMPLE)
+        cache.put("b message", COMPLEX)
+        cache.get("a message")
+        cache.put("c message", SIMPLE)
+        assert cache.get("b message") is None
+        assert cache.get("a message") == SIMPLE
+        assert cache.stats()["entries"] == 2
+
+    def test_returned_entries_are_copies(self):
+        """Callers mutating results do not corrupt the cache."""
+        cache = ClassificationCache(path=None)
+        cache.put("hello", SIMPLE)
+        cache.get("hello")["intent_type"] = "complex"
+        assert cache.get("hello")["intent_type"] == "simple"
+
+    def test_persistence(self, tmp_path):
+        """Entries survive a restart."""
+        path = tmp_path / "cache.json"
+        cache = ClassificationCache(path=path)
+        cache.put("explain recursion", SIMPLE)
+        cache.save()
+
+        reloaded = ClassificationCache(path=path)
+        assert reloaded.get("Explain recursion.") == SIMPLE
+
+    def test_older_key_versions_are_ignored(self, tmp_path):
+        """Entries keyed by an older normalisation are not reused."""
+        path = tmp_path / "cache.json"
+        path.write_text(json.dumps([["what is 2 2", {"classification": COMPLEX, "source": "llm"}]]))
+        assert ClassificationCache(path=path).stats()["entries"] == 0
@@ -0,0 +1,184 @@
+"""
+Unit tests for the per-session context cache.
+Tests version vectors, full-context reuse and incremental history updates.
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from context.context_cache import ContextCache
+
+
+TURN = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+REQUEST = ("You are ATLUS.", "user_1", "hi")
+
+
+class TestVersions:
+    """Version vector bookkeeping."""
+
+    def test_bump_changes_only_that_component(self):
+        cache = ContextCache()
+        before = cache.vector("s1", "user_1")
+        cache.bump("working", "s1")
+        after = cache.vector("s1", "user_1")
+        assert before[0] == after[0] and before[1] != after[1]
+        assert cache.vector("s2", "user_1") == (0, 0, 0, 0)
+
+    def test_long_term_is_per_user(self):
+        cache = ContextCache()
+        cache.bump("long_term", "user_1")
+        assert cache.vector("s1", "user_1")[2] == cache.vector("s2", "user_1")[2] != 0
+        assert cache.vector("s1", "user_2")[2] == 0
+
+    def test_unknown_component(self):
+        with pytest.raises(ValueError):
+            ContextCache().bump("episodic", "s1")
+
+
+class TestContextReuse:
+    """Full context is reused only for the same request at the same vector."""
+
+    def test_hit_and_miss(self):
+        cache = ContextCache()
+        vector = cache.vector("s1", "user_1")
+        assert cache.lookup("s1", vector, REQUEST) is None
+        cache.store("s1", "user_1", vector, REQUEST, [{"role": "system", "content": "x"}])
+        assert cache.lookup("s1", vector, REQUEST) == [{"role": "system", "content": "x"}]
+        assert cache.lookup("s1", vector, ("You are ATLUS.", "user_1", "bye")) is None
+
+        cache.bump("behavior", "s1")
+        assert cache.lookup("s1", cache.vector("s1", "user_1"), REQUEST) is None
+        assert cache.stats()["hits"] == 1
+
+    def test_returns_copies(self):
+        cache = ContextCache()
+        vector = cache.vector("s1", "user_1")
+        cache.store("s1", "user_1", vector, REQUEST, [{"role": "system", "content": "x"}])
+        cache.lookup("s1", vector, REQUEST)[0]["content"] = "mutated"
+        assert cache.lookup("s1", vector, REQUEST)[0]["content"] == "x"
+
+    def test_stale_build_is_not_stored(self):
+        """A context built while memory changed underneath is dropped."""
+        cache = ContextCache()
+        vector = cache.vector("s1", "user_1")
+        cache.bump("long_term", "user_1")
+        cache.store("s1", "user_1", vector, REQUEST, [{"role": "system", "content": "old"}])
+        assert cache.lookup("s1", vector, REQUEST) is None
+
+    def test_disabled(self):
+        cache = ContextCache(max_entries=0)
+        vector = cache.vector("s1", "user_1")
+        cache.store("s1", "user_1", vector, REQUEST, [])
+        assert cache.lookup("s1", vector, REQUEST) is None
+        assert len(cache) == 0
+
+    def test_lru_bound(self):
+        cache = ContextCache(max_entries=2)
+        for session_id in ("s1", "s2", "s3"):
+            cache.store(session_id, "user_1", cache.vector(session_id, "user_1"), REQUEST, [])
+        assert "s1" not in cache and len(cache) == 2
+
+
+class TestIncrementalHistory:
+    """Saved turns carry the cached history segment forward."""
+
+    def test_summarized_segment_appends(self):
+        cache = ContextCache()
+        cache.store_history("s1", cache.version("session", "s1"), list(TURN), summarized=True)
+        assert cache.append_turn("s1", TURN, window=lambda: pytest.fail("window not needed"))
+        history, summarized = cache.history("s1", cache.version("session", "s1"))
+        assert summarized and history == TURN + TURN
+        assert cache.stats()["incremental_updates"] == 1
+
+    def test_window_segment_rereads(self):
+        cache = ContextCache()
+        cache.store_history("s1", 0, [], summarized=False)
+        assert cache.append_turn("s1", TURN, window=lambda: TURN)
+        assert cache.history("s1", cache.version("session", "s1")) == (TURN, False)
+
+    def test_turn_drops_full_context(self):
+        cache = ContextCache()
+        vector = cache.vector("s1", "user_1")
+        cache.store_history("s1", vector[0], [], summarized=True)
+        cache.store("s1", "user_1", vector, REQUEST, [])
+        cache.append_turn("s1", TURN, window=list)
+        assert cache.lookup("s1", cache.vector("s1", "user_1"), REQUEST) is None
+
+    def test_stale_segment_not_extended(self):
+        """A segment from before an unrelated session change is rebuilt, not extended."""
+        cache = ContextCache()
+        cache.store_history("s1", 0, [], summarized=True)
+        cache.bump("session", "s1")
+        assert not cache.append_turn("s1", TURN, window=list)
+        assert cache.history("s1", cache.version("session", "s1")) is None
+
+    def test_invalidate(self):
+        cache = ContextCache()
+        cache.bump("session", "s1")
+        cache.store_history("s1", cache.version("session", "s1"), [], summarized=True)
+        cache.invalidate("s1")
+        assert "s1" not in cache
+        # Forgotten: reads like a session the cache has never seen
+        assert cache.vector("s1", "user_1") == cache.vector("s_new", "user_new")
+        assert cache.stats()["versions"] == 0
+
+
+class TestVersionRetention:
+    """Versions do not outlive the entries they describe."""
+
+    def test_lru_eviction_drops_versions(self):
+        cache = ContextCache(max_entries=2)
+        for i in range(100):
+            session_id, user_id = f"s{i}", f"user_{i}"
+            cache.bump("session", session_id)
+            cache.bump("long_term", user_id)
+            cache.store(session_id, user_id, cache.vector(session_id, user_id), REQUEST, [])
+        assert len(cache) == 2
+        assert cache.stats()["versions"] <= 2 * 4
+
+    def test_user_version_kept_while_a_session_uses_it(self):
+        cache = ContextCache(max_entries=2)
+        cache.bump("long_term", "user_1")
+        for session_id in ("s1", "s2"):
+            cache.store(session_id, "user_1", cache.vector(session_id, "user_1"), REQUEST, [{"role": "system"}])
+        cache.store("s3", "user_2", cache.vector("s3", "user_2"), REQUEST, [])  # evicts s1
+        vector = cache.vector("s2", "user_1")
+        assert cache.lookup("s2", vector, REQUEST) == [{"role": "system"}]
+
+    def test_versions_without_entries_are_pruned(self):
+        cache = ContextCache(max_entries=2, max_versions=10)
+        for i in range(1000):
+            cache.bump("session", f"s{i}")
+        assert cache.stats()["versions"] <= 20
+        assert cache.stats()["versions_pruned"] > 0
+
+    def test_cached_entries_survive_pruning(self):
+        cache = ContextCache(max_entries=2, max_versions=10)
+        vector = cache.vector("s1", "user_1")
+        cache.store("s1", "user_1", vector, REQUEST, [{"role": "system"}])
+        for i in range(100):
+            cache.bump("working", f"other_{i}")
+        assert cache.lookup("s1", cache.vector("s1", "user_1"), REQUEST) == [{"role": "system"}]
+
+    def test_build_across_eviction_is_not_stored(self):
+        """A vector read before the session's versions were dropped never matches after."""
+        cache = ContextCache(max_entries=1)
+        cache.store("s1", "user_1", cache.vector("s1", "user_1"), REQUEST, [])
+        vector = cache.vector("s1", "user_1")  # build starts
+        cache.bump("working", "s1")            # memory changes mid-build
+        cache.store("s2", "user_2", cache.vector("s2", "user_2"), REQUEST, [])  # evicts s1
+        cache.store("s1", "user_1", vector, REQUEST, [{"role": "system", "content": "stale"}])
+        assert cache.lookup("s1", vector, REQUEST) is None
+
+    def test_first_build_survives_evicting_another_entry(self):
+        """Creating an entry in a full cache keeps the vector the build started from."""
+        cache = ContextCache(max_entries=1)
+        cache.store("s1", "user_1", cache.vector("s1", "user_1"), REQUEST, [])
+        vector = cache.vector("s2", "user_2")
+        cache.store_history("s2", vector[0], [], summarized=True, user_id="user_2")  # evicts s1
+        cache.store("s2", "user_2", vector, REQUEST, [{"role": "system"}])
+        assert cache.lookup("s2", cache.vector("s2", "user_2"), REQUEST) == [{"role": "system"}]
@@ -0,0 +1,87 @@
+"""
+Unit tests for ContextPacker.
+Tests section tagging, budget enforcement, value-per-token ordering and drop reports.
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from context.packer import ContextPacker, SUMMARY_PREFIX
+from context.summarizer import estimate_tokens
+
+
+def context(turns=6, size=200):
+    messages = [
+        {"role": "system", "content": "You are ATLUS."},
+        {"role": "system", "content": "User preferences: preferred_language=Python"},
+        {"role": "system", "content": f"{SUMMARY_PREFIX}\nthe user is building a todo app"},
+    ]
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"q{i} " + "x" * size})
+        messages.append({"role": "assistant", "content": f"a{i} " + "y" * size})
+    return messages
+
+
+@pytest.fixture
+def packer():
+    return ContextPacker()
+
+
+class TestContextPacker:
+    """Test suite for ContextPacker class."""
+
+    def test_split_tags_sections(self, packer):
+        items = packer.split(context(turns=2))
+        assert [item.section for item in items] == ["system", "memory", "summary", "history", "history"]
+        assert items[0].required
+        assert items[-1].value > items[-2].value  # newer turns are worth more
+
+    def test_under_budget_is_unchanged(self, packer):
+        messages = context(turns=2)
+        result = packer.pack(messages, budget=10_000)
+        assert result.messages == messages
+        assert result.dropped == []
+
+    def test_over_budget_drops_oldest_history_first(self, packer):
+        messages = context(turns=6)
+        result = packer.pack(messages, budget=300)
+        assert result.used_tokens <= 300
+        assert result.messages[0]["content"] == "You are ATLUS."
+        kept = [m["content"][:2] for m in result.messages if m["role"] == "user"]
+        assert kept and kept[-1] == "q5"
+        assert "q0" not in kept
+        assert {d["section"] for d in result.dropped} == {"history"}
+        assert result.dropped_tokens == estimate_tokens(messages) - result.used_tokens
+
+    def test_turns_are_kept_whole(self, packer):
+        result = packer.pack(context(turns=6), budget=300)
+        roles = [m["role"] for m in result.messages if m["role"] != "system"]
+        assert roles == ["user", "assistant"] * (len(roles) // 2)
+
+    def test_required_items_kept_over_budget(self, packer):
+        messages = context(turns=2) + [{"role": "user", "content": "current " + "z" * 400}]
+        result = packer.pack(messages, budget=50, user_message=messages[-1]["content"])
+        assert result.messages[0]["content"] == "You are ATLUS."
+        assert result.messages[-1] == messages[-1]
+        assert result.used_tokens > 50
+
+    def test_weights_change_priority(self):
+        """With memory weighted below history, memory is dropped first."""
+        packer = ContextPacker(weights={"memory": 0.01, "summary": 0.01})
+        messages = context(turns=1, size=20)
+        budget = estimate_tokens(messages) - 5
+        result = packer.pack(messages, budget=budget)
+        assert {d["section"] for d in result.dropped} <= {"memory", "summary"}
+        assert result.dropped
+
+    def test_stats(self, packer):
+        packer.pack(context(turns=1), budget=10_000)
+        packer.pack(context(turns=6), budget=300)
+        stats = packer.stats()
+        assert stats["packs"] == 2
+        assert stats["packs_trimmed"] == 1
+        assert stats["dropped_items"]["history"] >= 1
@@ -0,0 +1,115 @@
+"""
+Unit tests for ExpiryQueue and ExpirySweeper.
+Tests deadline ordering, rescheduling, cancellation and batched sweeps.
+"""
+
+import threading
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from storage.expiry import ExpiryQueue, ExpirySweeper
+
+
+class TestExpiryQueue:
+    """Test suite for ExpiryQueue class."""
+
+    def test_pop_expired_in_deadline_order(self):
+        queue = ExpiryQueue()
+        queue.schedule("late", 30)
+        queue.schedule("early", 10)
+        queue.schedule("future", 100)
+        assert queue.pop_expired(now=50) == ["early", "late"]
+        assert len(queue) == 1
+        assert queue.next_deadline() == 100
+
+    def test_reschedule_skips_stale_entry(self):
+        """Touching a key moves its deadline; the old heap entry is ignored."""
+        queue = ExpiryQueue()
+        queue.schedule("s1", 10)
+        queue.schedule("s1", 100)
+        assert queue.pop_expired(now=50) == []
+        assert not queue.is_expired("s1", now=50)
+        assert queue.pop_expired(now=150) == ["s1"]
+
+    def test_cancel(self):
+        queue = ExpiryQueue()
+        queue.schedule("s1", 10)
+        assert queue.cancel("s1") is True
+        assert queue.cancel("s1") is False
+        assert queue.pop_expired(now=50) == []
+        assert queue.next_deadline() is None
+
+    def test_limit(self):
+        queue = ExpiryQueue()
+        for i in range(5):
+            queue.schedule(f"s{i}", i)
+        assert queue.pop_expired(now=10, limit=2) == ["s0", "s1"]
+        assert len(queue) == 3
+
+    def test_heap_rebuild_keeps_deadlines(self):
+        """Frequent touches trigger a rebuild without losing keys."""
+        queue = ExpiryQueue()
+        for i in range(3000):
+            queue.schedule("hot", float(i))
+        queue.schedule("cold", 5000.0)
+        assert len(queue._heap) < 3000
+        assert queue.pop_expired(now=10_000) == ["hot", "cold"]
+
+
+class TestExpirySweeper:
+    """Test suite for ExpirySweeper class."""
+
+    def test_sweep_drains_in_batches(self):
+        queue = ExpiryQueue()
+        for i in range(7):
+            queue.schedule(f"s{i}", 0)
+        expired = []
+
+        def on_expire(key):
+            expired.append(key)
+            return True
+
+        sweeper = ExpirySweeper("session", queue, on_expire, batch_size=3)
+        assert sweeper.sweep(now=1) == 7
+        assert len(expired) == 7
+        stats = sweeper.stats()
+        assert stats["last_reclaimed"] == 7
+        assert stats["scheduled"] == 0
+
+    def test_failed_expiry_is_counted(self):
+        queue = ExpiryQueue()
+        queue.schedule("bad", 0)
+        queue.schedule("good", 0)
+
+        def on_expire(key):
+            if key == "bad":
+                raise OSError("file busy")
+            return True
+
+        sweeper = ExpirySweeper("session", queue, on_expire)
+        assert sweeper.sweep(now=1) == 1
+        assert sweeper.stats()["errors"] == 1
+
+    def test_nothing_to_reclaim_is_not_counted(self):
+        """Keys whose on_expire returns False (touched again, already gone) are skipped, not reclaimed."""
+        queue = ExpiryQueue()
+        for key in ("stale", "touched", "expired"):
+            queue.schedule(key, 0)
+        sweeper = ExpirySweeper("session", queue, lambda key: key == "expired")
+        assert sweeper.sweep(now=1) == 1
+        stats = sweeper.stats()
+        assert stats["reclaimed_total"] == 1
+        assert stats["skipped_total"] == 2
+        assert stats["errors"] == 0
+
+    def test_background_thread(self):
+        queue = ExpiryQueue()
+        queue.schedule("s1", 0)
+        done = threading.Event()
+        sweeper = ExpirySweeper("session", queue, lambda key: done.set(), interval=0.01).start()
+        assert done.wait(timeout=2)
+        sweeper.stop()
@@ -0,0 +1,104 @@
+"""
+Unit tests for FactBatcher.
+Tests skipping unchanged values, per-user coalescing within the window and the final flush.
+"""
+
+import threading
+import time
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from storage import FactBatcher
+
+
+class RecordingApply:
+    def __init__(self):
+        self.calls = []
+        self.applied = threading.Event()
+
+    def __call__(self, user_id, facts):
+        self.calls.append((user_id, dict(facts)))
+        self.applied.set()
+
+
+class TestFactBatcher:
+    """Test suite for FactBatcher class."""
+
+    def test_unchanged_values_are_skipped(self):
+        apply = RecordingApply()
+        batcher = FactBatcher("long_term", apply, window=0)
+        assert batcher.update("u1", {"lang": "Python"}, current={"lang": "Python"}) == {}
+        assert apply.calls == []
+        assert batcher.update("u1", {"lang": "Go", "style": "brief"}, current={"lang": "Python"}) == {
+            "lang": "Go", "style": "brief"
+        }
+        assert apply.calls == [("u1", {"lang": "Go", "style": "brief"})]
+        assert batcher.stats()["unchanged_skipped"] == 1
+
+    def test_updates_coalesce_per_user(self):
+        apply = RecordingApply()
+        batcher = FactBatcher("long_term", apply, window=3600).start()
+        try:
+            batcher.update("u1", {"lang": "Python"})
+            batcher.update("u1", {"lang": "Go", "style": "brief"})
+            batcher.update("u1", {"style": "brief"})  # already pending
+            batcher.update("u2", {"lang": "Rust"})
+            assert apply.calls == []
+            assert batcher.pending("u1") == {"lang": "Go", "style": "brief"}
+        finally:
+            batcher.close()
+        assert sorted(apply.calls) == [("u1", {"lang": "Go", "style": "brief"}), ("u2", {"lang": "Rust"})]
+        stats = batcher.stats()
+        assert stats["coalesced"] == 1 and stats["unchanged_skipped"] == 1 and stats["batches"] == 2
+
+    def test_window_elapses(self):
+        apply = RecordingApply()
+        batcher = FactBatcher("long_term", apply, window=0.05).start()
+        try:
+            batcher.update("u1", {"lang": "Python"})
+            assert apply.applied.wait(2)
+            assert apply.calls == [("u1", {"lang": "Python"})]
+            assert batcher.pending("u1") == {}
+        finally:
+            batcher.close()
+
+    def test_max_delay_bounds_a_busy_user(self):
+        apply = RecordingApply()
+        batcher = FactBatcher("long_term", apply, window=0.2, max_delay=0.3).start()
+        try:
+            deadline = time.monotonic() + 2
+            i = 0
+            while not apply.applied.is_set() and time.monotonic() < deadline:
+                batcher.update("u1", {"counter": i})
+                i += 1
+                time.sleep(0.02)
+            assert apply.applied.is_set()
+        finally:
+            batcher.close()
+
+    def test_discard(self):
+        apply = RecordingApply()
+        batcher = FactBatcher("long_term", apply, window=3600).start()
+        batcher.update("u1", {"lang": "Python", "style": "brief"})
+        batcher.discard("u1", "lang")
+        batcher.close()
+        assert apply.calls == [("u1", {"style": "brief"})]
+
+    def test_failed_batch_is_retried(self):
+        calls = []
+
+        def flaky(user_id, facts):
+            calls.append(dict(facts))
+            if len(calls) == 1:
+                raise OSError("disk full")
+
+        batcher = FactBatcher("long_term", flaky, window=3600)
+        batcher.update("u1", {"lang": "Python"})
+        assert batcher.pending("u1") == {"lang": "Python"}
+        assert batcher.flush() == 1
+        assert calls == [{"lang": "Python"}, {"lang": "Python"}]
+        assert batcher.stats()["failures"] == 1
@@ -0,0 +1,99 @@
+"""
+Unit tests for FactIndex.
+Tests relevance ranking, incremental upsert/delete, sync and persistence.
+"""
+
+import json
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from context.fact_index import FactIndex, embed
+
+
+FACTS = {
+    "preferred_language": "Python",
+    "prefers_free_tier": True,
+    "favorite_database": "PostgreSQL",
+    "deploy_target": "AWS Lambda",
+    "editor": "neovim with vim keybindings",
+    "timezone": "Europe/Berlin",
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = FactIndex.load("user_1", tmp_path)
+    index.sync(FACTS)
+    return index
+
+
+class TestFactIndex:
+    """Test suite for FactIndex class."""
+
+    def test_embed_is_normalised(self):
+        vector = embed("preferred language: Python")
+        assert abs(sum(w * w for w in vector.values()) - 1.0) < 1e-9
+        assert embed("") == {}
+
+    def test_search_ranks_relevant_fact_first(self, index):
+        assert index.search("which database should I use?", k=1)[0][0] == "favorite_database"
+        assert index.search("write it in python please", k=1)[0][0] == "preferred_language"
+
+    def test_search_respects_k_and_min_score(self, index):
+        assert len(index.search("python database lambda", k=2)) == 2
+        assert index.search("zzzz qqqq", k=5, min_score=0.2) == []
+
+    def test_upsert_replaces_old_vector(self, index):
+        """Updating a value drops the old value's features from the postings."""
+        assert index.upsert("favorite_database", "SQLite") is True
+        assert index.upsert("favorite_database", "SQLite") is False
+        hits = dict(index.search("postgresql", k=10))
+        assert "favorite_database" not in hits or hits["favorite_database"] < 0.3
+        assert index.search("sqlite", k=1)[0][0] == "favorite_database"
+
+    def test_delete(self, index):
+        assert index.delete("timezone") is True
+        assert index.delete("timezone") is False
+        assert "timezone" not in index
+        assert all(key != "timezone" for key, _ in index.search("berlin timezone", k=10))
+
+    def test_sync_removes_and_adds(self, index):
+        facts = dict(FACTS)
+        del facts["editor"]
+        facts["shell"] = "zsh"
+        assert index.sync(facts) == 2
+        assert sorted(index.keys()) == sorted(facts)
+        assert index.sync(facts) == 0
+
+    def test_persistence_roundtrip(self, index, tmp_path):
+        index.delete("editor")
+        reloaded = FactIndex.load("user_1", tmp_path)
+        assert sorted(reloaded.keys()) == sorted(index.keys())
+        assert reloaded.search("postgres database", k=1) == index.search("postgres database", k=1)
+
+    def test_corrupt_file_starts_empty(self, tmp_path):
+        (tmp_path / "user_1.json").write_text("{not json", encoding="utf-8")
+        index = FactIndex.load("user_1", tmp_path)
+        assert len(index) == 0
+        index.sync(FACTS)
+        assert len(json.loads((tmp_path / "user_1.json").read_text())["facts"]) == len(FACTS)
+
+    def test_similar_user_ids_get_their_own_files(self, tmp_path):
+        first = FactIndex.load("alice@corp.com", tmp_path)
+        first.upsert("preferred_language", "Rust")
+        assert len(FactIndex.load("alice_corp.com", tmp_path)) == 0
+        assert FactIndex.load("alice@corp.com", tmp_path).keys() == ["preferred_language"]
+
+    def test_file_of_another_user_is_discarded(self, index, tmp_path):
+        os.replace(tmp_path / "user_1.json", tmp_path / "user_2.json")
+        assert len(FactIndex.load("user_2", tmp_path)) == 0
+
+    def test_in_memory_index(self):
+        index = FactIndex("user_1")
+        index.upsert("preferred_language", "Go")
+        index.save()  # no path: nothing written
+        assert index.search("golang or go?", k=1)[0][0] == "preferred_language"
@@ -0,0 +1,122 @@
+"""
+Unit tests for cross-process file locking and atomic writes.
+Tests lock timeouts and contention counters, and FileStorage shared by several processes.
+"""
+
+import multiprocessing
+import pytest
+import sys
+import os
+import time
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from storage import FileLock, FileStorage, LockTimeout
+from storage.file_lock import atomic_write, lock_stats, quarantine
+
+fcntl_only = pytest.mark.skipif(sys.platform == "win32", reason="fcntl locks are POSIX-only")
+
+
+def _hold_lock(path, ready, seconds):
+    with FileLock(path):
+        ready.set()
+        time.sleep(seconds)
+
+
+def _write_facts(data_dir, worker, n):
+    storage = FileStorage(data_dir, fsync="never")
+    for i in range(n):
+        storage.update_long_term("user_1", {f"w{worker}_{i}": i})
+        storage.save_session({"session_id": f"w{worker}_{i}", "user_id": "user_1", "last_activity": ""})
+
+
+def _context():
+    return multiprocessing.get_context("fork")
+
+
+class TestAtomicWrite:
+    """Atomic replace and quarantine."""
+
+    def test_replaces_without_leftovers(self, tmp_path):
+        path = tmp_path / "data.json"
+        atomic_write(path, "one")
+        atomic_write(path, b"two", fsync=False)
+        assert path.read_text() == "two"
+        assert os.listdir(tmp_path) == ["data.json"]
+
+    def test_quarantine(self, tmp_path):
+        path = tmp_path / "sessions.json"
+        path.write_text("{not json")
+        moved = quarantine(path)
+        assert not path.exists()
+        assert moved.read_text() == "{not json"
+        assert quarantine(path) is None
+
+
+@fcntl_only
+class TestFileLock:
+    """Advisory locking between processes."""
+
+    def test_reentrant(self, tmp_path):
+        lock = FileLock(tmp_path / "a.lock")
+        with lock:
+            with lock:
+                pass
+        with FileLock(tmp_path / "a.lock", timeout=0):
+            pass
+
+    def test_timeout_and_contention(self, tmp_path):
+        path = tmp_path / "a.lock"
+        ctx = _context()
+        ready = ctx.Event()
+        holder = ctx.Process(target=_hold_lock, args=(path, ready, 0.5))
+        holder.start()
+        try:
+            assert ready.wait(5)
+            before = lock_stats()
+            with pytest.raises(LockTimeout):
+                FileLock(path, timeout=0.05).acquire()
+            with FileLock(path, timeout=5):
+                pass
+            after = lock_stats()
+        finally:
+            holder.join()
+        assert after["timeouts"] == before["timeouts"] + 1
+        assert after["contended"] >= before["contended"] + 2
+        assert after["wait_ms_max"] > 0
+
+
+@fcntl_only
+class TestSharedFileStorage:
+    """Several processes writing one data directory."""
+
+    def test_no_lost_updates(self, tmp_path):
+        ctx = _context()
+        workers = [ctx.Process(target=_write_facts, args=(tmp_path, w, 15)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            assert worker.exitcode == 0
+
+        storage = FileStorage(tmp_path, fsync="never")
+        assert len(storage.load_long_term("user_1")) == 60
+        assert len(storage.load_sessions()) == 60
+
+    def test_sees_other_process_sessions(self, tmp_path):
+        first = FileStorage(tmp_path, fsync="never")
+        second = FileStorage(tmp_path, fsync="never")
+        first.save_session({"session_id": "a", "user_id": "u"})
+        assert second.get_session("a") is not None
+        second.save_session({"session_id": "b", "user_id": "u"})
+        assert set(first.load_sessions()) == {"a", "b"}
+
+    def test_corrupt_sessions_file_is_kept(self, tmp_path):
+        (tmp_path / "sessions.json").write_text('{"a": {"session_id": "a"')
+        storage = FileStorage(tmp_path, fsync="never")
+        assert storage.load_sessions() == {}
+        corrupt = list(tmp_path.glob("sessions.json.corrupt-*"))
+        assert len(corrupt) == 1
+        storage.save_session({"session_id": "b", "user_id": "u"})
+        assert corrupt[0].read_text() == '{"a": {"session_id": "a"'
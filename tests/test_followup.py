@@ -0,0 +1,115 @@
+"""
+Unit tests for the follow-up fast path.
+Tests refinement detection and TaskAgent answering follow-ups against its stored draft.
+"""
+
+import pytest
+import time
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent.followup import FollowupDetector
+from agent.task_agent import TaskAgent
+
+
+INTENT = {"goal": "Build a REST API", "constraints": ["Python"], "expected_output": "Code"}
+
+
+def _state(**overrides):
+    state = {
+        "intent": INTENT, "plan": ["Design routes", "Write handlers"], "draft": "API draft",
+        "request": "build a REST API", "followups": 0, "updated_at": time.time()
+    }
+    state.update(overrides)
+    return state
+
+
+class TestFollowupDetector:
+    """Refinement heuristics."""
+
+    @pytest.mark.parametrize("message", [
+        "now add OAuth to that",
+        "also include unit tests",
+        "rename it to UserService",
+        "change the code to use async handlers",
+        "please add logging to it",
+        "looks good. now remove the debug prints from the code",
+    ])
+    def test_refinements(self, message):
+        assert FollowupDetector().is_followup(message, _state())
+
+    @pytest.mark.parametrize("message", [
+        "make an app that uses flask",
+        "write a function that sorts a list",
+        "what is OAuth?",
+        "hi",
+        "thanks, I will use it",
+        "ok, how does it handle errors?",
+        "great, does this support python 3.8?",
+        "and what if I use postgres instead?",
+        "can you add tests to it?",
+        "I might use that later",
+    ])
+    def test_new_requests(self, message):
+        assert not FollowupDetector().is_followup(message, _state())
+
+    def test_needs_recent_state(self):
+        detector = FollowupDetector(max_age_seconds=60)
+        assert not detector.is_followup("now add OAuth to that", None)
+        assert not detector.is_followup("now add OAuth to that", _state(updated_at=time.time() - 120))
+
+    def test_chain_and_length_limits(self):
+        detector = FollowupDetector(max_chain=2, max_length=40)
+        assert not detector.is_followup("now add OAuth to that", _state(followups=2))
+        assert not detector.is_followup("now add OAuth to that " + "x" * 40, _state())
+
+
+class TestTaskAgentFollowup:
+    """run_task keeps its state; refine reuses it."""
+
+    @pytest.fixture
+    def agent(self):
+        with patch('agent.task_agent.get_llm', side_effect=lambda role: Mock(name=role)):
+            agent = TaskAgent()
+        agent.intent_llm.generate.return_value = (
+            '{"goal": "Build a REST API", "constraints": ["Python"], "expected_output": "Code"}'
+        )
+        agent.planning_llm.generate.return_value = '{"plan": ["Design routes", "Write handlers"]}'
+        agent.reasoning_llm.generate.return_value = "API draft"
+        agent.verifier_llm.generate.return_value = '{"issues": [], "suggested_fixes": []}'
+        agent.writer_llm.generate.return_value = "Final answer"
+        return agent
+
+    def test_run_task_returns_state(self, agent):
+        final, state = agent.run_task("build a REST API")
+        assert final == "Final answer"
+        assert state["intent"]["goal"] == "Build a REST API"
+        assert state["plan"] == ["Design routes", "Write handlers"]
+        assert state["draft"] == "API draft"
+        assert state["followups"] == 0
+
+    def test_refine_skips_intent_planning_and_verification(self, agent):
+        agent.reasoning_llm.generate.side_effect = ["OAuth section", "API draft with OAuth"]
+        final, state = agent.refine("now add OAuth to that", _state())
+
+        assert final == "Final answer"
+        assert state["draft"] == "API draft with OAuth"
+        assert state["followups"] == 1
+        assert agent.reasoning_llm.generate.call_count == 2  # delta + merge
+        agent.writer_llm.generate.assert_called_once()
+        agent.intent_llm.generate.assert_not_called()
+        agent.planning_llm.generate.assert_not_called()
+        agent.verifier_llm.generate.assert_not_called()
+
+        delta_prompt = agent.reasoning_llm.generate.call_args_list[0][0][0]
+        assert "API draft" in delta_prompt[-1]["content"]
+        assert "now add OAuth to that" in delta_prompt[-1]["content"]
+
+    def test_refine_empty_delta_raises(self, agent):
+        agent.reasoning_llm.generate.return_value = "  "
+        with pytest.raises(RuntimeError):
+            agent.refine("now add OAuth to that", _state())
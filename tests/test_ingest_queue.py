@@ -0,0 +1,109 @@
+"""
+Unit tests for IngestQueue.
+Tests per-key ordering, waiting for a key, backpressure, non-blocking submits, failures and drain on close.
+"""
+
+import threading
+import time
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from storage.ingest_queue import IngestQueue
+
+
+@pytest.fixture
+def ingest():
+    ingest = IngestQueue("test", workers=4).start()
+    yield ingest
+    ingest.close(timeout=5)
+
+
+class TestIngestQueue:
+    """Test suite for IngestQueue class."""
+
+    def test_per_key_order(self, ingest):
+        """Jobs for one key run in submission order, even across many keys."""
+        seen = {}
+        lock = threading.Lock()
+
+        def record(key, i):
+            time.sleep(0.0005 * (i % 3))
+            with lock:
+                seen.setdefault(key, []).append(i)
+
+        for i in range(50):
+            for key in ("s1", "s2", "s3"):
+                ingest.submit(key, record, key, i)
+        assert ingest.drain(timeout=5)
+        assert all(seen[key] == list(range(50)) for key in ("s1", "s2", "s3"))
+
+    def test_wait_for_key(self, ingest):
+        release = threading.Event()
+        done = []
+        ingest.submit("s1", lambda: (release.wait(2), done.append(1)))
+        assert ingest.pending("s1") == 1
+        assert ingest.wait_for("s1", timeout=0.05) is False
+        assert ingest.wait_for("other", timeout=0.05) is True
+        release.set()
+        assert ingest.wait_for("s1", timeout=2) is True
+        assert done == [1]
+
+    def test_failure_does_not_block_key(self, ingest):
+        done = []
+
+        def boom():
+            raise OSError("disk full")
+
+        ingest.submit("s1", boom)
+        ingest.submit("s1", done.append, "after")
+        assert ingest.wait_for("s1", timeout=2)
+        assert done == ["after"]
+        assert ingest.stats()["failures"] == 1
+
+    def test_backpressure_blocks_producer(self):
+        ingest = IngestQueue("small", workers=1, max_pending=1).start()
+        started, release = threading.Event(), threading.Event()
+        ingest.submit("s1", lambda: (started.set(), release.wait(2)))
+        assert started.wait(timeout=2)         # running
+        ingest.submit("s1", lambda: None)      # fills the shard
+
+        submitted = threading.Event()
+
+        def producer():
+            ingest.submit("s1", lambda: None)
+            submitted.set()
+
+        threading.Thread(target=producer, daemon=True).start()
+        assert not submitted.wait(timeout=0.1)
+        release.set()
+        assert submitted.wait(timeout=2)
+        assert ingest.close(timeout=2)
+        assert ingest.stats()["producer_blocks"] == 1
+
+    def test_try_submit_does_not_block(self):
+        """try_submit reports a full shard instead of waiting for room."""
+        ingest = IngestQueue("small", workers=1, max_pending=1).start()
+        started, release = threading.Event(), threading.Event()
+        ingest.submit("s1", lambda: (started.set(), release.wait(2)))
+        assert started.wait(timeout=2)
+        assert ingest.try_submit("s2", lambda: None) is True   # fills the shard
+        assert ingest.try_submit("s3", lambda: None) is False
+        assert ingest.pending("s3") == 0
+        release.set()
+        assert ingest.close(timeout=2)
+        assert ingest.try_submit("s1", lambda: None) is False
+        assert ingest.stats()["producer_blocks"] == 0
+
+    def test_close_drains_and_rejects(self):
+        ingest = IngestQueue("closing", workers=2).start()
+        done = []
+        for i in range(20):
+            ingest.submit(f"s{i % 3}", done.append, i)
+        assert ingest.close(timeout=5) is True
+        assert sorted(done) == list(range(20))
+        with pytest.raises(RuntimeError):
+            ingest.submit("s1", done.append, 99)
@@ -0,0 +1,93 @@
+"""
+Unit tests for IntentClassifier.
+Tests the local hashed n-gram intent classifier (no API calls).
+"""
+
+import json
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from llm.intent_classifier import IntentClassifier, load_examples
+
+
+EXAMPLES = [
+    ("hi", "simple"),
+    ("hello there", "simple"),
+    ("thanks a lot", "simple"),
+    ("what is a rest api", "simple"),
+    ("explain recursion", "simple"),
+    ("good morning", "simple"),
+    ("build a web application with a database and authentication", "complex"),
+    ("implement a microservices architecture with monitoring", "complex"),
+    ("create a full-stack application with frontend and backend", "complex"),
+    ("develop a chat application with websockets and persistence", "complex"),
+]
+
+
+@pytest.fixture
+def trained():
+    return IntentClassifier().fit(EXAMPLES, epochs=40)
+
+
+class TestIntentClassifier:
+    """Test suite for IntentClassifier class."""
+
+    def test_featurize_is_normalised(self):
+        """Feature vectors are L2-normalised and deterministic."""
+        clf = IntentClassifier()
+        features = clf.featurize("Hello there, friend")
+        norm = sum(v * v for v in features.values())
+        assert norm == pytest.approx(1.0)
+        assert features == clf.featurize("hello there friend")
+
+    def test_fit_and_classify(self, trained):
+        """Trained model separates greetings from implementation tasks."""
+        assert trained.classify("hello")["intent_type"] == "simple"
+        result = trained.classify("build an application with a database")
+        assert result["intent_type"] == "complex"
+        assert 0.0 <= result["confidence"] <= 1.0
+
+    def test_probabilities_sum_to_one(self, trained):
+        """predict_proba returns a distribution over all labels."""
+        probs = trained.predict_proba("anything at all")
+        assert set(probs) == {"simple", "medium", "complex"}
+        assert sum(probs.values()) == pytest.approx(1.0)
+
+    def test_fit_without_known_labels(self):
+        """Training with no usable examples raises ValueError."""
+        with pytest.raises(ValueError):
+            IntentClassifier().fit([("hi", "unknown")])
+
+    def test_save_load_roundtrip(self, trained, tmp_path):
+        """A saved model reloads with identical predictions."""
+        path = tmp_path / "model.json"
+        trained.save(path)
+        loaded = IntentClassifier.load(path)
+        for text, _ in EXAMPLES:
+            assert loaded.predict_proba(text) == pytest.approx(trained.predict_proba(text))
+
+    def test_evaluate_report(self, trained):
+        """Evaluation report carries accuracy, coverage and confusion counts."""
+        report = trained.evaluate(EXAMPLES, min_confidence=0.5)
+        assert report["examples"] == len(EXAMPLES)
+        assert report["accuracy"] == 1.0
+        assert 0.0 <= report["coverage"] <= 1.0
+        assert sum(sum(row.values()) for row in report["confusion"].values()) == len(EXAMPLES)
+
+    def test_load_examples_filters_low_confidence(self, tmp_path):
+        """Logged decisions below min_confidence are skipped."""
+        path = tmp_path / "decisions.jsonl"
+        path.write_text(
+            "\n".join([
+                json.dumps({"message": "hi", "intent_type": "simple", "confidence": 0.95}),
+                json.dumps({"message": "maybe", "intent_type": "complex", "confidence": 0.4}),
+                "not json",
+            ]),
+            encoding="utf-8"
+        )
+        assert load_examples(path, min_confidence=0.8) == [("hi", "simple")]
+        assert load_examples(tmp_path / "missing.jsonl") == []
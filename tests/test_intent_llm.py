@@ -109,5 +109,20 @@ class TestIntentLLM:
         # Intent config doesn't have "reasoning" key, should default to False
         assert call_kwargs["extra_body"]["reasoning"]["enabled"] == False
 
-
-
+    @patch('llm.intent_llm.OpenAI')
+    @patch('llm.intent_llm.load_dotenv')
+    @patch.dict(os.environ, {'OPENROUTER_API_KEY': 'test-key'})
+    def test_warm_up(self, mock_dotenv, mock_openai):
+        """Test warm_up connects, and only probes the model when asked."""
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        
+        llm = IntentLLM()
+        llm.warm_up()
+        mock_client.models.list.assert_called_once()
+        mock_client.chat.completions.create.assert_not_called()
+        
+        llm.warm_up(probe=True)
+        call_kwargs = mock_client.chat.completions.create.call_args[1]
+        assert call_kwargs["model"] == MODELS["intent"]["model"]
+        assert call_kwargs["max_tokens"] == 1
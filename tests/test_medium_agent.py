@@ -0,0 +1,52 @@
+"""
+Unit tests for MediumAgent.
+Tests the single planned reasoning call and extraction of the Answer section.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent.medium_agent import MediumAgent
+
+
+@pytest.fixture
+def agent():
+    with patch('agent.medium_agent.get_llm', return_value=Mock()):
+        return MediumAgent()
+
+
+class TestMediumAgent:
+    """Test suite for MediumAgent class."""
+
+    def test_extract_answer_after_heading(self, agent):
+        raw = "## Plan\n1. Read the file\n2. Parse it\n\n## Answer\nUse csv.reader.\n"
+        assert agent._extract_answer(raw) == "Use csv.reader."
+
+    def test_extract_answer_heading_variants(self, agent):
+        assert agent._extract_answer("# Plan\nx\n### answer:\nDone") == "Done"
+
+    def test_extract_answer_without_heading(self, agent):
+        raw = "  Use csv.reader to parse the file.  "
+        assert agent._extract_answer(raw) == "Use csv.reader to parse the file."
+
+    def test_extract_answer_empty_section_returns_full_response(self, agent):
+        raw = "## Plan\nRead the file\n## Answer\n"
+        assert agent._extract_answer(raw) == raw.strip()
+
+    def test_extract_answer_empty(self, agent):
+        assert agent._extract_answer("") == ""
+
+    def test_run_makes_one_call(self, agent):
+        agent.reasoning_llm.generate.return_value = "## Plan\nsteps\n## Answer\nresult"
+        context = [{"role": "system", "content": "memory"}]
+
+        assert agent.run("parse this csv", context_messages=context) == "result"
+        agent.reasoning_llm.generate.assert_called_once()
+        prompt = agent.reasoning_llm.generate.call_args[0][0]
+        assert prompt[1] == context[0]
+        assert "parse this csv" in prompt[-1]["content"]
@@ -0,0 +1,257 @@
+"""
+Unit tests for MemoryRegistry.
+Tests LRU/idle eviction, spill-to-disk and transparent reload, and idle sweeps.
+"""
+
+import threading
+import time
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from storage.registry import MemoryRegistry, RegistrySweeper
+
+
+class FakeMemory:
+    def __init__(self, key):
+        self.key = key
+        self.history = []
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return MemoryRegistry("session", FakeMemory, spill_dir=tmp_path, max_entries=2)
+
+
+class TestMemoryRegistry:
+    """Test suite for MemoryRegistry class."""
+
+    def test_get_creates_once(self, registry):
+        """Repeated gets return the same live object."""
+        first = registry.get("a")
+        assert registry.get("a") is first
+        assert registry.stats()["creations"] == 1
+
+    def test_lru_eviction_spills_and_reloads(self, registry):
+        """Least recently used object is spilled and reloaded with its state."""
+        registry.get("a").history.append("hello")
+        registry.get("b")
+        registry.get("a")
+        registry.get("c")  # evicts b, the least recently used
+
+        assert not registry.is_resident("b")
+        assert registry.is_resident("a")
+        assert "b" in registry
+        assert len(registry) == 2
+
+        registry.get("d")  # evicts a
+        reloaded = registry.get("a")
+        assert reloaded.history == ["hello"]
+
+        stats = registry.stats()
+        assert stats["evictions"] >= 2
+        assert stats["reloads"] == 1
+        assert stats["creations"] == 4
+
+    def test_idle_eviction(self, tmp_path):
+        """Objects idle longer than max_idle_seconds are evicted."""
+        registry = MemoryRegistry("working", FakeMemory, spill_dir=tmp_path, max_idle_seconds=0.01)
+        registry.get("a")
+        time.sleep(0.02)
+        assert registry.evict_idle() == 1
+        assert not registry.is_resident("a")
+        assert "a" in registry
+
+    def test_byte_limit(self, tmp_path):
+        """Resident size estimate is capped by max_bytes."""
+        registry = MemoryRegistry(
+            "session", FakeMemory, spill_dir=tmp_path, max_entries=10,
+            max_bytes=10, size_of=lambda m: sum(len(h) for h in m.history)
+        )
+        registry.get("a").history.append("x" * 8)
+        registry.refresh_size("a")
+        registry.get("b").history.append("y" * 8)
+        registry.refresh_size("b")  # a+b exceed the cap
+        assert registry.stats()["resident_bytes"] <= 10
+        assert not registry.is_resident("a")
+
+    def test_pop_removes_spill(self, registry):
+        """pop returns spilled objects and deletes them from disk."""
+        registry.get("a").history.append("bye")
+        registry.get("b")
+        registry.get("c")
+        assert not registry.is_resident("a")
+
+        popped = registry.pop("a")
+        assert popped.history == ["bye"]
+        assert "a" not in registry
+        assert registry.pop("missing") is None
+
+    def test_without_spill_dir(self):
+        """Without a spill directory evicted objects are recreated fresh."""
+        registry = MemoryRegistry("behavior", FakeMemory, max_entries=1)
+        registry.get("a").history.append("lost")
+        registry.get("b")
+        assert registry.get("a").history == []
+
+    def test_peek_does_not_create(self, registry):
+        """peek never loads or creates objects."""
+        assert registry.peek("a") is None
+        assert registry.stats()["creations"] == 0
+
+
+class TestWarmTier:
+    """Compressed in-RAM tier between live objects and disk."""
+
+    @pytest.fixture
+    def tiered(self, tmp_path):
+        return MemoryRegistry(
+            "session", FakeMemory, spill_dir=tmp_path, max_entries=2,
+            max_idle_seconds=60, warm_after_seconds=60
+        )
+
+    def test_lru_overflow_is_compressed_not_spilled(self, tiered, tmp_path):
+        tiered.get("a").history.append("hello " * 100)
+        tiered.get("b")
+        tiered.get("c")
+
+        assert tiered.tier("a") == "warm"
+        assert not tiered.is_resident("a") and "a" in tiered
+        assert not list((tmp_path / "session").glob("*.pkl"))
+
+        warm = tiered.stats()["tiers"]["warm"]
+        assert warm["entries"] == 1
+        assert 0 < warm["ram_bytes"] < warm["uncompressed_bytes"]
+
+    def test_promotion_restores_state(self, tiered):
+        tiered.get("a").history.append("hello")
+        tiered.get("b")
+        tiered.get("c")
+        assert tiered.peek("a").history == ["hello"]
+        assert tiered.tier("a") == "warm"
+
+        assert tiered.get("a").history == ["hello"]
+        assert tiered.tier("a") == "hot"
+        stats = tiered.stats()
+        assert stats["promotions"] == 1 and stats["reloads"] == 0
+        assert stats["tiers"]["warm"]["ram_bytes"] > 0  # b was pushed down in turn
+
+    def test_idle_thresholds(self, tmp_path):
+        registry = MemoryRegistry(
+            "session", FakeMemory, spill_dir=tmp_path,
+            max_idle_seconds=0.2, warm_after_seconds=0.01
+        )
+        registry.get("a").history.append("x")
+        time.sleep(0.02)
+        assert registry.evict_idle() == 1
+        assert registry.tier("a") == "warm"
+
+        time.sleep(0.2)
+        assert registry.evict_idle() == 1
+        assert registry.tier("a") == "cold"
+        assert registry.get("a").history == ["x"]
+        assert registry.stats()["reloads"] == 1
+
+    def test_warm_byte_cap_spills_oldest(self, tmp_path):
+        registry = MemoryRegistry(
+            "session", FakeMemory, spill_dir=tmp_path, max_entries=1,
+            warm_after_seconds=60, max_warm_bytes=1
+        )
+        registry.get("a").history.append("x")
+        registry.get("b")
+        assert registry.tier("a") == "cold"
+        assert registry.stats()["tiers"]["cold"]["files"] == 1
+
+    def test_pop_and_flush(self, tiered, tmp_path):
+        tiered.get("a").history.append("bye")
+        tiered.get("b")
+        tiered.get("c")
+        tiered.flush()
+        assert (tmp_path / "session" / "a.pkl").exists()
+
+        assert tiered.pop("a").history == ["bye"]
+        assert tiered.tier("a") is None
+        assert tiered.stats()["tiers"]["warm"]["entries"] == 0
+
+
+class TestSpillFiles:
+    """Spill files are per key, even for ids that sanitise to the same name."""
+
+    def test_similar_ids_do_not_share_a_spill_file(self, tmp_path):
+        registry = MemoryRegistry("long_term", FakeMemory, spill_dir=tmp_path, max_entries=1)
+        registry.get("alice@corp.com").history.append("alice's fact")
+        registry.get("alice_corp.com").history.append("other fact")
+        registry.get("bob")  # both are spilled now
+
+        assert registry.get("alice@corp.com").history == ["alice's fact"]
+        assert registry.get("alice_corp.com").history == ["other fact"]
+        assert registry.stats()["tiers"]["cold"]["files"] == 3
+
+    def test_spill_file_of_another_key_is_not_loaded(self, tmp_path):
+        registry = MemoryRegistry("session", FakeMemory, spill_dir=tmp_path, max_entries=1)
+        registry.get("a").history.append("a's turn")
+        registry.get("b")
+        os.replace(registry._spill_path("a"), registry._spill_path("c"))
+
+        assert registry.get("c").history == []
+        assert registry.stats()["creations"] == 3
+
+
+class SlowMemory(FakeMemory):
+    """Pickling blocks until released, to catch work done under the registry lock."""
+
+    pickling = threading.Event()
+    release = threading.Event()
+
+    def __getstate__(self):
+        SlowMemory.pickling.set()
+        SlowMemory.release.wait(5)
+        return self.__dict__
+
+
+class TestIdleMoves:
+    """Idle objects move down a tier on a timer, without holding up other keys."""
+
+    def test_sweeper_compresses_without_new_keys(self, tmp_path):
+        registry = MemoryRegistry(
+            "session", FakeMemory, spill_dir=tmp_path,
+            max_idle_seconds=60, warm_after_seconds=0.01
+        )
+        registry.get("a").history.append("idle")
+        sweeper = RegistrySweeper([registry], interval=0.01).start()
+        try:
+            deadline = time.time() + 5
+            while registry.tier("a") != "warm" and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            sweeper.stop()
+        assert registry.tier("a") == "warm"
+        assert sweeper.stats()["moved_total"] == 1
+
+    def test_compression_does_not_block_other_keys(self, tmp_path):
+        SlowMemory.pickling.clear()
+        SlowMemory.release.clear()
+        registry = MemoryRegistry(
+            "session", SlowMemory, spill_dir=tmp_path,
+            max_idle_seconds=60, warm_after_seconds=0.01
+        )
+        registry.get("slow").history.append("kept")
+        time.sleep(0.02)
+        mover = threading.Thread(target=registry.evict_idle)
+        mover.start()
+        try:
+            assert SlowMemory.pickling.wait(5)
+            # Another key is served while "slow" is being pickled
+            start = time.perf_counter()
+            registry.get("other")
+            assert time.perf_counter() - start < 1
+            assert registry.stats()["moving"] == 1
+        finally:
+            SlowMemory.release.set()
+            mover.join(5)
+        # The moved key comes back intact once its move finished
+        assert registry.get("slow").history == ["kept"]
+        assert registry.stats()["moving"] == 0
@@ -0,0 +1,128 @@
+"""
+Unit tests for MemoryService helpers.
+Tests the session history size estimate used by the session registry's byte limit,
+long-term memory kept in a non-file storage backend, and loading only a session's recent history.
+"""
+
+import pickle
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Importing the app package pulls in the memory package
+pytest.importorskip("memory")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+import storage
+from storage import FileStorage, SQLiteStorage
+from app.services.memory_service import MemoryService, _StoredLongTermMemory, _history_size, _new_session_memory
+from context.summarizer import RollingSummarizer
+from models.message import Message, compact
+
+
+HISTORY = [
+    {"role": "user", "content": "How do I read a CSV file?"},
+    {"role": "assistant", "content": "Use csv.reader on an open file."},
+]
+
+
+class TestHistorySize:
+    """_history_size counts content characters only."""
+
+    def test_dict_history(self):
+        session = SimpleNamespace(history=list(HISTORY))
+        assert _history_size(session) == sum(len(m["content"]) for m in HISTORY)
+
+    def test_message_history_counts_content_not_repr(self):
+        session = SimpleNamespace(history=compact(HISTORY))
+        assert all(isinstance(m, Message) for m in session.history)
+        assert _history_size(session) == sum(len(m["content"]) for m in HISTORY)
+
+    def test_missing_content_and_history(self):
+        assert _history_size(SimpleNamespace(history=[{"role": "tool", "content": None}])) == 0
+        assert _history_size(SimpleNamespace()) == 0
+
+
+class TestStoredLongTermMemory:
+    """On SQLite, long-term facts live in the database and only changed keys are written."""
+
+    @pytest.fixture
+    def backend(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        backend = SQLiteStorage(tmp_path / "atlus.db")
+        monkeypatch.setattr(storage, "_storage", backend)
+        yield backend
+        backend.close()
+
+    def test_save_writes_changed_keys_only(self, backend, tmp_path, monkeypatch):
+        backend.update_long_term("user_1", {"preferred_language": "Python", "editor": "vim"})
+        long_term = _StoredLongTermMemory("user_1")
+        assert long_term.get_all() == {"preferred_language": "Python", "editor": "vim"}
+
+        writes = []
+        monkeypatch.setattr(backend, "update_long_term", lambda user_id, facts: writes.append(facts))
+        long_term.save({"preferred_language": "Python", "timezone": "UTC"})
+
+        assert writes == [{"timezone": "UTC"}]
+        assert backend.load_long_term("user_1") == {"preferred_language": "Python"}
+        assert not list(tmp_path.rglob("memory_*.json"))
+
+    def test_reloads_facts_from_backend_after_spill(self, backend):
+        long_term = _StoredLongTermMemory("user_1")
+        long_term.update("preferred_language", "Go")
+        spilled = pickle.dumps(long_term)
+        backend.update_long_term("user_1", {"preferred_language": "Rust"})
+        assert pickle.loads(spilled).get_all() == {"preferred_language": "Rust"}
+
+
+def _messages(n):
+    return [{"role": "user" if i % 2 == 0 else "assistant", "content": f"m{i}"} for i in range(n)]
+
+
+class TestRecentHistory:
+    """A session becoming resident loads its recent turns from the log's tail, not the whole history."""
+
+    @pytest.fixture
+    def backend(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        backend = FileStorage(tmp_path / "data", fsync="never")
+        backend.append_history("s1", _messages(100))
+        monkeypatch.setattr(storage, "_storage", backend)
+        monkeypatch.setattr(MemoryService, "RECENT_HISTORY_MESSAGES", 40)
+        monkeypatch.setattr(MemoryService, "SUMMARY_ENABLED", True)
+        # Any full read of the log fails the test
+        monkeypatch.setattr(backend.turn_log, "read", Mock(side_effect=AssertionError("full history read")))
+        yield backend
+        backend.close()
+
+    def test_loads_recent_window_only(self, backend):
+        backend.save_summary("s1", {"text": "earlier", "covered": 90})
+        session = _new_session_memory("s1")
+        assert [m["content"] for m in session.history] == [f"m{i}" for i in range(60, 100)]
+        assert session.history_offset == 60
+
+    def test_without_summaries_loads_recent_window(self, backend, monkeypatch):
+        monkeypatch.setattr(MemoryService, "SUMMARY_ENABLED", False)
+        session = _new_session_memory("s1")
+        assert [m["content"] for m in session.history] == [f"m{i}" for i in range(60, 100)]
+        assert session.history_offset == 60
+
+    def test_loads_every_unsummarized_message(self, backend):
+        backend.save_summary("s1", {"text": "earlier", "covered": 30})
+        session = _new_session_memory("s1")
+        assert session.history[0]["content"] == "m30"
+        assert session.history_offset == 30
+        # Coverage counts from the loaded window in memory
+        assert session.summary == {"text": "earlier", "covered": 0}
+
+    def test_window_summary_is_stored_with_absolute_coverage(self, backend):
+        backend.save_summary("s1", {"text": "earlier", "covered": 80})
+        session = _new_session_memory("s1")
+        assert session.history_offset == 60
+        assert session.summary["covered"] == 20
+        assert RollingSummarizer.unsummarized(session.history, session.summary)[0]["content"] == "m80"
@@ -0,0 +1,63 @@
+"""
+Unit tests for the compact message types.
+Tests the dict-compatible Message interface, wire conversion and pickling.
+"""
+
+import pickle
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.message import Message, Turn, compact, to_wire
+
+
+class TestMessage:
+    """Message reads like the dict it replaces."""
+
+    def test_mapping_interface(self):
+        msg = Message("user", "hi")
+        assert msg["role"] == "user" and msg.get("content") == "hi"
+        assert msg.get("name") is None and "name" not in msg
+        assert dict(msg) == {"role": "user", "content": "hi"}
+        assert msg == {"role": "user", "content": "hi"}
+        with pytest.raises(KeyError):
+            msg["name"]
+
+    def test_compact_layout(self):
+        msg = Message("".join(["assis", "tant"]), "ok")
+        assert not hasattr(msg, "__dict__")
+        assert msg.role is Message("assistant", "other").role
+        assert sys.getsizeof(msg) < sys.getsizeof(msg.to_wire())
+
+    def test_immutable(self):
+        with pytest.raises(AttributeError):
+            Message("user", "hi").content = "changed"
+
+    def test_pickle(self):
+        msg = Message("user", "hi")
+        assert pickle.loads(pickle.dumps(msg)) == msg
+        assert pickle.loads(pickle.dumps(Turn("q", "a"))).messages() == Turn("q", "a").messages()
+
+
+class TestWireConversion:
+    """compact() on the way in, to_wire() at the LLM and storage boundaries."""
+
+    def test_round_trip(self):
+        wire = [{"role": "user", "content": "q"}, {"role": "assistant", "content": "a"}]
+        history = compact(wire)
+        assert all(isinstance(m, Message) for m in history)
+        assert to_wire(history) == wire
+        assert all(type(m) is dict for m in to_wire(history))
+
+    def test_extra_fields_are_kept_as_dicts(self):
+        tool = {"role": "tool", "content": "42", "tool_call_id": "call_1"}
+        assert compact([tool])[0] is tool
+        assert to_wire([tool])[0] is tool
+
+    def test_turn(self):
+        assert to_wire(Turn("q", "a").messages()) == [
+            {"role": "user", "content": "q"}, {"role": "assistant", "content": "a"}
+        ]
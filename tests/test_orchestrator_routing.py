@@ -0,0 +1,73 @@
+"""
+Unit tests for Orchestrator routing.
+Tests the complex -> medium downgrade threshold and that each intent is served by its own agent pool.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# The orchestrator imports the memory package (ContextAssembler, BehaviorProfile)
+pytest.importorskip("memory")
+
+from orchestrator.orchestrator import Orchestrator
+
+
+def _agent_class(name):
+    cls = Mock(name=name)
+    cls.side_effect = lambda: Mock(name=f"{name}()", **{"run.return_value": f"{name} answer"})
+    return cls
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    monkeypatch.setattr(Orchestrator, "CLASSIFIER_MODEL_PATH", tmp_path / "missing.json")
+    monkeypatch.setattr(Orchestrator, "CLASSIFICATION_CACHE_PATH", tmp_path / "cache.json")
+    monkeypatch.setattr(Orchestrator, "CLASSIFIER_DECISIONS_LOG", tmp_path / "decisions.jsonl")
+    with patch('orchestrator.orchestrator.get_llm', return_value=Mock()), \
+            patch('orchestrator.orchestrator.SimpleAgent', _agent_class("SimpleAgent")), \
+            patch('orchestrator.orchestrator.MediumAgent', _agent_class("MediumAgent")), \
+            patch('orchestrator.orchestrator.TaskAgent', _agent_class("TaskAgent")):
+        yield Orchestrator()
+
+
+def _classify_as(orchestrator, intent_type, confidence):
+    orchestrator._classify_intent = Mock(return_value={"intent_type": intent_type, "confidence": confidence})
+
+
+class TestOrchestratorRouting:
+    """Test suite for Orchestrator routing."""
+
+    @pytest.mark.parametrize("classification,expected", [
+        ({"intent_type": "complex", "confidence": 0.95}, "complex"),
+        ({"intent_type": "complex", "confidence": 0.8}, "complex"),
+        ({"intent_type": "complex", "confidence": 0.79}, "medium"),
+        ({"intent_type": "complex"}, "medium"),
+        ({"intent_type": "medium", "confidence": 0.3}, "medium"),
+        ({"intent_type": "simple", "confidence": 0.3}, "simple"),
+        ({}, "simple"),
+    ])
+    def test_downgrade_threshold(self, orchestrator, classification, expected):
+        assert orchestrator._route(classification) == expected
+
+    def test_threshold_is_configurable(self, orchestrator, monkeypatch):
+        monkeypatch.setattr(Orchestrator, "COMPLEX_MIN_CONFIDENCE", 0.5)
+        assert orchestrator._route({"intent_type": "complex", "confidence": 0.6}) == "complex"
+
+    def test_medium_request_uses_medium_pool(self, orchestrator):
+        _classify_as(orchestrator, "medium", 0.9)
+        assert orchestrator.run("fix this KeyError in my parser") == "MediumAgent answer"
+
+        stats = orchestrator.get_pool_stats()
+        assert stats["medium"]["created"] == 1
+        assert stats["simple"]["created"] == 0
+        assert stats["complex"]["created"] == 0
+
+    def test_uncertain_complex_request_uses_medium_pool(self, orchestrator):
+        _classify_as(orchestrator, "complex", 0.6)
+        assert orchestrator.run("build a small CLI tool") == "MediumAgent answer"
+        assert orchestrator.get_pool_stats()["complex"]["created"] == 0
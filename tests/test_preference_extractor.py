@@ -0,0 +1,60 @@
+"""
+Unit tests for PreferenceExtractor.
+Pins extraction results to those of the original (per-call regex) extractor.
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Importing the app package pulls in the orchestrator and its memory package
+pytest.importorskip("memory")
+
+from app.services.preference_extractor import PreferenceExtractor
+
+
+# Results of the original extractor for the same messages
+ORIGINAL_RESULTS = [
+    ('I used to use java but now I like kotlin', {'preferred_language': 'Kotlin'}),
+    ('Can you go use java', {'preferred_language': 'Java'}),
+    ('I know you use free api', {}),
+    ('I prefer Python', {'preferred_language': 'Python'}),
+    ('My favorite language is JavaScript', {'preferred_language': 'Javascript'}),
+    ('I use TypeScript', {'preferred_language': 'Typescript'}),
+    ('Python is my go-to language', {'preferred_language': 'Python'}),
+    ('I code in rust', {'preferred_language': 'Rust'}),
+    ('this is good, use go', {'preferred_language': 'Go'}),
+    ('Write a quicksort in python', {'communication_style': 'brief'}),
+    ('Show me a rust example', {}),
+    ('only free tier please', {'api_preference': 'free_only'}),
+    ('no paid APIs', {'api_preference': 'free_only'}),
+    ('avoid paid services', {'api_preference': 'free_only'}),
+    ('I prefer paid APIs', {'api_preference': 'paid_ok'}),
+    ('free api, no signup', {'api_preference': 'free_only'}),
+    ('Explain in detail how it works', {'communication_style': 'detailed'}),
+    ('keep it short', {'communication_style': 'brief'}),
+    ('explain simply', {'communication_style': 'simple'}),
+    ('Can you help me?', {}),
+    ("I'd like a detailed answer in kotlin", {'communication_style': 'detailed'}),
+    ('i work with swift and dart', {'preferred_language': 'Swift'}),
+    ('hi, love php', {'preferred_language': 'Php'}),
+]
+
+
+class TestPreferenceExtractor:
+    """Test suite for PreferenceExtractor class."""
+
+    @pytest.mark.parametrize("message,expected", ORIGINAL_RESULTS)
+    def test_matches_original_extractor(self, message, expected):
+        assert PreferenceExtractor.extract_preferences(message) == expected
+
+    def test_explicit_statement_wins_over_earlier_mention(self):
+        prefs = PreferenceExtractor.extract_preferences("I used to use java but now I like kotlin")
+        assert prefs["preferred_language"] == "Kotlin"
+
+    def test_history_adds_no_facts(self):
+        history = [{"role": "user", "content": "python again"}] * 5
+        assert PreferenceExtractor.extract_preferences("hello", history) == {}
@@ -0,0 +1,123 @@
+"""
+Unit tests for the Redis storage backend.
+Runs against InProcessRedis; the shared backend contract is in test_storage.py.
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from storage import InProcessRedis, RedisStorage, SQLiteStorage
+from storage.snapshot import restore_snapshot, write_snapshot
+
+
+def make_session(session_id, user_id="user_1", last_activity="2024-01-01T00:00:00Z", is_active=True):
+    return {
+        "session_id": session_id,
+        "user_id": user_id,
+        "created_at": "2024-01-01T00:00:00Z",
+        "last_activity": last_activity,
+        "is_active": is_active,
+        "metadata": {}
+    }
+
+
+class TestRedisStorage:
+    """Redis-specific behaviour: shared state, key layout and round trips."""
+
+    def test_workers_share_state(self):
+        """Two backends over one server see each other's writes."""
+        server = InProcessRedis()
+        worker_a, worker_b = RedisStorage(server), RedisStorage(server)
+        worker_a.save_session(make_session("s1"))
+        worker_a.append_history("s1", [{"role": "user", "content": "hi"}])
+        assert worker_b.get_session("s1") == make_session("s1")
+        assert worker_b.history_length("s1") == 1
+
+        worker_b.append_history("s1", [{"role": "assistant", "content": "hello"}])
+        assert [m["content"] for m in worker_a.load_history("s1")] == ["hi", "hello"]
+
+        worker_b.delete_session("s1")
+        assert worker_a.get_session("s1") is None
+        assert worker_a.history_length("s1") == 0
+
+    def test_prefix_isolates_deployments(self):
+        server = InProcessRedis()
+        RedisStorage(server, prefix="a:").save_session(make_session("s1"))
+        assert RedisStorage(server, prefix="b:").get_session("s1") is None
+
+    def test_batch_save_is_one_round_trip(self):
+        server = InProcessRedis()
+        storage = RedisStorage(server)
+        before = server.commands
+        storage.save_sessions([make_session(f"s{i}") for i in range(50)])
+        assert server.commands - before == 1
+        assert storage.count_user_sessions("user_1") == 50
+
+    def test_deactivation_leaves_active_index(self):
+        storage = RedisStorage(InProcessRedis())
+        storage.save_sessions([make_session("s1"), make_session("s2", last_activity="2024-01-02T00:00:00Z")])
+        storage.save_session(make_session("s2", is_active=False))
+        assert [s["session_id"] for s in storage.list_user_sessions("user_1")] == ["s1"]
+        assert storage.count_user_sessions("user_1") == 1
+        assert storage.count_user_sessions("user_1", active_only=False) == 2
+
+    def test_cursor_skips_ties_across_fetches(self):
+        """Sessions sharing the cursor's score are filtered by id, fetching more as needed."""
+        storage = RedisStorage(InProcessRedis())
+        storage.save_sessions([make_session(f"s{i}") for i in range(5)])
+        page = storage.list_user_sessions("user_1", limit=2, after=("2024-01-01T00:00:00Z", "s4"))
+        assert [s["session_id"] for s in page] == ["s3", "s2"]
+
+    def test_listing_helpers(self):
+        storage = RedisStorage(InProcessRedis())
+        storage.save_sessions([make_session("s1"), make_session("s2", user_id="user_2")])
+        storage.update_long_term("user_2", {"preferred_language": "Go"})
+        assert storage.list_history_sessions() == ["s1", "s2"]
+        assert storage.list_long_term_users() == ["user_2"]
+        storage.delete_long_term("user_2")
+        assert storage.list_long_term_users() == []
+
+    def test_snapshot_roundtrip(self, tmp_path):
+        """A SQLite deployment can move to Redis through a snapshot."""
+        source = SQLiteStorage(tmp_path / "atlus.db")
+        source.save_sessions([make_session("s1"), make_session("s2", is_active=False)])
+        source.replace_history("s1", [{"role": "user", "content": "hi"}])
+        source.save_summary("s1", {"text": "greeting", "covered": 1})
+        source.update_long_term("user_1", {"communication_style": "brief"})
+        write_snapshot(source, tmp_path / "atlus.snap")
+
+        target = RedisStorage(InProcessRedis())
+        restore_snapshot(target, tmp_path / "atlus.snap")
+        assert target.load_sessions() == source.load_sessions()
+        assert target.load_history("s1") == source.load_history("s1")
+        assert target.load_summary("s1") == {"text": "greeting", "covered": 1}
+        assert target.load_long_term("user_1") == {"communication_style": "brief"}
+        source.close()
+
+    def test_from_url_without_client_library(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "redis", None)
+        with pytest.raises(ImportError, match="pip install redis"):
+            RedisStorage.from_url("redis://localhost:6379/0")
+
+
+class TestInProcessRedis:
+    """The stand-in behaves like Redis where RedisStorage depends on it."""
+
+    def test_wrong_type(self):
+        server = InProcessRedis()
+        server.set("k", "v")
+        with pytest.raises(TypeError):
+            server.rpush("k", "x")
+
+    def test_negative_ranges(self):
+        server = InProcessRedis()
+        server.rpush("l", "a", "b", "c")
+        assert server.lrange("l", -2, -1) == ["b", "c"]
+        assert server.lrange("l", -10, -1) == ["a", "b", "c"]
+        server.zadd("z", {"a": 1, "b": 3, "c": 2})
+        assert server.zrevrange("z", 0, 1) == ["b", "c"]
+        assert server.zrevrange("z", 1, -1) == ["c", "a"]
@@ -0,0 +1,78 @@
+"""
+Unit tests for SessionIndex.
+Tests the per-user, activity-ordered session index.
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from storage.session_index import SessionIndex
+
+
+def ts(minute):
+    return f"2024-01-01T12:{minute:02d}:00.000000Z"
+
+
+@pytest.fixture
+def index():
+    idx = SessionIndex()
+    idx.add("s1", "alice", ts(1))
+    idx.add("s2", "alice", ts(2))
+    idx.add("s3", "alice", ts(3))
+    idx.add("b1", "bob", ts(5))
+    return idx
+
+
+class TestSessionIndex:
+    """Test suite for SessionIndex class."""
+
+    def test_latest(self, index):
+        """latest returns the most recently active session per user."""
+        assert index.latest("alice") == "s3"
+        assert index.latest("bob") == "b1"
+        assert index.latest("nobody") is None
+
+    def test_touch_reorders(self, index):
+        """Touching a session moves it to the front."""
+        index.touch("s1", ts(9))
+        assert index.latest("alice") == "s1"
+        assert index.page("alice") == ["s1", "s3", "s2"]
+        index.touch("unknown", ts(9))  # ignored
+        assert len(index) == 4
+
+    def test_remove(self, index):
+        """Removed sessions disappear from lookups and counts."""
+        assert index.remove("s3") is True
+        assert index.remove("s3") is False
+        assert index.latest("alice") == "s2"
+        assert index.count("alice") == 2
+        index.remove("b1")
+        assert index.latest("bob") is None
+        assert "b1" not in index
+
+    def test_page(self, index):
+        """Pages are newest first and respect limit/offset."""
+        assert index.page("alice", limit=2) == ["s3", "s2"]
+        assert index.page("alice", limit=2, offset=2) == ["s1"]
+        assert index.page("alice", limit=2, offset=3) == []
+        assert index.page("nobody", limit=5) == []
+
+    def test_same_timestamp_is_stable(self):
+        """Sessions with identical activity times are all kept and removable."""
+        idx = SessionIndex()
+        idx.add("a", "u", ts(1))
+        idx.add("b", "u", ts(1))
+        assert sorted(idx.page("u")) == ["a", "b"]
+        idx.touch("a", ts(2))
+        assert idx.latest("u") == "a"
+        assert idx.remove("b") is True
+
+    def test_re_add_moves_session(self, index):
+        """Adding an indexed session again re-indexes it (e.g. under a new user)."""
+        index.add("s1", "bob", ts(7))
+        assert index.count("alice") == 2
+        assert index.latest("bob") == "s1"
@@ -0,0 +1,116 @@
+"""
+Unit tests for SessionService.
+Tests that inspecting or continuing sessions only warms up memory for usable sessions,
+and finding the last session on a shared backend.
+"""
+
+import time
+import pytest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Importing the app package pulls in the orchestrator and its memory package
+pytest.importorskip("memory")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+import storage
+from storage import FileStorage, InProcessRedis, RedisStorage
+from storage.expiry import ExpiryQueue
+from storage.session_index import SessionIndex
+from app.services.memory_service import MemoryService
+from app.services.session_service import SessionService
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    """SessionService on a fresh file backend, without background writers."""
+    monkeypatch.setattr(storage, "_storage", FileStorage(tmp_path))
+    monkeypatch.setattr(SessionService, "_sessions", {})
+    monkeypatch.setattr(SessionService, "_fetched_at", {})
+    monkeypatch.setattr(SessionService, "_index", SessionIndex())
+    monkeypatch.setattr(SessionService, "_expiry", ExpiryQueue())
+    monkeypatch.setattr(SessionService, "_persister", Mock())
+    monkeypatch.setattr(SessionService, "_sweeper", Mock())
+    monkeypatch.setattr(SessionService, "_initialized", True, raising=False)
+    return SessionService
+
+
+def _expire_now(sessions, session_id):
+    sessions._expiry.schedule(session_id, time.time() - 1)
+
+
+def _resident(session_id):
+    return [
+        registry.name
+        for registry in (MemoryService._sessions, MemoryService._working, MemoryService._behavior)
+        if registry.is_resident(session_id)
+    ]
+
+
+class TestSessionInfoPrefetch:
+    """get_session_info prefetches memory only for active, unexpired sessions."""
+
+    def test_active_session_is_prefetched(self, sessions):
+        session_id = sessions.create_session("info_user")["session_id"]
+        with patch.object(MemoryService, "prefetch") as prefetch:
+            info = sessions.get_session_info(session_id)
+        assert info["is_active"] is True
+        prefetch.assert_called_once_with(session_id, "info_user")
+
+    def test_expired_session_leaves_no_registry_entry(self, sessions):
+        session_id = sessions.create_session("info_user")["session_id"]
+        assert _resident(session_id)
+        _expire_now(sessions, session_id)
+
+        info = sessions.get_session_info(session_id)
+        if MemoryService._prefetch is not None:
+            MemoryService._prefetch.drain(timeout=5)
+
+        assert info["is_active"] is False
+        assert _resident(session_id) == []
+
+    def test_inactive_session_is_not_prefetched(self, sessions):
+        session_id = sessions.create_session("info_user")["session_id"]
+        _expire_now(sessions, session_id)
+        assert sessions._expire_session(session_id)
+
+        with patch.object(MemoryService, "prefetch") as prefetch:
+            info = sessions.get_session_info(session_id)
+        assert info["is_active"] is False
+        prefetch.assert_not_called()
+
+
+class TestLastSharedSession:
+    """get_last_session on a shared backend pages past expired sessions without skipping any."""
+
+    def test_finds_session_behind_a_page_of_expired_ones(self, sessions, monkeypatch):
+        backend = RedisStorage(InProcessRedis())
+        monkeypatch.setattr(storage, "_storage", backend)
+        # Deactivations reach storage immediately, as a flush between pages would
+        persister = Mock()
+        persister.mark_dirty.side_effect = lambda session_id, session: backend.save_session(session)
+        monkeypatch.setattr(SessionService, "_persister", persister)
+
+        records = [
+            {
+                "session_id": f"s{i:02d}", "user_id": "shared_user", "created_at": "2024-01-01T00:00:00Z",
+                "last_activity": f"2024-01-{i + 1:02d}T00:00:00Z", "is_active": True, "metadata": {}
+            }
+            for i in range(12)
+        ]
+        backend.save_sessions(records)
+        # Every session but the oldest is past its TTL
+        expired = {r["session_id"] for r in records[1:]}
+        monkeypatch.setattr(SessionService, "_schedule_expiry", classmethod(
+            lambda cls, session_id, last_activity: cls._expiry.schedule(
+                session_id, time.time() + (-1 if session_id in expired else 3600)
+            )
+        ))
+
+        last = sessions.get_last_session("shared_user")
+        assert last is not None and last["session_id"] == "s00"
+        assert backend.count_user_sessions("shared_user") == 1
@@ -0,0 +1,103 @@
+"""
+Unit tests for storage snapshots.
+Tests round-trips between backends, compression flags and damaged files.
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from storage import FileStorage, SQLiteStorage
+from storage.snapshot import SnapshotError, iter_snapshot, restore_snapshot, write_snapshot
+
+
+def make_backend(name, path):
+    if name == "file":
+        return FileStorage(path / "data", fsync="never")
+    return SQLiteStorage(path / "atlus.db")
+
+
+def seed(storage):
+    storage.save_sessions([
+        {"session_id": f"s{i}", "user_id": f"u{i % 2}", "created_at": "2024-01-01T00:00:00Z",
+         "last_activity": f"2024-01-01T00:00:0{i}Z", "is_active": i != 2, "metadata": {"n": i}}
+        for i in range(3)
+    ])
+    storage.replace_history("s0", [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "héllo"}])
+    storage.replace_history("s1", [{"role": "user", "content": "x" * 5000}])
+    storage.save_summary("s0", {"text": "greeting", "covered": 2})
+    storage.update_long_term("u0", {"preferred_language": "Python", "tags": ["a", "b"]})
+
+
+def state(storage):
+    sessions = storage.load_sessions()
+    return {
+        "sessions": sessions,
+        "history": {sid: storage.load_history(sid) for sid in sessions},
+        "summaries": {sid: storage.load_summary(sid) for sid in sessions},
+        "long_term": {uid: storage.load_long_term(uid) for uid in ("u0", "u1")},
+    }
+
+
+class TestSnapshot:
+    """Snapshot write, read and restore."""
+
+    @pytest.mark.parametrize("source_name,target_name", [("file", "sqlite"), ("sqlite", "file"), ("file", "file")])
+    def test_roundtrip_between_backends(self, source_name, target_name, tmp_path):
+        source = make_backend(source_name, tmp_path / "source")
+        seed(source)
+        written = write_snapshot(source, tmp_path / "atlus.snap")
+        assert written["sessions"] == 3
+        assert written["messages"] == 3
+        assert written["summaries"] == 1
+        assert written["facts"] == 2
+
+        target = make_backend(target_name, tmp_path / "target")
+        restored = restore_snapshot(target, tmp_path / "atlus.snap")
+        assert restored["sessions"] == 3
+        assert state(target) == state(source)
+        source.close()
+        target.close()
+
+    def test_uncompressed(self, tmp_path):
+        source = make_backend("sqlite", tmp_path)
+        seed(source)
+        compressed = write_snapshot(source, tmp_path / "a.snap")
+        raw = write_snapshot(source, tmp_path / "b.snap", compress=False)
+        assert raw["bytes"] > compressed["bytes"]
+        assert [kind for kind, _ in iter_snapshot(tmp_path / "a.snap")] == \
+               [kind for kind, _ in iter_snapshot(tmp_path / "b.snap")]
+        source.close()
+
+    def test_truncated_file_rolls_back_sqlite(self, tmp_path):
+        source = make_backend("file", tmp_path / "source")
+        seed(source)
+        path = tmp_path / "atlus.snap"
+        write_snapshot(source, path, compress=False)
+        path.write_bytes(path.read_bytes()[:-10])
+
+        target = make_backend("sqlite", tmp_path / "target")
+        with pytest.raises(SnapshotError):
+            restore_snapshot(target, path)
+        assert target.load_sessions() == {}
+        assert target.load_history("s0") == []
+        target.close()
+
+    def test_not_a_snapshot(self, tmp_path):
+        path = tmp_path / "sessions.json"
+        path.write_text("{}")
+        with pytest.raises(SnapshotError):
+            list(iter_snapshot(path))
+
+    def test_nested_transactions_join(self, tmp_path):
+        """bulk() wraps writes that open their own transactions."""
+        storage = make_backend("sqlite", tmp_path)
+        with pytest.raises(RuntimeError):
+            with storage.bulk():
+                storage.update_long_term("u0", {"a": 1})
+                raise RuntimeError("abort")
+        assert storage.load_long_term("u0") == {}
+        storage.close()
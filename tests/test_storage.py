@@ -0,0 +1,170 @@
+"""
+Unit tests for storage backends.
+Runs the same contract against FileStorage, SQLiteStorage and RedisStorage, plus the JSON -> SQLite migration.
+"""
+
+import pytest
+import sys
+import os
+import threading
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from storage import FileStorage, InProcessRedis, RedisStorage, SQLiteStorage, create_storage
+from scripts.migrate_json_to_sqlite import migrate
+
+
+def make_session(session_id, user_id="user_1", last_activity="2024-01-01T00:00:00Z", is_active=True):
+    return {
+        "session_id": session_id,
+        "user_id": user_id,
+        "created_at": "2024-01-01T00:00:00Z",
+        "last_activity": last_activity,
+        "is_active": is_active,
+        "metadata": {"source": "test"}
+    }
+
+
+@pytest.fixture(params=["file", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "file":
+        storage = FileStorage(tmp_path)
+    elif request.param == "redis":
+        storage = RedisStorage(InProcessRedis())
+    else:
+        storage = SQLiteStorage(tmp_path / "atlus.db")
+    yield storage
+    storage.close()
+
+
+class TestStorageBackends:
+    """Contract shared by every storage backend."""
+
+    def test_session_roundtrip(self, backend):
+        """Saved sessions load back unchanged."""
+        backend.save_session(make_session("s1"))
+        assert backend.get_session("s1") == make_session("s1")
+        assert backend.get_session("missing") is None
+        assert list(backend.load_sessions()) == ["s1"]
+
+    def test_list_user_sessions_orders_by_activity(self, backend):
+        """Most recent activity first; inactive sessions skipped by default; paginated."""
+        backend.save_sessions([
+            make_session("old", last_activity="2024-01-01T00:00:00Z"),
+            make_session("new", last_activity="2024-01-03T00:00:00Z"),
+            make_session("mid", last_activity="2024-01-02T00:00:00Z"),
+            make_session("gone", last_activity="2024-01-04T00:00:00Z", is_active=False),
+            make_session("other", user_id="user_2"),
+        ])
+        ids = [s["session_id"] for s in backend.list_user_sessions("user_1")]
+        assert ids == ["new", "mid", "old"]
+        assert [s["session_id"] for s in backend.list_user_sessions("user_1", limit=1, offset=1)] == ["mid"]
+        assert len(backend.list_user_sessions("user_1", active_only=False)) == 4
+
+    def test_list_user_sessions_after_cursor(self, backend):
+        """Keyset paging: ties order by session id, and deactivating seen sessions skips nothing."""
+        backend.save_sessions([make_session(f"s{i}", last_activity=f"2024-01-0{1 + i // 2}T00:00:00Z") for i in range(6)])
+        first = backend.list_user_sessions("user_1", limit=2)
+        assert [s["session_id"] for s in first] == ["s5", "s4"]
+
+        # Sessions already seen drop out of the active list between pages
+        backend.save_sessions([dict(s, is_active=False) for s in first])
+        cursor = (first[-1]["last_activity"], first[-1]["session_id"])
+        page = backend.list_user_sessions("user_1", limit=3, after=cursor)
+        assert [s["session_id"] for s in page] == ["s3", "s2", "s1"]
+        cursor = (page[-1]["last_activity"], page[-1]["session_id"])
+        assert [s["session_id"] for s in backend.list_user_sessions("user_1", limit=3, after=cursor)] == ["s0"]
+        assert [s["session_id"] for s in backend.list_user_sessions("user_1", after=("2024-01-02T00:00:00Z", "s3"))] == [
+            "s2", "s1", "s0"
+        ]
+
+    def test_history_append_and_tail(self, backend):
+        """History appends in order and tail reads return the last messages."""
+        backend.append_history("s1", [{"role": "user", "content": "a"}, {"role": "assistant", "content": "b"}])
+        backend.append_history("s1", [{"role": "user", "content": "c"}])
+        assert [m["content"] for m in backend.load_history("s1")] == ["a", "b", "c"]
+        assert [m["content"] for m in backend.load_history("s1", last_n=2)] == ["b", "c"]
+        assert backend.history_length("s1") == 3
+
+        backend.replace_history("s1", [{"role": "user", "content": "z"}])
+        assert backend.load_history("s1") == [{"role": "user", "content": "z"}]
+        assert backend.history_length("s1") == 1
+        assert backend.history_length("missing") == 0
+
+    def test_delete_session_removes_history(self, backend):
+        """Deleting a session drops its record and history."""
+        backend.save_session(make_session("s1"))
+        backend.append_history("s1", [{"role": "user", "content": "a"}])
+        assert backend.delete_session("s1") is True
+        assert backend.get_session("s1") is None
+        assert backend.load_history("s1") == []
+        assert backend.delete_session("s1") is False
+
+    def test_long_term_merge(self, backend):
+        """Long-term facts merge per key and survive JSON round-trips."""
+        backend.update_long_term("user_1", {"preferred_language": "Python", "tags": ["a"]})
+        backend.update_long_term("user_1", {"api_preference": "free_only"})
+        assert backend.load_long_term("user_1") == {
+            "preferred_language": "Python", "tags": ["a"], "api_preference": "free_only"
+        }
+        backend.delete_long_term("user_1", ["tags", "missing"])
+        assert backend.load_long_term("user_1") == {
+            "preferred_language": "Python", "api_preference": "free_only"
+        }
+        backend.delete_long_term("user_1")
+        assert backend.load_long_term("user_1") == {}
+
+
+class TestSQLiteConnections:
+    """SQLiteStorage does not keep connections of threads that have exited."""
+
+    def test_finished_threads_release_connections(self, tmp_path):
+        storage = SQLiteStorage(tmp_path / "atlus.db")
+        for i in range(20):
+            thread = threading.Thread(target=storage.save_session, args=(make_session(f"s{i}"),))
+            thread.start()
+            thread.join()
+        assert storage.stats()["connections"] == 1
+        assert len(storage.load_sessions()) == 20
+        storage.close()
+
+
+class TestStorageFactory:
+    """Test suite for create_storage."""
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_storage("postgres")
+
+    def test_sqlite_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("ATLUS_SQLITE_PATH", str(tmp_path / "env.db"))
+        storage = create_storage("sqlite")
+        assert isinstance(storage, SQLiteStorage)
+        assert storage.path == tmp_path / "env.db"
+        storage.close()
+
+
+class TestMigration:
+    """Test suite for the JSON -> SQLite migration."""
+
+    def test_migrate_json_layout(self, tmp_path):
+        """Sessions, history files and memory files all land in SQLite."""
+        source = FileStorage(tmp_path / "data")
+        source.save_sessions([make_session("s1"), make_session("s2", user_id="user_2")])
+        source.replace_history("s1", [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}])
+        source.update_long_term("user_1", {"preferred_language": "Python"})
+
+        target = SQLiteStorage(tmp_path / "atlus.db")
+        counts = migrate(source, target, batch_size=1)
+
+        assert counts["sessions"] == 2
+        assert counts["messages"] == 2
+        assert target.get_session("s2") == make_session("s2", user_id="user_2")
+        assert target.load_history("s1")[-1]["content"] == "hello"
+        assert target.load_long_term("user_1") == {"preferred_language": "Python"}
+
+        # Re-running is idempotent
+        migrate(source, target)
+        assert len(target.load_history("s1")) == 2
+        target.close()
@@ -0,0 +1,140 @@
+"""
+Unit tests for RollingSummarizer.
+Tests fold planning, background folding and summary persistence (fake LLM, no API calls).
+"""
+
+import threading
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from context.summarizer import RollingSummarizer, estimate_tokens
+from storage import FileStorage, SQLiteStorage
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, messages, **kwargs):
+        self.calls.append(messages)
+        return f"summary #{len(self.calls)}"
+
+
+def history(turns, size=200, start=0):
+    messages = []
+    for i in range(start, start + turns):
+        messages.append({"role": "user", "content": f"q{i} " + "x" * size})
+        messages.append({"role": "assistant", "content": f"a{i} " + "y" * size})
+    return messages
+
+
+@pytest.fixture
+def llm():
+    return FakeLLM()
+
+
+@pytest.fixture
+def summarizer(llm):
+    return RollingSummarizer(lambda: llm, token_threshold=300, keep_turns=2)
+
+
+class TestRollingSummarizer:
+    """Test suite for RollingSummarizer class."""
+
+    def test_under_threshold_does_nothing(self, summarizer, llm):
+        short = history(1, size=10)
+        assert summarizer.plan(short, None) is None
+        assert summarizer.fold(short, None) is None
+        assert llm.calls == []
+
+    def test_fold_keeps_last_turns(self, summarizer, llm):
+        """Folding covers everything except the last keep_turns turns."""
+        messages = history(6)
+        summary = summarizer.fold(messages, None)
+        assert summary == {"text": "summary #1", "covered": 8}
+        assert summarizer.unsummarized(messages, summary) == messages[8:]
+        assert "q0" in llm.calls[0][1]["content"]
+
+    def test_fold_is_incremental(self, summarizer, llm):
+        """Later folds only send new messages plus the previous summary."""
+        messages = history(6)
+        first = summarizer.fold(messages, None)
+        messages += history(4, start=6)
+        second = summarizer.fold(messages, first)
+        assert second["covered"] == len(messages) - 4
+        prompt = llm.calls[1][1]["content"]
+        assert "summary #1" in prompt
+        assert "q0 " not in prompt
+
+    def test_stale_summary_is_ignored(self, summarizer):
+        """A summary covering more than the history (history was reset) is not applied."""
+        messages = history(1, size=10)
+        assert summarizer.unsummarized(messages, {"text": "old", "covered": 50}) == messages
+
+    def test_schedule_runs_in_background(self, summarizer):
+        messages = history(6)
+        done = threading.Event()
+        results = []
+
+        def on_done(summary):
+            results.append(summary)
+            done.set()
+
+        assert summarizer.schedule("s1", lambda: (messages, None), on_done) is True
+        assert done.wait(timeout=2)
+        assert summarizer.wait(timeout=2)
+        assert results[0]["covered"] == 8
+        assert summarizer.stats()["folds"] == 1
+        assert summarizer.schedule("s1", lambda: (history(1, 10), None), on_done) is False
+
+    def test_failed_fold_is_counted(self):
+        class BrokenLLM:
+            def generate(self, messages, **kwargs):
+                raise RuntimeError("provider down")
+
+        summarizer = RollingSummarizer(BrokenLLM, token_threshold=10, keep_turns=1)
+        summarizer.schedule("s1", lambda: (history(4), None), lambda s: None)
+        assert summarizer.wait(timeout=2)
+        assert summarizer.stats()["failures"] == 1
+
+    @pytest.mark.parametrize("output", ["", "   ", None])
+    def test_empty_fold_keeps_previous_summary(self, summarizer, llm, output):
+        """An empty result does not mark turns as covered, so they stay in context."""
+        messages = history(6)
+        first = summarizer.fold(messages, None)
+        messages += history(4, start=6)
+        llm.generate = lambda prompt, **kwargs: output
+
+        assert summarizer.fold(messages, first) is None
+        assert summarizer.unsummarized(messages, first) == messages[first["covered"]:]
+        assert summarizer.stats()["failures"] == 1
+        assert summarizer.stats()["folds"] == 1
+
+    def test_empty_fold_is_not_applied_in_background(self, summarizer, llm):
+        llm.generate = lambda prompt, **kwargs: ""
+        applied = []
+        assert summarizer.schedule("s1", lambda: (history(6), None), applied.append) is True
+        assert summarizer.wait(timeout=2)
+        assert applied == []
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens([{"role": "user", "content": "x" * 40}]) == 14
+
+
+class TestSummaryStorage:
+    """Summary persistence in each storage backend."""
+
+    @pytest.mark.parametrize("backend_name", ["file", "sqlite"])
+    def test_summary_roundtrip(self, backend_name, tmp_path):
+        """Summaries round-trip through storage and are dropped with the history."""
+        storage = FileStorage(tmp_path, fsync="never") if backend_name == "file" else SQLiteStorage(tmp_path / "a.db")
+        assert storage.load_summary("s1") is None
+        storage.save_summary("s1", {"text": "the user wants a todo app", "covered": 6})
+        assert storage.load_summary("s1") == {"text": "the user wants a todo app", "covered": 6}
+        storage.delete_history("s1")
+        assert storage.load_summary("s1") is None
+        storage.close()
@@ -0,0 +1,145 @@
+"""
+Unit tests for TurnLog.
+Tests the append-only per-session history log (appends, tail reads, resets, torn writes, compaction).
+"""
+
+import json
+import time
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from storage import FileStorage, TurnLog
+
+
+def turn(i):
+    return [{"role": "user", "content": f"q{i}"}, {"role": "assistant", "content": f"a{i}"}]
+
+
+@pytest.fixture
+def log(tmp_path):
+    return TurnLog(tmp_path, fsync="never", tail_block_size=16)
+
+
+class TestTurnLog:
+    """Test suite for TurnLog class."""
+
+    def test_append_is_append_only(self, log):
+        """Each append adds lines; earlier bytes are untouched."""
+        log.append("s1", turn(0))
+        before = log.path("s1").read_bytes()
+        log.append("s1", turn(1))
+        after = log.path("s1").read_bytes()
+        assert after.startswith(before)
+        assert [m["content"] for m in log.read("s1")] == ["q0", "a0", "q1", "a1"]
+
+    def test_tail_reads_from_end(self, log):
+        """tail returns the last n messages across small read blocks."""
+        for i in range(20):
+            log.append("s1", turn(i))
+        assert [m["content"] for m in log.tail("s1", 3)] == ["a18", "q19", "a19"]
+        assert len(log.tail("s1", 100)) == 40
+        assert log.tail("missing", 5) == []
+
+    def test_replace_and_tail_stop_at_reset(self, log):
+        """Replaced history hides earlier messages from read and tail."""
+        for i in range(3):
+            log.append("s1", turn(i))
+        log.replace("s1", [{"role": "user", "content": "fresh"}])
+        assert log.read("s1") == [{"role": "user", "content": "fresh"}]
+        assert log.tail("s1", 10) == [{"role": "user", "content": "fresh"}]
+
+    def test_torn_write_is_skipped_and_fenced(self, log):
+        """A partial last line from a crash is ignored and the next append starts clean."""
+        log.append("s1", turn(0))
+        with open(log.path("s1"), "ab") as f:
+            f.write(b'{"role": "user", "cont')
+        assert [m["content"] for m in log.tail("s1", 5)] == ["q0", "a0"]
+
+        log.append("s1", turn(1))
+        assert [m["content"] for m in log.tail("s1", 2)] == ["q1", "a1"]
+
+    def test_compact_drops_dead_records(self, log):
+        """Compaction rewrites the file with live messages only."""
+        log.append("s1", turn(0))
+        log.replace("s1", turn(1))
+        assert log.compact("s1") is True
+        lines = log.path("s1").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(l)["content"] for l in lines] == ["q1", "a1"]
+        assert log.compact("s1") is False
+
+    def test_fsync_policies(self, tmp_path):
+        """'always' fsyncs every append; 'interval' defers to sync()."""
+        always = TurnLog(tmp_path / "a", fsync="always")
+        always.append("s1", turn(0))
+        assert always.stats()["fsyncs"] == 1
+
+        interval = TurnLog(tmp_path / "b", fsync="interval", fsync_interval=3600)
+        interval.append("s1", turn(0))
+        interval.append("s1", turn(1))
+        assert interval.stats()["unsynced_files"] == 1
+        interval.close()
+        assert interval.stats()["unsynced_files"] == 0
+
+        with pytest.raises(ValueError):
+            TurnLog(tmp_path, fsync="sometimes")
+
+    def test_interval_policy_syncs_without_further_appends(self, tmp_path):
+        """A session that goes quiet is still fsynced by the background thread."""
+        log = TurnLog(tmp_path, fsync="interval", fsync_interval=0.01)
+        log.append("s1", turn(0))
+        deadline = time.time() + 5
+        while log.stats()["unsynced_files"] and time.time() < deadline:
+            time.sleep(0.01)
+        assert log.stats()["unsynced_files"] == 0
+        assert log.stats()["fsyncs"] >= 1
+        log.close()
+
+    def test_count_reads_last_line_only(self, log):
+        """count comes from the last line's position; positions never leak into messages."""
+        for i in range(5):
+            log.append("s1", turn(i))
+        assert log.count("s1") == 10
+        assert "_seq" not in log.read("s1")[0]
+        assert "_seq" not in log.tail("s1", 1)[0]
+        log.replace("s1", turn(9))
+        assert log.count("s1") == 2
+        assert log.count("missing") == 0
+
+    def test_count_of_log_without_positions(self, log):
+        """Logs written before lines carried positions are counted by reading them."""
+        log.path("s1").parent.mkdir(parents=True, exist_ok=True)
+        log.path("s1").write_text("".join(json.dumps(m) + "\n" for m in turn(0) + turn(1)), encoding="utf-8")
+        assert log.count("s1") == 4
+        log.append("s1", turn(2))
+        assert log.count("s1") == 6
+        assert [m["content"] for m in log.tail("s1", 3)] == ["a1", "q2", "a2"]
+
+    def test_file_storage_migrates_legacy_history(self, tmp_path):
+        """FileStorage carries a legacy session file into the log on first append."""
+        legacy = {"session_id": "s1", "history": turn(0)}
+        (tmp_path / "session_s1.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+        storage = FileStorage(tmp_path, fsync="never")
+        assert storage.load_history("s1") == turn(0)
+        storage.append_history("s1", turn(1))
+        assert storage.load_history("s1") == turn(0) + turn(1)
+        assert storage.load_history("s1", last_n=2) == turn(1)
+
+        storage.delete_history("s1")
+        assert storage.load_history("s1") == []
+        assert not (tmp_path / "session_s1.json").exists()
+
+    def test_similar_session_ids_get_their_own_logs(self, log):
+        """Ids that only differ in unsafe characters never share a file."""
+        log.append("a/b", turn(0))
+        log.append("a_b", turn(1))
+        log.append("a:b", turn(2))
+
+        assert log.read("a/b") == turn(0)
+        assert log.read("a_b") == turn(1)
+        assert log.read("a:b") == turn(2)
+        assert sorted(log.session_ids()) == ["a/b", "a:b", "a_b"]
@@ -0,0 +1,121 @@
+"""
+Unit tests for WarmupService.
+Tests that a failed warm-up, including an LLM provider that cannot be reached,
+is retried with backoff until the instance is ready.
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Importing the app package pulls in the orchestrator and its memory package
+pytest.importorskip("memory")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+from app.services.chat_service import ChatService
+from app.services.warmup_service import WarmupService
+from llm.config import MODELS
+from orchestrator.orchestrator import Orchestrator
+
+
+@pytest.fixture
+def warmup(monkeypatch):
+    """WarmupService in its initial state, retrying quickly."""
+    monkeypatch.setattr(WarmupService, "_state", "pending")
+    monkeypatch.setattr(WarmupService, "_report", None)
+    monkeypatch.setattr(WarmupService, "_error", None)
+    monkeypatch.setattr(WarmupService, "_started_at", None)
+    monkeypatch.setattr(WarmupService, "_done", threading.Event())
+    monkeypatch.setattr(WarmupService, "_thread", None)
+    monkeypatch.setattr(WarmupService, "_attempts", 0)
+    monkeypatch.setattr(WarmupService, "_next_retry_at", None)
+    monkeypatch.setattr(WarmupService, "RETRY_INITIAL_SECONDS", 0.01)
+    monkeypatch.setattr(WarmupService, "RETRY_MAX_SECONDS", 0.02)
+    monkeypatch.setattr(WarmupService, "MAX_ATTEMPTS", 0)
+    return WarmupService
+
+
+def _orchestrator_failing(times):
+    orchestrator = Mock()
+    orchestrator.warm_up.return_value = {"agents_created": {}}
+    return Mock(side_effect=[RuntimeError("provider unreachable")] * times + [orchestrator] * 10)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestWarmupRetry:
+    """Warm-up failures are retried in the background."""
+
+    def test_recovers_after_failures(self, warmup):
+        with patch.object(ChatService, "_get_orchestrator", _orchestrator_failing(2)):
+            warmup.start()
+            # Startup only waits for the first attempt
+            assert warmup.wait(timeout=5) is False
+            assert _wait_for(warmup.is_ready)
+
+        status = warmup.status()
+        assert status["state"] == "ready"
+        assert status["attempts"] == 3
+        assert "error" not in status
+
+    def test_gives_up_after_max_attempts(self, warmup, monkeypatch):
+        monkeypatch.setattr(WarmupService, "MAX_ATTEMPTS", 2)
+        with patch.object(ChatService, "_get_orchestrator", _orchestrator_failing(5)):
+            warmup.start()
+            warmup._thread.join(timeout=5)
+
+        status = warmup.status()
+        assert status["state"] == "failed"
+        assert status["attempts"] == 2
+        assert status["error"] == "provider unreachable"
+
+
+@pytest.fixture
+def unreachable_provider(tmp_path, monkeypatch):
+    """An Orchestrator whose classifier LLM fails to connect twice, then connects."""
+    monkeypatch.setattr(Orchestrator, "CLASSIFIER_MODEL_PATH", tmp_path / "missing.json")
+    monkeypatch.setattr(Orchestrator, "CLASSIFICATION_CACHE_PATH", tmp_path / "cache.json")
+    monkeypatch.setattr(Orchestrator, "CLASSIFIER_DECISIONS_LOG", tmp_path / "decisions.jsonl")
+    llm = Mock(cfg=MODELS["intent"])
+    llm.warm_up.side_effect = [ConnectionError("Name or service not known")] * 2 + [None] * 10
+    with patch("orchestrator.orchestrator.get_llm", return_value=llm), \
+            patch("orchestrator.orchestrator.SimpleAgent", Mock), \
+            patch("orchestrator.orchestrator.MediumAgent", Mock), \
+            patch("orchestrator.orchestrator.TaskAgent", Mock):
+        orchestrator = Orchestrator()
+    return orchestrator
+
+
+class TestWarmupConnectFailure:
+    """An LLM role that fails to connect keeps the instance unready until a retry succeeds."""
+
+    def test_orchestrator_raises_for_failed_role(self, unreachable_provider):
+        with pytest.raises(RuntimeError) as failure:
+            unreachable_provider.warm_up()
+        assert failure.value.report["failed_roles"] == ["intent"]
+        assert failure.value.report["connections"]["intent"]["errors"] == ["Name or service not known"]
+
+    def test_optional_role_does_not_fail(self, unreachable_provider, monkeypatch):
+        monkeypatch.setattr(Orchestrator, "WARMUP_OPTIONAL_ROLES", frozenset({"intent"}))
+        assert unreachable_provider.warm_up()["failed_roles"] == []
+
+    def test_retries_until_provider_connects(self, warmup, unreachable_provider):
+        with patch.object(ChatService, "_get_orchestrator", return_value=unreachable_provider):
+            warmup.start()
+            assert warmup.wait(timeout=5) is False
+            assert _wait_for(warmup.is_ready)
+
+        status = warmup.status()
+        assert status["attempts"] == 3
+        assert status["report"]["failed_roles"] == []
@@ -0,0 +1,102 @@
+"""
+Unit tests for WriteBehind.
+Tests batching, coalescing, count-triggered flushes and the final flush on close.
+"""
+
+import threading
+import time
+import pytest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from storage import FileStorage, WriteBehind
+
+
+class RecordingSink:
+    def __init__(self):
+        self.batches = []
+        self.flushed = threading.Event()
+
+    def __call__(self, records):
+        self.batches.append(records)
+        self.flushed.set()
+
+
+class TestWriteBehind:
+    """Test suite for WriteBehind class."""
+
+    def test_mark_does_not_write(self):
+        """Marking dirty returns without touching storage."""
+        sink = RecordingSink()
+        persister = WriteBehind("sessions", sink, interval=3600)
+        persister.mark_dirty("s1", {"session_id": "s1"})
+        assert sink.batches == []
+        assert persister.stats()["pending"] == 1
+
+    def test_updates_coalesce(self):
+        """Repeated updates to one record become a single write of the latest snapshot."""
+        sink = RecordingSink()
+        persister = WriteBehind("sessions", sink, interval=3600)
+        record = {"session_id": "s1", "last_activity": "t0"}
+        for i in range(5):
+            record["last_activity"] = f"t{i}"
+            persister.mark_dirty("s1", record)
+        assert persister.flush() == 1
+        assert sink.batches == [[{"session_id": "s1", "last_activity": "t4"}]]
+        assert persister.stats()["coalesced"] == 4
+
+    def test_count_threshold_triggers_flush(self):
+        """The background thread flushes early once max_pending records are dirty."""
+        sink = RecordingSink()
+        persister = WriteBehind("sessions", sink, interval=3600, max_pending=3).start()
+        for i in range(3):
+            persister.mark_dirty(f"s{i}", {"session_id": f"s{i}"})
+        assert sink.flushed.wait(timeout=2)
+        assert len(sink.batches[0]) == 3
+        persister.close()
+
+    def test_interval_flush(self):
+        """Dirty records are written within the interval without further calls."""
+        sink = RecordingSink()
+        persister = WriteBehind("sessions", sink, interval=0.05).start()
+        persister.mark_dirty("s1", {"session_id": "s1"})
+        assert sink.flushed.wait(timeout=2)
+        persister.close()
+
+    def test_close_flushes_and_discard_drops(self):
+        """close() writes what is pending; discarded records are never written."""
+        sink = RecordingSink()
+        persister = WriteBehind("sessions", sink, interval=3600).start()
+        persister.mark_dirty("keep", {"session_id": "keep"})
+        persister.mark_dirty("gone", {"session_id": "gone"})
+        persister.discard("gone")
+        persister.close()
+        assert sink.batches == [[{"session_id": "keep"}]]
+
+    def test_failed_flush_is_retried(self):
+        """A failing batch stays pending for the next flush."""
+        calls = []
+
+        def flaky(records):
+            calls.append(records)
+            if len(calls) == 1:
+                raise OSError("disk full")
+
+        persister = WriteBehind("sessions", flaky, interval=3600)
+        persister.mark_dirty("s1", {"session_id": "s1"})
+        assert persister.flush() == 0
+        assert persister.flush() == 1
+        assert persister.stats()["failures"] == 1
+
+    def test_with_file_storage(self, tmp_path):
+        """Batches land in sessions.json through an atomic rewrite."""
+        storage = FileStorage(tmp_path, fsync="never")
+        persister = WriteBehind("sessions", storage.save_sessions, interval=3600)
+        for i in range(10):
+            persister.mark_dirty(f"s{i}", {"session_id": f"s{i}", "user_id": "u"})
+        persister.flush()
+        assert len(FileStorage(tmp_path).load_sessions()) == 10
+        assert not (tmp_path / "sessions.json.tmp").exists()